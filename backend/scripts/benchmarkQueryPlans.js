@@ -0,0 +1,168 @@
+const db = require('../src/config/database');
+const Player = require('../src/models/Player');
+const RecommendationService = require('../src/services/RecommendationService');
+const logger = require('../src/utils/logger');
+
+require('dotenv').config();
+
+const PLAYERS = parseInt(process.env.BENCH_PLAYERS) || 100000;
+const ITERATIONS = parseInt(process.env.BENCH_ITERATIONS) || 30;
+const SEARCH_P99_MS = parseFloat(process.env.BENCH_SEARCH_P99_MS) || 20;
+const CANDIDATES_P99_MS = parseFloat(process.env.BENCH_CANDIDATES_P99_MS) || 60;
+
+const POSITIONS = ['GK', 'CB', 'LB', 'RB', 'CDM', 'CM', 'CAM', 'LW', 'RW', 'ST', 'CF', 'LM'];
+const SURNAMES = ['Silva', 'Müller', 'García', 'Rossi', 'Smith', 'Dubois', 'Santos', 'Kowalski', 'Jensen', 'Yilmaz'];
+
+/**
+ * Seed synthetic players inside a transaction, then EXPLAIN ANALYZE and time every
+ * filter combination the Python UIs send: /players searches (Players tab, filter
+ * fallback) and candidate filters (recommendations), plus the per-shortlist
+ * scoring and signal lookups. Queries run as the same named prepared statements
+ * the API uses. Everything is rolled back at the end, so it is safe on a dev database.
+ *
+ * Fails (exit code 1) when a selective case falls back to a sequential scan of
+ * players, when the season is computed inside the plan, or when a p99 is over budget.
+ *
+ * Usage: npm run db:setup && npm run bench:queries
+ */
+
+// `seqScan: false` marks combinations selective enough that an index must be used
+const SEARCH_CASES = [
+  { label: 'no filters', filters: {} },
+  { label: 'position', filters: { position: 'ST' } },
+  { label: 'position + age', filters: { position: 'CM', age_min: 21, age_max: 23 }, seqScan: false },
+  { label: 'age', filters: { age_min: 30, age_max: 31 } },
+  { label: 'name', filters: { search: 'silva 4240' }, seqScan: false },
+  { label: 'position + age + name', filters: { position: 'ST', age_min: 18, age_max: 35, search: 'rossi 77' }, seqScan: false },
+  { label: 'club', filters: { club_id: 7 }, seqScan: false },
+  { label: 'position, page 2', filters: { position: 'ST', cursor: Math.floor(PLAYERS / 2) } }
+];
+
+const CANDIDATE_CASES = [
+  { label: 'one position', need: { positions_required: ['ST'] } },
+  { label: 'positions + age', need: { positions_required: ['CM', 'CDM'], age_min: 23, age_max: 32 } },
+  { label: 'positions + age + budget', need: { positions_required: ['ST', 'RW'], age_min: 20, age_max: 28, budget_max_eur: 80000000 } },
+  {
+    label: 'position + age + budget + foot',
+    need: { positions_required: ['CB'], age_min: 24, age_max: 25, budget_max_eur: 20000000, preferred_foot: 'left' },
+    seqScan: false
+  },
+  { label: 'budget only', need: { positions_required: [], budget_max_eur: 5000000 } }
+];
+
+const percentile = (sorted, p) =>
+  sorted[Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1)];
+
+const planNodes = (node, nodes = []) => {
+  nodes.push(node);
+  (node.Plans || []).forEach(child => planNodes(child, nodes));
+  return nodes;
+};
+
+async function seed(client) {
+  const started = Date.now();
+  await client.query(
+    `INSERT INTO players (external_id, first_name, last_name, full_name, age, primary_position,
+                          secondary_positions, preferred_foot, market_value_eur, current_club_id, is_available)
+     SELECT 'bench-' || g, 'Bench', s.surname, s.surname || ' ' || g, 17 + g % 22,
+            ($2::text[])[1 + g % 12], ARRAY[($2::text[])[1 + (g * 7 + 3) % 12]],
+            (ARRAY['right', 'right', 'left', 'both'])[1 + g % 4],
+            (g % 1000) * 150000, 1 + g % 60, g % 10 <> 0
+     FROM generate_series(1, $1) g
+     CROSS JOIN LATERAL (SELECT ($3::text[])[1 + g % 10] AS surname) s`,
+    [PLAYERS, POSITIONS, SURNAMES]
+  );
+  await client.query(
+    `INSERT INTO player_performance (player_id, season, form_score, consistency_score)
+     SELECT id, $1, random(), random() FROM players
+     WHERE external_id LIKE 'bench-%' AND id % 5 <> 0`,
+    [Player.currentSeason()]
+  );
+  await client.query(
+    `INSERT INTO player_signals (player_id, signal_type, signal_value, confidence_score, evidence, is_risk, expires_at)
+     SELECT id, (ARRAY['injury', 'form', 'transfer'])[1 + id % 3], random(), random(), 'bench', id % 3 = 0,
+            NOW() + INTERVAL '14 days'
+     FROM players WHERE external_id LIKE 'bench-%' AND id % 20 = 0`
+  );
+  await client.query('ANALYZE players');
+  await client.query('ANALYZE player_performance');
+  await client.query('ANALYZE player_signals');
+  logger.info(`🌱 Seeded ${PLAYERS} players (with performance and signals) in ${Date.now() - started}ms`);
+}
+
+/**
+ * EXPLAIN ANALYZE one query, then time it as a prepared statement; returns false on a failed check
+ */
+async function runCase(client, kind, label, { name, text, params }, { seqScan = true, subplans = true, budget }) {
+  const explained = await client.query(`EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ${text}`, params);
+  const [{ Plan: plan }] = explained.rows[0]['QUERY PLAN'];
+  const nodes = planNodes(plan);
+  const indexes = [...new Set(nodes.filter(n => n['Index Name']).map(n => n['Index Name']))];
+  const seqScanned = nodes.some(n => n['Node Type'] === 'Seq Scan' && n['Relation Name'] === 'players');
+  const nested = nodes.filter(n => ['InitPlan', 'SubPlan'].includes(n['Parent Relationship']));
+
+  const latencies = [];
+  for (let i = 0; i < ITERATIONS; i++) {
+    const start = process.hrtime.bigint();
+    await client.query({ name, text, values: params });
+    latencies.push(Number(process.hrtime.bigint() - start) / 1e6);
+  }
+  latencies.sort((a, b) => a - b);
+  const p99 = percentile(latencies, 99);
+
+  const failures = [];
+  if (!seqScan && seqScanned) failures.push('sequential scan of players');
+  if (!subplans && nested.length > 0) failures.push(`${nested.length} sub-plan(s), e.g. the season, evaluated inside the query`);
+  if (p99 > budget) failures.push(`p99 over the ${budget}ms budget`);
+
+  const line = `${kind} / ${label} [${name}]: ${plan['Actual Rows']} rows, ` +
+    `${seqScanned ? 'seq scan' : 'no seq scan'}, indexes: ${indexes.join(', ') || 'none'}, ` +
+    `p50 ${percentile(latencies, 50).toFixed(2)}ms, p99 ${p99.toFixed(2)}ms`;
+  if (failures.length > 0) {
+    logger.error(`❌ ${line} (${failures.join('; ')})`);
+    return false;
+  }
+  logger.info(`✓ ${line}`);
+  return true;
+}
+
+async function benchmarkQueryPlans() {
+  const client = await db.pool.connect();
+  let ok = true;
+
+  try {
+    await client.query('BEGIN');
+    await seed(client);
+
+    for (const { label, filters, seqScan } of SEARCH_CASES) {
+      const query = Player.searchQuery({ ...filters, limit: 50 });
+      ok = await runCase(client, 'search', label, query, { seqScan, budget: SEARCH_P99_MS }) && ok;
+    }
+
+    for (const { label, need, seqScan } of CANDIDATE_CASES) {
+      const query = RecommendationService._candidateQuery(need);
+      ok = await runCase(client, 'candidates', label, query, { seqScan, subplans: false, budget: CANDIDATES_P99_MS }) && ok;
+    }
+
+    // The two per-shortlist lookups, over a 500-candidate id list
+    const ids = (await client.query(
+      `SELECT id FROM players WHERE external_id LIKE 'bench-%' ORDER BY id LIMIT 500`
+    )).rows.map(row => row.id);
+    ok = await runCase(client, 'scoring', 'signal rollups', RecommendationService._scoringInputsQuery(ids),
+                       { seqScan: false, budget: SEARCH_P99_MS }) && ok;
+    ok = await runCase(client, 'scoring', 'recent signals', RecommendationService._recentSignalsQuery(ids),
+                       { seqScan: false, budget: SEARCH_P99_MS }) && ok;
+
+    if (!ok) process.exitCode = 1;
+    logger.info(ok ? '✓ All plan and latency checks passed' : '❌ Some plan or latency checks failed');
+  } catch (error) {
+    logger.error(`❌ Benchmark failed: ${error.message}`);
+    process.exitCode = 1;
+  } finally {
+    await client.query('ROLLBACK').catch(() => {});
+    client.release();
+    await db.pool.end();
+  }
+}
+
+benchmarkQueryPlans();
@@ -0,0 +1,72 @@
+const db = require('../src/config/database');
+const RecommendationService = require('../src/services/RecommendationService');
+const logger = require('../src/utils/logger');
+
+require('dotenv').config();
+
+const ITERATIONS = parseInt(process.env.BENCH_ITERATIONS) || 50;
+const TOP_N = parseInt(process.env.BENCH_TOP_N) || 20;
+
+/**
+ * Benchmark recommendation generation against the seeded database.
+ * Reports queries per request and p50/p99 latency for each active club need.
+ *
+ * Usage: npm run db:setup && npm run db:seed && npm run bench:recommendations
+ */
+
+const percentile = (sorted, p) =>
+  sorted[Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1)];
+
+async function benchmarkRecommendations() {
+  // Count every query issued through the shared pool wrapper
+  let queryCount = 0;
+  const originalQuery = db.query;
+  db.query = (text, params) => {
+    queryCount++;
+    return originalQuery(text, params);
+  };
+
+  try {
+    const needs = (await originalQuery(
+      'SELECT * FROM club_needs WHERE is_active = true ORDER BY id'
+    )).rows;
+
+    if (needs.length === 0) {
+      logger.warn('No active club needs found. Run npm run db:seed first.');
+      return;
+    }
+
+    logger.info(`📊 Benchmarking ${needs.length} club needs × ${ITERATIONS} iterations (top ${TOP_N})`);
+
+    for (const need of needs) {
+      const latencies = [];
+      const queries = [];
+
+      for (let i = 0; i < ITERATIONS; i++) {
+        queryCount = 0;
+        const start = process.hrtime.bigint();
+        await RecommendationService.generateRecommendations(need, TOP_N);
+        latencies.push(Number(process.hrtime.bigint() - start) / 1e6);
+        queries.push(queryCount);
+      }
+
+      latencies.sort((a, b) => a - b);
+      const avgQueries = queries.reduce((sum, q) => sum + q, 0) / queries.length;
+
+      logger.info(
+        `club_need ${need.id} (club ${need.club_id}, ${need.positions_required.join('/')}): ` +
+        `${avgQueries.toFixed(1)} queries/request, ` +
+        `p50 ${percentile(latencies, 50).toFixed(2)}ms, ` +
+        `p99 ${percentile(latencies, 99).toFixed(2)}ms`
+      );
+    }
+  } catch (error) {
+    logger.error(`❌ Benchmark failed: ${error.message}`);
+    process.exitCode = 1;
+  } finally {
+    db.query = originalQuery;
+    await db.pool.end();
+  }
+}
+
+benchmarkRecommendations();
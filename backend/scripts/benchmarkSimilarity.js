@@ -0,0 +1,121 @@
+const { IVFIndex } = require('../src/utils/annIndex');
+const { DIMENSIONS, POSITION_COORDS, buildVectors } = require('../src/utils/playerVectors');
+const logger = require('../src/utils/logger');
+
+require('dotenv').config();
+
+const PLAYERS = parseInt(process.env.BENCH_PLAYERS) || 100000;
+const QUERIES = parseInt(process.env.BENCH_QUERIES) || 500;
+const K = parseInt(process.env.BENCH_K) || 10;
+const NPROBE = parseInt(process.env.SIMILARITY_NPROBE) || 12;
+
+/**
+ * Benchmark the in-process similar-players index on synthetic profiles.
+ * Reports build time, p50/p99 lookup latency (plain and with a "cheaper" filter)
+ * and recall@K against an exact scan. Needs no database.
+ *
+ * Usage: npm run bench:similarity
+ *        BENCH_PLAYERS=250000 SIMILARITY_NPROBE=16 npm run bench:similarity
+ */
+
+const percentile = (sorted, p) =>
+  sorted[Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1)];
+
+// Small deterministic PRNG so runs are comparable
+let seed = 7;
+const random = () => {
+  seed = (seed * 1103515245 + 12345) % 2147483648;
+  return seed / 2147483648;
+};
+const between = (min, max) => min + random() * (max - min);
+
+function syntheticPlayers(count) {
+  const positions = Object.keys(POSITION_COORDS);
+  return Array.from({ length: count }, (_, i) => {
+    const position = positions[Math.floor(random() * positions.length)];
+    const minutes = Math.floor(between(0, 3400));
+    return {
+      id: i + 1,
+      primary_position: position,
+      secondary_positions: random() < 0.5 ? [positions[Math.floor(random() * positions.length)]] : [],
+      age: Math.floor(between(17, 37)),
+      height_cm: Math.floor(between(165, 200)),
+      weight_kg: Math.floor(between(60, 95)),
+      preferred_foot: ['left', 'right', 'right', 'both'][Math.floor(random() * 4)],
+      market_value_eur: Math.floor(10 ** between(5, 8.3)),
+      form_score: random() < 0.9 ? between(0.3, 0.95) : null,
+      consistency_score: between(0.3, 0.95),
+      passing_accuracy: between(60, 93),
+      goals: Math.floor(between(0, position === 'ST' ? 30 : 8)),
+      assists: Math.floor(between(0, 12)),
+      minutes_played: minutes,
+      tackles_per_game: between(0, 4),
+      interceptions_per_game: between(0, 3),
+      dribbles_per_game: between(0, 4)
+    };
+  });
+}
+
+function exactNeighbours(vectors, count, queryId, k) {
+  const query = vectors.subarray((queryId - 1) * DIMENSIONS, queryId * DIMENSIONS);
+  const scored = [];
+  for (let i = 0; i < count; i++) {
+    if (i + 1 === queryId) continue;
+    let sum = 0;
+    for (let d = 0; d < DIMENSIONS; d++) {
+      const diff = vectors[i * DIMENSIONS + d] - query[d];
+      sum += diff * diff;
+    }
+    scored.push([i + 1, sum]);
+  }
+  return scored.sort((a, b) => a[1] - b[1]).slice(0, k).map(([id]) => id);
+}
+
+function benchmarkSimilarity() {
+  const players = syntheticPlayers(PLAYERS);
+  const byId = new Map(players.map(p => [p.id, p]));
+
+  let start = Date.now();
+  const { vectors } = buildVectors(players);
+  const vectorMs = Date.now() - start;
+
+  start = Date.now();
+  const index = new IVFIndex({ dim: DIMENSIONS, nprobe: NPROBE }).build(players.map(p => p.id), vectors);
+  logger.info(
+    `🧭 ${PLAYERS} players × ${DIMENSIONS} dims: vectors ${vectorMs}ms, ` +
+    `index ${Date.now() - start}ms (${index.nlist} clusters, nprobe ${NPROBE})`
+  );
+
+  const queryIds = Array.from({ length: QUERIES }, () => 1 + Math.floor(random() * PLAYERS));
+  const run = (label, filterFor) => {
+    const latencies = [];
+    const scanned = [];
+    for (const id of queryIds) {
+      const t = process.hrtime.bigint();
+      const filter = filterFor(byId.get(id));
+      const found = index.search(index.vector(id), K, { filter: other => other !== id && filter(byId.get(other)) });
+      latencies.push(Number(process.hrtime.bigint() - t) / 1e6);
+      scanned.push(found.scanned);
+    }
+    latencies.sort((a, b) => a - b);
+    logger.info(
+      `${label}: p50 ${percentile(latencies, 50).toFixed(3)}ms, p99 ${percentile(latencies, 99).toFixed(3)}ms, ` +
+      `${Math.round(scanned.reduce((s, n) => s + n, 0) / scanned.length)} vectors scanned/query`
+    );
+  };
+
+  run('similar', () => () => true);
+  run('similar + cheaper', source => other => other.market_value_eur < source.market_value_eur);
+
+  // Recall against an exact scan, on a subset (the exact scan is the slow part)
+  const recallQueries = queryIds.slice(0, Math.min(100, QUERIES));
+  let hits = 0;
+  for (const id of recallQueries) {
+    const exact = new Set(exactNeighbours(vectors, PLAYERS, id, K));
+    const found = index.search(index.vector(id), K, { filter: other => other !== id });
+    hits += found.ids.filter(other => exact.has(other)).length;
+  }
+  logger.info(`recall@${K}: ${(hits / (recallQueries.length * K)).toFixed(3)}`);
+}
+
+benchmarkSimilarity();
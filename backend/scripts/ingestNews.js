@@ -0,0 +1,35 @@
+require('dotenv').config();
+
+const db = require('../src/config/database');
+const NewsIngestionService = require('../src/services/NewsIngestionService');
+const logger = require('../src/utils/logger');
+
+/**
+ * Run one news ingestion cycle and report per-stage throughput.
+ *
+ * Usage:
+ *   npm run llm:ingest                 # live sources, OpenAI, Postgres
+ *   npm run llm:ingest -- --offline    # mock articles, stubbed LLM, in-memory store
+ *
+ * Offline tuning: NEWS_OFFLINE_ARTICLES_PER_SOURCE, NEWS_STUB_LLM_LATENCY_MS,
+ * and the NEWS_*_CONCURRENCY / NEWS_BATCH_SIZE knobs shared with the live pipeline.
+ */
+async function ingestNews() {
+  const offline = process.argv.includes('--offline') || process.env.NEWS_INGEST_OFFLINE === 'true';
+
+  try {
+    logger.info(`📰 Running news ingestion${offline ? ' (offline)' : ''}...`);
+    const stats = await NewsIngestionService.ingestAllNews({ offline });
+
+    if (!stats) {
+      process.exitCode = 1;
+      return;
+    }
+
+    console.table(stats.stages);
+  } finally {
+    if (!offline) await db.pool.end();
+  }
+}
+
+ingestNews();
@@ -1,3 +1,6 @@
+-- Trigram index support for substring name search (full_name ILIKE '%...%')
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Players Table
 CREATE TABLE IF NOT EXISTS players (
     id SERIAL PRIMARY KEY,
@@ -74,6 +77,20 @@ CREATE TABLE IF NOT EXISTS player_signals (
     expires_at TIMESTAMP
 );
 
+-- Per-player signal rollups, maintained by triggers on player_signals and news_extractions.
+-- Ranking reads one row per candidate; stale_after marks when the rolling window
+-- (signal expiry, 7-day news) next changes the row without a write.
+CREATE TABLE IF NOT EXISTS player_signal_rollups (
+    player_id INT PRIMARY KEY REFERENCES players(id),
+    availability_penalty FLOAT NOT NULL DEFAULT 0,
+    active_risk_count INT NOT NULL DEFAULT 0,
+    avg_risk FLOAT,
+    news_confidence FLOAT,
+    news_mentions INT NOT NULL DEFAULT 0,
+    stale_after TIMESTAMP NOT NULL DEFAULT 'infinity',
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Player Performance Metrics
 CREATE TABLE IF NOT EXISTS player_performance (
     id SERIAL PRIMARY KEY,
@@ -110,6 +127,19 @@ CREATE TABLE IF NOT EXISTS transfers (
 );
 
 -- News Articles
+-- Feed position: bumped whenever an article or its extractions change (see NEWS FEED triggers)
+CREATE SEQUENCE IF NOT EXISTS news_feed_seq;
+
+-- Next feed position. The writer's transaction id is assigned first, so a transaction
+-- that is still open when the feed is read is always at or above the snapshot's xmin
+CREATE OR REPLACE FUNCTION news_feed_next()
+RETURNS BIGINT AS $$
+BEGIN
+    PERFORM txid_current();
+    RETURN nextval('news_feed_seq');
+END;
+$$ LANGUAGE plpgsql;
+
 CREATE TABLE IF NOT EXISTS news_articles (
     id SERIAL PRIMARY KEY,
     external_id VARCHAR(255) UNIQUE,
@@ -123,6 +153,10 @@ CREATE TABLE IF NOT EXISTS news_articles (
     author VARCHAR(255),
     image_url VARCHAR(500),
     raw_json JSONB,
+    content_hash CHAR(64),
+    duplicate_count INT NOT NULL DEFAULT 0,
+    feed_seq BIGINT NOT NULL DEFAULT news_feed_next(),
+    feed_txid BIGINT NOT NULL DEFAULT txid_current(),  -- transaction that set feed_seq
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -142,6 +176,31 @@ CREATE TABLE IF NOT EXISTS news_extractions (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- LLM extraction cache: unchanged content skips the LLM call
+CREATE TABLE IF NOT EXISTS llm_extraction_cache (
+    content_hash CHAR(64) NOT NULL,
+    llm_model VARCHAR(100) NOT NULL,
+    prompt_version VARCHAR(50) NOT NULL,
+    extraction JSONB NOT NULL,
+    processing_time_ms INT,
+    hit_count INT NOT NULL DEFAULT 0,
+    last_hit_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (content_hash, llm_model, prompt_version)
+);
+
+-- LLM extraction work queue (survives restarts; expired leases are reclaimed)
+CREATE TABLE IF NOT EXISTS news_ingest_queue (
+    id SERIAL PRIMARY KEY,
+    article_id INT NOT NULL UNIQUE REFERENCES news_articles(id),
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    last_error TEXT,
+    locked_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Recommendations
 CREATE TABLE IF NOT EXISTS recommendations (
     id SERIAL PRIMARY KEY,
@@ -186,10 +245,39 @@ CREATE TABLE IF NOT EXISTS audit_logs (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Analytics rollups, maintained by triggers (see ANALYTICS ROLLUPS) so /analytics never
+-- counts the underlying tables. Running totals, spread over slot rows so concurrent
+-- writers don't queue on one row lock; a metric's value is the sum of its slots
+CREATE TABLE IF NOT EXISTS analytics_counters (
+    metric VARCHAR(50) NOT NULL,
+    slot SMALLINT NOT NULL DEFAULT 0,
+    value BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (metric, slot)
+);
+
+-- Players by primary position and age band
+CREATE TABLE IF NOT EXISTS analytics_player_distribution (
+    position VARCHAR(50) NOT NULL,
+    age_band VARCHAR(10) NOT NULL,
+    players INT NOT NULL DEFAULT 0,
+    available INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (position, age_band)
+);
+
+-- Events per day, split by a dimension (news source, feedback type, ...)
+CREATE TABLE IF NOT EXISTS analytics_daily (
+    metric VARCHAR(50) NOT NULL,
+    dimension VARCHAR(255) NOT NULL DEFAULT '',
+    day DATE NOT NULL,
+    count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (metric, dimension, day)
+);
+
 -- Indexes for Performance
 CREATE INDEX idx_players_club ON players(current_club_id);
 CREATE INDEX idx_players_position ON players(primary_position);
-CREATE INDEX idx_players_availability ON players(is_available);
+CREATE INDEX idx_players_last_updated ON players(last_updated);
 CREATE INDEX idx_player_signals_type ON player_signals(signal_type);
 CREATE INDEX idx_player_signals_expires ON player_signals(expires_at);
 CREATE INDEX idx_club_needs_active ON club_needs(is_active);
@@ -198,5 +286,473 @@ CREATE INDEX idx_recommendations_player ON recommendations(player_id);
 CREATE INDEX idx_recommendations_score ON recommendations(final_score DESC);
 CREATE INDEX idx_news_articles_source ON news_articles(source_name);
 CREATE INDEX idx_news_articles_published ON news_articles(published_at DESC);
+CREATE INDEX idx_news_articles_feed_seq ON news_articles(feed_seq);
+CREATE UNIQUE INDEX idx_news_articles_content_hash ON news_articles(content_hash);
 CREATE INDEX idx_news_extractions_article ON news_extractions(article_id);
 CREATE INDEX idx_news_extractions_type ON news_extractions(event_type);
+CREATE INDEX idx_news_ingest_queue_status ON news_ingest_queue(status, id);
+CREATE INDEX idx_player_signals_player_recent ON player_signals(player_id, created_at DESC) WHERE is_active = true;
+CREATE INDEX idx_news_extractions_players ON news_extractions USING GIN (affected_players);
+CREATE INDEX idx_news_extractions_clubs ON news_extractions USING GIN (affected_clubs);
+CREATE INDEX idx_analytics_daily_day ON analytics_daily(day);
+
+-- Candidate filter and /players search (see RecommendationService._candidateQuery, Player.searchQuery).
+-- Both only ever read available players, so the btree indexes are partial on is_available;
+-- primary position OR secondary positions plans as a BitmapOr of the first and the GIN index.
+CREATE INDEX idx_players_available_position_age ON players(primary_position, age) WHERE is_available = true;
+CREATE INDEX idx_players_available_age_value ON players(age, market_value_eur) WHERE is_available = true;
+CREATE INDEX idx_players_secondary_positions ON players USING GIN (secondary_positions);
+CREATE INDEX idx_players_full_name_trgm ON players USING GIN (full_name gin_trgm_ops);
+CREATE INDEX idx_player_performance_player_season ON player_performance(player_id, season)
+    INCLUDE (form_score, consistency_score);
+
+-- ==================== CHANGE NOTIFICATIONS ====================
+
+-- Announce changed players on the player_changes channel so the API can drop
+-- cached shortlists that include them; chunked to stay under the payload limit
+CREATE OR REPLACE FUNCTION notify_player_changes(ids INT[], source TEXT)
+RETURNS VOID AS $$
+DECLARE
+    chunk_start INT := 1;
+BEGIN
+    WHILE chunk_start <= COALESCE(array_length(ids, 1), 0) LOOP
+        PERFORM pg_notify('player_changes', json_build_object(
+            'source', source,
+            'player_ids', ids[chunk_start:chunk_start + 499]
+        )::text);
+        chunk_start := chunk_start + 500;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ==================== SIGNAL ROLLUPS ====================
+
+-- Recompute rollups for the given players; returns the refreshed rows
+CREATE OR REPLACE FUNCTION refresh_player_rollups(ids INT[])
+RETURNS SETOF player_signal_rollups AS $$
+    INSERT INTO player_signal_rollups AS r (
+        player_id, availability_penalty, active_risk_count, avg_risk,
+        news_confidence, news_mentions, stale_after, refreshed_at
+    )
+    SELECT p.id,
+           COALESCE(a.penalty, 0),
+           COALESCE(k.risk_count, 0),
+           k.avg_risk,
+           n.avg_confidence,
+           COALESCE(n.mentions, 0),
+           LEAST(COALESCE(a.next_expiry, 'infinity'), COALESCE(n.oldest + INTERVAL '7 days', 'infinity')),
+           NOW()
+    FROM players p
+    LEFT JOIN LATERAL (
+        SELECT SUM(signal_value) * 0.3 AS penalty, MIN(expires_at) AS next_expiry
+        FROM player_signals
+        WHERE player_id = p.id AND is_active = true
+          AND signal_type IN ('injury', 'suspension') AND expires_at > NOW()
+    ) a ON true
+    LEFT JOIN LATERAL (
+        SELECT COUNT(*) AS risk_count, AVG(signal_value) AS avg_risk
+        FROM player_signals
+        WHERE player_id = p.id AND is_risk = true AND is_active = true
+    ) k ON true
+    LEFT JOIN LATERAL (
+        SELECT AVG(ne.confidence_score) AS avg_confidence, COUNT(*) AS mentions, MIN(na.published_at) AS oldest
+        FROM news_extractions ne
+        JOIN news_articles na ON na.id = ne.article_id
+        WHERE ne.affected_players @> ARRAY[p.id]
+          AND na.published_at > NOW() - INTERVAL '7 days'
+    ) n ON true
+    WHERE p.id = ANY(ids)
+    ON CONFLICT (player_id) DO UPDATE SET
+        availability_penalty = EXCLUDED.availability_penalty,
+        active_risk_count = EXCLUDED.active_risk_count,
+        avg_risk = EXCLUDED.avg_risk,
+        news_confidence = EXCLUDED.news_confidence,
+        news_mentions = EXCLUDED.news_mentions,
+        stale_after = EXCLUDED.stale_after,
+        refreshed_at = EXCLUDED.refreshed_at
+    RETURNING r.*;
+$$ LANGUAGE sql;
+
+-- Statement-level triggers: one refresh per write, covering every player it touched
+CREATE OR REPLACE FUNCTION player_signals_rollup_trigger()
+RETURNS TRIGGER AS $$
+DECLARE
+    ids INT[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        ids := ARRAY(SELECT DISTINCT player_id FROM new_rows);
+    ELSIF TG_OP = 'UPDATE' THEN
+        ids := ARRAY(SELECT player_id FROM new_rows UNION SELECT player_id FROM old_rows);
+    ELSE
+        ids := ARRAY(SELECT DISTINCT player_id FROM old_rows);
+    END IF;
+    PERFORM refresh_player_rollups(ids);
+    PERFORM notify_player_changes(ids, TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION news_extractions_rollup_trigger()
+RETURNS TRIGGER AS $$
+DECLARE
+    ids INT[];
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        ids := ARRAY(SELECT DISTINCT unnest(affected_players) FROM old_rows);
+    ELSE
+        ids := ARRAY(SELECT DISTINCT unnest(affected_players) FROM new_rows);
+    END IF;
+    PERFORM refresh_player_rollups(ids);
+    PERFORM notify_player_changes(ids, TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER player_signals_rollup_insert AFTER INSERT ON player_signals
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION player_signals_rollup_trigger();
+CREATE TRIGGER player_signals_rollup_update AFTER UPDATE ON player_signals
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION player_signals_rollup_trigger();
+CREATE TRIGGER player_signals_rollup_delete AFTER DELETE ON player_signals
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION player_signals_rollup_trigger();
+CREATE TRIGGER news_extractions_rollup_insert AFTER INSERT ON news_extractions
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION news_extractions_rollup_trigger();
+CREATE TRIGGER news_extractions_rollup_delete AFTER DELETE ON news_extractions
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION news_extractions_rollup_trigger();
+
+-- Performance, transfer and profile writes change scores or eligibility directly
+CREATE OR REPLACE FUNCTION player_changes_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'players' THEN
+        PERFORM notify_player_changes(ARRAY(SELECT id FROM new_rows), TG_TABLE_NAME);
+    ELSE
+        PERFORM notify_player_changes(ARRAY(SELECT DISTINCT player_id FROM new_rows), TG_TABLE_NAME);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER player_performance_changes_insert AFTER INSERT ON player_performance
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION player_changes_trigger();
+CREATE TRIGGER player_performance_changes_update AFTER UPDATE ON player_performance
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION player_changes_trigger();
+CREATE TRIGGER transfers_changes_insert AFTER INSERT ON transfers
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION player_changes_trigger();
+CREATE TRIGGER players_changes_update AFTER UPDATE ON players
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION player_changes_trigger();
+
+-- Every profile write bumps last_updated, which client snapshots delta-sync on
+CREATE OR REPLACE FUNCTION touch_last_updated()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.last_updated := CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER players_touch_last_updated BEFORE UPDATE ON players
+    FOR EACH ROW EXECUTE FUNCTION touch_last_updated();
+
+-- ==================== NEWS FEED ====================
+
+-- Clients follow /news?since=<feed_seq>. An edited article or a new extraction moves the
+-- article to the head of the feed, so late extractions reach clients that already hold it
+CREATE OR REPLACE FUNCTION news_articles_feed_bump()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.title IS DISTINCT FROM OLD.title OR NEW.content IS DISTINCT FROM OLD.content
+       OR NEW.published_at IS DISTINCT FROM OLD.published_at THEN
+        NEW.feed_seq := news_feed_next();
+        NEW.feed_txid := txid_current();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION news_extractions_feed_bump()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE news_articles SET feed_seq = news_feed_next(), feed_txid = txid_current()
+    WHERE id IN (SELECT DISTINCT article_id FROM new_rows);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- One notification per write on the news_feed channel carrying the new feed head;
+-- the API pushes the delta to /news/stream subscribers
+CREATE OR REPLACE FUNCTION news_feed_notify()
+RETURNS TRIGGER AS $$
+DECLARE
+    head BIGINT;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        head := (SELECT MAX(feed_seq) FROM new_rows);
+    ELSE
+        head := (SELECT MAX(n.feed_seq) FROM new_rows n JOIN old_rows o ON o.id = n.id
+                 WHERE n.feed_seq <> o.feed_seq);
+    END IF;
+    IF head IS NOT NULL THEN
+        PERFORM pg_notify('news_feed', json_build_object('feed_seq', head)::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER news_articles_feed_bump BEFORE UPDATE OF title, content, published_at ON news_articles
+    FOR EACH ROW EXECUTE FUNCTION news_articles_feed_bump();
+CREATE TRIGGER news_extractions_feed_bump AFTER INSERT ON news_extractions
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION news_extractions_feed_bump();
+CREATE TRIGGER news_articles_feed_insert AFTER INSERT ON news_articles
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION news_feed_notify();
+CREATE TRIGGER news_articles_feed_update AFTER UPDATE ON news_articles
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION news_feed_notify();
+
+-- ==================== ANALYTICS ROLLUPS ====================
+
+-- Statement-level triggers apply signed deltas (+1 per new row, -1 per old row), so a
+-- bulk write costs one upsert per touched bucket. TRUNCATE bypasses them: run
+-- refresh_analytics() afterwards.
+CREATE OR REPLACE FUNCTION analytics_age_band(age INT)
+RETURNS TEXT AS $$
+    SELECT CASE
+        WHEN age IS NULL THEN 'unknown'
+        WHEN age < 21 THEN 'U21'
+        WHEN age <= 24 THEN '21-24'
+        WHEN age <= 28 THEN '25-28'
+        WHEN age <= 32 THEN '29-32'
+        ELSE '33+'
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Each backend adds to its own slot (pid modulo 16), so concurrent transactions bumping
+-- the same metric lock different rows instead of serializing on one
+CREATE OR REPLACE FUNCTION bump_analytics_counter(name TEXT, delta BIGINT)
+RETURNS VOID AS $$
+    INSERT INTO analytics_counters AS c (metric, slot, value, updated_at)
+    SELECT name, pg_backend_pid() % 16, delta, NOW() WHERE delta <> 0
+    ON CONFLICT (metric, slot) DO UPDATE SET
+        value = c.value + EXCLUDED.value,
+        updated_at = EXCLUDED.updated_at;
+$$ LANGUAGE sql;
+
+-- One signed count per (dimension, day) pair; the arrays are row-aligned
+CREATE OR REPLACE FUNCTION bump_analytics_daily(name TEXT, dimensions TEXT[], days DATE[], signs INT[])
+RETURNS VOID AS $$
+    INSERT INTO analytics_daily AS d (metric, dimension, day, count)
+    SELECT name, COALESCE(r.dimension, 'unknown'), r.day, SUM(r.sign)
+    FROM unnest(dimensions, days, signs) AS r(dimension, day, sign)
+    GROUP BY 2, 3
+    HAVING SUM(r.sign) <> 0
+    ON CONFLICT (metric, dimension, day) DO UPDATE SET count = d.count + EXCLUDED.count;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION bump_player_distribution(positions TEXT[], ages INT[], available BOOLEAN[], signs INT[])
+RETURNS VOID AS $$
+    INSERT INTO analytics_player_distribution AS d (position, age_band, players, available)
+    SELECT COALESCE(r.position, 'unknown'), analytics_age_band(r.age), SUM(r.sign),
+           COALESCE(SUM(r.sign) FILTER (WHERE r.is_available), 0)
+    FROM unnest(positions, ages, available, signs) AS r(position, age, is_available, sign)
+    GROUP BY 1, 2
+    HAVING SUM(r.sign) <> 0 OR COALESCE(SUM(r.sign) FILTER (WHERE r.is_available), 0) <> 0
+    ON CONFLICT (position, age_band) DO UPDATE SET
+        players = d.players + EXCLUDED.players,
+        available = d.available + EXCLUDED.available;
+$$ LANGUAGE sql;
+
+-- Profile updates only count when position, age or availability changed
+CREATE OR REPLACE FUNCTION players_analytics_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_player_distribution(array_agg(primary_position::text), array_agg(age), array_agg(is_available),
+                                         array_agg(1))
+        FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM bump_player_distribution(array_agg(primary_position::text), array_agg(age), array_agg(is_available),
+                                         array_agg(-1))
+        FROM old_rows;
+    ELSE
+        PERFORM bump_player_distribution(array_agg(c.position), array_agg(c.age), array_agg(c.is_available),
+                                         array_agg(c.sign))
+        FROM (
+            SELECT n.primary_position::text AS position, n.age, n.is_available, 1 AS sign
+            FROM new_rows n JOIN old_rows o ON o.id = n.id
+            WHERE (n.primary_position, n.age, n.is_available) IS DISTINCT FROM (o.primary_position, o.age, o.is_available)
+            UNION ALL
+            SELECT o.primary_position::text, o.age, o.is_available, -1
+            FROM new_rows n JOIN old_rows o ON o.id = n.id
+            WHERE (n.primary_position, n.age, n.is_available) IS DISTINCT FROM (o.primary_position, o.age, o.is_available)
+        ) c;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- News volume by source and publication day
+CREATE OR REPLACE FUNCTION news_articles_analytics_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_analytics_counter('news_articles', (SELECT COUNT(*) FROM new_rows));
+        PERFORM bump_analytics_daily('news', array_agg(source_name::text), array_agg(published_at::date), array_agg(1))
+        FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM bump_analytics_counter('news_articles', -(SELECT COUNT(*) FROM old_rows));
+        PERFORM bump_analytics_daily('news', array_agg(source_name::text), array_agg(published_at::date), array_agg(-1))
+        FROM old_rows;
+    ELSE
+        -- Re-ingested articles (ON CONFLICT DO UPDATE) may move to another day
+        PERFORM bump_analytics_daily('news', array_agg(c.source_name), array_agg(c.day), array_agg(c.sign))
+        FROM (
+            SELECT n.source_name::text, n.published_at::date AS day, 1 AS sign
+            FROM new_rows n JOIN old_rows o ON o.id = n.id
+            WHERE (n.source_name, n.published_at::date) IS DISTINCT FROM (o.source_name, o.published_at::date)
+            UNION ALL
+            SELECT o.source_name::text, o.published_at::date, -1
+            FROM new_rows n JOIN old_rows o ON o.id = n.id
+            WHERE (n.source_name, n.published_at::date) IS DISTINCT FROM (o.source_name, o.published_at::date)
+        ) c;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Shortlist rows generated per day (cumulative) and currently active (not archived)
+CREATE OR REPLACE FUNCTION recommendations_analytics_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_analytics_counter('recommendations_generated', (SELECT COUNT(*) FROM new_rows));
+        PERFORM bump_analytics_counter('recommendations_active',
+                                       (SELECT COUNT(*) FROM new_rows WHERE NOT COALESCE(is_archived, false)));
+        PERFORM bump_analytics_daily('recommendations', array_agg(''::text), array_agg(COALESCE(generated_at, NOW())::date),
+                                     array_agg(1))
+        FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM bump_analytics_counter('recommendations_active',
+                                       -(SELECT COUNT(*) FROM old_rows WHERE NOT COALESCE(is_archived, false)));
+    ELSE
+        PERFORM bump_analytics_counter('recommendations_active',
+            (SELECT COUNT(*) FILTER (WHERE NOT COALESCE(n.is_archived, false))
+                  - COUNT(*) FILTER (WHERE NOT COALESCE(o.is_archived, false))
+             FROM new_rows n JOIN old_rows o ON o.id = n.id));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Feedback per day by type
+CREATE OR REPLACE FUNCTION club_feedback_analytics_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_analytics_counter('feedback', (SELECT COUNT(*) FROM new_rows));
+        PERFORM bump_analytics_daily('feedback', array_agg(feedback_type::text), array_agg(COALESCE(created_at, NOW())::date),
+                                     array_agg(1))
+        FROM new_rows;
+    ELSE
+        PERFORM bump_analytics_counter('feedback', -(SELECT COUNT(*) FROM old_rows));
+        PERFORM bump_analytics_daily('feedback', array_agg(feedback_type::text), array_agg(COALESCE(created_at, NOW())::date),
+                                     array_agg(-1))
+        FROM old_rows;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION clubs_analytics_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_analytics_counter('clubs', (SELECT COUNT(*) FROM new_rows));
+    ELSE
+        PERFORM bump_analytics_counter('clubs', -(SELECT COUNT(*) FROM old_rows));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER players_analytics_insert AFTER INSERT ON players
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION players_analytics_trigger();
+CREATE TRIGGER players_analytics_update AFTER UPDATE ON players
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION players_analytics_trigger();
+CREATE TRIGGER players_analytics_delete AFTER DELETE ON players
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION players_analytics_trigger();
+CREATE TRIGGER news_articles_analytics_insert AFTER INSERT ON news_articles
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION news_articles_analytics_trigger();
+CREATE TRIGGER news_articles_analytics_update AFTER UPDATE ON news_articles
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION news_articles_analytics_trigger();
+CREATE TRIGGER news_articles_analytics_delete AFTER DELETE ON news_articles
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION news_articles_analytics_trigger();
+CREATE TRIGGER recommendations_analytics_insert AFTER INSERT ON recommendations
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION recommendations_analytics_trigger();
+CREATE TRIGGER recommendations_analytics_update AFTER UPDATE ON recommendations
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION recommendations_analytics_trigger();
+CREATE TRIGGER recommendations_analytics_delete AFTER DELETE ON recommendations
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION recommendations_analytics_trigger();
+CREATE TRIGGER club_feedback_analytics_insert AFTER INSERT ON club_feedback
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION club_feedback_analytics_trigger();
+CREATE TRIGGER club_feedback_analytics_delete AFTER DELETE ON club_feedback
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION club_feedback_analytics_trigger();
+CREATE TRIGGER clubs_analytics_insert AFTER INSERT ON clubs
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION clubs_analytics_trigger();
+CREATE TRIGGER clubs_analytics_delete AFTER DELETE ON clubs
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION clubs_analytics_trigger();
+
+-- Rebuild every analytics rollup from the base tables (setup, or after a TRUNCATE)
+CREATE OR REPLACE FUNCTION refresh_analytics()
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM analytics_counters;
+    DELETE FROM analytics_player_distribution;
+    DELETE FROM analytics_daily;
+
+    INSERT INTO analytics_counters (metric, value)
+    VALUES ('clubs', (SELECT COUNT(*) FROM clubs)),
+           ('news_articles', (SELECT COUNT(*) FROM news_articles)),
+           ('recommendations_generated', (SELECT COUNT(*) FROM recommendations)),
+           ('recommendations_active', (SELECT COUNT(*) FROM recommendations WHERE NOT COALESCE(is_archived, false))),
+           ('feedback', (SELECT COUNT(*) FROM club_feedback));
+
+    INSERT INTO analytics_player_distribution (position, age_band, players, available)
+    SELECT COALESCE(primary_position, 'unknown'), analytics_age_band(age), COUNT(*), COUNT(*) FILTER (WHERE is_available)
+    FROM players
+    GROUP BY 1, 2;
+
+    INSERT INTO analytics_daily (metric, dimension, day, count)
+    SELECT 'news', COALESCE(source_name, 'unknown'), published_at::date, COUNT(*) FROM news_articles GROUP BY 2, 3
+    UNION ALL
+    SELECT 'recommendations', '', COALESCE(generated_at, created_at)::date, COUNT(*) FROM recommendations GROUP BY 3
+    UNION ALL
+    SELECT 'feedback', COALESCE(feedback_type, 'unknown'), created_at::date, COUNT(*) FROM club_feedback GROUP BY 2, 3;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill rollups for data loaded before the triggers existed
+SELECT refresh_player_rollups(ARRAY(SELECT id FROM players));
+SELECT refresh_analytics();
@@ -0,0 +1,343 @@
+require('dotenv').config();
+
+const crypto = require('crypto');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const { Worker, isMainThread, parentPort, workerData } = require('worker_threads');
+
+const Player = require('../src/models/Player');
+const RecommendationService = require('../src/services/RecommendationService');
+
+const WORKERS = parseInt(process.env.RANKING_WORKERS) || Math.max(1, os.cpus().length - 1);
+const TOP_N = parseInt(process.env.RANKING_TOP_N) || 20;
+const TTL_HOURS = parseInt(process.env.RANKING_TTL_HOURS) || 24;
+const RESUME_HOURS = parseInt(process.env.RANKING_RESUME_HOURS) || 12;
+const INSERT_CHUNK_ROWS = parseInt(process.env.RANKING_INSERT_CHUNK_ROWS) || 5000;
+const CHECKPOINT_DIR = process.env.RANKING_CHECKPOINT_DIR || path.join(os.tmpdir(), 'sportify-rankings');
+// Arbitrary constant; keeps two nightly runs from overlapping
+const RUN_LOCK_KEY = 472001;
+
+/**
+ * Precompute shortlists for every active club need.
+ *
+ * Players, performance and signal rollups are loaded once. Needs are then scored
+ * against every available player by a pool of worker threads, using the same
+ * scoring as RecommendationService. Shortlists are written in short transactions
+ * of about RANKING_INSERT_CHUNK_ROWS rows, each archiving its needs' previous rows.
+ * GET /recommendations/:club_id then serves them without ranking anything.
+ *
+ * Each scored need is checkpointed under RANKING_CHECKPOINT_DIR, keyed by a
+ * fingerprint of the need. A rerun after a crash only scores what is missing.
+ *
+ * Usage:
+ *   npm run rank:update
+ *   npm run rank:update -- --fresh        # ignore checkpoints
+ *   npm run rank:update -- --workers 8
+ */
+
+// ==================== WORKER ====================
+
+/**
+ * Top-N by final_score, ties to the lower player id; N is small, so insertion beats a heap
+ */
+const topN = (scored, n) => {
+  const ahead = (a, b) => a.final_score > b.final_score || (a.final_score === b.final_score && a.id < b.id);
+  const top = [];
+  for (const rec of scored) {
+    if (top.length === n && !ahead(rec, top[n - 1])) continue;
+    let i = top.length;
+    while (i > 0 && ahead(rec, top[i - 1])) i--;
+    top.splice(i, 0, rec);
+    if (top.length > n) top.pop();
+  }
+  return top;
+};
+
+function runWorker() {
+  const { players, rollups, topN: n } = workerData;
+  const inputs = { rollups: new Map(rollups.map(row => [row.player_id, row])) };
+
+  parentPort.on('message', (clubNeed) => {
+    const started = process.hrtime.bigint();
+    const scored = [];
+    for (const player of players) {
+      if (!RecommendationService._matchesNeed(player, clubNeed)) continue;
+      const scores = RecommendationService._calculateScores(player, clubNeed, inputs);
+      // Only what the stored row and its explanation need; spreading whole players costs more than scoring them
+      scored.push({
+        id: player.id,
+        primary_position: player.primary_position,
+        age: player.age,
+        market_value_eur: player.market_value_eur,
+        fit_score: scores.fit_score,
+        performance_score: scores.performance_score,
+        availability_score: scores.availability_score,
+        risk_penalty: scores.risk_penalty,
+        news_confidence: scores.news_confidence,
+        final_score: RecommendationService._calculateFinalScore(scores)
+      });
+    }
+
+    const recommendations = topN(scored, n).map((rec, index) => ({ ...rec, rank_position: index + 1 }));
+    parentPort.postMessage({
+      needId: clubNeed.id,
+      recommendations,
+      candidates: scored.length,
+      ms: Number(process.hrtime.bigint() - started) / 1e6
+    });
+  });
+}
+
+// ==================== CHECKPOINTS ====================
+
+const fingerprint = (clubNeed) => crypto.createHash('sha256').update(JSON.stringify({
+  positions_required: clubNeed.positions_required,
+  age_min: clubNeed.age_min,
+  age_max: clubNeed.age_max,
+  budget_max_eur: clubNeed.budget_max_eur,
+  preferred_foot: clubNeed.preferred_foot,
+  top_n: TOP_N
+})).digest('hex').slice(0, 16);
+
+const checkpointPath = (clubNeed) => path.join(CHECKPOINT_DIR, `need-${clubNeed.id}-${fingerprint(clubNeed)}.json`);
+
+const readCheckpoint = (clubNeed) => {
+  try {
+    const checkpoint = JSON.parse(fs.readFileSync(checkpointPath(clubNeed), 'utf8'));
+    return Date.now() - checkpoint.scored_at < RESUME_HOURS * 3600 * 1000 ? checkpoint : null;
+  } catch (error) {
+    return null;
+  }
+};
+
+const writeCheckpoint = (clubNeed, result) => {
+  // Write-then-rename: a crash mid-write leaves no half checkpoint behind
+  const file = checkpointPath(clubNeed);
+  fs.writeFileSync(`${file}.tmp`, JSON.stringify({ ...result, scored_at: Date.now() }));
+  fs.renameSync(`${file}.tmp`, file);
+};
+
+const clearCheckpoints = () => {
+  for (const file of fs.readdirSync(CHECKPOINT_DIR)) {
+    if (file.startsWith('need-')) fs.rmSync(path.join(CHECKPOINT_DIR, file), { force: true });
+  }
+};
+
+// ==================== MAIN ====================
+
+const argValue = (name) => {
+  const index = process.argv.indexOf(name);
+  return index >= 0 ? process.argv[index + 1] : undefined;
+};
+
+async function loadInputs(db) {
+  const needs = (await db.query(
+    `SELECT id, club_id, positions_required, age_min, age_max,
+            budget_min_eur::float8 AS budget_min_eur, budget_max_eur::float8 AS budget_max_eur,
+            contract_preference, preferred_foot
+     FROM club_needs WHERE is_active = true ORDER BY id`
+  )).rows;
+
+  // Same season join and defaults as RecommendationService._candidateQuery
+  const players = (await db.query(
+    `SELECT p.id, p.primary_position, p.secondary_positions, p.age,
+            p.market_value_eur::float8 AS market_value_eur, p.preferred_foot,
+            COALESCE(pp.form_score, 0.5) AS form_score,
+            COALESCE(pp.consistency_score, 0.5) AS consistency_score
+     FROM players p
+     LEFT JOIN player_performance pp ON p.id = pp.player_id
+       AND pp.season = $1
+     WHERE p.is_available = true
+     ORDER BY p.id`,
+    [Player.currentSeason()]
+  )).rows;
+
+  // Refreshes rollups whose rolling window moved on, as online ranking does
+  const { rollups } = await RecommendationService._loadScoringInputs(players.map(p => p.id));
+  return { needs, players, rollups: [...rollups.values()] };
+}
+
+/**
+ * Score `needs` on a worker pool; each need goes to the next idle worker
+ */
+function scoreNeeds(needs, players, rollups, workerCount, onResult) {
+  if (needs.length === 0) return Promise.resolve();
+
+  return new Promise((resolve, reject) => {
+    const queue = [...needs];
+    let pending = needs.length;
+    const workers = Array.from({ length: Math.min(workerCount, needs.length) }, () =>
+      new Worker(__filename, { workerData: { players, rollups, topN: TOP_N } }));
+    const finish = (error) => {
+      workers.forEach(worker => worker.terminate());
+      if (error) reject(error);
+      else resolve();
+    };
+
+    for (const worker of workers) {
+      worker.on('message', (result) => {
+        try {
+          onResult(result);
+        } catch (error) {
+          return finish(error);
+        }
+        if (queue.length > 0) worker.postMessage(queue.shift());
+        if (--pending === 0) finish();
+      });
+      worker.on('error', finish);
+      worker.postMessage(queue.shift());
+    }
+  });
+}
+
+/**
+ * Archive the needs' previous shortlists and insert the new ones. Needs are written
+ * in groups of about INSERT_CHUNK_ROWS rows, one short transaction per group, so a
+ * need's shortlist is swapped atomically but no transaction stays open for the whole
+ * write: an open transaction holds back GET /news?since= until it ends (News.getFeed).
+ */
+async function writeShortlists(client, needs, results, explanations) {
+  let inserted = 0;
+  let archived = 0;
+  let group = [];
+  let groupRows = 0;
+  for (const [i, clubNeed] of needs.entries()) {
+    group.push(clubNeed);
+    groupRows += results.get(clubNeed.id).length;
+    if (groupRows >= INSERT_CHUNK_ROWS || i === needs.length - 1) {
+      const written = await writeShortlistGroup(client, group, results, explanations);
+      inserted += written.inserted;
+      archived += written.archived;
+      group = [];
+      groupRows = 0;
+    }
+  }
+  return { inserted, archived };
+}
+
+/**
+ * One transaction: archive the group's previous rows, then insert its new ones as
+ * column arrays through unnest(), one statement with no per-row binds
+ */
+async function writeShortlistGroup(client, needs, results, explanations) {
+  const columns = {
+    club_id: [], club_need_id: [], player_id: [], rank_position: [], fit_score: [], performance_score: [],
+    availability_score: [], risk_penalty: [], news_confidence: [], final_score: [], explanation: []
+  };
+  for (const clubNeed of needs) {
+    for (const rec of results.get(clubNeed.id)) {
+      columns.club_id.push(clubNeed.club_id);
+      columns.club_need_id.push(clubNeed.id);
+      columns.player_id.push(rec.id);
+      for (const field of ['rank_position', 'fit_score', 'performance_score', 'availability_score',
+                           'risk_penalty', 'news_confidence', 'final_score']) {
+        columns[field].push(rec[field]);
+      }
+      columns.explanation.push(JSON.stringify(explanations.get(clubNeed.id).get(rec.id)));
+    }
+  }
+
+  const types = ['int', 'int', 'int', 'int', 'float8', 'float8', 'float8', 'float8', 'float8', 'float8', 'jsonb'];
+  const names = Object.keys(columns);
+
+  await client.query('BEGIN');
+  try {
+    const archived = await client.query(
+      `UPDATE recommendations SET is_archived = true
+       WHERE club_need_id = ANY($1::int[]) AND is_archived = false`,
+      [needs.map(n => n.id)]
+    );
+    await client.query(
+      `INSERT INTO recommendations (${names.join(', ')}, generated_at, expires_at)
+       SELECT *, NOW(), NOW() + make_interval(hours => $${names.length + 1})
+       FROM unnest(${names.map((_, i) => `$${i + 1}::${types[i]}[]`).join(', ')})`,
+      [...names.map(name => columns[name]), TTL_HOURS]
+    );
+    await client.query('COMMIT');
+    return { inserted: columns.club_id.length, archived: archived.rowCount };
+  } catch (error) {
+    await client.query('ROLLBACK');
+    throw error;
+  }
+}
+
+async function updateRankings() {
+  const db = require('../src/config/database');
+  const logger = require('../src/utils/logger');
+  const fresh = process.argv.includes('--fresh');
+  const workerCount = parseInt(argValue('--workers')) || WORKERS;
+  const client = await db.pool.connect();
+
+  try {
+    const locked = (await client.query('SELECT pg_try_advisory_lock($1) AS locked', [RUN_LOCK_KEY])).rows[0].locked;
+    if (!locked) {
+      logger.warn('Another ranking update is running; exiting');
+      process.exitCode = 1;
+      return;
+    }
+
+    const runStarted = Date.now();
+    const { needs, players, rollups } = await loadInputs(db);
+    const loadMs = Date.now() - runStarted;
+    logger.info(`📥 Loaded ${needs.length} active club needs, ${players.length} players, ` +
+                `${rollups.length} rollups in ${loadMs}ms`);
+    if (needs.length === 0) return;
+
+    fs.mkdirSync(CHECKPOINT_DIR, { recursive: true });
+    if (fresh) clearCheckpoints();
+    const results = new Map();
+    for (const clubNeed of needs) {
+      const checkpoint = readCheckpoint(clubNeed);
+      if (checkpoint) results.set(clubNeed.id, checkpoint.recommendations);
+    }
+    const todo = needs.filter(n => !results.has(n.id));
+    if (results.size > 0) logger.info(`↩️ Resuming: ${results.size} needs already scored, ${todo.length} to go`);
+
+    const needsById = new Map(needs.map(n => [n.id, n]));
+    const scoreStarted = Date.now();
+    let candidates = 0;
+    await scoreNeeds(todo, players, rollups, workerCount, (result) => {
+      const clubNeed = needsById.get(result.needId);
+      writeCheckpoint(clubNeed, result);
+      results.set(clubNeed.id, result.recommendations);
+      candidates += result.candidates;
+    });
+    if (todo.length > 0) {
+      const scoreSeconds = Math.max((Date.now() - scoreStarted) / 1000, 0.001);
+      const pairs = todo.length * players.length;
+      logger.info(
+        `⚙️ Scored ${todo.length} needs × ${players.length} players = ${pairs} pairs ` +
+        `(${candidates} passed the filters) in ${scoreSeconds.toFixed(2)}s on ${Math.min(workerCount, todo.length)} workers: ` +
+        `${Math.round(pairs / scoreSeconds)} pairs/s`
+      );
+    }
+
+    // Explanations need recent signals; one query for every player on any shortlist
+    const shortlisted = [...new Set([...results.values()].flatMap(recs => recs.map(rec => rec.id)))];
+    const signals = await RecommendationService._loadRecentSignals(shortlisted);
+    const explanations = new Map(needs.map(clubNeed => [clubNeed.id, new Map(results.get(clubNeed.id).map(rec =>
+      [rec.id, RecommendationService._generateExplanation(rec, clubNeed, signals.get(rec.id) || [])]))]));
+
+    const writeStarted = Date.now();
+    const { inserted, archived } = await writeShortlists(client, needs, results, explanations);
+    const writeMs = Date.now() - writeStarted;
+    clearCheckpoints();
+
+    logger.info(`💾 Wrote ${inserted} shortlist rows (${archived} previous rows archived) in ${writeMs}ms; ` +
+                `run took ${Date.now() - runStarted}ms (load ${loadMs}ms)`);
+  } catch (error) {
+    logger.error(`❌ Ranking update failed: ${error.message}`);
+    process.exitCode = 1;
+  } finally {
+    await client.query('SELECT pg_advisory_unlock($1)', [RUN_LOCK_KEY]).catch(() => {});
+    client.release();
+    await db.pool.end();
+  }
+}
+
+if (isMainThread) {
+  updateRankings();
+} else {
+  runWorker();
+}
@@ -6,7 +6,9 @@ const pool = new Pool({
   port: process.env.DB_PORT,
   user: process.env.DB_USER,
   password: process.env.DB_PASSWORD,
-  database: process.env.DB_NAME
+  database: process.env.DB_NAME,
+  // A session left idle inside a transaction would hold back the news feed (News.getFeed)
+  idle_in_transaction_session_timeout: parseInt(process.env.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS) || 60000
 });
 
 pool.on('error', (err) => {
@@ -29,7 +31,14 @@ const query = (text, params) => {
   });
 };
 
+/**
+ * Run a named prepared statement: parsed and planned once per pooled connection,
+ * then only bound and executed. A name must always carry the same text.
+ */
+const prepared = (name, text, params) => query({ name, text, values: params });
+
 module.exports = {
   query,
+  prepared,
   pool
 };
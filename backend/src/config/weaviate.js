@@ -4,13 +4,22 @@ const logger = require('../utils/logger');
 let client;
 
 const initWeaviate = async () => {
+  if (!process.env.WEAVIATE_URL) {
+    logger.info('WEAVIATE_URL not set; similar players use the in-process index');
+    return null;
+  }
+
   try {
-    client = await weaviate.connectToLocal();
+    const url = new URL(process.env.WEAVIATE_URL);
+    client = await weaviate.connectToLocal({
+      host: url.hostname,
+      port: parseInt(url.port) || 8080
+    });
     logger.info('✓ Weaviate vector DB connected');
     return client;
   } catch (error) {
     logger.error(`Weaviate connection error: ${error.message}`);
-    logger.warn('Vector embeddings will be stored in PostgreSQL fallback');
+    logger.warn('Similar players will use the in-process index');
     return null;
   }
 };
@@ -0,0 +1,33 @@
+const Analytics = require('../models/Analytics');
+const logger = require('../utils/logger');
+
+/**
+ * Analytics Controller
+ */
+class AnalyticsController {
+  /**
+   * GET /api/analytics
+   * Totals, players by position and age band, and per-day news, recommendation
+   * and feedback activity over the last `days` days (default 14, max 90).
+   * Served from trigger-maintained rollups; nothing is counted on request.
+   */
+  static async getAnalytics(req, res) {
+    try {
+      const data = await Analytics.getSummary(req.query.days);
+
+      return res.json({
+        status: 'success',
+        data,
+        timestamp: new Date().toISOString()
+      });
+    } catch (error) {
+      logger.error(`Error fetching analytics: ${error.message}`);
+      return res.status(500).json({
+        status: 'error',
+        message: 'Failed to fetch analytics'
+      });
+    }
+  }
+}
+
+module.exports = AnalyticsController;
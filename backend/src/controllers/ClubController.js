@@ -1,5 +1,6 @@
 const Club = require('../models/Club');
 const RecommendationService = require('../services/RecommendationService');
+const WriteBuffer = require('../services/WriteBuffer');
 const logger = require('../utils/logger');
 
 /**
@@ -24,6 +25,8 @@ class ClubController {
       }
 
       const needs = await Club.upsertNeedsProfile(club_id, needsData);
+      await WriteBuffer.audit({ entity_type: 'club_needs', entity_id: needs.id, action: 'upsert', new_value: needs })
+        .catch(error => logger.warn(`Audit of club needs ${needs.id} failed: ${error.message}`));
 
       return res.status(201).json({
         status: 'success',
@@ -0,0 +1,102 @@
+const ExportService = require('../services/ExportService');
+const logger = require('../utils/logger');
+
+const FORMATS = {
+  arrow: 'application/vnd.apache.arrow.stream',
+  ndjson: 'application/x-ndjson'
+};
+
+/**
+ * Export Controller
+ * Bulk, column-projected dumps for analysts loading straight into dataframes
+ */
+class ExportController {
+  /**
+   * GET /api/export/players
+   * Query: columns=a,b,c; format=arrow|ndjson; position, club_id, age_min,
+   * age_max, max_market_value_eur, is_available, updated_since, limit
+   */
+  static async exportPlayers(req, res) {
+    const { position, club_id, age_min, age_max, max_market_value_eur, is_available, updated_since, limit } = req.query;
+    return ExportController._export(req, res, {
+      catalog: ExportService.PLAYER_COLUMNS,
+      chunks: (columns) => ExportService.playerChunks(columns, {
+        position, club_id, age_min, age_max, max_market_value_eur, is_available, updated_since, limit
+      })
+    });
+  }
+
+  /**
+   * GET /api/export/clubs
+   * Query: columns=a,b,c; format=arrow|ndjson; league
+   */
+  static async exportClubs(req, res) {
+    return ExportController._export(req, res, {
+      catalog: ExportService.CLUB_COLUMNS,
+      chunks: (columns) => ExportService.clubChunks(columns, { league: req.query.league })
+    });
+  }
+
+  static async _export(req, res, { catalog, chunks }) {
+    const format = req.query.format || 'arrow';
+    if (!FORMATS[format]) {
+      return res.status(400).json({
+        status: 'error',
+        message: `format must be one of: ${Object.keys(FORMATS).join(', ')}`
+      });
+    }
+
+    let columns;
+    try {
+      columns = ExportService.resolveColumns(catalog, req.query.columns);
+    } catch (error) {
+      return res.status(error.status || 500).json({
+        status: 'error',
+        message: error.message,
+        available_columns: Object.keys(catalog)
+      });
+    }
+
+    res.status(200);
+    res.setHeader('Content-Type', FORMATS[format]);
+    res.setHeader('X-Export-Columns', columns.join(','));
+    let closed = false;
+    req.on('close', () => { closed = true; });
+
+    const start = Date.now();
+    // An empty result is still sent as one zero-row chunk so the client gets the columns
+    const empty = { columns: Object.fromEntries(columns.map(name => [name, []])), rows: 0 };
+    let rows = 0;
+    try {
+      if (format === 'arrow') {
+        // One schema for the whole stream; each chunk becomes one record batch
+        const schema = ExportService.arrowSchema(catalog, columns);
+        const writer = ExportService.arrowWriter();
+        writer.toNodeStream().pipe(res);
+        for await (const chunk of chunks(columns)) {
+          if (closed) break;
+          writer.write(ExportService.toRecordBatch(schema, chunk));
+          rows += chunk.rows;
+        }
+        if (rows === 0) writer.write(ExportService.toRecordBatch(schema, empty));
+        writer.finish();
+      } else {
+        const write = (chunk) => res.write(`${JSON.stringify({ columns: chunk.columns, rows: chunk.rows })}\n`);
+        for await (const chunk of chunks(columns)) {
+          if (closed) break;
+          write(chunk);
+          rows += chunk.rows;
+        }
+        if (rows === 0) write(empty);
+        res.end();
+      }
+      logger.info(`📦 Exported ${rows} rows × ${columns.length} columns as ${format} in ${Date.now() - start}ms`);
+    } catch (error) {
+      // Headers are gone; cut the stream so the client cannot mistake it for a complete export
+      logger.error(`Error exporting ${req.path}: ${error.message}`);
+      res.destroy(error);
+    }
+  }
+}
+
+module.exports = ExportController;
@@ -1,6 +1,32 @@
 const db = require('../config/database');
+const WriteBuffer = require('../services/WriteBuffer');
 const logger = require('../utils/logger');
 
+const MAX_BATCH_FEEDBACK = parseInt(process.env.FEEDBACK_BATCH_MAX) || 500;
+
+const feedbackRow = ({ club_id, player_id, recommendation_id, feedback_type, rating, comment }) => ({
+  club_id,
+  player_id,
+  recommendation_id: recommendation_id || null,
+  feedback_type, // 'interested', 'not_interested', 'contacted', 'signed'
+  rating: rating || null, // 1-5
+  comment
+});
+
+const writeFailed = (res, error) => {
+  if (error instanceof WriteBuffer.WriteBufferFull) {
+    return res.status(503).json({
+      status: 'error',
+      message: 'Too many pending writes, retry shortly'
+    });
+  }
+  logger.error(`Error submitting feedback: ${error.message}`);
+  return res.status(500).json({
+    status: 'error',
+    message: 'Failed to submit feedback'
+  });
+};
+
 /**
  * Feedback Controller
  */
@@ -11,14 +37,7 @@ class FeedbackController {
    */
   static async submitFeedback(req, res) {
     try {
-      const {
-        club_id,
-        player_id,
-        recommendation_id,
-        feedback_type, // 'interested', 'not_interested', 'contacted', 'signed'
-        rating, // 1-5
-        comment
-      } = req.body;
+      const { club_id, player_id } = req.body;
 
       if (!club_id || !player_id) {
         return res.status(400).json({
@@ -27,34 +46,61 @@ class FeedbackController {
         });
       }
 
-      const result = await db.query(
-        `INSERT INTO club_feedback 
-         (club_id, recommendation_id, player_id, feedback_type, rating, comment)
-         VALUES ($1, $2, $3, $4, $5, $6)
-         RETURNING *`,
-        [club_id, recommendation_id || null, player_id, feedback_type, rating || null, comment]
-      );
+      // Resolves once the batch it joined has committed
+      const [stored] = await WriteBuffer.submitFeedback([feedbackRow(req.body)]);
+
+      return res.status(201).json({
+        status: 'success',
+        data: stored,
+        message: 'Feedback recorded'
+      });
+    } catch (error) {
+      return writeFailed(res, error);
+    }
+  }
+
+  /**
+   * POST /api/feedback/batch
+   * Submit many feedback entries at once, e.g. a triaged shortlist.
+   * Body: { club_id?, feedback: [{ player_id, recommendation_id?, feedback_type, rating?, comment? }] };
+   * a top-level club_id applies to entries without one. All entries commit or none do.
+   */
+  static async submitFeedbackBatch(req, res) {
+    try {
+      const { club_id, feedback } = req.body;
 
-      // Mark recommendation as not archived but noted
-      if (recommendation_id) {
-        await db.query(
-          `UPDATE recommendations SET expires_at = NOW() + INTERVAL '7 days'
-           WHERE id = $1`,
-          [recommendation_id]
-        );
+      if (!Array.isArray(feedback) || feedback.length === 0) {
+        return res.status(400).json({
+          status: 'error',
+          message: 'feedback must be a non-empty array'
+        });
+      }
+      if (feedback.length > MAX_BATCH_FEEDBACK) {
+        return res.status(400).json({
+          status: 'error',
+          message: `At most ${MAX_BATCH_FEEDBACK} feedback entries per batch`
+        });
       }
 
+      const rows = feedback.map(entry => feedbackRow({ club_id, ...entry }));
+      const invalid = rows.findIndex(row => !row.club_id || !row.player_id);
+      if (invalid !== -1) {
+        return res.status(400).json({
+          status: 'error',
+          message: `club_id and player_id are required (entry ${invalid})`
+        });
+      }
+
+      const stored = await WriteBuffer.submitFeedback(rows);
+
       return res.status(201).json({
         status: 'success',
-        data: result.rows[0],
+        data: stored,
+        count: stored.length,
         message: 'Feedback recorded'
       });
     } catch (error) {
-      logger.error(`Error submitting feedback: ${error.message}`);
-      return res.status(500).json({
-        status: 'error',
-        message: 'Failed to submit feedback'
-      });
+      return writeFailed(res, error);
     }
   }
 
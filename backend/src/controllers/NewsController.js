@@ -1,4 +1,6 @@
 const db = require('../config/database');
+const NewsModel = require('../models/News');
+const NewsFeed = require('../services/NewsFeed');
 const logger = require('../utils/logger');
 
 /**
@@ -7,39 +9,36 @@ const logger = require('../utils/logger');
 class NewsController {
   /**
    * GET /api/news
-   * Get recent football news
+   * Get recent football news. With `since` (a previous response's cursor), only
+   * articles added or changed after it, new extractions included, oldest change first.
    */
   static async getNews(req, res) {
     try {
-      const { entity_id, entity_type = 'player', limit = 50 } = req.query;
+      const { entity_id, entity_type = 'player', limit = 50, since } = req.query;
 
-      let query = `SELECT na.*, 
-                          json_agg(json_build_object('event_type', ne.event_type, 'confidence', ne.confidence_score)) as extractions
-                   FROM news_articles na
-                   LEFT JOIN news_extractions ne ON na.id = ne.article_id`;
-
-      const params = [];
-
-      if (entity_id && entity_type === 'player') {
-        query += ` WHERE $1 = ANY(ne.affected_players)`;
-        params.push(entity_id);
-      } else if (entity_id && entity_type === 'club') {
-        query += ` WHERE $1 = ANY(ne.affected_clubs)`;
-        params.push(entity_id);
+      if (since !== undefined && !/^\d+$/.test(since)) {
+        return res.status(400).json({
+          status: 'error',
+          message: 'since must be a cursor returned by GET /news'
+        });
       }
 
-      query += ` GROUP BY na.id
-                 ORDER BY na.published_at DESC
-                 LIMIT ${params.length ? '$2' : '$1'}`;
-      
-      params.push(limit);
-
-      const result = await db.query(query, params);
+      // Read the head first: anything stored while the page is read is re-sent next time, never skipped
+      const head = since === undefined ? await NewsModel.getFeedHead() : null;
+      const rows = await NewsModel.getFeed({
+        since: since === undefined ? null : since,
+        limit,
+        entityId: entity_id,
+        entityType: entity_type
+      });
+      const cursor = since === undefined ? head : (rows.length ? rows[rows.length - 1].feed_seq : since);
 
       return res.json({
         status: 'success',
-        data: result.rows,
-        count: result.rows.length
+        data: rows,
+        count: rows.length,
+        cursor,
+        has_more: since !== undefined && rows.length === NewsModel.feedLimit(limit)
       });
     } catch (error) {
       logger.error(`Error fetching news: ${error.message}`);
@@ -50,6 +49,34 @@ class NewsController {
     }
   }
 
+  /**
+   * GET /api/news/stream
+   * Server-Sent Events: a `news` event with the delta whenever articles or
+   * extractions are stored. Resumes from `since` or the Last-Event-ID header.
+   */
+  static async streamNews(req, res) {
+    const since = req.get('Last-Event-ID') || req.query.since;
+    if (since !== undefined && !/^\d+$/.test(since)) {
+      return res.status(400).json({
+        status: 'error',
+        message: 'since must be a cursor returned by GET /news'
+      });
+    }
+
+    try {
+      await NewsFeed.subscribe(req, res, since === undefined ? null : since);
+    } catch (error) {
+      logger.error(`Error opening news stream: ${error.message}`);
+      if (!res.headersSent) {
+        return res.status(500).json({
+          status: 'error',
+          message: 'Failed to open news stream'
+        });
+      }
+      res.end();
+    }
+  }
+
   /**
    * GET /api/news/:article_id
    * Get news article with extraction details
@@ -90,6 +117,27 @@ class NewsController {
       });
     }
   }
+
+  /**
+   * GET /api/news/extraction-cache
+   * LLM extraction cache hit rate and calls saved by content-hash dedup
+   */
+  static async getExtractionCacheStats(req, res) {
+    try {
+      const stats = await NewsModel.getExtractionCacheStats();
+
+      return res.json({
+        status: 'success',
+        data: stats
+      });
+    } catch (error) {
+      logger.error(`Error fetching extraction cache stats: ${error.message}`);
+      return res.status(500).json({
+        status: 'error',
+        message: 'Failed to fetch extraction cache stats'
+      });
+    }
+  }
 }
 
 module.exports = NewsController;
@@ -1,7 +1,9 @@
 const Player = require('../models/Player');
-const db = require('../config/database');
+const PlayerSimilarityService = require('../services/PlayerSimilarityService');
 const logger = require('../utils/logger');
 
+const MAX_PAGE_SIZE = 200;
+
 /**
  * Player Controller
  */
@@ -9,48 +11,23 @@ class PlayerController {
   /**
    * GET /api/players/search
    * Search players by position, club, or criteria
+   * Keyset-paginated on id: pass the previous response's next_cursor as cursor
    */
   static async searchPlayers(req, res) {
     try {
-      const { position, club_id, age_min, age_max, limit = 50 } = req.query;
-
-      let query = 'SELECT * FROM players WHERE is_available = true';
-      const params = [];
-      let paramIndex = 1;
+      const { position, club_id, search, cursor } = req.query;
+      const age_min = req.query.age_min || req.query.min_age;
+      const age_max = req.query.age_max || req.query.max_age;
+      const limit = Math.min(Math.max(parseInt(req.query.limit) || 50, 1), MAX_PAGE_SIZE);
 
-      if (position) {
-        query += ` AND (primary_position = $${paramIndex} OR $${paramIndex} = ANY(secondary_positions))`;
-        params.push(position);
-        paramIndex++;
-      }
-
-      if (club_id) {
-        query += ` AND current_club_id = $${paramIndex}`;
-        params.push(club_id);
-        paramIndex++;
-      }
-
-      if (age_min) {
-        query += ` AND age >= $${paramIndex}`;
-        params.push(age_min);
-        paramIndex++;
-      }
-
-      if (age_max) {
-        query += ` AND age <= $${paramIndex}`;
-        params.push(age_max);
-        paramIndex++;
-      }
-
-      query += ` LIMIT $${paramIndex}`;
-      params.push(limit);
-
-      const result = await db.query(query, params);
+      const rows = await Player.search({ position, club_id, age_min, age_max, search, cursor, limit });
+      const lastRow = rows[rows.length - 1];
 
       return res.json({
         status: 'success',
-        data: result.rows,
-        count: result.rows.length
+        data: rows,
+        count: rows.length,
+        next_cursor: rows.length === limit ? lastRow.id : null
       });
     } catch (error) {
       logger.error(`Error searching players: ${error.message}`);
@@ -95,6 +72,51 @@ class PlayerController {
       });
     }
   }
+
+  /**
+   * GET /api/players/:player_id/similar
+   * Nearest players by profile vector, e.g. "like Rodri but cheaper"
+   */
+  static async getSimilarPlayers(req, res) {
+    try {
+      const { player_id } = req.params;
+      const { k, position, age_min, age_max, max_market_value_eur } = req.query;
+      const flag = (value) => value === 'true' || value === '1';
+
+      const similar = await PlayerSimilarityService.similarPlayers(player_id, k, {
+        position,
+        age_min,
+        age_max,
+        max_market_value_eur,
+        cheaper: flag(req.query.cheaper),
+        exclude_same_club: flag(req.query.exclude_same_club),
+        include_unavailable: flag(req.query.include_unavailable)
+      });
+
+      if (!similar) {
+        return res.status(404).json({
+          status: 'error',
+          message: 'Player not found'
+        });
+      }
+
+      return res.json({
+        status: 'success',
+        data: similar.results,
+        count: similar.results.length,
+        source: similar.source,
+        backend: similar.backend,
+        took_ms: similar.took_ms,
+        index_built_at: similar.index_built_at
+      });
+    } catch (error) {
+      logger.error(`Error finding similar players: ${error.message}`);
+      return res.status(500).json({
+        status: 'error',
+        message: 'Failed to find similar players'
+      });
+    }
+  }
 }
 
 module.exports = PlayerController;
@@ -1,19 +1,29 @@
 const RecommendationService = require('../services/RecommendationService');
+const RecommendationCache = require('../services/RecommendationCache');
 const Club = require('../models/Club');
 const db = require('../config/database');
 const logger = require('../utils/logger');
 
+const MAX_BATCH_CLUBS = 50;
+const DEFAULT_SHORTLIST = 20;
+const MAX_SHORTLIST = 100;
+
 /**
  * Recommendation Controller
  */
 class RecommendationController {
+  static shortlistLimit(limit) {
+    return Math.min(Math.max(parseInt(limit) || DEFAULT_SHORTLIST, 1), MAX_SHORTLIST);
+  }
+
   /**
    * POST /api/recommendations
    * Generate recommendations for a club
    */
   static async generateRecommendations(req, res) {
     try {
-      const { club_id, limit = 20 } = req.body;
+      const { club_id } = req.body;
+      const limit = RecommendationController.shortlistLimit(req.body.limit);
 
       if (!club_id) {
         return res.status(400).json({
@@ -31,30 +41,22 @@ class RecommendationController {
         });
       }
 
-      // Generate recommendations for primary need
-      const recommendations = await RecommendationService.generateRecommendations(
-        clubNeeds[0],
-        limit
-      );
-
-      // Store recommendations in database
-      for (const rec of recommendations) {
-        await db.query(
-          `INSERT INTO recommendations 
-           (club_id, club_need_id, player_id, rank_position, fit_score, 
-            performance_score, availability_score, risk_penalty, news_confidence, 
-            final_score, explanation)
-           VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)`,
-          [club_id, clubNeeds[0].id, rec.id, rec.rank_position, rec.fit_score,
-           rec.performance_score, rec.availability_score, rec.risk_penalty,
-           rec.news_confidence, rec.final_score, JSON.stringify(rec.explanation)]
-        );
+      // Serve the primary need from cache, otherwise rank and store it
+      let entry = RecommendationCache.get(clubNeeds[0], limit);
+      const cached = Boolean(entry);
+      if (!entry) {
+        const since = RecommendationCache.version();
+        const { recommendations, candidateIds } = await RecommendationService.rank(clubNeeds[0], limit);
+        await RecommendationController._storeRecommendations(club_id, clubNeeds[0].id, recommendations);
+        entry = RecommendationCache.set(clubNeeds[0], limit, recommendations, candidateIds, since);
       }
 
       return res.json({
         status: 'success',
-        data: recommendations,
-        count: recommendations.length,
+        data: entry.recommendations,
+        count: entry.recommendations.length,
+        cached,
+        generated_at: entry.generatedAt.toISOString(),
         timestamp: new Date().toISOString()
       });
     } catch (error) {
@@ -66,14 +68,226 @@ class RecommendationController {
     }
   }
 
+  /**
+   * POST /api/recommendations/batch
+   * Generate recommendations for many clubs in one call.
+   * Streams one NDJSON line per club as its shortlist finishes.
+   */
+  static async generateRecommendationsBatch(req, res) {
+    const { club_ids } = req.body;
+    const limit = RecommendationController.shortlistLimit(req.body.limit);
+
+    if (!Array.isArray(club_ids) || club_ids.length === 0) {
+      return res.status(400).json({
+        status: 'error',
+        message: 'club_ids must be a non-empty array'
+      });
+    }
+    if (club_ids.length > MAX_BATCH_CLUBS) {
+      return res.status(400).json({
+        status: 'error',
+        message: `At most ${MAX_BATCH_CLUBS} clubs per batch`
+      });
+    }
+
+    let needs;
+    try {
+      needs = await Club.getNeedsProfiles(club_ids);
+    } catch (error) {
+      logger.error(`Error loading club needs for batch: ${error.message}`);
+      return res.status(500).json({
+        status: 'error',
+        message: 'Failed to generate recommendations'
+      });
+    }
+
+    res.status(200);
+    res.setHeader('Content-Type', 'application/x-ndjson');
+    res.setHeader('Cache-Control', 'no-cache');
+    const writeLine = (line) => {
+      res.write(`${JSON.stringify(line)}\n`);
+      if (res.flush) res.flush(); // push through compression middleware
+    };
+
+    // Primary need per club, matching the single-club endpoint
+    const primaryNeeds = new Map();
+    for (const need of needs) {
+      if (!primaryNeeds.has(need.club_id)) primaryNeeds.set(need.club_id, need);
+    }
+
+    for (const clubId of club_ids) {
+      if (!primaryNeeds.has(Number(clubId))) {
+        writeLine({ club_id: clubId, status: 'error', message: 'Club needs profile not found' });
+      }
+    }
+
+    const writeEntry = (clubId, entry, cached) => writeLine({
+      club_id: clubId,
+      status: 'success',
+      data: entry.recommendations,
+      count: entry.recommendations.length,
+      cached,
+      generated_at: entry.generatedAt.toISOString(),
+      timestamp: new Date().toISOString()
+    });
+
+    // Cached shortlists go out first; only the misses are ranked
+    const misses = [];
+    for (const need of primaryNeeds.values()) {
+      const entry = RecommendationCache.get(need, limit);
+      if (entry) writeEntry(need.club_id, entry, true);
+      else misses.push(need);
+    }
+
+    try {
+      const since = RecommendationCache.version();
+      const batch = RecommendationService.generateRecommendationsBatch(misses, limit);
+      for await (const { clubNeed, recommendations, candidateIds } of batch) {
+        await RecommendationController._storeRecommendations(clubNeed.club_id, clubNeed.id, recommendations);
+        const entry = RecommendationCache.set(clubNeed, limit, recommendations, candidateIds, since);
+        writeEntry(clubNeed.club_id, entry, false);
+      }
+    } catch (error) {
+      logger.error(`Error generating batch recommendations: ${error.message}`);
+      writeLine({ status: 'error', message: 'Failed to generate recommendations' });
+    }
+
+    return res.end();
+  }
+
+  /**
+   * POST /api/recommendations/stream
+   * Same shortlist as POST /api/recommendations, streamed as it is produced:
+   * a `ranked` event with the top-N once scoring finishes, one `explanation`
+   * event per player, then `done`. NDJSON by default; Server-Sent Events when
+   * the request sends `Accept: text/event-stream`.
+   */
+  static async streamRecommendations(req, res) {
+    const { club_id, narrate = false } = req.body;
+    const limit = RecommendationController.shortlistLimit(req.body.limit);
+
+    if (!club_id) {
+      return res.status(400).json({
+        status: 'error',
+        message: 'club_id is required'
+      });
+    }
+
+    let clubNeed;
+    try {
+      const clubNeeds = await Club.getNeedsProfile(club_id);
+      clubNeed = clubNeeds && clubNeeds[0];
+    } catch (error) {
+      logger.error(`Error loading club needs for stream: ${error.message}`);
+      return res.status(500).json({
+        status: 'error',
+        message: 'Failed to generate recommendations'
+      });
+    }
+    if (!clubNeed) {
+      return res.status(404).json({
+        status: 'error',
+        message: 'Club needs profile not found. Define needs first via POST /club-needs'
+      });
+    }
+
+    const sse = (req.get('Accept') || '').includes('text/event-stream');
+    res.status(200);
+    res.setHeader('Content-Type', sse ? 'text/event-stream' : 'application/x-ndjson');
+    res.setHeader('Cache-Control', 'no-cache');
+    let closed = false;
+    req.on('close', () => { closed = true; });
+
+    const send = (event, data, extra = {}) => {
+      const line = { event, ...extra, data };
+      res.write(sse ? `event: ${event}\ndata: ${JSON.stringify(line)}\n\n` : `${JSON.stringify(line)}\n`);
+      if (res.flush) res.flush(); // push through compression middleware
+    };
+    const withoutExplanation = (recs) => recs.map(({ explanation, ...rec }) => rec);
+
+    try {
+      // Narratives are never cached, so narrated requests always rank afresh
+      const entry = narrate ? null : RecommendationCache.get(clubNeed, limit);
+      if (entry) {
+        const meta = { cached: true, generated_at: entry.generatedAt.toISOString() };
+        send('ranked', withoutExplanation(entry.recommendations), meta);
+        for (const rec of entry.recommendations) {
+          send('explanation', { player_id: rec.id, rank_position: rec.rank_position, explanation: rec.explanation });
+        }
+        send('done', entry.recommendations, { ...meta, count: entry.recommendations.length });
+        return res.end();
+      }
+
+      const since = RecommendationCache.version();
+      let candidateIds = [];
+      const stream = RecommendationService.streamRecommendations(clubNeed, limit, { narrate: Boolean(narrate) });
+      for await (const { event, data, candidateIds: ids } of stream) {
+        // Keep generating after a disconnect so the run is still stored and cached
+        if (event === 'ranked') {
+          candidateIds = ids;
+          if (!closed) send(event, withoutExplanation(data), { cached: false });
+        } else if (event === 'explanation') {
+          if (!closed) send(event, data);
+        } else {
+          await RecommendationController._storeRecommendations(club_id, clubNeed.id, data);
+          const generatedAt = narrate
+            ? new Date()
+            : RecommendationCache.set(clubNeed, limit, data, candidateIds, since).generatedAt;
+          if (!closed) send(event, data, { cached: false, generated_at: generatedAt.toISOString(), count: data.length });
+        }
+      }
+    } catch (error) {
+      logger.error(`Error streaming recommendations: ${error.message}`);
+      if (!closed) send('error', null, { message: 'Failed to generate recommendations' });
+    }
+
+    return res.end();
+  }
+
+  /**
+   * Store a shortlist with one multi-row insert (as updateRankings' writeShortlists)
+   */
+  static async _storeRecommendations(clubId, clubNeedId, recommendations) {
+    if (recommendations.length === 0) return;
+    const column = field => recommendations.map(rec => rec[field]);
+    await db.query(
+      `INSERT INTO recommendations
+       (club_id, club_need_id, player_id, rank_position, fit_score,
+        performance_score, availability_score, risk_penalty, news_confidence,
+        final_score, explanation)
+       SELECT $1::int, $2::int, *
+       FROM unnest($3::int[], $4::int[], $5::float8[], $6::float8[], $7::float8[],
+                   $8::float8[], $9::float8[], $10::float8[], $11::jsonb[])`,
+      [clubId, clubNeedId, column('id'), column('rank_position'), column('fit_score'),
+       column('performance_score'), column('availability_score'), column('risk_penalty'),
+       column('news_confidence'), column('final_score'),
+       recommendations.map(rec => JSON.stringify(rec.explanation))]
+    );
+  }
+
   /**
    * GET /api/recommendations/:club_id
-   * Get cached recommendations for a club
+   * Get cached recommendations for a club.
+   * Served from the result cache while the shortlist is still valid,
+   * otherwise from the last stored run.
    */
   static async getRecommendations(req, res) {
     try {
       const { club_id } = req.params;
-      const limit = parseInt(req.query.limit) || 20;
+      const limit = RecommendationController.shortlistLimit(req.query.limit);
+
+      const clubNeeds = await Club.getNeedsProfile(club_id);
+      const entry = clubNeeds && clubNeeds.length > 0 ? RecommendationCache.get(clubNeeds[0], limit) : null;
+      if (entry) {
+        return res.json({
+          status: 'success',
+          data: entry.recommendations,
+          count: entry.recommendations.length,
+          cached: true,
+          generated_at: entry.generatedAt.toISOString(),
+          timestamp: new Date().toISOString()
+        });
+      }
 
       const result = await db.query(
         `SELECT r.*, p.full_name, p.primary_position, p.age, p.market_value_eur
@@ -94,6 +308,10 @@ class RecommendationController {
         status: 'success',
         data: recommendations,
         count: recommendations.length,
+        cached: false,
+        generated_at: recommendations.length > 0
+          ? new Date(Math.max(...recommendations.map(r => new Date(r.created_at).getTime()))).toISOString()
+          : null,
         timestamp: new Date().toISOString()
       });
     } catch (error) {
@@ -116,7 +334,7 @@ class RecommendationController {
       const result = await db.query(
         `SELECT ps.*, na.title as news_source, na.published_at
          FROM player_signals ps
-         LEFT JOIN news_extractions ne ON $1 = ANY(ne.affected_players)
+         LEFT JOIN news_extractions ne ON ne.affected_players @> ARRAY[$1::int]
          LEFT JOIN news_articles na ON ne.article_id = na.id
          WHERE ps.player_id = $1 AND ps.is_active = true
          ORDER BY ps.created_at DESC`,
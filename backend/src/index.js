@@ -5,6 +5,12 @@ const cors = require('cors');
 const compression = require('compression');
 const morgan = require('morgan');
 const logger = require('./utils/logger');
+const RecommendationService = require('./services/RecommendationService');
+const RecommendationCache = require('./services/RecommendationCache');
+const PlayerSimilarityService = require('./services/PlayerSimilarityService');
+const NewsFeed = require('./services/NewsFeed');
+const WriteBuffer = require('./services/WriteBuffer');
+const { initWeaviate } = require('./config/weaviate');
 
 // Import routes
 const clubRoutes = require('./routes/clubRoutes');
@@ -12,6 +18,8 @@ const playerRoutes = require('./routes/playerRoutes');
 const recommendationRoutes = require('./routes/recommendationRoutes');
 const newsRoutes = require('./routes/newsRoutes');
 const feedbackRoutes = require('./routes/feedbackRoutes');
+const exportRoutes = require('./routes/exportRoutes');
+const analyticsRoutes = require('./routes/analyticsRoutes');
 const healthRoutes = require('./routes/healthRoutes');
 
 // Initialize app
@@ -41,6 +49,8 @@ app.use('/api/players', playerRoutes);
 app.use('/api/recommendations', recommendationRoutes);
 app.use('/api/news', newsRoutes);
 app.use('/api/feedback', feedbackRoutes);
+app.use('/api/export', exportRoutes);
+app.use('/api/analytics', analyticsRoutes);
 
 // 404 handler
 app.use((req, res) => {
@@ -71,6 +81,19 @@ app.use((err, req, res, next) => {
 app.listen(PORT, () => {
   logger.info(`🚀 Sportify AI server running on port ${PORT}`);
   logger.info(`Environment: ${process.env.NODE_ENV}`);
+  RecommendationCache.listen((player, need) => RecommendationService._matchesNeed(player, need));
+  NewsFeed.listen();
+
+  // Warm the similar-players index so the first lookup doesn't pay for the build
+  initWeaviate()
+    .then(() => PlayerSimilarityService.rebuild())
+    .catch(error => logger.error(`Similarity index build failed: ${error.message}`));
+});
+
+// Commit queued feedback and audit writes before exiting
+process.on('SIGTERM', () => {
+  logger.info('SIGTERM received, draining write buffer');
+  WriteBuffer.drain().finally(() => process.exit(0));
 });
 
 module.exports = app;
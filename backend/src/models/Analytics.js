@@ -0,0 +1,99 @@
+const db = require('../config/database');
+
+const AGE_BANDS = ['U21', '21-24', '25-28', '29-32', '33+', 'unknown'];
+const DEFAULT_DAYS = 14;
+const MAX_DAYS = 90;
+
+// BIGINT counters arrive from pg as strings
+const toNumber = value => Number(value) || 0;
+
+const addTo = (groups, key, label, row) => {
+  const group = groups.get(key) || { [label]: key, players: 0, available: 0 };
+  group.players += row.players;
+  group.available += row.available;
+  groups.set(key, group);
+};
+
+/**
+ * Analytics Model
+ * Reads only the rollups the schema triggers maintain on every write
+ * (analytics_counters, analytics_player_distribution, analytics_daily), so a
+ * page view costs three small index reads however large the base tables grow.
+ */
+class Analytics {
+  static windowDays(days) {
+    return Math.min(Math.max(parseInt(days) || DEFAULT_DAYS, 1), MAX_DAYS);
+  }
+
+  static async getSummary(days) {
+    const window = Analytics.windowDays(days);
+    const [counters, distribution, daily] = await Promise.all([
+      db.prepared(
+        'analytics_counters',
+        'SELECT metric, SUM(value) AS value, MAX(updated_at) AS updated_at FROM analytics_counters GROUP BY metric',
+        []
+      ),
+      db.prepared(
+        'analytics_player_distribution',
+        `SELECT position, age_band, players, available FROM analytics_player_distribution
+         WHERE players <> 0 OR available <> 0
+         ORDER BY position, age_band`,
+        []
+      ),
+      db.prepared(
+        'analytics_daily',
+        `SELECT metric, dimension, to_char(day, 'YYYY-MM-DD') AS day, count, day = CURRENT_DATE AS is_today
+         FROM analytics_daily
+         WHERE day > CURRENT_DATE - $1::int AND count <> 0
+         ORDER BY day, metric, dimension`,
+        [window]
+      )
+    ]);
+
+    const totals = {
+      players: 0,
+      players_available: 0,
+      clubs: 0,
+      news_articles: 0,
+      recommendations_active: 0,
+      recommendations_generated: 0,
+      feedback: 0
+    };
+    let updatedAt = null;
+    for (const row of counters.rows) {
+      totals[row.metric] = toNumber(row.value);
+      if (!updatedAt || row.updated_at > updatedAt) updatedAt = row.updated_at;
+    }
+
+    const byPosition = new Map();
+    const byAgeBand = new Map(AGE_BANDS.map(band => [band, { age_band: band, players: 0, available: 0 }]));
+    for (const row of distribution.rows) {
+      totals.players += row.players;
+      totals.players_available += row.available;
+      addTo(byPosition, row.position, 'position', row);
+      addTo(byAgeBand, row.age_band, 'age_band', row);
+    }
+
+    const today = { news: 0, recommendations: 0, feedback: 0 };
+    const perDay = { news: [], recommendations: [], feedback: [] };
+    for (const row of daily.rows) {
+      if (row.is_today) today[row.metric] = (today[row.metric] || 0) + row.count;
+      perDay[row.metric]?.push(row);
+    }
+
+    return {
+      days: window,
+      totals,
+      today,
+      players_by_position: [...byPosition.values()].sort((a, b) => b.players - a.players),
+      players_by_age_band: [...byAgeBand.values()].filter(band => band.age_band !== 'unknown' || band.players > 0),
+      players_by_position_age: distribution.rows,
+      news_per_source_per_day: perDay.news.map(row => ({ day: row.day, source: row.dimension, articles: row.count })),
+      recommendations_per_day: perDay.recommendations.map(row => ({ day: row.day, count: row.count })),
+      feedback_per_day: perDay.feedback.map(row => ({ day: row.day, feedback_type: row.dimension, count: row.count })),
+      updated_at: updatedAt
+    };
+  }
+}
+
+module.exports = Analytics;
@@ -53,6 +53,14 @@ class Club {
     return result.rows;
   }
 
+  static async getNeedsProfiles(clubIds) {
+    const result = await db.query(
+      'SELECT * FROM club_needs WHERE club_id = ANY($1) AND is_active = true ORDER BY club_id, id',
+      [clubIds]
+    );
+    return result.rows;
+  }
+
   static async upsertNeedsProfile(clubId, needsData) {
     const {
       positions_required, age_min, age_max, budget_min_eur, budget_max_eur,
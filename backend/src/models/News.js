@@ -1,5 +1,58 @@
 const db = require('../config/database');
 
+const ARTICLE_COLUMNS = [
+  'external_id', 'title', 'content', 'original_language', 'source_name', 'source_url',
+  'published_at', 'author', 'image_url', 'raw_json', 'content_hash'
+];
+
+const EXTRACTION_COLUMNS = [
+  'article_id', 'event_type', 'confidence_score', 'extracted_entities', 'key_facts',
+  'evidence_snippet', 'affected_players', 'affected_clubs', 'llm_model', 'processing_time_ms'
+];
+
+const FEED_MAX_LIMIT = 200;
+// Below this every transaction has ended, so no feed position under it can still appear.
+// The cost is liveness: while any transaction is open, on any table, the feed stops at the
+// positions drawn before it began. Transactions must stay short: updateRankings commits per
+// group of needs, and the pool ends sessions left idle in a transaction
+// (DB_IDLE_IN_TRANSACTION_TIMEOUT_MS).
+const SETTLED_TXID = 'txid_snapshot_xmin(txid_current_snapshot())';
+
+// Serialized explicitly: pg would send JS arrays as Postgres arrays, not JSON
+const JSONB_COLUMNS = new Set(['raw_json', 'extracted_entities', 'key_facts', 'extraction']);
+
+const columnValue = (row, col) => {
+  const value = row[col] ?? null;
+  return value !== null && JSONB_COLUMNS.has(col) ? JSON.stringify(value) : value;
+};
+
+// Column types for a VALUES list read through a subquery, where untyped parameters become text
+const ARTICLE_CASTS = ARTICLE_COLUMNS.map(col => ({ published_at: '::timestamp', raw_json: '::jsonb' })[col] || '');
+
+/**
+ * Multi-row VALUES list: ($1, $2), ($3, $4), ... with an optional cast per column
+ */
+const valuesClause = (rowCount, width, casts = []) =>
+  Array.from({ length: rowCount }, (_, row) =>
+    `(${Array.from({ length: width }, (_, col) => `$${row * width + col + 1}${casts[col] || ''}`).join(', ')})`
+  ).join(',\n       ');
+
+const UNIQUE_VIOLATION = '23505';
+
+/**
+ * Run a single write statement, retrying when a concurrent writer claimed one of
+ * its unique keys first; the retried statement sees the other writer's row.
+ */
+const retryOnUniqueViolation = async (run, attempts = 3) => {
+  for (let attempt = 1; ; attempt++) {
+    try {
+      return await run();
+    } catch (error) {
+      if (error.code !== UNIQUE_VIOLATION || attempt >= attempts) throw error;
+    }
+  }
+};
+
 /**
  * News & Extraction Model
  */
@@ -43,6 +96,275 @@ class NewsModel {
     return result.rows[0];
   }
 
+  /**
+   * Store many articles, deduplicated by content hash.
+   * Returns { id, external_id, content_hash, duplicate } per distinct hash; duplicates
+   * point at the article already holding that content and are not rewritten.
+   * Safe under concurrent store workers: the insert is arbitrated on the content hash
+   * itself, so two batches carrying the same new article never both insert it.
+   */
+  static async createArticles(articles) {
+    const byHash = [...new Map(articles.map(a => [a.content_hash, a])).values()];
+    // A statement may not touch the same conflict key twice
+    const batch = [...new Map(byHash.map(a => [a.external_id, a])).values()];
+    if (batch.length === 0) return [];
+
+    // New content is inserted; content already stored anywhere bumps that row's
+    // duplicate_count in the same statement. Edits (known external_id, new text)
+    // are left to the next step: they would conflict on external_id instead.
+    const params = batch.flatMap(article => ARTICLE_COLUMNS.map(col => columnValue(article, col)));
+    const stored = await retryOnUniqueViolation(() => db.query(
+      `INSERT INTO news_articles (${ARTICLE_COLUMNS.join(', ')})
+       SELECT * FROM (VALUES ${valuesClause(batch.length, ARTICLE_COLUMNS.length, ARTICLE_CASTS)}) AS v(${ARTICLE_COLUMNS.join(', ')})
+       WHERE NOT EXISTS (
+         SELECT 1 FROM news_articles e
+         WHERE e.external_id = v.external_id AND e.content_hash IS DISTINCT FROM v.content_hash
+       )
+       ON CONFLICT (content_hash) DO UPDATE SET duplicate_count = news_articles.duplicate_count + 1
+       RETURNING id, external_id, content_hash, xmax = 0 AS inserted`,
+      params
+    ));
+    const rows = stored.rows.map(({ inserted, ...row }) => ({ ...row, duplicate: !inserted }));
+
+    const handled = new Set(rows.map(row => row.content_hash));
+    const edits = batch.filter(a => !handled.has(a.content_hash));
+    if (edits.length === 0) return rows;
+
+    // Rewrite edited articles whose new text isn't stored yet. A concurrent insert of
+    // the same text between the check and the write fails the statement; on retry
+    // the check sees it and the edit falls through to the duplicate step below.
+    const updated = await retryOnUniqueViolation(() => db.query(
+      `UPDATE news_articles n SET
+       title = v.title, content = v.content, content_hash = v.content_hash, published_at = v.published_at
+       FROM unnest($1::text[], $2::text[], $3::text[], $4::text[], $5::timestamp[])
+            AS v(external_id, title, content, content_hash, published_at)
+       WHERE n.external_id = v.external_id AND n.content_hash IS DISTINCT FROM v.content_hash
+         AND NOT EXISTS (SELECT 1 FROM news_articles d WHERE d.content_hash = v.content_hash)
+       RETURNING n.id, n.external_id, n.content_hash`,
+      [
+        edits.map(a => a.external_id),
+        edits.map(a => a.title),
+        edits.map(a => a.content),
+        edits.map(a => a.content_hash),
+        edits.map(a => a.published_at)
+      ]
+    ));
+    updated.rows.forEach(row => handled.add(row.content_hash));
+    rows.push(...updated.rows.map(row => ({ ...row, duplicate: false })));
+
+    // Edits whose new text another article already holds are duplicates of that article
+    const duplicateHashes = edits.map(a => a.content_hash).filter(hash => !handled.has(hash));
+    if (duplicateHashes.length > 0) {
+      const duplicates = await db.query(
+        `UPDATE news_articles SET duplicate_count = duplicate_count + 1
+         WHERE content_hash = ANY($1::text[])
+         RETURNING id, external_id, content_hash`,
+        [duplicateHashes]
+      );
+      rows.push(...duplicates.rows.map(row => ({ ...row, duplicate: true })));
+    }
+    return rows;
+  }
+
+  static async createExtractions(extractions) {
+    if (extractions.length === 0) return [];
+
+    const params = extractions.flatMap(extraction => EXTRACTION_COLUMNS.map(col => columnValue(extraction, col)));
+    const result = await db.query(
+      `INSERT INTO news_extractions (${EXTRACTION_COLUMNS.join(', ')})
+       VALUES ${valuesClause(extractions.length, EXTRACTION_COLUMNS.length)}
+       RETURNING id, article_id`,
+      params
+    );
+    return result.rows;
+  }
+
+  // ==================== EXTRACTION CACHE ====================
+
+  /**
+   * Cached extractions for these hashes under one model and prompt version.
+   * Counts each returned row as a hit.
+   */
+  static async getCachedExtractions(hashes, model, promptVersion) {
+    if (hashes.length === 0) return [];
+
+    const result = await db.query(
+      `UPDATE llm_extraction_cache
+       SET hit_count = hit_count + 1, last_hit_at = NOW()
+       WHERE content_hash = ANY($1::text[]) AND llm_model = $2 AND prompt_version = $3
+       RETURNING content_hash, extraction, processing_time_ms`,
+      [hashes, model, promptVersion]
+    );
+    return result.rows;
+  }
+
+  static async cacheExtractions(entries) {
+    if (entries.length === 0) return;
+
+    const columns = ['content_hash', 'llm_model', 'prompt_version', 'extraction', 'processing_time_ms'];
+    await db.query(
+      `INSERT INTO llm_extraction_cache (${columns.join(', ')})
+       VALUES ${valuesClause(entries.length, columns.length)}
+       ON CONFLICT (content_hash, llm_model, prompt_version) DO NOTHING`,
+      entries.flatMap(entry => columns.map(col => columnValue(entry, col)))
+    );
+  }
+
+  /**
+   * Lifetime cache effectiveness; every miss stores one entry, so misses = entries
+   */
+  static async getExtractionCacheStats() {
+    const result = await db.query(
+      `SELECT llm_model, prompt_version,
+              COUNT(*)::int AS entries,
+              COALESCE(SUM(hit_count), 0)::int AS hits,
+              COALESCE(SUM(hit_count * processing_time_ms), 0)::bigint AS llm_ms_saved,
+              MAX(last_hit_at) AS last_hit_at
+       FROM llm_extraction_cache
+       GROUP BY llm_model, prompt_version
+       ORDER BY llm_model, prompt_version`
+    );
+    const duplicates = await db.query(
+      `SELECT COALESCE(SUM(duplicate_count), 0)::int AS duplicates FROM news_articles`
+    );
+
+    const hits = result.rows.reduce((sum, row) => sum + row.hits, 0);
+    const entries = result.rows.reduce((sum, row) => sum + row.entries, 0);
+    return {
+      entries,
+      hits,
+      hit_rate: entries + hits > 0 ? +(hits / (entries + hits)).toFixed(3) : 0,
+      duplicate_articles: duplicates.rows[0].duplicates,
+      llm_calls_saved: hits + duplicates.rows[0].duplicates,
+      llm_ms_saved: Number(result.rows.reduce((sum, row) => sum + Number(row.llm_ms_saved), 0)),
+      by_prompt: result.rows
+    };
+  }
+
+  // ==================== EXTRACTION QUEUE ====================
+
+  /**
+   * Queue articles for LLM extraction, claimed by the caller straight away.
+   * Articles that already have a job are skipped; returns the new jobs.
+   */
+  static async enqueueExtractions(articleIds) {
+    if (articleIds.length === 0) return [];
+
+    const result = await db.query(
+      `INSERT INTO news_ingest_queue (article_id, status, locked_at)
+       SELECT unnest($1::int[]), 'processing', NOW()
+       ON CONFLICT (article_id) DO NOTHING
+       RETURNING id, article_id`,
+      [articleIds]
+    );
+    return result.rows;
+  }
+
+  /**
+   * Claim jobs left pending, or whose lease expired because a previous run died
+   */
+  static async claimExtractionJobs(leaseMinutes, limit) {
+    const result = await db.query(
+      `UPDATE news_ingest_queue q
+       SET status = 'processing', locked_at = NOW(), updated_at = NOW()
+       FROM news_articles na
+       WHERE na.id = q.article_id
+         AND q.id IN (
+           SELECT id FROM news_ingest_queue
+           WHERE status = 'pending'
+              OR (status = 'processing' AND locked_at < NOW() - make_interval(mins => $1))
+           ORDER BY id
+           LIMIT $2
+           FOR UPDATE SKIP LOCKED
+         )
+       RETURNING q.id, q.article_id, q.attempts, na.title, na.content, na.source_name,
+                 na.original_language, na.published_at, na.content_hash`,
+      [leaseMinutes, limit]
+    );
+    return result.rows;
+  }
+
+  static async completeExtractionJobs(jobIds) {
+    if (jobIds.length === 0) return;
+    await db.query(
+      `UPDATE news_ingest_queue SET status = 'done', locked_at = NULL, updated_at = NOW()
+       WHERE id = ANY($1::int[])`,
+      [jobIds]
+    );
+  }
+
+  /**
+   * Return failed jobs to the queue, or park them once maxAttempts is reached
+   */
+  static async failExtractionJobs(failures, maxAttempts) {
+    if (failures.length === 0) return;
+    await db.query(
+      `UPDATE news_ingest_queue q
+       SET attempts = q.attempts + 1,
+           status = CASE WHEN q.attempts + 1 >= $3 THEN 'failed' ELSE 'pending' END,
+           last_error = f.error, locked_at = NULL, updated_at = NOW()
+       FROM unnest($1::int[], $2::text[]) AS f(id, error)
+       WHERE q.id = f.id`,
+      [failures.map(f => f.id), failures.map(f => f.error), maxAttempts]
+    );
+  }
+
+  // ==================== FEED ====================
+
+  /**
+   * Articles with their extractions. Without `since`: the newest by published_at.
+   * With `since`: everything whose feed_seq moved past it (new articles, edits and
+   * late extractions), oldest change first so a limited page can be resumed.
+   * feed_seq is drawn when a row is written, not when it commits, so a transaction
+   * still open can commit a position below rows already visible. Rows written at or
+   * after the oldest open transaction are held back until it ends; otherwise the
+   * cursor would move past the open transaction's rows and never return them.
+   * Any long transaction therefore delays the feed, see SETTLED_TXID.
+   */
+  static async getFeed({ since = null, limit = 50, entityId = null, entityType = 'player' } = {}) {
+    const conditions = [];
+    const params = [];
+    if (entityId) {
+      params.push(entityId);
+      const column = entityType === 'club' ? 'affected_clubs' : 'affected_players';
+      conditions.push(`EXISTS (SELECT 1 FROM news_extractions f
+                               WHERE f.article_id = na.id AND f.${column} @> ARRAY[$${params.length}::int])`);
+    }
+    if (since !== null) {
+      params.push(since);
+      conditions.push(`na.feed_seq > $${params.length}`, `na.feed_txid < ${SETTLED_TXID}`);
+    }
+    params.push(NewsModel.feedLimit(limit));
+
+    const result = await db.query(
+      `SELECT na.*,
+              COALESCE(json_agg(json_build_object('event_type', ne.event_type, 'confidence', ne.confidence_score))
+                       FILTER (WHERE ne.id IS NOT NULL), '[]') AS extractions
+       FROM news_articles na
+       LEFT JOIN news_extractions ne ON na.id = ne.article_id
+       ${conditions.length ? `WHERE ${conditions.join(' AND ')}` : ''}
+       GROUP BY na.id
+       ORDER BY ${since !== null ? 'na.feed_seq' : 'na.published_at DESC'}
+       LIMIT $${params.length}`,
+      params
+    );
+    return result.rows;
+  }
+
+  static feedLimit(limit) {
+    return Math.min(Math.max(parseInt(limit) || 50, 1), FEED_MAX_LIMIT);
+  }
+
+  /**
+   * Current head of the feed; a client that has read everything up to here resumes from it
+   */
+  static async getFeedHead() {
+    const result = await db.query(
+      `SELECT COALESCE(MAX(feed_seq), 0)::text AS head FROM news_articles WHERE feed_txid < ${SETTLED_TXID}`
+    );
+    return result.rows[0].head;
+  }
+
   static async getRecentArticles(limit = 50, languagesFilter = null) {
     let query = `SELECT * FROM news_articles`;
     const params = [];
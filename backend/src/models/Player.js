@@ -5,6 +5,46 @@ const logger = require('../utils/logger');
  * Player Model - Handles all player database operations
  */
 class Player {
+  /**
+   * Current season label ('2026/2027'), bound as a parameter instead of computed in SQL
+   */
+  static currentSeason(now = new Date()) {
+    const year = now.getFullYear();
+    return `${year}/${year + 1}`;
+  }
+
+  /**
+   * Build the /players search. Every filter combination gets its own prepared
+   * statement name, so each keeps a plan fitted to the indexes it can use.
+   */
+  static searchQuery({ position, club_id, age_min, age_max, search, cursor, limit = 50 }) {
+    let text = 'SELECT * FROM players WHERE is_available = true';
+    const params = [];
+    const flags = [];
+    const add = (flag, sql, value) => {
+      params.push(value);
+      flags.push(flag);
+      text += ` AND ${sql.replace(/\?/g, `$${params.length}`)}`;
+    };
+
+    if (position) add('pos', '(primary_position = ?::text OR secondary_positions @> ARRAY[?::text])', position);
+    if (club_id) add('club', 'current_club_id = ?', parseInt(club_id));
+    if (age_min) add('amin', 'age >= ?', parseInt(age_min));
+    if (age_max) add('amax', 'age <= ?', parseInt(age_max));
+    if (search) add('name', 'full_name ILIKE ?', `%${search}%`);
+    if (cursor) add('cur', 'id > ?', parseInt(cursor));
+
+    params.push(limit);
+    text += ` ORDER BY id ASC LIMIT $${params.length}`;
+    return { name: ['players_search', ...flags].join('_'), text, params };
+  }
+
+  static async search(filters) {
+    const { name, text, params } = this.searchQuery(filters);
+    const result = await db.prepared(name, text, params);
+    return result.rows;
+  }
+
   static async getById(id) {
     const result = await db.query(
       `SELECT p.*, json_agg(json_build_object('type', ps.signal_type, 'value', ps.signal_value, 'confidence', ps.confidence_score)) as signals
@@ -28,7 +68,7 @@ class Player {
   static async searchByPosition(position, limit = 100) {
     const result = await db.query(
       `SELECT * FROM players 
-       WHERE (primary_position = $1 OR $1 = ANY(secondary_positions))
+       WHERE (primary_position = $1::text OR secondary_positions @> ARRAY[$1::text])
        AND is_available = true
        LIMIT $2`,
       [position, limit]
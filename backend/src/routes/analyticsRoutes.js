@@ -0,0 +1,9 @@
+const express = require('express');
+const AnalyticsController = require('../controllers/AnalyticsController');
+
+const router = express.Router();
+
+// GET /api/analytics
+router.get('/', AnalyticsController.getAnalytics);
+
+module.exports = router;
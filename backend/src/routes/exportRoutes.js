@@ -0,0 +1,12 @@
+const express = require('express');
+const ExportController = require('../controllers/ExportController');
+
+const router = express.Router();
+
+// GET /api/export/players
+router.get('/players', ExportController.exportPlayers);
+
+// GET /api/export/clubs
+router.get('/clubs', ExportController.exportClubs);
+
+module.exports = router;
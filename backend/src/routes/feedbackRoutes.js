@@ -6,6 +6,9 @@ const router = express.Router();
 // POST /api/feedback
 router.post('/', FeedbackController.submitFeedback);
 
+// POST /api/feedback/batch
+router.post('/batch', FeedbackController.submitFeedbackBatch);
+
 // GET /api/feedback/:club_id
 router.get('/:club_id', FeedbackController.getFeedback);
 
@@ -1,4 +1,6 @@
 const express = require('express');
+const RecommendationCache = require('../services/RecommendationCache');
+const WriteBuffer = require('../services/WriteBuffer');
 
 const router = express.Router();
 
@@ -7,7 +9,9 @@ router.get('/', (req, res) => {
     status: 'healthy',
     timestamp: new Date().toISOString(),
     uptime: process.uptime(),
-    service: 'Sportify AI Intelligence Engine'
+    service: 'Sportify AI Intelligence Engine',
+    recommendation_cache: RecommendationCache.getStats(),
+    write_buffer: WriteBuffer.getStats()
   });
 });
 
@@ -6,6 +6,12 @@ const router = express.Router();
 // GET /api/news
 router.get('/', NewsController.getNews);
 
+// GET /api/news/stream
+router.get('/stream', NewsController.streamNews);
+
+// GET /api/news/extraction-cache
+router.get('/extraction-cache', NewsController.getExtractionCacheStats);
+
 // GET /api/news/:article_id
 router.get('/:article_id', NewsController.getNewsDetail);
 
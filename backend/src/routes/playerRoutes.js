@@ -3,9 +3,15 @@ const PlayerController = require('../controllers/PlayerController');
 
 const router = express.Router();
 
+// GET /api/players
+router.get('/', PlayerController.searchPlayers);
+
 // GET /api/players/search
 router.get('/search', PlayerController.searchPlayers);
 
+// GET /api/players/:player_id/similar
+router.get('/:player_id/similar', PlayerController.getSimilarPlayers);
+
 // GET /api/players/:player_id
 router.get('/:player_id', PlayerController.getPlayer);
 
@@ -6,6 +6,12 @@ const router = express.Router();
 // POST /api/recommendations
 router.post('/', RecommendationController.generateRecommendations);
 
+// POST /api/recommendations/batch
+router.post('/batch', RecommendationController.generateRecommendationsBatch);
+
+// POST /api/recommendations/stream
+router.post('/stream', RecommendationController.streamRecommendations);
+
 // GET /api/recommendations/:club_id
 router.get('/:club_id', RecommendationController.getRecommendations);
 
@@ -0,0 +1,197 @@
+const {
+  Bool, Field, Float64, Int32, RecordBatch, RecordBatchStreamWriter, Schema, Struct, Utf8,
+  makeData, vectorFromArray
+} = require('apache-arrow');
+const db = require('../config/database');
+
+const CHUNK_ROWS = parseInt(process.env.EXPORT_CHUNK_ROWS) || 10000;
+
+const int = () => new Int32();
+const float = () => new Float64();
+const text = () => new Utf8();
+const bool = () => new Bool();
+
+// column -> [SQL expression, Arrow type]; BIGINT and dates are cast so pg returns JS numbers/strings
+const PLAYER_COLUMNS = {
+  id: ['p.id', int],
+  external_id: ['p.external_id', text],
+  full_name: ['p.full_name', text],
+  age: ['p.age', int],
+  nationality: ['p.nationality', text],
+  primary_position: ['p.primary_position', text],
+  secondary_positions: ["array_to_string(p.secondary_positions, ',')", text],
+  preferred_foot: ['p.preferred_foot', text],
+  height_cm: ['p.height_cm', int],
+  weight_kg: ['p.weight_kg', int],
+  market_value_eur: ['p.market_value_eur::float8', float],
+  contract_end_date: ['p.contract_end_date::text', text],
+  contract_status: ['p.contract_status', text],
+  current_club_id: ['p.current_club_id', int],
+  is_available: ['p.is_available', bool],
+  last_updated: [`to_char(p.last_updated, 'YYYY-MM-DD"T"HH24:MI:SS.US')`, text],
+  season: ['pp.season', text],
+  league: ['pp.league', text],
+  matches_played: ['pp.matches_played', int],
+  goals: ['pp.goals', int],
+  assists: ['pp.assists', int],
+  minutes_played: ['pp.minutes_played', int],
+  passing_accuracy: ['pp.passing_accuracy', float],
+  tackles_per_game: ['pp.tackles_per_game', float],
+  interceptions_per_game: ['pp.interceptions_per_game', float],
+  dribbles_per_game: ['pp.dribbles_per_game', float],
+  form_score: ['pp.form_score', float],
+  consistency_score: ['pp.consistency_score', float],
+  availability_penalty: ['r.availability_penalty', float],
+  active_risk_count: ['r.active_risk_count', int],
+  avg_risk: ['r.avg_risk', float],
+  news_confidence: ['r.news_confidence', float]
+};
+
+const CLUB_COLUMNS = {
+  id: ['c.id', int],
+  external_id: ['c.external_id', text],
+  name: ['c.name', text],
+  country: ['c.country', text],
+  league: ['c.league', text],
+  founded_year: ['c.founded_year', int],
+  stadium_name: ['c.stadium_name', text],
+  is_active: ['c.is_active', bool]
+};
+
+const PERFORMANCE_COLUMN = /^pp\./;
+const ROLLUP_COLUMN = /^r\./;
+
+/**
+ * Columnar Export Service
+ * Streams players/clubs in id-keyset chunks, projected to the requested
+ * columns, as Arrow IPC record batches or column-major NDJSON.
+ */
+class ExportService {
+  get playerColumns() {
+    return Object.keys(PLAYER_COLUMNS);
+  }
+
+  get clubColumns() {
+    return Object.keys(CLUB_COLUMNS);
+  }
+
+  /**
+   * Validate a comma-separated projection; `id` is always included (it is the keyset)
+   */
+  resolveColumns(catalog, requested) {
+    const names = requested
+      ? [...new Set(['id', ...String(requested).split(',').map(c => c.trim()).filter(Boolean)])]
+      : Object.keys(catalog);
+    const unknown = names.filter(name => !catalog[name]);
+    if (unknown.length > 0) {
+      const error = new Error(`Unknown columns: ${unknown.join(', ')}`);
+      error.status = 400;
+      throw error;
+    }
+    return names;
+  }
+
+  /**
+   * Yield { columns: { name: values[] }, rows } per chunk of players matching the filters
+   */
+  async *playerChunks(columns, filters = {}) {
+    const expressions = columns.map(name => PLAYER_COLUMNS[name][0]);
+    const joins = [];
+    // Only join what the projection needs
+    if (expressions.some(e => PERFORMANCE_COLUMN.test(e))) {
+      joins.push(`LEFT JOIN LATERAL (
+         SELECT * FROM player_performance WHERE player_id = p.id ORDER BY season DESC LIMIT 1
+       ) pp ON true`);
+    }
+    if (expressions.some(e => ROLLUP_COLUMN.test(e))) {
+      joins.push('LEFT JOIN player_signal_rollups r ON r.player_id = p.id');
+    }
+
+    const conditions = [];
+    const params = [];
+    const add = (sql, value) => {
+      params.push(value);
+      conditions.push(sql.replace(/\?/g, `$${params.length}`));
+    };
+    if (filters.position) add('(p.primary_position = ?::text OR p.secondary_positions @> ARRAY[?::text])', filters.position);
+    if (filters.club_id) add('p.current_club_id = ?', parseInt(filters.club_id));
+    if (filters.age_min) add('p.age >= ?', parseInt(filters.age_min));
+    if (filters.age_max) add('p.age <= ?', parseInt(filters.age_max));
+    if (filters.max_market_value_eur) add('p.market_value_eur <= ?', Number(filters.max_market_value_eur));
+    if (filters.is_available !== undefined) add('p.is_available = ?', filters.is_available === 'true');
+    // Delta sync: rows touched at or after a previous export's max(last_updated)
+    if (filters.updated_since) add('p.last_updated >= ?::timestamp', filters.updated_since);
+
+    const limit = Math.max(parseInt(filters.limit) || Infinity, 1);
+    yield* this._chunks('players p', 'p.id', columns, expressions, joins, conditions, params, limit);
+  }
+
+  async *clubChunks(columns, filters = {}) {
+    const conditions = [];
+    const params = [];
+    if (filters.league) {
+      params.push(filters.league);
+      conditions.push(`c.league = $${params.length}`);
+    }
+    yield* this._chunks('clubs c', 'c.id', columns, columns.map(name => CLUB_COLUMNS[name][0]), [], conditions, params);
+  }
+
+  /**
+   * Keyset pages of at most CHUNK_ROWS, stopping once `limit` rows in total have been read
+   */
+  async *_chunks(from, key, columns, expressions, joins, conditions, params, limit = Infinity) {
+    const select = expressions.map((expression, i) => `${expression} AS "${columns[i]}"`).join(', ');
+    const keyIndex = params.length + 1;
+    const where = [...conditions, `${key} > $${keyIndex}`].join(' AND ');
+    const sql = `SELECT ${select} FROM ${from} ${joins.join(' ')}
+                 WHERE ${where} ORDER BY ${key} LIMIT $${keyIndex + 1}`;
+
+    let after = 0;
+    let remaining = limit;
+    for (;;) {
+      const pageRows = Math.min(CHUNK_ROWS, remaining);
+      const result = await db.query(sql, [...params, after, pageRows]);
+      if (result.rows.length === 0) return;
+
+      const chunk = {};
+      for (const name of columns) chunk[name] = result.rows.map(row => row[name]);
+      yield { columns: chunk, rows: result.rows.length };
+
+      remaining -= result.rows.length;
+      if (result.rows.length < pageRows || remaining === 0) return;
+      after = result.rows[result.rows.length - 1].id;
+    }
+  }
+
+  // ==================== ARROW ====================
+
+  /**
+   * Arrow schema for a projection; every field nullable so all batches share it
+   */
+  arrowSchema(catalog, columns) {
+    return new Schema(columns.map(name => new Field(name, catalog[name][1](), true)));
+  }
+
+  /**
+   * IPC stream writer whose batches all use `schema`; pipe writer.toNodeStream() to the response
+   */
+  arrowWriter() {
+    return new RecordBatchStreamWriter();
+  }
+
+  toRecordBatch(schema, chunk) {
+    const children = schema.fields.map(field => vectorFromArray(chunk.columns[field.name], field.type).data[0]);
+    return new RecordBatch(schema, makeData({
+      type: new Struct(schema.fields),
+      length: chunk.rows,
+      nullCount: 0,
+      children
+    }));
+  }
+}
+
+const service = new ExportService();
+service.PLAYER_COLUMNS = PLAYER_COLUMNS;
+service.CLUB_COLUMNS = CLUB_COLUMNS;
+
+module.exports = service;
@@ -1,6 +1,9 @@
 const { OpenAI } = require('openai');
 const logger = require('../utils/logger');
 
+// Bump whenever the system or user prompts change, so cached extractions are not reused
+const PROMPT_VERSION = 'v1';
+
 /**
  * LLM Service - Handles news extraction and signal generation
  */
@@ -12,6 +15,13 @@ class LLMService {
     this.model = process.env.OPENAI_MODEL || 'gpt-4-turbo';
   }
 
+  /**
+   * Prompt identity for the extraction cache; the system prompt differs per language
+   */
+  promptVersionFor(language = 'en') {
+    return `${PROMPT_VERSION}:${language}`;
+  }
+
   /**
    * Extract structured signals from football news
    */
@@ -0,0 +1,167 @@
+const db = require('../config/database');
+const NewsModel = require('../models/News');
+const logger = require('../utils/logger');
+
+const CHANNEL = 'news_feed';
+const PAGE_SIZE = parseInt(process.env.NEWS_FEED_PAGE_SIZE) || 100;
+// Notifications arrive per store/persist batch; coalesce a burst into one delta query
+const DEBOUNCE_MS = parseInt(process.env.NEWS_FEED_DEBOUNCE_MS) || 250;
+const HEARTBEAT_MS = parseInt(process.env.NEWS_FEED_HEARTBEAT_MS) || 15000;
+const RECONNECT_MS = 5000;
+
+/**
+ * Live News Feed
+ * Server-Sent Events for /news/stream. Postgres announces every feed_seq bump
+ * on the news_feed channel (schema triggers), whichever process ran the ingest;
+ * each subscriber is sent the articles past its own cursor, one query per
+ * distinct cursor, so a reconnect with Last-Event-ID catches up before going live.
+ */
+class NewsFeed {
+  constructor() {
+    this.subscribers = new Set();
+    this.listener = null;
+    this.listening = false;
+    this.flushing = null;
+    this.pending = false;
+    this.timer = null;
+    this.heartbeat = null;
+    this.stats = { notifications: 0, flushes: 0, events: 0, articles: 0 };
+  }
+
+  /**
+   * Stream feed events to `res` from `since` (the current head when null) until the client leaves
+   */
+  async subscribe(req, res, since = null) {
+    const subscriber = { res, cursor: since === null ? await NewsModel.getFeedHead() : String(since) };
+
+    res.status(200);
+    res.setHeader('Content-Type', 'text/event-stream');
+    res.setHeader('Cache-Control', 'no-cache');
+    res.setHeader('X-Accel-Buffering', 'no');
+    this._send(subscriber, 'ready', { cursor: subscriber.cursor });
+
+    this.subscribers.add(subscriber);
+    req.on('close', () => {
+      this.subscribers.delete(subscriber);
+      if (this.subscribers.size === 0) this._stopHeartbeat();
+    });
+    this._startHeartbeat();
+    // A resuming client may already be behind
+    if (since !== null) this._schedule(0);
+  }
+
+  _send(subscriber, event, data) {
+    const id = data.cursor !== undefined ? `id: ${data.cursor}\n` : '';
+    subscriber.res.write(`${id}event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+    if (subscriber.res.flush) subscriber.res.flush(); // push through compression middleware
+  }
+
+  _schedule(delay = DEBOUNCE_MS) {
+    if (this.timer) return;
+    this.timer = setTimeout(() => {
+      this.timer = null;
+      this.flush();
+    }, delay);
+  }
+
+  /**
+   * Send every subscriber the articles past its cursor; reruns if notified meanwhile
+   */
+  async flush() {
+    if (this.flushing) {
+      this.pending = true;
+      return this.flushing;
+    }
+
+    this.flushing = (async () => {
+      do {
+        this.pending = false;
+        this.stats.flushes++;
+        const byCursor = new Map();
+        for (const subscriber of this.subscribers) {
+          byCursor.set(subscriber.cursor, [...(byCursor.get(subscriber.cursor) || []), subscriber]);
+        }
+        for (const [cursor, group] of byCursor) {
+          await this._deliver(cursor, group);
+        }
+      } while (this.pending);
+    })();
+
+    try {
+      await this.flushing;
+    } catch (error) {
+      logger.warn(`News feed delivery failed: ${error.message}`);
+    } finally {
+      this.flushing = null;
+    }
+  }
+
+  async _deliver(cursor, group) {
+    for (;;) {
+      const rows = await NewsModel.getFeed({ since: cursor, limit: PAGE_SIZE });
+      if (rows.length === 0) return;
+      cursor = rows[rows.length - 1].feed_seq;
+      for (const subscriber of group) {
+        if (!this.subscribers.has(subscriber)) continue;
+        subscriber.cursor = cursor;
+        this._send(subscriber, 'news', { data: rows, cursor, has_more: rows.length === PAGE_SIZE });
+        this.stats.events++;
+      }
+      this.stats.articles += rows.length;
+      if (rows.length < PAGE_SIZE) return;
+    }
+  }
+
+  _startHeartbeat() {
+    if (this.heartbeat) return;
+    this.heartbeat = setInterval(() => {
+      for (const subscriber of this.subscribers) subscriber.res.write(': keepalive\n\n');
+      // Catch up on rows held back behind a transaction that has since ended without
+      // notifying (rolled back), and on notifications lost while the listener was down
+      this._schedule(0);
+    }, HEARTBEAT_MS);
+    this.heartbeat.unref();
+  }
+
+  _stopHeartbeat() {
+    clearInterval(this.heartbeat);
+    this.heartbeat = null;
+  }
+
+  // ==================== CHANGE NOTIFICATIONS ====================
+
+  /**
+   * LISTEN for feed bumps announced by the news_articles triggers
+   */
+  async listen() {
+    if (this.listener) return;
+
+    try {
+      this.listener = await db.pool.connect();
+      this.listener.on('notification', () => {
+        this.stats.notifications++;
+        if (this.subscribers.size > 0) this._schedule();
+      });
+      this.listener.on('error', (error) => this._reconnect(error));
+      await this.listener.query(`LISTEN ${CHANNEL}`);
+      this.listening = true;
+      logger.info('🔔 News feed listening for new articles');
+    } catch (error) {
+      this._reconnect(error);
+    }
+  }
+
+  _reconnect(error) {
+    logger.warn(`News feed listener lost: ${error.message}`);
+    if (this.listener) this.listener.release(true);
+    this.listener = null;
+    this.listening = false;
+    setTimeout(() => this.listen(), RECONNECT_MS).unref();
+  }
+
+  status() {
+    return { listening: this.listening, subscribers: this.subscribers.size, ...this.stats };
+  }
+}
+
+module.exports = new NewsFeed();
@@ -0,0 +1,249 @@
+const weaviate = require('weaviate-client');
+const db = require('../config/database');
+const { getWeaviateClient } = require('../config/weaviate');
+const { IVFIndex } = require('../utils/annIndex');
+const { DIMENSIONS, buildVectors } = require('../utils/playerVectors');
+const logger = require('../utils/logger');
+
+const REFRESH_MS = (parseInt(process.env.SIMILARITY_REFRESH_MINUTES) || 30) * 60 * 1000;
+const NPROBE = parseInt(process.env.SIMILARITY_NPROBE) || 12;
+const WEAVIATE_COLLECTION = 'PlayerProfile';
+const WEAVIATE_BATCH_SIZE = 1000;
+const MAX_K = 100;
+
+/**
+ * Similar Players Service
+ * Nearest neighbours over player profile vectors. Served from Weaviate when it
+ * is connected, otherwise (or if a Weaviate query fails) from an in-process IVF index.
+ */
+class PlayerSimilarityService {
+  constructor() {
+    this.index = null;
+    this.players = new Map(); // id -> summary row returned with results
+    this.builtAt = null;
+    this.building = null;
+    this.weaviateSynced = false;
+  }
+
+  /**
+   * Index that is at most SIMILARITY_REFRESH_MINUTES old; a stale index keeps
+   * serving while the rebuild runs in the background
+   */
+  async ensureIndex() {
+    if (!this.index) return this.rebuild();
+    if (Date.now() - this.builtAt > REFRESH_MS) {
+      this.rebuild().catch(error => logger.error(`Similarity index rebuild failed: ${error.message}`));
+    }
+    return this.index;
+  }
+
+  rebuild() {
+    if (!this.building) {
+      this.building = this._build().finally(() => { this.building = null; });
+    }
+    return this.building;
+  }
+
+  async _build() {
+    const start = Date.now();
+    const result = await db.query(
+      `SELECT p.id, p.full_name, p.age, p.primary_position, p.secondary_positions, p.preferred_foot,
+              p.height_cm, p.weight_kg, p.market_value_eur, p.current_club_id, p.is_available,
+              pp.form_score, pp.consistency_score, pp.passing_accuracy, pp.goals, pp.assists,
+              pp.minutes_played, pp.tackles_per_game, pp.interceptions_per_game, pp.dribbles_per_game
+       FROM players p
+       LEFT JOIN LATERAL (
+         SELECT * FROM player_performance
+         WHERE player_id = p.id
+         ORDER BY season DESC
+         LIMIT 1
+       ) pp ON true`
+    );
+
+    const rows = result.rows;
+    const { vectors } = buildVectors(rows);
+    const index = new IVFIndex({ dim: DIMENSIONS, nprobe: NPROBE }).build(rows.map(r => r.id), vectors);
+
+    this.players = new Map(rows.map(row => [row.id, {
+      id: row.id,
+      full_name: row.full_name,
+      age: row.age,
+      primary_position: row.primary_position,
+      secondary_positions: row.secondary_positions || [],
+      preferred_foot: row.preferred_foot,
+      market_value_eur: row.market_value_eur === null ? null : Number(row.market_value_eur),
+      current_club_id: row.current_club_id,
+      is_available: row.is_available,
+      form_score: row.form_score
+    }]));
+    this.index = index;
+    this.builtAt = Date.now();
+    logger.info(`🧭 Similarity index built: ${rows.length} players, ${index.nlist} clusters in ${Date.now() - start}ms`);
+
+    // Local index serves while the collection is being replaced
+    this.weaviateSynced = false;
+    this.weaviateSynced = await this._syncWeaviate(rows, vectors);
+    return index;
+  }
+
+  /**
+   * Nearest players to `playerId`.
+   * filters: position, age_min, age_max, max_market_value_eur, cheaper (below the
+   * source player's value), exclude_same_club, include_unavailable
+   */
+  async similarPlayers(playerId, k = 10, filters = {}) {
+    const index = await this.ensureIndex();
+    const id = Number(playerId);
+    if (!index.has(id)) return null;
+
+    const source = this.players.get(id);
+    const limit = Math.min(Math.max(parseInt(k) || 10, 1), MAX_K);
+    const start = process.hrtime.bigint();
+
+    let neighbours = null;
+    let backend = 'local';
+    if (this.weaviateSynced) {
+      try {
+        neighbours = await this._searchWeaviate(index.vector(id), limit, source, filters);
+        backend = 'weaviate';
+      } catch (error) {
+        logger.warn(`Weaviate similarity query failed, using local index: ${error.message}`);
+      }
+    }
+    if (!neighbours) {
+      const matches = this._filterFor(source, filters);
+      const found = index.search(index.vector(id), limit, { filter: other => other !== id && matches(this.players.get(other)) });
+      neighbours = found.ids.map((other, i) => ({ id: other, distance: found.distances[i] }));
+    }
+
+    return {
+      source,
+      backend,
+      took_ms: +(Number(process.hrtime.bigint() - start) / 1e6).toFixed(3),
+      index_built_at: new Date(this.builtAt).toISOString(),
+      results: neighbours.map(({ id: other, distance }) => {
+        const player = this.players.get(other);
+        return {
+          ...player,
+          distance: +distance.toFixed(4),
+          similarity: +(1 / (1 + distance)).toFixed(4),
+          value_difference_eur: player.market_value_eur !== null && source.market_value_eur !== null
+            ? player.market_value_eur - source.market_value_eur
+            : null
+        };
+      })
+    };
+  }
+
+  getStats() {
+    return {
+      players: this.index ? this.index.size : 0,
+      clusters: this.index ? this.index.nlist : 0,
+      nprobe: NPROBE,
+      dimensions: DIMENSIONS,
+      built_at: this.builtAt ? new Date(this.builtAt).toISOString() : null,
+      backend: this.weaviateSynced ? 'weaviate' : 'local'
+    };
+  }
+
+  _filterFor(source, filters) {
+    const position = filters.position ? String(filters.position).toUpperCase() : null;
+    const ageMin = filters.age_min ? Number(filters.age_min) : null;
+    const ageMax = filters.age_max ? Number(filters.age_max) : null;
+    let maxValue = filters.max_market_value_eur ? Number(filters.max_market_value_eur) : null;
+    if (filters.cheaper && source.market_value_eur !== null) {
+      maxValue = maxValue === null ? source.market_value_eur - 1 : Math.min(maxValue, source.market_value_eur - 1);
+    }
+
+    return (player) => {
+      if (!filters.include_unavailable && !player.is_available) return false;
+      if (position && player.primary_position !== position && !player.secondary_positions.includes(position)) return false;
+      if (ageMin !== null && player.age < ageMin) return false;
+      if (ageMax !== null && player.age > ageMax) return false;
+      if (maxValue !== null && (player.market_value_eur === null || player.market_value_eur > maxValue)) return false;
+      if (filters.exclude_same_club && source.current_club_id && player.current_club_id === source.current_club_id) return false;
+      return true;
+    };
+  }
+
+  // ==================== WEAVIATE ====================
+
+  async _syncWeaviate(rows, vectors) {
+    const client = getWeaviateClient();
+    if (!client) return false;
+
+    try {
+      if (await client.collections.exists(WEAVIATE_COLLECTION)) {
+        await client.collections.delete(WEAVIATE_COLLECTION);
+      }
+      // Vectors are precomputed; L2 keeps distances comparable with the local index
+      await client.collections.create({
+        name: WEAVIATE_COLLECTION,
+        vectorizers: weaviate.configure.vectorizer.none({
+          vectorIndexConfig: weaviate.configure.vectorIndex.hnsw({ distanceMetric: 'l2-squared' })
+        }),
+        properties: [
+          { name: 'player_id', dataType: 'int' },
+          { name: 'age', dataType: 'int' },
+          { name: 'primary_position', dataType: 'text' },
+          { name: 'positions', dataType: 'text[]' },
+          { name: 'market_value_eur', dataType: 'number' },
+          { name: 'current_club_id', dataType: 'int' },
+          { name: 'is_available', dataType: 'boolean' }
+        ]
+      });
+
+      const collection = client.collections.get(WEAVIATE_COLLECTION);
+      for (let i = 0; i < rows.length; i += WEAVIATE_BATCH_SIZE) {
+        await collection.data.insertMany(rows.slice(i, i + WEAVIATE_BATCH_SIZE).map((row, j) => ({
+          properties: {
+            player_id: row.id,
+            age: row.age,
+            primary_position: row.primary_position,
+            positions: [row.primary_position, ...(row.secondary_positions || [])].filter(Boolean),
+            market_value_eur: row.market_value_eur === null ? null : Number(row.market_value_eur),
+            current_club_id: row.current_club_id,
+            is_available: row.is_available
+          },
+          vectors: Array.from(vectors.subarray((i + j) * DIMENSIONS, (i + j + 1) * DIMENSIONS))
+        })));
+      }
+      logger.info(`✓ Synced ${rows.length} player vectors to Weaviate`);
+      return true;
+    } catch (error) {
+      logger.warn(`Weaviate sync failed, serving similar players locally: ${error.message}`);
+      return false;
+    }
+  }
+
+  async _searchWeaviate(vector, limit, source, filters) {
+    const collection = getWeaviateClient().collections.get(WEAVIATE_COLLECTION);
+    const where = collection.filter;
+    const conditions = [where.byProperty('player_id').notEqual(source.id)];
+
+    if (!filters.include_unavailable) conditions.push(where.byProperty('is_available').equal(true));
+    if (filters.position) conditions.push(where.byProperty('positions').containsAny([String(filters.position).toUpperCase()]));
+    if (filters.age_min) conditions.push(where.byProperty('age').greaterOrEqual(Number(filters.age_min)));
+    if (filters.age_max) conditions.push(where.byProperty('age').lessOrEqual(Number(filters.age_max)));
+    if (filters.max_market_value_eur) {
+      conditions.push(where.byProperty('market_value_eur').lessOrEqual(Number(filters.max_market_value_eur)));
+    }
+    if (filters.cheaper && source.market_value_eur !== null) {
+      conditions.push(where.byProperty('market_value_eur').lessThan(source.market_value_eur));
+    }
+    if (filters.exclude_same_club && source.current_club_id) {
+      conditions.push(where.byProperty('current_club_id').notEqual(source.current_club_id));
+    }
+
+    const response = await collection.query.nearVector(Array.from(vector), {
+      limit,
+      filters: weaviate.Filters.and(...conditions),
+      returnMetadata: ['distance']
+    });
+    return response.objects
+      .filter(object => this.players.has(object.properties.player_id))
+      .map(object => ({ id: object.properties.player_id, distance: Math.sqrt(object.metadata.distance) }));
+  }
+}
+
+module.exports = new PlayerSimilarityService();
@@ -0,0 +1,248 @@
+const crypto = require('crypto');
+const db = require('../config/database');
+const logger = require('../utils/logger');
+
+const CHANNEL = 'player_changes';
+const MAX_ENTRIES = parseInt(process.env.RECOMMENDATION_CACHE_MAX_ENTRIES) || 500;
+// Backstop for score drift no write announces (signals expiring, news leaving the 7-day window)
+const TTL_MS = (parseInt(process.env.RECOMMENDATION_CACHE_TTL_MINUTES) || 60) * 60 * 1000;
+const RECONNECT_MS = 5000;
+const RECENT_CHANGES = 256;
+
+/**
+ * Recommendation Result Cache
+ * Shortlists keyed by a fingerprint of the normalized club need, invalidated
+ * when Postgres announces a change to a player in the entry's candidate set.
+ */
+class RecommendationCache {
+  constructor() {
+    this.entries = new Map(); // fingerprint -> entry, oldest first
+    this.byPlayer = new Map(); // player_id -> Set of fingerprints whose candidate set includes it
+    this.stats = { hits: 0, misses: 0, invalidations: 0, evictions: 0, discarded: 0 };
+    this.sequence = 0; // bumped per change notification
+    this.recentChanges = []; // { sequence, playerIds, all } for the last RECENT_CHANGES notifications
+    this.listener = null;
+    this.listening = false;
+  }
+
+  /**
+   * Need fields that change the shortlist; order- and case-insensitive
+   */
+  normalizeNeed(clubNeed) {
+    const number = (value) => (value === null || value === undefined || value === '' ? null : Number(value));
+    return {
+      positions: [...new Set((clubNeed.positions_required || []).map(p => String(p).toUpperCase()))].sort(),
+      age_min: number(clubNeed.age_min),
+      age_max: number(clubNeed.age_max),
+      budget_min_eur: number(clubNeed.budget_min_eur),
+      budget_max_eur: number(clubNeed.budget_max_eur),
+      preferred_foot: clubNeed.preferred_foot ? String(clubNeed.preferred_foot).toLowerCase() : null
+    };
+  }
+
+  fingerprint(clubNeed, limit) {
+    const key = JSON.stringify({ ...this.normalizeNeed(clubNeed), limit: Number(limit) });
+    return crypto.createHash('sha256').update(key).digest('hex');
+  }
+
+  /**
+   * Cached shortlist for this need and limit, or null
+   */
+  get(clubNeed, limit) {
+    const fingerprint = this.fingerprint(clubNeed, limit);
+    const entry = this.entries.get(fingerprint);
+
+    if (!entry || Date.now() - entry.generatedAt.getTime() > TTL_MS) {
+      if (entry) this._delete(fingerprint);
+      this.stats.misses++;
+      return null;
+    }
+
+    // Refresh LRU position
+    this.entries.delete(fingerprint);
+    this.entries.set(fingerprint, entry);
+    this.stats.hits++;
+    return entry;
+  }
+
+  /**
+   * Change sequence to pass back to set(); taken before ranking starts
+   */
+  version() {
+    return this.sequence;
+  }
+
+  /**
+   * Cache a freshly ranked shortlist. If a change that touches its candidates
+   * arrived after `since`, the result is returned but not kept.
+   */
+  set(clubNeed, limit, recommendations, candidateIds, since = this.sequence) {
+    const fingerprint = this.fingerprint(clubNeed, limit);
+    this._delete(fingerprint);
+
+    const entry = {
+      fingerprint,
+      need: this.normalizeNeed(clubNeed),
+      recommendations,
+      candidateIds: new Set(candidateIds),
+      generatedAt: new Date()
+    };
+    if (this._changedSince(since, entry.candidateIds)) {
+      this.stats.discarded++;
+      return entry;
+    }
+
+    this.entries.set(fingerprint, entry);
+    for (const playerId of entry.candidateIds) {
+      if (!this.byPlayer.has(playerId)) this.byPlayer.set(playerId, new Set());
+      this.byPlayer.get(playerId).add(fingerprint);
+    }
+
+    while (this.entries.size > MAX_ENTRIES) {
+      this._delete(this.entries.keys().next().value);
+      this.stats.evictions++;
+    }
+    return entry;
+  }
+
+  /**
+   * Drop every entry whose candidate set contains one of these players
+   */
+  invalidatePlayers(playerIds) {
+    let dropped = 0;
+    for (const playerId of playerIds) {
+      for (const fingerprint of this.byPlayer.get(playerId) || []) {
+        if (this._delete(fingerprint)) dropped++;
+      }
+    }
+    this.stats.invalidations += dropped;
+    return dropped;
+  }
+
+  /**
+   * Players whose profile or club changed may now pass a need's filter
+   * without having been candidates; drop entries they would enter.
+   */
+  invalidateEligible(players, matchesNeed) {
+    let dropped = 0;
+    for (const [fingerprint, entry] of [...this.entries]) {
+      const need = {
+        positions_required: entry.need.positions,
+        age_min: entry.need.age_min,
+        age_max: entry.need.age_max,
+        budget_max_eur: entry.need.budget_max_eur,
+        preferred_foot: entry.need.preferred_foot
+      };
+      if (players.some(player => player.is_available && matchesNeed(player, need)) && this._delete(fingerprint)) {
+        dropped++;
+      }
+    }
+    this.stats.invalidations += dropped;
+    return dropped;
+  }
+
+  clear() {
+    this.stats.invalidations += this.entries.size;
+    this.entries.clear();
+    this.byPlayer.clear();
+  }
+
+  getStats() {
+    const lookups = this.stats.hits + this.stats.misses;
+    return {
+      ...this.stats,
+      entries: this.entries.size,
+      hit_rate: lookups > 0 ? +(this.stats.hits / lookups).toFixed(3) : 0,
+      listening: this.listening
+    };
+  }
+
+  _recordChange(playerIds, all = false) {
+    this.sequence++;
+    this.recentChanges.push({ sequence: this.sequence, playerIds: new Set(playerIds), all });
+    if (this.recentChanges.length > RECENT_CHANGES) this.recentChanges.shift();
+  }
+
+  _changedSince(since, candidateIds) {
+    if (since >= this.sequence) return false;
+    // Older changes have been forgotten; assume the worst
+    if (this.recentChanges.length === 0 || this.recentChanges[0].sequence > since + 1) return true;
+
+    return this.recentChanges.some(change => change.sequence > since &&
+      (change.all || [...change.playerIds].some(id => candidateIds.has(id))));
+  }
+
+  _delete(fingerprint) {
+    const entry = this.entries.get(fingerprint);
+    if (!entry) return false;
+
+    this.entries.delete(fingerprint);
+    for (const playerId of entry.candidateIds) {
+      const fingerprints = this.byPlayer.get(playerId);
+      if (!fingerprints) continue;
+      fingerprints.delete(fingerprint);
+      if (fingerprints.size === 0) this.byPlayer.delete(playerId);
+    }
+    return true;
+  }
+
+  // ==================== CHANGE NOTIFICATIONS ====================
+
+  /**
+   * LISTEN for player changes announced by the schema triggers.
+   * `matchesNeed` decides whether a changed player could enter a cached need.
+   */
+  async listen(matchesNeed) {
+    if (this.listener) return;
+
+    try {
+      this.listener = await db.pool.connect();
+      this.listener.on('notification', (message) => this._onNotification(message, matchesNeed));
+      this.listener.on('error', (error) => this._reconnect(error, matchesNeed));
+      await this.listener.query(`LISTEN ${CHANNEL}`);
+      this.listening = true;
+      logger.info('🔔 Recommendation cache listening for player changes');
+    } catch (error) {
+      this._reconnect(error, matchesNeed);
+    }
+  }
+
+  _reconnect(error, matchesNeed) {
+    logger.warn(`Recommendation cache listener lost: ${error.message}`);
+    if (this.listener) this.listener.release(true);
+    this.listener = null;
+    this.listening = false;
+    // Changes may have been missed while disconnected
+    this._recordChange([], true);
+    this.clear();
+    setTimeout(() => this.listen(matchesNeed), RECONNECT_MS).unref();
+  }
+
+  async _onNotification(message, matchesNeed) {
+    try {
+      const { source, player_ids: playerIds } = JSON.parse(message.payload);
+      const eligibilityChange = source === 'players' || source === 'transfers';
+      this._recordChange(playerIds, eligibilityChange);
+      let dropped = this.invalidatePlayers(playerIds);
+
+      if (eligibilityChange && this.entries.size > 0) {
+        const result = await db.query(
+          `SELECT id, primary_position, secondary_positions, age, market_value_eur, preferred_foot, is_available
+           FROM players WHERE id = ANY($1::int[])`,
+          [playerIds]
+        );
+        dropped += this.invalidateEligible(result.rows, matchesNeed);
+      }
+
+      if (dropped > 0) {
+        logger.info(`♻️ Invalidated ${dropped} cached shortlists after ${source} change (${playerIds.length} players)`);
+      }
+    } catch (error) {
+      logger.warn(`Bad ${CHANNEL} notification, clearing recommendation cache: ${error.message}`);
+      this._recordChange([], true);
+      this.clear();
+    }
+  }
+}
+
+module.exports = new RecommendationCache();
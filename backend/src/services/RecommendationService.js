@@ -1,7 +1,11 @@
 const db = require('../config/database');
 const Player = require('../models/Player');
+const { Channel, Semaphore } = require('../utils/pipeline');
 const logger = require('../utils/logger');
 
+const CANDIDATE_LIMIT = 500;
+const NARRATIVE_CONCURRENCY = parseInt(process.env.RECOMMENDATION_NARRATIVE_CONCURRENCY) || 4;
+
 /**
  * Recommendation & Ranking Engine
  * Implements the two-step matching process: filtering + ranking
@@ -11,119 +15,332 @@ class RecommendationService {
    * Generate recommendations for a club
    */
   async generateRecommendations(clubNeed, topN = 20) {
+    const { recommendations } = await this.rank(clubNeed, topN);
+    return recommendations;
+  }
+
+  /**
+   * Generate recommendations along with the ids of every filtered candidate,
+   * which is the set of players whose changes can alter this shortlist
+   */
+  async rank(clubNeed, topN = 20) {
     try {
       // Step 1: Candidate Filtering
       const candidates = await this._filterCandidates(clubNeed);
       logger.info(`Found ${candidates.length} candidates after filtering`);
 
-      // Step 2: Ranking with scoring
-      const ranked = await this._rankCandidates(candidates, clubNeed);
-      const topRecommendations = ranked.slice(0, topN);
-
-      // Step 3: Generate explanations
-      const recommendations = await Promise.all(
-        topRecommendations.map(async (rec, index) => ({
-          ...rec,
-          rank_position: index + 1,
-          explanation: await this._generateExplanation(rec, clubNeed)
-        }))
-      );
-
-      return recommendations;
+      // Step 2 + 3: Ranking with scoring, then explanations
+      const recommendations = await this._finalizeRecommendations(candidates, clubNeed, topN);
+      return { recommendations, candidateIds: candidates.map(c => c.id) };
     } catch (error) {
       logger.error(`Recommendation generation error: ${error.message}`);
       throw error;
     }
   }
 
+  /**
+   * Generate recommendations for many club needs at once.
+   * Needs whose positions overlap share one candidate-filtering query;
+   * yields { clubNeed, recommendations, candidateIds } per need as each finishes ranking.
+   */
+  async *generateRecommendationsBatch(clubNeeds, topN = 20) {
+    for (const group of this._groupOverlappingNeeds(clubNeeds)) {
+      const merged = this._mergeNeeds(group);
+      const cap = CANDIDATE_LIMIT * group.length;
+      const pool = await this._filterCandidates(merged, cap);
+      logger.info(`Batch: ${pool.length} shared candidates for ${group.length} club needs`);
+
+      for (const clubNeed of group) {
+        // The pool is the merged need's best-form prefix, so each need's matches in it are
+        // that need's own best-form prefix. Only a short slice of a capped pool can be
+        // missing players (other needs' matches crowded them out), so that need is re-queried alone.
+        let candidates = pool
+          .filter(player => this._matchesNeed(player, clubNeed))
+          .slice(0, CANDIDATE_LIMIT);
+        if (candidates.length < CANDIDATE_LIMIT && pool.length === cap) {
+          candidates = await this._filterCandidates(clubNeed);
+        }
+        const recommendations = await this._finalizeRecommendations(candidates, clubNeed, topN);
+        yield { clubNeed, recommendations, candidateIds: candidates.map(c => c.id) };
+      }
+    }
+  }
+
+  /**
+   * Stream one need's shortlist as it is produced. Yields, in order:
+   *   { event: 'ranked', data, candidateIds }  top-N as soon as scoring finishes, no explanations
+   *   { event: 'explanation', data }           one per player: { player_id, rank_position, explanation }
+   *   { event: 'done', data }                  the complete shortlist, explanations attached
+   * With `narrate`, each explanation also carries an LLM-written narrative, and
+   * explanations arrive in completion order rather than rank order.
+   */
+  async *streamRecommendations(clubNeed, topN = 20, { narrate = false } = {}) {
+    const candidates = await this._filterCandidates(clubNeed);
+    const top = (await this._rankCandidates(candidates, clubNeed))
+      .slice(0, topN)
+      .map((rec, index) => ({ ...rec, rank_position: index + 1 }));
+    yield { event: 'ranked', data: top, candidateIds: candidates.map(c => c.id) };
+
+    const recentSignals = await this._loadRecentSignals(top.map(rec => rec.id));
+    const explained = new Channel(Math.max(top.length, 1));
+    const narratives = new Semaphore(NARRATIVE_CONCURRENCY);
+    // Loaded lazily: the OpenAI client needs an API key only when narratives are requested
+    const LLMService = narrate ? require('./LLMService') : null;
+
+    for (const rec of top) {
+      (async () => {
+        const explanation = this._generateExplanation(rec, clubNeed, recentSignals.get(rec.id) || []);
+        if (narrate) {
+          await narratives.acquire();
+          try {
+            explanation.narrative = await LLMService.generateExplanation(rec, rec);
+          } catch (error) {
+            logger.warn(`Narrative for player ${rec.id} failed: ${error.message}`);
+          } finally {
+            narratives.release();
+          }
+        }
+        rec.explanation = explanation;
+        await explained.push({ player_id: rec.id, rank_position: rec.rank_position, explanation });
+      })();
+    }
+
+    for (let i = 0; i < top.length; i++) {
+      yield { event: 'explanation', data: await explained.take() };
+    }
+    yield { event: 'done', data: top };
+  }
+
+  /**
+   * Rank, truncate and explain a candidate list for one club need
+   */
+  async _finalizeRecommendations(candidates, clubNeed, topN) {
+    const ranked = await this._rankCandidates(candidates, clubNeed);
+    const top = ranked.slice(0, topN);
+    const recentSignals = await this._loadRecentSignals(top.map(rec => rec.id));
+
+    return top.map((rec, index) => ({
+      ...rec,
+      rank_position: index + 1,
+      explanation: this._generateExplanation(rec, clubNeed, recentSignals.get(rec.id) || [])
+    }));
+  }
+
+  /**
+   * Union-find over club needs that share at least one required position
+   */
+  _groupOverlappingNeeds(clubNeeds) {
+    const parent = clubNeeds.map((_, i) => i);
+    const find = (i) => (parent[i] === i ? i : (parent[i] = find(parent[i])));
+    const owner = new Map();
+
+    clubNeeds.forEach((need, i) => {
+      for (const position of need.positions_required || []) {
+        if (owner.has(position)) {
+          parent[find(i)] = find(owner.get(position));
+        } else {
+          owner.set(position, i);
+        }
+      }
+    });
+
+    const groups = new Map();
+    clubNeeds.forEach((need, i) => {
+      const root = find(i);
+      if (!groups.has(root)) groups.set(root, []);
+      groups.get(root).push(need);
+    });
+    return [...groups.values()];
+  }
+
+  /**
+   * Loosest need covering every need in the group (used for the shared query)
+   */
+  _mergeNeeds(group) {
+    const unbounded = (key) => group.some(n => n[key] === null || n[key] === undefined);
+    const feet = new Set(group.map(n => n.preferred_foot || null));
+
+    return {
+      positions_required: [...new Set(group.flatMap(n => n.positions_required || []))],
+      age_min: unbounded('age_min') ? null : Math.min(...group.map(n => n.age_min)),
+      age_max: unbounded('age_max') ? null : Math.max(...group.map(n => n.age_max)),
+      budget_max_eur: group.some(n => !n.budget_max_eur) ? null : Math.max(...group.map(n => n.budget_max_eur)),
+      preferred_foot: feet.size === 1 ? [...feet][0] : null
+    };
+  }
+
+  /**
+   * In-memory equivalent of the _filterCandidates predicates for one need
+   */
+  _matchesNeed(player, clubNeed) {
+    const positions = clubNeed.positions_required || [];
+    if (positions.length > 0 &&
+        !positions.includes(player.primary_position) &&
+        !(player.secondary_positions || []).some(p => positions.includes(p))) {
+      return false;
+    }
+    if (clubNeed.age_min !== null && clubNeed.age_min !== undefined && player.age < clubNeed.age_min) return false;
+    if (clubNeed.age_max !== null && clubNeed.age_max !== undefined && player.age > clubNeed.age_max) return false;
+    if (clubNeed.budget_max_eur && player.market_value_eur > clubNeed.budget_max_eur) return false;
+    if (clubNeed.preferred_foot &&
+        player.preferred_foot !== clubNeed.preferred_foot && player.preferred_foot !== 'both') {
+      return false;
+    }
+    return true;
+  }
+
   /**
    * Step 1: Filter candidates based on hard constraints
    */
-  async _filterCandidates(clubNeed) {
+  async _filterCandidates(clubNeed, limit = CANDIDATE_LIMIT) {
+    const { name, text, params } = this._candidateQuery(clubNeed, limit);
+    const result = await db.prepared(name, text, params);
+    return result.rows;
+  }
+
+  /**
+   * Candidate filter as a prepared statement: one name per combination of
+   * constraints, so each combination is planned once against the partial
+   * position/age and GIN secondary-position indexes. The season is bound
+   * rather than computed per query, and the cut to `limit` keeps the
+   * best-form candidates instead of whichever rows the scan hit first.
+   */
+  _candidateQuery(clubNeed, limit = CANDIDATE_LIMIT, season = Player.currentSeason()) {
     const {
       positions_required,
       age_min,
       age_max,
-      budget_min_eur,
       budget_max_eur,
-      contract_preference,
       preferred_foot
     } = clubNeed;
 
-    let query = `
+    let text = `
       SELECT p.*, 
              COALESCE(pp.form_score, 0.5) as form_score,
              COALESCE(pp.consistency_score, 0.5) as consistency_score
       FROM players p
-      LEFT JOIN player_performance pp ON p.id = pp.player_id 
-        AND pp.season = (SELECT CONCAT(YEAR(NOW()), '/', YEAR(NOW())+1))
+      LEFT JOIN player_performance pp ON p.id = pp.player_id AND pp.season = $1
       WHERE p.is_available = true
     `;
 
-    const params = [];
+    const params = [season];
+    const flags = [];
+    const add = (flag, sql, value) => {
+      params.push(value);
+      flags.push(flag);
+      text += ` AND ${sql.replace(/\?/g, `$${params.length}`)}`;
+    };
 
     // Position filter
     if (positions_required && positions_required.length > 0) {
-      query += ` AND (p.primary_position = ANY($${params.length + 1}) 
-                 OR (p.secondary_positions && $${params.length + 1}::text[]))`;
-      params.push(positions_required);
+      add('pos', '(p.primary_position = ANY(?::text[]) OR p.secondary_positions && ?::text[])', positions_required);
     }
 
     // Age filter
-    if (age_min !== null && age_min !== undefined) {
-      query += ` AND p.age >= $${params.length + 1}`;
-      params.push(age_min);
-    }
-    if (age_max !== null && age_max !== undefined) {
-      query += ` AND p.age <= $${params.length + 1}`;
-      params.push(age_max);
-    }
+    if (age_min !== null && age_min !== undefined) add('amin', 'p.age >= ?', age_min);
+    if (age_max !== null && age_max !== undefined) add('amax', 'p.age <= ?', age_max);
 
     // Budget filter
-    if (budget_max_eur) {
-      query += ` AND p.market_value_eur <= $${params.length + 1}`;
-      params.push(budget_max_eur);
-    }
+    if (budget_max_eur) add('budget', 'p.market_value_eur <= ?', budget_max_eur);
 
     // Preferred foot
-    if (preferred_foot) {
-      query += ` AND (p.preferred_foot = $${params.length + 1} OR p.preferred_foot = 'both')`;
-      params.push(preferred_foot);
-    }
-
-    query += ` LIMIT 500`;
+    if (preferred_foot) add('foot', "(p.preferred_foot = ? OR p.preferred_foot = 'both')", preferred_foot);
 
-    const result = await db.query(query, params);
-    return result.rows;
+    params.push(limit);
+    text += ` ORDER BY form_score DESC, p.id LIMIT $${params.length}`;
+    return { name: ['filter_candidates', ...flags].join('_'), text, params };
   }
 
   /**
    * Step 2: Rank filtered candidates with multi-factor scoring
    */
   async _rankCandidates(candidates, clubNeed) {
-    const scoredCandidates = await Promise.all(
-      candidates.map(async (candidate) => {
-        const scores = await this._calculateScores(candidate, clubNeed);
-        return {
-          ...candidate,
-          ...scores,
-          final_score: this._calculateFinalScore(scores)
-        };
-      })
-    );
+    const inputs = await this._loadScoringInputs(candidates.map(c => c.id));
+
+    const scoredCandidates = candidates.map((candidate) => {
+      const scores = this._calculateScores(candidate, clubNeed, inputs);
+      return {
+        ...candidate,
+        ...scores,
+        final_score: this._calculateFinalScore(scores)
+      };
+    });
 
     return scoredCandidates.sort((a, b) => b.final_score - a.final_score);
   }
 
+  /**
+   * Fetch each candidate's signal rollup in one query. Rows whose rolling
+   * window has moved on (a signal expired, news aged out) are recomputed inline.
+   */
+  async _loadScoringInputs(playerIds) {
+    const inputs = { rollups: new Map() };
+    if (playerIds.length === 0) return inputs;
+
+    const { name, text, params } = this._scoringInputsQuery(playerIds);
+    const result = await db.prepared(name, text, params);
+
+    for (const row of result.rows) {
+      inputs.rollups.set(row.player_id, row);
+    }
+    return inputs;
+  }
+
+  /**
+   * Latest five active signals per player, for explanations
+   */
+  async _loadRecentSignals(playerIds) {
+    const signals = new Map();
+    if (playerIds.length === 0) return signals;
+
+    const { name, text, params } = this._recentSignalsQuery(playerIds);
+    const result = await db.prepared(name, text, params);
+
+    for (const row of result.rows) {
+      if (!signals.has(row.player_id)) signals.set(row.player_id, []);
+      signals.get(row.player_id).push(row);
+    }
+    return signals;
+  }
+
+  _scoringInputsQuery(playerIds) {
+    return {
+      name: 'scoring_inputs',
+      text: `SELECT * FROM player_signal_rollups
+             WHERE player_id = ANY($1::int[]) AND stale_after > NOW()
+             UNION ALL
+             SELECT * FROM refresh_player_rollups(ARRAY(
+               SELECT player_id FROM player_signal_rollups
+               WHERE player_id = ANY($1::int[]) AND stale_after <= NOW()
+             ))`,
+      params: [playerIds]
+    };
+  }
+
+  _recentSignalsQuery(playerIds) {
+    return {
+      name: 'recent_signals',
+      text: `SELECT player_id, signal_type, signal_value, evidence, created_at
+             FROM (
+               SELECT ps.*, ROW_NUMBER() OVER (PARTITION BY player_id ORDER BY created_at DESC) AS rn
+               FROM player_signals ps
+               WHERE player_id = ANY($1::int[]) AND is_active = true
+             ) recent
+             WHERE rn <= 5
+             ORDER BY player_id, created_at DESC`,
+      params: [playerIds]
+    };
+  }
+
   /**
    * Calculate individual scoring components
    */
-  async _calculateScores(player, clubNeed) {
+  _calculateScores(player, clubNeed, inputs) {
     const fitScore = this._calculateFitScore(player, clubNeed);
     const performanceScore = player.form_score || 0.5;
-    const availabilityScore = await this._calculateAvailabilityScore(player);
-    const riskPenalty = await this._calculateRiskPenalty(player);
-    const newsConfidence = await this._getNewsConfidence(player);
+    const availabilityScore = this._calculateAvailabilityScore(player, inputs);
+    const riskPenalty = this._calculateRiskPenalty(player, inputs);
+    const newsConfidence = this._getNewsConfidence(player, inputs);
 
     return {
       fit_score: fitScore,
@@ -181,51 +398,26 @@ class RecommendationService {
   /**
    * Availability Score: Based on injury, suspension, contract status
    */
-  async _calculateAvailabilityScore(player) {
-    const result = await db.query(
-      `SELECT signal_value, signal_type FROM player_signals 
-       WHERE player_id = $1 AND is_active = true AND signal_type IN ('injury', 'suspension')
-       AND expires_at > NOW()`,
-      [player.id]
-    );
-
-    let penalty = 0;
-    for (const signal of result.rows) {
-      penalty += signal.signal_value * 0.3; // Max 30% penalty per signal
-    }
-
-    return Math.max(0, 1 - penalty);
+  _calculateAvailabilityScore(player, inputs) {
+    // Rollup holds sum(signal_value) * 0.3 over active injury/suspension signals
+    const { availability_penalty = 0 } = inputs.rollups.get(player.id) || {};
+    return Math.max(0, 1 - availability_penalty);
   }
 
   /**
    * Risk Penalty: Injury, suspension, disciplinary history
    */
-  async _calculateRiskPenalty(player) {
-    const result = await db.query(
-      `SELECT COUNT(*) as count, AVG(signal_value) as avg_risk
-       FROM player_signals 
-       WHERE player_id = $1 AND is_risk = true AND is_active = true`,
-      [player.id]
-    );
-
-    const { count, avg_risk } = result.rows[0];
-    return Math.min(0.4, (parseInt(count) * 0.1) + ((avg_risk || 0) * 0.2));
+  _calculateRiskPenalty(player, inputs) {
+    const { active_risk_count = 0, avg_risk = 0 } = inputs.rollups.get(player.id) || {};
+    return Math.min(0.4, (active_risk_count * 0.1) + ((avg_risk || 0) * 0.2));
   }
 
   /**
    * News Confidence: Based on recent signal extraction confidence
    */
-  async _getNewsConfidence(player) {
-    const result = await db.query(
-      `SELECT AVG(confidence_score) as avg_confidence
-       FROM news_extractions ne
-       JOIN news_articles na ON ne.article_id = na.id
-       WHERE $1 = ANY(ne.affected_players)
-       AND na.published_at > NOW() - INTERVAL '7 days'`,
-      [player.id]
-    );
-
-    return result.rows[0]?.avg_confidence || 0.5;
+  _getNewsConfidence(player, inputs) {
+    const { news_confidence = null } = inputs.rollups.get(player.id) || {};
+    return news_confidence || 0.5;
   }
 
   /**
@@ -253,7 +445,7 @@ class RecommendationService {
   /**
    * Generate explanation for recommendation
    */
-  async _generateExplanation(recommendation, clubNeed) {
+  _generateExplanation(recommendation, clubNeed, signals) {
     const topReasons = [
       `Position match: ${recommendation.primary_position}`,
       `Age fit: ${recommendation.age} (target: ${clubNeed.age_min}-${clubNeed.age_max})`,
@@ -261,15 +453,7 @@ class RecommendationService {
       `Market value: €${recommendation.market_value_eur?.toLocaleString() || 'N/A'}`
     ];
 
-    const signals = await db.query(
-      `SELECT signal_type, signal_value, evidence, created_at 
-       FROM player_signals 
-       WHERE player_id = $1 AND is_active = true
-       ORDER BY created_at DESC LIMIT 5`,
-      [recommendation.id]
-    );
-
-    const risks = signals.rows
+    const risks = signals
       .filter(s => s.signal_type === 'injury' || s.signal_type === 'suspension')
       .map(s => `${s.signal_type.charAt(0).toUpperCase() + s.signal_type.slice(1)}: ${s.evidence}`);
 
@@ -280,7 +464,7 @@ class RecommendationService {
         performance_score: (recommendation.performance_score * 100).toFixed(0),
         availability_score: (recommendation.availability_score * 100).toFixed(0)
       },
-      recent_signals: signals.rows.map(s => ({
+      recent_signals: signals.map(s => ({
         type: s.signal_type,
         timestamp: s.created_at,
         evidence: s.evidence
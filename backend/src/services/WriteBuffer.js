@@ -0,0 +1,221 @@
+const db = require('../config/database');
+const logger = require('../utils/logger');
+
+// Longest a write waits for company before its batch is committed
+const FLUSH_MS = parseInt(process.env.WRITE_BUFFER_FLUSH_MS) || 20;
+// A batch this large is committed without waiting for the timer
+const BATCH_ROWS = parseInt(process.env.WRITE_BUFFER_BATCH_ROWS) || 500;
+// Beyond this many queued rows new writes are refused instead of piling up
+const MAX_PENDING_ROWS = parseInt(process.env.WRITE_BUFFER_MAX_PENDING) || 10000;
+const FEEDBACK_EXPIRY = '7 days';
+
+class WriteBufferFull extends Error {
+  constructor() {
+    super('Write buffer is full');
+    this.status = 503;
+  }
+}
+
+/**
+ * Group-committed Write Path
+ * Feedback, the recommendation expiry it triggers and audit events are queued
+ * and committed together: one transaction per batch, one multi-row statement
+ * per table. A caller's promise settles only once its batch has committed, so
+ * an acknowledged write is durable and an unacknowledged one was never applied.
+ * A unit (one request's rows) is all-or-nothing; when a batch fails, its units
+ * are retried one transaction each so a bad row only fails its own request.
+ */
+class WriteBuffer {
+  constructor() {
+    this.queue = [];
+    this.pendingRows = 0;
+    this.timer = null;
+    this.flushing = null;
+    this.stats = { units: 0, rows: 0, batches: 0, max_batch_rows: 0, retried_units: 0, failed_units: 0, rejected_units: 0 };
+  }
+
+  /**
+   * Queue feedback rows as one unit; resolves with the stored rows once committed.
+   * Each row is audited, and a row naming a recommendation_id pushes its expiry out.
+   */
+  submitFeedback(rows) {
+    return this._enqueue({ feedback: rows, audits: [] });
+  }
+
+  /**
+   * Queue an audit_logs event; resolves once committed
+   */
+  audit({ entity_type, entity_id = null, action, old_value = null, new_value = null, user_id = null }) {
+    return this._enqueue({ feedback: [], audits: [{ entity_type, entity_id, action, old_value, new_value, user_id }] });
+  }
+
+  _enqueue({ feedback, audits }) {
+    const rows = 2 * feedback.length + audits.length; // feedback rows are audited too
+    if (this.pendingRows + rows > MAX_PENDING_ROWS) {
+      this.stats.rejected_units++;
+      return Promise.reject(new WriteBufferFull());
+    }
+
+    return new Promise((resolve, reject) => {
+      this.queue.push({ feedback, audits, rows, resolve, reject });
+      this.pendingRows += rows;
+      this.stats.units++;
+      if (this.pendingRows >= BATCH_ROWS) this._schedule(0);
+      else this._schedule(FLUSH_MS);
+    });
+  }
+
+  _schedule(delay) {
+    if (this.flushing) return; // the running flush picks the queue up when it finishes
+    if (this.timer && delay > 0) return;
+    clearTimeout(this.timer);
+    this.timer = setTimeout(() => {
+      this.timer = null;
+      this.flush();
+    }, delay);
+  }
+
+  /**
+   * Commit everything queued, a batch at a time; one flush runs at a time
+   */
+  async flush() {
+    if (this.flushing) return this.flushing;
+
+    this.flushing = (async () => {
+      while (this.queue.length > 0) {
+        const batch = this._take();
+        try {
+          const results = await this._commit(batch);
+          batch.forEach((unit, i) => unit.resolve(results[i]));
+        } catch (error) {
+          logger.warn(`Group commit of ${batch.length} writes failed, retrying one by one: ${error.message}`);
+          await this._commitEach(batch);
+        }
+      }
+    })();
+
+    try {
+      await this.flushing;
+    } finally {
+      this.flushing = null;
+      // Writes queued after the last batch was taken
+      if (this.queue.length > 0) this._schedule(FLUSH_MS);
+    }
+  }
+
+  _take() {
+    const batch = [];
+    let rows = 0;
+    while (this.queue.length > 0 && (batch.length === 0 || rows + this.queue[0].rows <= BATCH_ROWS)) {
+      const unit = this.queue.shift();
+      rows += unit.rows;
+      batch.push(unit);
+    }
+    this.pendingRows -= rows;
+    this.stats.batches++;
+    this.stats.rows += rows;
+    this.stats.max_batch_rows = Math.max(this.stats.max_batch_rows, rows);
+    return batch;
+  }
+
+  async _commitEach(batch) {
+    for (const unit of batch) {
+      this.stats.retried_units++;
+      try {
+        const [result] = await this._commit([unit]);
+        unit.resolve(result);
+      } catch (error) {
+        this.stats.failed_units++;
+        unit.reject(error);
+      }
+    }
+  }
+
+  /**
+   * One transaction for the batch; returns each unit's stored feedback rows
+   */
+  async _commit(batch) {
+    const feedback = batch.flatMap(unit => unit.feedback);
+    const audits = batch.flatMap(unit => unit.audits);
+    const client = await db.pool.connect();
+    try {
+      await client.query('BEGIN');
+
+      let stored = [];
+      if (feedback.length > 0) {
+        // INSERT ... SELECT keeps the unnest order, so the rows line up with `feedback`
+        const result = await client.query(
+          `WITH inserted AS (
+             INSERT INTO club_feedback (club_id, recommendation_id, player_id, feedback_type, rating, comment)
+             SELECT * FROM unnest($1::int[], $2::int[], $3::int[], $4::varchar[], $5::int[], $6::text[])
+             RETURNING *
+           ), audited AS (
+             INSERT INTO audit_logs (entity_type, entity_id, action, new_value)
+             SELECT 'club_feedback', id, 'create', to_jsonb(inserted) FROM inserted
+           )
+           SELECT * FROM inserted`,
+          [
+            feedback.map(row => row.club_id),
+            feedback.map(row => row.recommendation_id || null),
+            feedback.map(row => row.player_id),
+            feedback.map(row => row.feedback_type || null),
+            feedback.map(row => row.rating || null),
+            feedback.map(row => row.comment || null)
+          ]
+        );
+        stored = result.rows;
+
+        // Mark recommendations as not archived but noted
+        const recommendationIds = [...new Set(feedback.map(row => row.recommendation_id).filter(Boolean))];
+        if (recommendationIds.length > 0) {
+          await client.query(
+            `UPDATE recommendations SET expires_at = NOW() + INTERVAL '${FEEDBACK_EXPIRY}'
+             WHERE id = ANY($1::int[])`,
+            [recommendationIds]
+          );
+        }
+      }
+
+      if (audits.length > 0) {
+        await client.query(
+          `INSERT INTO audit_logs (entity_type, entity_id, action, old_value, new_value, user_id)
+           SELECT * FROM unnest($1::varchar[], $2::int[], $3::varchar[], $4::jsonb[], $5::jsonb[], $6::int[])`,
+          [
+            audits.map(event => event.entity_type),
+            audits.map(event => event.entity_id),
+            audits.map(event => event.action),
+            audits.map(event => (event.old_value === null ? null : JSON.stringify(event.old_value))),
+            audits.map(event => (event.new_value === null ? null : JSON.stringify(event.new_value))),
+            audits.map(event => event.user_id)
+          ]
+        );
+      }
+
+      await client.query('COMMIT');
+
+      let offset = 0;
+      return batch.map(unit => stored.slice(offset, (offset += unit.feedback.length)));
+    } catch (error) {
+      await client.query('ROLLBACK').catch(() => {});
+      throw error;
+    } finally {
+      client.release();
+    }
+  }
+
+  /**
+   * Commit whatever is queued; for shutdown
+   */
+  async drain() {
+    clearTimeout(this.timer);
+    this.timer = null;
+    await this.flush();
+  }
+
+  getStats() {
+    return { queued_units: this.queue.length, queued_rows: this.pendingRows, flush_ms: FLUSH_MS, ...this.stats };
+  }
+}
+
+module.exports = new WriteBuffer();
+module.exports.WriteBufferFull = WriteBufferFull;
@@ -0,0 +1,192 @@
+/**
+ * In-process approximate nearest-neighbour index (IVF-flat, L2 distance)
+ * Vectors are clustered with k-means; a query scans only the `nprobe`
+ * clusters whose centroids are closest. No external dependencies.
+ */
+
+const KMEANS_ITERATIONS = 8;
+const KMEANS_SAMPLE = 20000;
+
+// Deterministic PRNG so rebuilding the same data gives the same clusters
+const mulberry32 = (seed) => () => {
+  seed = (seed + 0x6D2B79F5) | 0;
+  let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+  t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+  return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+};
+
+const squaredDistance = (a, aOffset, b, bOffset, dim) => {
+  let sum = 0;
+  for (let d = 0; d < dim; d++) {
+    const diff = a[aOffset + d] - b[bOffset + d];
+    sum += diff * diff;
+  }
+  return sum;
+};
+
+/**
+ * Fixed-size result list ordered by distance; k is small, so insertion beats a heap
+ */
+class TopK {
+  constructor(k) {
+    this.k = k;
+    this.ids = [];
+    this.distances = [];
+  }
+
+  get worst() {
+    return this.ids.length < this.k ? Infinity : this.distances[this.distances.length - 1];
+  }
+
+  add(id, distance) {
+    if (distance >= this.worst) return;
+    let i = this.distances.length;
+    while (i > 0 && this.distances[i - 1] > distance) i--;
+    this.ids.splice(i, 0, id);
+    this.distances.splice(i, 0, distance);
+    if (this.ids.length > this.k) {
+      this.ids.pop();
+      this.distances.pop();
+    }
+  }
+}
+
+class IVFIndex {
+  constructor({ dim, nlist = null, nprobe = 12, seed = 42 }) {
+    this.dim = dim;
+    this.nlist = nlist;
+    this.nprobe = nprobe;
+    this.seed = seed;
+    this.size = 0;
+  }
+
+  /**
+   * Build from ids and a packed Float32Array of ids.length * dim values
+   */
+  build(ids, vectors) {
+    const n = ids.length;
+    const dim = this.dim;
+    const nlist = Math.max(1, Math.min(n, this.nlist || Math.round(Math.sqrt(n))));
+    const centroids = this._kmeans(vectors, n, nlist);
+
+    const assignment = new Int32Array(n);
+    const counts = new Int32Array(nlist);
+    for (let i = 0; i < n; i++) {
+      assignment[i] = this._nearestCentroid(centroids, nlist, vectors, i * dim);
+      counts[assignment[i]]++;
+    }
+
+    // Store each list contiguously so a probe is one linear scan
+    const offsets = new Int32Array(nlist + 1);
+    for (let c = 0; c < nlist; c++) offsets[c + 1] = offsets[c] + counts[c];
+    const cursor = offsets.slice(0, nlist);
+    const listIds = new Int32Array(n);
+    const listVectors = new Float32Array(n * dim);
+    const positions = new Map();
+
+    for (let i = 0; i < n; i++) {
+      const slot = cursor[assignment[i]]++;
+      listIds[slot] = ids[i];
+      listVectors.set(vectors.subarray(i * dim, (i + 1) * dim), slot * dim);
+      positions.set(ids[i], slot);
+    }
+
+    Object.assign(this, { size: n, nlist, centroids, offsets, listIds, listVectors, positions });
+    return this;
+  }
+
+  has(id) {
+    return this.positions !== undefined && this.positions.has(id);
+  }
+
+  vector(id) {
+    const slot = this.positions.get(id);
+    return this.listVectors.subarray(slot * this.dim, (slot + 1) * this.dim);
+  }
+
+  /**
+   * k nearest ids to `query`, skipping ids for which `filter(id)` is false.
+   * Probes further clusters while fewer than k ids pass the filter.
+   */
+  search(query, k, { nprobe = this.nprobe, filter = null } = {}) {
+    const dim = this.dim;
+    const order = Array.from({ length: this.nlist }, (_, c) => [c, squaredDistance(this.centroids, c * dim, query, 0, dim)])
+      .sort((a, b) => a[1] - b[1]);
+
+    const top = new TopK(k);
+    let probed = 0;
+    let scanned = 0;
+
+    for (const [cluster] of order) {
+      if (probed >= nprobe && top.ids.length >= k) break;
+      probed++;
+      for (let slot = this.offsets[cluster]; slot < this.offsets[cluster + 1]; slot++) {
+        const id = this.listIds[slot];
+        if (filter && !filter(id)) continue;
+        scanned++;
+        top.add(id, squaredDistance(this.listVectors, slot * dim, query, 0, dim));
+      }
+    }
+
+    return {
+      ids: top.ids,
+      distances: top.distances.map(Math.sqrt),
+      probed,
+      scanned
+    };
+  }
+
+  _nearestCentroid(centroids, nlist, vectors, offset) {
+    let best = 0;
+    let bestDistance = Infinity;
+    for (let c = 0; c < nlist; c++) {
+      const distance = squaredDistance(centroids, c * this.dim, vectors, offset, this.dim);
+      if (distance < bestDistance) {
+        bestDistance = distance;
+        best = c;
+      }
+    }
+    return best;
+  }
+
+  /**
+   * Lloyd's k-means over a sample, seeded with distinct random points
+   */
+  _kmeans(vectors, n, nlist) {
+    const dim = this.dim;
+    const random = mulberry32(this.seed);
+    const shuffled = Int32Array.from({ length: n }, (_, i) => i);
+    for (let i = n - 1; i > 0; i--) {
+      const j = Math.floor(random() * (i + 1));
+      [shuffled[i], shuffled[j]] = [shuffled[j], shuffled[i]];
+    }
+    const sample = shuffled.subarray(0, Math.min(n, Math.max(nlist, KMEANS_SAMPLE)));
+
+    const centroids = new Float32Array(nlist * dim);
+    for (let c = 0; c < nlist; c++) {
+      centroids.set(vectors.subarray(sample[c] * dim, (sample[c] + 1) * dim), c * dim);
+    }
+
+    const sums = new Float64Array(nlist * dim);
+    const counts = new Int32Array(nlist);
+    for (let iteration = 0; iteration < KMEANS_ITERATIONS; iteration++) {
+      sums.fill(0);
+      counts.fill(0);
+      for (const i of sample) {
+        const c = this._nearestCentroid(centroids, nlist, vectors, i * dim);
+        counts[c]++;
+        for (let d = 0; d < dim; d++) sums[c * dim + d] += vectors[i * dim + d];
+      }
+      for (let c = 0; c < nlist; c++) {
+        // Empty clusters keep their previous centroid
+        if (counts[c] === 0) continue;
+        for (let d = 0; d < dim; d++) centroids[c * dim + d] = sums[c * dim + d] / counts[c];
+      }
+    }
+    return centroids;
+  }
+}
+
+module.exports = {
+  IVFIndex
+};
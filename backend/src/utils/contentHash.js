@@ -0,0 +1,37 @@
+const crypto = require('crypto');
+
+/**
+ * Article normalization and content hashing
+ * Two articles with the same hash are the same story for storage and LLM purposes.
+ */
+
+// Unicode-normalize, drop zero-width characters, collapse runs of spaces; keep line breaks
+const normalizeText = (text) =>
+  String(text || '')
+    .normalize('NFKC')
+    .replace(/[\u200B-\u200D\uFEFF]/g, '')
+    .replace(/[^\S\n]+/g, ' ')
+    .replace(/ *\n[\n ]*/g, '\n')
+    .trim();
+
+const normalizeArticle = (article) => ({
+  ...article,
+  title: normalizeText(article.title).replace(/\n/g, ' '),
+  content: normalizeText(article.content)
+});
+
+/**
+ * SHA-256 over title and content, case- and whitespace-insensitive
+ */
+const contentHash = (article) => {
+  const canonical = [article.title, article.content]
+    .map(text => normalizeText(text).replace(/\s+/g, ' ').toLowerCase())
+    .join('\n');
+  return crypto.createHash('sha256').update(canonical).digest('hex');
+};
+
+module.exports = {
+  normalizeText,
+  normalizeArticle,
+  contentHash
+};
@@ -0,0 +1,201 @@
+/**
+ * Pipeline primitives - bounded channels, semaphores and concurrent stages
+ * Used by the news ingestion pipeline; no external dependencies.
+ */
+
+const CLOSED = Symbol('closed');
+const TIMEOUT = Symbol('timeout');
+
+/**
+ * Bounded async FIFO. push() waits while the buffer is full, which is what
+ * propagates backpressure from a slow stage to the ones feeding it.
+ */
+class Channel {
+  constructor(capacity = 100) {
+    this.capacity = capacity;
+    this.items = [];
+    this.closed = false;
+    this.takers = [];
+    this.pushers = [];
+  }
+
+  async push(item) {
+    if (this.closed) throw new Error('push on closed channel');
+
+    while (this.takers.length === 0 && this.items.length >= this.capacity) {
+      await new Promise(resolve => this.pushers.push(resolve));
+    }
+
+    const taker = this.takers.shift();
+    if (taker) taker(item);
+    else this.items.push(item);
+  }
+
+  /**
+   * Next item, CLOSED once drained, or TIMEOUT after timeoutMs (if given)
+   */
+  take(timeoutMs = null) {
+    if (this.items.length > 0) {
+      const item = this.items.shift();
+      const pusher = this.pushers.shift();
+      if (pusher) pusher();
+      return Promise.resolve(item);
+    }
+    if (this.closed) return Promise.resolve(CLOSED);
+
+    return new Promise(resolve => {
+      let timer = null;
+      const taker = (item) => {
+        clearTimeout(timer);
+        resolve(item);
+      };
+      this.takers.push(taker);
+
+      if (timeoutMs !== null) {
+        timer = setTimeout(() => {
+          this.takers = this.takers.filter(t => t !== taker);
+          resolve(TIMEOUT);
+        }, timeoutMs);
+      }
+    });
+  }
+
+  close() {
+    this.closed = true;
+    this.takers.splice(0).forEach(taker => taker(CLOSED));
+  }
+}
+
+/**
+ * Counting semaphore; used to cap in-flight work per news source
+ */
+class Semaphore {
+  constructor(permits) {
+    this.permits = permits;
+    this.waiters = [];
+  }
+
+  async acquire() {
+    if (this.permits > 0) {
+      this.permits--;
+      return;
+    }
+    await new Promise(resolve => this.waiters.push(resolve));
+  }
+
+  release() {
+    const waiter = this.waiters.shift();
+    if (waiter) waiter();
+    else this.permits++;
+  }
+}
+
+/**
+ * Per-stage counters; rates are items per second of stage wall time
+ */
+class StageMetrics {
+  constructor(name, concurrency) {
+    this.name = name;
+    this.concurrency = concurrency;
+    this.itemsIn = 0;
+    this.itemsOut = 0;
+    this.errors = 0;
+    this.busyMs = 0;
+    this.startedAt = null;
+    this.finishedAt = null;
+  }
+
+  get wallMs() {
+    if (!this.startedAt) return 0;
+    return (this.finishedAt || Date.now()) - this.startedAt;
+  }
+
+  rate(count) {
+    return this.wallMs > 0 ? +(count / (this.wallMs / 1000)).toFixed(1) : 0;
+  }
+
+  toJSON() {
+    return {
+      stage: this.name,
+      concurrency: this.concurrency,
+      items_in: this.itemsIn,
+      items_out: this.itemsOut,
+      errors: this.errors,
+      wall_ms: this.wallMs,
+      // Share of worker time spent busy; near 1.0 means this stage is the bottleneck
+      utilization: this.wallMs > 0 ? +(this.busyMs / (this.wallMs * this.concurrency)).toFixed(2) : 0,
+      in_per_second: this.rate(this.itemsIn),
+      out_per_second: this.rate(this.itemsOut)
+    };
+  }
+}
+
+/**
+ * Run `concurrency` workers that pull from `input`, call `handler(item, emit)`
+ * and close `output` when the input is drained (unless `closeOutput` is false,
+ * for outputs that more than one producer feeds).
+ *
+ * With `batchSize`, the handler receives arrays of up to batchSize items,
+ * flushed early after `flushMs` of inactivity.
+ */
+function runStage(name, {
+  input, output = null, closeOutput = true, concurrency = 1, batchSize = null, flushMs = 50, handler, onError
+}) {
+  const metrics = new StageMetrics(name, concurrency);
+  const emit = async (item) => {
+    metrics.itemsOut++;
+    if (output) await output.push(item);
+  };
+
+  const handle = async (work, size) => {
+    metrics.startedAt = metrics.startedAt || Date.now();
+    metrics.itemsIn += size;
+    const start = Date.now();
+    try {
+      await handler(work, emit);
+    } catch (error) {
+      metrics.errors += size;
+      if (onError) await onError(error, work, emit);
+    } finally {
+      metrics.busyMs += Date.now() - start;
+    }
+  };
+
+  const worker = async () => {
+    if (!batchSize) {
+      for (let item = await input.take(); item !== CLOSED; item = await input.take()) {
+        await handle(item, 1);
+      }
+      return;
+    }
+
+    let batch = [];
+    for (;;) {
+      const item = await input.take(batch.length > 0 ? flushMs : null);
+      if (item !== CLOSED && item !== TIMEOUT) batch.push(item);
+      if (batch.length > 0 && (item === CLOSED || item === TIMEOUT || batch.length >= batchSize)) {
+        const full = batch;
+        batch = [];
+        await handle(full, full.length);
+      }
+      if (item === CLOSED) return;
+    }
+  };
+
+  const done = Promise.all(Array.from({ length: concurrency }, worker)).then(() => {
+    metrics.finishedAt = Date.now();
+    if (output && closeOutput) output.close();
+    return metrics;
+  });
+
+  return { metrics, done };
+}
+
+module.exports = {
+  Channel,
+  Semaphore,
+  StageMetrics,
+  runStage,
+  CLOSED,
+  TIMEOUT
+};
@@ -0,0 +1,100 @@
+/**
+ * Player profile vectors
+ * Position, age, physicals, market value and performance as a fixed-length
+ * Float32 vector. Features are standardized across the population and then
+ * weighted, so L2 distance reads as "how differently do these two play and cost".
+ */
+
+// Pitch coordinates: x = left (-1) to right (1), y = own goal (0) to opposition goal (1)
+const POSITION_COORDS = {
+  GK: [0, 0],
+  CB: [0, 0.2],
+  LB: [-0.9, 0.3],
+  RB: [0.9, 0.3],
+  LWB: [-0.9, 0.4],
+  RWB: [0.9, 0.4],
+  CDM: [0, 0.45],
+  CM: [0, 0.55],
+  LM: [-0.8, 0.6],
+  RM: [0.8, 0.6],
+  CAM: [0, 0.7],
+  LW: [-0.8, 0.8],
+  RW: [0.8, 0.8],
+  CF: [0, 0.9],
+  ST: [0, 1]
+};
+
+const FOOT = { left: -1, right: 1, both: 0 };
+
+const per90 = (count, minutes) => (minutes > 0 ? (count || 0) * 90 / minutes : null);
+
+const coords = (position) => POSITION_COORDS[String(position || '').toUpperCase()] || null;
+
+const secondaryCoords = (player) => {
+  const points = (player.secondary_positions || []).map(coords).filter(Boolean);
+  if (points.length === 0) return coords(player.primary_position);
+  return [0, 1].map(axis => points.reduce((sum, p) => sum + p[axis], 0) / points.length);
+};
+
+// [name, weight, extractor]; null means missing and is imputed with the population mean
+const FEATURES = [
+  ['goalkeeper', 3.0, p => (String(p.primary_position || '').toUpperCase() === 'GK' ? 1 : 0)],
+  ['position_x', 1.5, p => (coords(p.primary_position) || [null])[0]],
+  ['position_y', 2.0, p => (coords(p.primary_position) || [null, null])[1]],
+  ['secondary_x', 0.5, p => (secondaryCoords(p) || [null])[0]],
+  ['secondary_y', 0.75, p => (secondaryCoords(p) || [null, null])[1]],
+  ['age', 1.0, p => p.age],
+  ['height_cm', 0.5, p => p.height_cm],
+  ['weight_kg', 0.3, p => p.weight_kg],
+  ['preferred_foot', 0.3, p => (p.preferred_foot in FOOT ? FOOT[p.preferred_foot] : null)],
+  ['log_market_value', 0.75, p => (p.market_value_eur > 0 ? Math.log10(p.market_value_eur) : null)],
+  ['form_score', 1.0, p => p.form_score],
+  ['consistency_score', 0.75, p => p.consistency_score],
+  ['passing_accuracy', 0.75, p => p.passing_accuracy],
+  ['goals_per_90', 1.0, p => per90(p.goals, p.minutes_played)],
+  ['assists_per_90', 0.75, p => per90(p.assists, p.minutes_played)],
+  ['tackles_per_game', 0.75, p => p.tackles_per_game],
+  ['interceptions_per_game', 0.75, p => p.interceptions_per_game],
+  ['dribbles_per_game', 0.75, p => p.dribbles_per_game]
+];
+
+const DIMENSIONS = FEATURES.length;
+
+/**
+ * Vectors for a list of player rows, standardized against that same list.
+ * Returns { vectors: Float32Array(n * DIMENSIONS), scaler } where `scaler`
+ * can vectorize further rows on the same scale.
+ */
+function buildVectors(players) {
+  const raw = players.map(player => FEATURES.map(([, , extract]) => {
+    const value = extract(player);
+    return value === null || value === undefined || Number.isNaN(Number(value)) ? null : Number(value);
+  }));
+
+  const scaler = FEATURES.map(([name, weight], j) => {
+    const present = raw.map(row => row[j]).filter(v => v !== null);
+    const mean = present.length > 0 ? present.reduce((s, v) => s + v, 0) / present.length : 0;
+    const variance = present.length > 1
+      ? present.reduce((s, v) => s + (v - mean) ** 2, 0) / (present.length - 1)
+      : 0;
+    return { name, weight, mean, std: Math.sqrt(variance) || 1 };
+  });
+
+  const vectors = new Float32Array(players.length * DIMENSIONS);
+  raw.forEach((row, i) => writeVector(row, scaler, vectors, i * DIMENSIONS));
+  return { vectors, scaler };
+}
+
+function writeVector(row, scaler, target, offset) {
+  scaler.forEach(({ weight, mean, std }, j) => {
+    const value = row[j] === null ? mean : row[j];
+    target[offset + j] = weight * (value - mean) / std;
+  });
+}
+
+module.exports = {
+  FEATURES,
+  DIMENSIONS,
+  POSITION_COORDS,
+  buildVectors
+};
@@ -0,0 +1,95 @@
+process.env.RECOMMENDATION_CACHE_MAX_ENTRIES = '2';
+
+jest.mock('../src/config/database', () => ({ pool: { connect: jest.fn() }, query: jest.fn() }));
+jest.mock('../src/utils/logger', () => ({ info: jest.fn(), warn: jest.fn(), error: jest.fn(), debug: jest.fn() }));
+
+const STRIKER = { positions_required: ['ST', 'CF'], age_min: 20, age_max: 28, budget_max_eur: 50000000 };
+const KEEPER = { positions_required: ['GK'], age_min: 18, age_max: 34 };
+const DEFENDER = { positions_required: ['CB'] };
+
+const notify = (cache, payload, matchesNeed = () => false) =>
+  cache._onNotification({ payload: JSON.stringify(payload) }, matchesNeed);
+
+describe('RecommendationCache', () => {
+  let db;
+  let cache;
+
+  beforeEach(() => {
+    jest.resetModules();
+    db = require('../src/config/database');
+    cache = require('../src/services/RecommendationCache');
+  });
+
+  test('serves a stored shortlist to the same need however it is written', () => {
+    cache.set(STRIKER, 20, [{ id: 1 }], [1, 2, 3]);
+
+    const reordered = { ...STRIKER, positions_required: ['cf', 'st', 'ST'], age_min: '20' };
+    expect(cache.get(reordered, 20).recommendations).toEqual([{ id: 1 }]);
+    expect(cache.get(STRIKER, 10)).toBeNull();
+    expect(cache.getStats()).toMatchObject({ hits: 1, misses: 1, entries: 1 });
+  });
+
+  test('drops only the entries whose candidates changed', () => {
+    cache.set(STRIKER, 20, [], [1, 2]);
+    cache.set(KEEPER, 20, [], [3]);
+
+    expect(cache.invalidatePlayers([2])).toBe(1);
+    expect(cache.get(STRIKER, 20)).toBeNull();
+    expect(cache.get(KEEPER, 20)).not.toBeNull();
+  });
+
+  test('evicts the least recently used entry beyond MAX_ENTRIES', () => {
+    cache.set(STRIKER, 20, [], [1]);
+    cache.set(KEEPER, 20, [], [2]);
+    cache.get(STRIKER, 20);
+    cache.set(DEFENDER, 20, [], [3]);
+
+    expect(cache.get(KEEPER, 20)).toBeNull();
+    expect(cache.get(STRIKER, 20)).not.toBeNull();
+    expect(cache.getStats().evictions).toBe(1);
+  });
+
+  test('expires entries older than the TTL', () => {
+    const entry = cache.set(STRIKER, 20, [], [1]);
+    entry.generatedAt = new Date(Date.now() - 24 * 60 * 60 * 1000);
+
+    expect(cache.get(STRIKER, 20)).toBeNull();
+    expect(cache.getStats().entries).toBe(0);
+  });
+
+  test('does not keep a ranking that a change overtook while it ran', async () => {
+    const since = cache.version();
+    await notify(cache, { source: 'player_signals', player_ids: [2] });
+
+    const overtaken = cache.set(STRIKER, 20, [{ id: 2 }], [1, 2], since);
+    expect(overtaken.recommendations).toEqual([{ id: 2 }]);
+    expect(cache.get(STRIKER, 20)).toBeNull();
+
+    cache.set(KEEPER, 20, [], [3], since);
+    expect(cache.get(KEEPER, 20)).not.toBeNull();
+    expect(cache.getStats().discarded).toBe(1);
+  });
+
+  test('drops entries a changed player could now enter', async () => {
+    cache.set(STRIKER, 20, [], [1]);
+    cache.set(KEEPER, 20, [], [2]);
+    db.query.mockResolvedValueOnce({ rows: [{ id: 9, primary_position: 'ST', is_available: true }] });
+    const matchesNeed = (player, need) => need.positions_required.includes(player.primary_position);
+
+    await notify(cache, { source: 'players', player_ids: [9] }, matchesNeed);
+
+    expect(db.query).toHaveBeenCalledTimes(1);
+    expect(cache.get(STRIKER, 20)).toBeNull();
+    expect(cache.get(KEEPER, 20)).not.toBeNull();
+  });
+
+  test('clears everything on a notification it cannot read', async () => {
+    cache.set(STRIKER, 20, [], [1]);
+    await cache._onNotification({ payload: 'not json' }, () => false);
+
+    expect(cache.getStats().entries).toBe(0);
+    // A ranking that started before the bad notification is not kept either
+    cache.set(KEEPER, 20, [], [2], cache.version() - 1);
+    expect(cache.get(KEEPER, 20)).toBeNull();
+  });
+});
@@ -0,0 +1,93 @@
+jest.mock('../src/config/database', () => ({ pool: { connect: jest.fn() }, query: jest.fn(), prepared: jest.fn() }));
+jest.mock('../src/utils/logger', () => ({ info: jest.fn(), warn: jest.fn(), error: jest.fn(), debug: jest.fn() }));
+
+const db = require('../src/config/database');
+const RecommendationService = require('../src/services/RecommendationService');
+
+// Parameters _candidateQuery binds after the season, keyed by the flag in the statement name
+const FLAG_TESTS = {
+  pos: (player, positions) => positions.includes(player.primary_position) ||
+    player.secondary_positions.some(p => positions.includes(p)),
+  amin: (player, ageMin) => player.age >= ageMin,
+  amax: (player, ageMax) => player.age <= ageMax,
+  budget: (player, budget) => player.market_value_eur <= budget,
+  foot: (player, foot) => player.preferred_foot === foot || player.preferred_foot === 'both'
+};
+
+/**
+ * Runs the candidate filter against an in-memory players table the way Postgres would:
+ * available players passing every bound predicate, best form first, cut to the limit
+ */
+const fakeDatabase = players => (name, text, params) => {
+  if (!name.startsWith('filter_candidates')) return Promise.resolve({ rows: [] });
+  const flags = name.split('_').slice(2);
+  const rows = players
+    .filter(player => player.is_available && flags.every((flag, i) => FLAG_TESTS[flag](player, params[i + 1])))
+    .sort((a, b) => b.form_score - a.form_score || a.id - b.id)
+    .slice(0, params[params.length - 1]);
+  return Promise.resolve({ rows });
+};
+
+const player = (id, fields) => ({
+  id,
+  secondary_positions: [],
+  market_value_eur: 10000000,
+  preferred_foot: 'right',
+  is_available: true,
+  ...fields
+});
+
+const batch = async needs => {
+  const results = new Map();
+  for await (const result of RecommendationService.generateRecommendationsBatch(needs, 10)) {
+    results.set(result.clubNeed.id, result);
+  }
+  return results;
+};
+
+const ids = recommendations => recommendations.map(rec => rec.id);
+
+describe('RecommendationService.generateRecommendationsBatch', () => {
+  const young = { id: 1, club_id: 1, positions_required: ['ST'], age_min: 18, age_max: 24 };
+  const veteran = { id: 2, club_id: 2, positions_required: ['ST', 'CF'], age_min: 30, age_max: 35 };
+
+  beforeEach(() => db.prepared.mockClear());
+
+  test('matches the single-need shortlist when other needs crowd the shared pool', async () => {
+    // 1200 in-form young strikers fill the shared pool; the veterans all rank below them
+    const players = [
+      ...Array.from({ length: 1200 }, (_, i) => player(i + 1, { primary_position: 'ST', age: 21, form_score: 0.9 })),
+      ...Array.from({ length: 40 }, (_, i) => player(2000 + i, {
+        primary_position: 'CF', age: 32, form_score: 0.3 + i / 100
+      }))
+    ];
+    db.prepared.mockImplementation(fakeDatabase(players));
+
+    const results = await batch([young, veteran]);
+
+    for (const need of [young, veteran]) {
+      const single = await RecommendationService.rank(need, 10);
+      expect(ids(results.get(need.id).recommendations)).toEqual(ids(single.recommendations));
+      expect(results.get(need.id).candidateIds).toEqual(single.candidateIds);
+    }
+    expect(results.get(veteran.id).candidateIds).toHaveLength(40);
+  });
+
+  test('shares one candidate query when the pool is not capped', async () => {
+    const players = [
+      ...Array.from({ length: 30 }, (_, i) => player(i + 1, { primary_position: 'ST', age: 21, form_score: 0.5 + i / 100 })),
+      ...Array.from({ length: 30 }, (_, i) => player(100 + i, { primary_position: 'CF', age: 33, form_score: 0.4 }))
+    ];
+    db.prepared.mockImplementation(fakeDatabase(players));
+
+    const results = await batch([young, veteran]);
+    const candidateQueries = db.prepared.mock.calls.filter(([name]) => name.startsWith('filter_candidates'));
+    expect(candidateQueries).toHaveLength(1);
+
+    db.prepared.mockClear();
+    for (const need of [young, veteran]) {
+      const single = await RecommendationService.rank(need, 10);
+      expect(ids(results.get(need.id).recommendations)).toEqual(ids(single.recommendations));
+    }
+  });
+});
@@ -0,0 +1,164 @@
+// Small limits so a handful of writes exercises batching and back-pressure
+process.env.WRITE_BUFFER_FLUSH_MS = '5';
+process.env.WRITE_BUFFER_BATCH_ROWS = '8';
+process.env.WRITE_BUFFER_MAX_PENDING = '12';
+
+jest.mock('../src/config/database', () => ({ pool: { connect: jest.fn() }, query: jest.fn() }));
+jest.mock('../src/utils/logger', () => ({ info: jest.fn(), warn: jest.fn(), error: jest.fn(), debug: jest.fn() }));
+
+const BAD_PLAYER = 999;
+
+/**
+ * A pooled client that stores feedback like Postgres would, and fails the
+ * whole statement when it carries BAD_PLAYER (a foreign key violation)
+ */
+const fakeClient = () => {
+  let nextId = 1;
+  const client = { statements: [], release: jest.fn() };
+  client.query = jest.fn(async (text, params) => {
+    const kind = /INSERT INTO club_feedback/.test(text) ? 'feedback'
+      : /UPDATE recommendations/.test(text) ? 'expiry'
+        : /INSERT INTO audit_logs/.test(text) ? 'audit'
+          : text;
+    client.statements.push({ kind, params });
+    if (kind === 'feedback') {
+      if (params[2].includes(BAD_PLAYER)) throw new Error('violates foreign key constraint');
+      return { rows: params[2].map((playerId, i) => ({ id: nextId++, club_id: params[0][i], player_id: playerId })) };
+    }
+    return { rows: [] };
+  });
+  client.kinds = () => client.statements.map(statement => statement.kind);
+  return client;
+};
+
+const row = (playerId, extra = {}) => ({ club_id: 1, player_id: playerId, feedback_type: 'interested', ...extra });
+
+describe('WriteBuffer', () => {
+  let db;
+  let WriteBuffer;
+  let client;
+
+  beforeEach(() => {
+    jest.resetModules();
+    db = require('../src/config/database');
+    WriteBuffer = require('../src/services/WriteBuffer');
+    client = fakeClient();
+    db.pool.connect.mockImplementation(async () => client);
+  });
+
+  test('commits concurrent writes in one transaction', async () => {
+    const [first, second, audited] = await Promise.all([
+      WriteBuffer.submitFeedback([row(10)]),
+      WriteBuffer.submitFeedback([row(11), row(12)]),
+      WriteBuffer.audit({ entity_type: 'club_needs', entity_id: 1, action: 'upsert', new_value: { id: 1 } })
+    ]);
+
+    expect(db.pool.connect).toHaveBeenCalledTimes(1);
+    expect(client.kinds()).toEqual(['BEGIN', 'feedback', 'audit', 'COMMIT']);
+    expect(first.map(stored => stored.player_id)).toEqual([10]);
+    expect(second.map(stored => stored.player_id)).toEqual([11, 12]);
+    expect(audited).toEqual([]);
+    expect(client.release).toHaveBeenCalledTimes(1);
+    expect(WriteBuffer.getStats()).toMatchObject({ units: 3, batches: 1, rows: 7, queued_units: 0 });
+  });
+
+  test('pushes out the expiry of each recommendation that got feedback once', async () => {
+    await Promise.all([
+      WriteBuffer.submitFeedback([row(10, { recommendation_id: 5 })]),
+      WriteBuffer.submitFeedback([row(11, { recommendation_id: 5 }), row(12)])
+    ]);
+
+    const expiry = client.statements.find(statement => statement.kind === 'expiry');
+    expect(expiry.params).toEqual([[5]]);
+  });
+
+  test('retries a failed batch one unit at a time', async () => {
+    const results = await Promise.allSettled([
+      WriteBuffer.submitFeedback([row(10)]),
+      WriteBuffer.submitFeedback([row(BAD_PLAYER)]),
+      WriteBuffer.submitFeedback([row(12)])
+    ]);
+
+    expect(results.map(result => result.status)).toEqual(['fulfilled', 'rejected', 'fulfilled']);
+    expect(results[1].reason.message).toMatch('foreign key');
+    expect(results[2].value.map(stored => stored.player_id)).toEqual([12]);
+    expect(client.kinds()).toEqual([
+      'BEGIN', 'feedback', 'ROLLBACK',
+      'BEGIN', 'feedback', 'COMMIT',
+      'BEGIN', 'feedback', 'ROLLBACK',
+      'BEGIN', 'feedback', 'COMMIT'
+    ]);
+    expect(WriteBuffer.getStats()).toMatchObject({ retried_units: 3, failed_units: 1 });
+  });
+
+  test('splits the queue into batches of at most BATCH_ROWS rows', async () => {
+    // Each unit is 4 rows (feedback plus its audit row)
+    await Promise.all([
+      WriteBuffer.submitFeedback([row(10), row(11)]),
+      WriteBuffer.submitFeedback([row(12), row(13)]),
+      WriteBuffer.submitFeedback([row(14), row(15)])
+    ]);
+
+    expect(db.pool.connect).toHaveBeenCalledTimes(2);
+    expect(WriteBuffer.getStats()).toMatchObject({ batches: 2, rows: 12, max_batch_rows: 8 });
+  });
+
+  test('refuses writes beyond MAX_PENDING_ROWS instead of queueing them', async () => {
+    const accepted = [
+      WriteBuffer.submitFeedback([row(10), row(11)]),
+      WriteBuffer.submitFeedback([row(12), row(13)]),
+      WriteBuffer.submitFeedback([row(14), row(15)])
+    ];
+
+    const refused = WriteBuffer.audit({ entity_type: 'club_needs', action: 'upsert' });
+    await expect(refused).rejects.toBeInstanceOf(WriteBuffer.WriteBufferFull);
+    await refused.catch(error => expect(error.status).toBe(503));
+    expect(WriteBuffer.getStats().rejected_units).toBe(1);
+
+    await Promise.all(accepted);
+    await expect(WriteBuffer.audit({ entity_type: 'club_needs', action: 'upsert' })).resolves.toEqual([]);
+  });
+
+  test('answers 503 from the feedback endpoint while the buffer is full', async () => {
+    const FeedbackController = require('../src/controllers/FeedbackController');
+    const accepted = [
+      WriteBuffer.submitFeedback([row(10), row(11)]),
+      WriteBuffer.submitFeedback([row(12), row(13)]),
+      WriteBuffer.submitFeedback([row(14), row(15)])
+    ];
+    const res = { status: jest.fn().mockReturnThis(), json: jest.fn() };
+
+    await FeedbackController.submitFeedback({ body: { club_id: 1, player_id: 16 } }, res);
+
+    expect(res.status).toHaveBeenCalledWith(503);
+    await Promise.all(accepted);
+  });
+
+  test('drain commits queued writes, including those behind a running batch', async () => {
+    let openGate;
+    const gate = new Promise(resolve => { openGate = resolve; });
+    db.pool.connect.mockImplementationOnce(async () => {
+      await gate;
+      return client;
+    });
+
+    const running = WriteBuffer.submitFeedback([row(10)]);
+    WriteBuffer.flush(); // takes the first write and blocks on the connection
+    const queued = WriteBuffer.submitFeedback([row(11)]);
+    const drained = WriteBuffer.drain();
+    openGate();
+    await drained;
+
+    expect((await running)[0].player_id).toBe(10);
+    expect((await queued)[0].player_id).toBe(11);
+    expect(WriteBuffer.getStats()).toMatchObject({ queued_units: 0, queued_rows: 0 });
+  });
+
+  test('drain commits without waiting for the flush timer', async () => {
+    const pending = WriteBuffer.submitFeedback([row(10)]);
+    await WriteBuffer.drain();
+
+    expect(client.kinds()).toEqual(['BEGIN', 'feedback', 'COMMIT']);
+    expect((await pending)[0].player_id).toBe(10);
+  });
+});
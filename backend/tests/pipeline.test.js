@@ -0,0 +1,153 @@
+const { Channel, Semaphore, runStage, CLOSED, TIMEOUT } = require('../src/utils/pipeline');
+
+const tick = () => new Promise(resolve => setImmediate(resolve));
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+describe('Channel', () => {
+  test('push waits while the buffer is full', async () => {
+    const channel = new Channel(1);
+    await channel.push('a');
+    let pushed = false;
+    const second = channel.push('b').then(() => { pushed = true; });
+
+    await tick();
+    expect(pushed).toBe(false);
+    expect(await channel.take()).toBe('a');
+    await second;
+    expect(pushed).toBe(true);
+    expect(await channel.take()).toBe('b');
+  });
+
+  test('hands an item straight to a waiting taker', async () => {
+    const channel = new Channel(0);
+    const taken = channel.take();
+    await channel.push('a');
+    expect(await taken).toBe('a');
+  });
+
+  test('take times out when nothing arrives', async () => {
+    const channel = new Channel();
+    expect(await channel.take(5)).toBe(TIMEOUT);
+    await channel.push('a');
+    expect(await channel.take(5)).toBe('a');
+  });
+
+  test('close drains buffered items before reporting CLOSED', async () => {
+    const channel = new Channel();
+    await channel.push('a');
+    channel.close();
+
+    expect(await channel.take()).toBe('a');
+    expect(await channel.take()).toBe(CLOSED);
+    await expect(channel.push('b')).rejects.toThrow('closed');
+  });
+
+  test('close wakes takers that are waiting', async () => {
+    const channel = new Channel();
+    const taken = channel.take();
+    channel.close();
+    expect(await taken).toBe(CLOSED);
+  });
+});
+
+describe('Semaphore', () => {
+  test('caps concurrent holders and hands permits over in order', async () => {
+    const semaphore = new Semaphore(2);
+    const order = [];
+    await semaphore.acquire();
+    await semaphore.acquire();
+    const third = semaphore.acquire().then(() => order.push('third'));
+    const fourth = semaphore.acquire().then(() => order.push('fourth'));
+
+    await tick();
+    expect(order).toEqual([]);
+    semaphore.release();
+    await third;
+    expect(order).toEqual(['third']);
+    semaphore.release();
+    await fourth;
+    expect(order).toEqual(['third', 'fourth']);
+  });
+});
+
+describe('runStage', () => {
+  test('passes items through and closes the output when the input is drained', async () => {
+    const input = new Channel();
+    const output = new Channel(10);
+    const stage = runStage('double', { input, output, concurrency: 2, handler: async (n, emit) => emit(n * 2) });
+
+    for (const n of [1, 2, 3]) await input.push(n);
+    input.close();
+    const metrics = await stage.done;
+
+    const results = [];
+    for (let item = await output.take(); item !== CLOSED; item = await output.take()) results.push(item);
+    expect(results.sort()).toEqual([2, 4, 6]);
+    expect(metrics.toJSON()).toMatchObject({ items_in: 3, items_out: 3, errors: 0, concurrency: 2 });
+  });
+
+  test('hands the handler batches of up to batchSize items', async () => {
+    const input = new Channel();
+    const batches = [];
+    const stage = runStage('batch', { input, batchSize: 3, handler: async batch => batches.push(batch) });
+
+    for (let n = 1; n <= 7; n++) await input.push(n);
+    input.close();
+    await stage.done;
+
+    expect(batches).toEqual([[1, 2, 3], [4, 5, 6], [7]]);
+  });
+
+  test('flushes a partial batch after flushMs without new items', async () => {
+    const input = new Channel();
+    const batches = [];
+    const stage = runStage('batch', { input, batchSize: 10, flushMs: 5, handler: async batch => batches.push(batch) });
+
+    await input.push(1);
+    await input.push(2);
+    await sleep(30);
+    expect(batches).toEqual([[1, 2]]);
+
+    input.close();
+    await stage.done;
+  });
+
+  test('counts a failed item as an error and keeps going', async () => {
+    const input = new Channel();
+    const failed = [];
+    const stage = runStage('fragile', {
+      input,
+      handler: async n => {
+        if (n === 2) throw new Error('bad item');
+      },
+      onError: async (error, n) => failed.push([n, error.message])
+    });
+
+    for (const n of [1, 2, 3]) await input.push(n);
+    input.close();
+    const metrics = await stage.done;
+
+    expect(failed).toEqual([[2, 'bad item']]);
+    expect(metrics.toJSON()).toMatchObject({ items_in: 3, errors: 1 });
+  });
+
+  test('a slow stage holds back the producer feeding it', async () => {
+    const input = new Channel(1);
+    let release;
+    const blocked = new Promise(resolve => { release = resolve; });
+    const stage = runStage('slow', { input, handler: () => blocked });
+
+    await input.push(1); // taken by the worker, which then blocks
+    await tick();
+    await input.push(2); // fills the buffer
+    let pushed = false;
+    const third = input.push(3).then(() => { pushed = true; });
+    await tick();
+    expect(pushed).toBe(false);
+
+    release();
+    await third;
+    input.close();
+    await stage.done;
+  });
+});
@@ -1,8 +1,21 @@
 import streamlit as st
+import pandas as pd
 import requests
 import json
+import os
 from datetime import datetime
 
+from client_metrics import ClientMetrics
+from gateway import Gateway
+from news_feed import NewsFeed
+from player_snapshot import PlayerSnapshot
+from sportify_client import SportifyClient
+from table_view import CLUB_COLUMNS, PLAYER_COLUMNS, TableView, build_frame
+
+# Client-side auto-refresh choices for the Analytics tab; the first is the default
+ANALYTICS_REFRESH_SECONDS = int(os.getenv("ANALYTICS_REFRESH_SECONDS", "30"))
+REFRESH_CHOICES = sorted({ANALYTICS_REFRESH_SECONDS, 15, 30, 60, 300})
+
 # Page config
 st.set_page_config(page_title="Sportify AI - Testing", layout="wide", initial_sidebar_state="expanded")
 
@@ -15,19 +28,60 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_client(base_url: str) -> SportifyClient:
+    """One pooled client per API URL, shared across reruns and sessions"""
+    return SportifyClient(base_url, metrics=ClientMetrics(), gateway=Gateway())
+
+@st.cache_resource
+def get_snapshot(base_url: str) -> PlayerSnapshot:
+    """Local players table, delta-synced in the background so filters never wait on the API"""
+    snapshot = PlayerSnapshot(get_client(base_url))
+    snapshot.start()
+    return snapshot
+
+@st.cache_resource
+def get_news_feed(base_url: str) -> NewsFeed:
+    """Latest articles, pushed by the backend into a local buffer"""
+    feed = NewsFeed(get_client(base_url))
+    feed.start()
+    return feed
+
+def render_article(article):
+    with st.container():
+        st.markdown(f"### {article.get('title')}")
+        
+        col_a, col_b = st.columns([3, 1])
+        with col_a:
+            st.caption(f"Source: {article.get('source') or article.get('source_name')} | "
+                       f"{article.get('published_date') or article.get('published_at')}")
+            st.write((article.get('summary') or article.get('content') or 'No summary available')[:200] + "...")
+        
+        with col_b:
+            confidences = [e.get('confidence') for e in article.get('extractions') or [] if e.get('confidence') is not None]
+            confidence = article.get('confidence_score') or max(confidences, default=0)
+            if confidence > 0.8:
+                st.success(f"Confidence: {confidence:.0%}")
+            elif confidence > 0.6:
+                st.warning(f"Confidence: {confidence:.0%}")
+            else:
+                st.info(f"Confidence: {confidence:.0%}")
+        
+        st.divider()
+
 # Sidebar config
 with st.sidebar:
     st.title("⚙️ Configuration")
     api_url = st.text_input("API Base URL", value="http://localhost:3000/api", help="Enter the backend API URL")
+    client = get_client(api_url)
     st.markdown("---")
     
     if st.button("🔗 Test Connection", use_container_width=True):
         try:
-            response = requests.get(f"{api_url}/health", timeout=5)
-            if response.status_code == 200:
-                st.success("✅ Connected to backend!")
-            else:
-                st.error(f"❌ Backend responded with status {response.status_code}")
+            client.fetch_health()
+            st.success("✅ Connected to backend!")
+        except requests.HTTPError as e:
+            st.error(f"❌ Backend responded with status {e.response.status_code}")
         except Exception as e:
             st.error(f"❌ Connection failed: {str(e)}")
 
@@ -51,16 +105,14 @@ with tab1:
         
         if st.button("Fetch Club Needs", key="fetch_needs", use_container_width=True):
             try:
-                response = requests.get(f"{api_url}/clubs", timeout=10)
-                if response.status_code == 200:
-                    clubs_data = response.json()
-                    matching_club = next((c for c in clubs_data if c.get('name') == selected_club), None)
-                    if matching_club:
-                        st.json(matching_club)
-                    else:
-                        st.warning("Club not found")
+                clubs_data = client.fetch_clubs()
+                matching_club = next((c for c in clubs_data if c.get('name') == selected_club), None)
+                if matching_club:
+                    st.json(matching_club)
                 else:
-                    st.error("Failed to fetch clubs")
+                    st.warning("Club not found")
+            except requests.HTTPError:
+                st.error("Failed to fetch clubs")
             except Exception as e:
                 st.error(f"Error: {str(e)}")
     
@@ -78,34 +130,41 @@ with tab1:
                 if position_filter:
                     payload["positions"] = position_filter
                 
-                response = requests.post(
-                    f"{api_url}/recommendations",
-                    json=payload,
-                    timeout=15
-                )
-                
-                if response.status_code == 201:
-                    recommendations = response.json()
-                    st.success(f"Generated {len(recommendations.get('recommendations', []))} recommendations")
-                    
-                    for rec in recommendations.get('recommendations', [])[:5]:
-                        with st.container():
-                            st.markdown('<div class="recommendation-box">', unsafe_allow_html=True)
-                            col_a, col_b = st.columns([3, 1])
-                            
-                            with col_a:
-                                st.markdown(f"### {rec.get('player_name')} ({rec.get('position')})")
-                                st.markdown(f"**Club:** {rec.get('current_club')} | **Age:** {rec.get('age')}")
-                                st.markdown(f"**Match Score:** {rec.get('match_score', 0):.1f}%")
-                                if rec.get('explanation'):
-                                    st.caption(f"💡 {rec.get('explanation')}")
-                            
-                            with col_b:
-                                st.metric("Fit Score", f"{rec.get('fit_score', 0):.1f}%")
-                            
-                            st.markdown('</div>', unsafe_allow_html=True)
-                else:
-                    st.error(f"API Error: {response.status_code}")
+                # Ranked cards appear first; each caption fills in as its explanation arrives
+                status = st.empty()
+                explanations = {}
+                for event in client.stream_recommendations(payload):
+                    if event.get("event") == "ranked":
+                        recommendations = event["data"]
+                        status.info(f"Ranked {len(recommendations)} players, explaining…")
+                        for rec in recommendations[:5]:
+                            with st.container():
+                                st.markdown('<div class="recommendation-box">', unsafe_allow_html=True)
+                                col_a, col_b = st.columns([3, 1])
+                                
+                                with col_a:
+                                    st.markdown(f"### {rec.get('full_name')} ({rec.get('primary_position')})")
+                                    st.markdown(f"**Club:** {rec.get('current_club_id')} | **Age:** {rec.get('age')}")
+                                    st.markdown(f"**Match Score:** {rec.get('final_score', 0) * 100:.1f}%")
+                                    explanations[rec.get('rank_position')] = st.empty()
+                                    explanations[rec.get('rank_position')].caption("💡 Explaining…")
+                                
+                                with col_b:
+                                    st.metric("Fit Score", f"{rec.get('fit_score', 0) * 100:.1f}%")
+                                
+                                st.markdown('</div>', unsafe_allow_html=True)
+                    elif event.get("event") == "explanation":
+                        placeholder = explanations.get(event["data"]["rank_position"])
+                        if placeholder is not None:
+                            reasons = event["data"]["explanation"].get("top_reasons", [])
+                            placeholder.caption(f"💡 {'; '.join(reasons)}")
+                    elif event.get("event") == "done":
+                        source = " (cached)" if event.get("cached") else ""
+                        status.success(f"Generated {event.get('count', 0)} recommendations{source}")
+                    elif event.get("event") == "error":
+                        status.error(event.get("message", "Failed to generate recommendations"))
+            except requests.HTTPError as e:
+                st.error(f"API Error: {e.response.status_code}")
             except Exception as e:
                 st.error(f"Error: {str(e)}")
 
@@ -113,7 +172,7 @@ with tab1:
 with tab2:
     st.header("Player Database")
     
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         search_name = st.text_input("Search by Player Name")
@@ -124,10 +183,29 @@ with tab2:
     with col3:
         age_range = st.slider("Age Range", 18, 40, (22, 35))
     
-    if st.button("Search Players", use_container_width=True):
+    with col4:
+        max_results = st.number_input("Max Results", min_value=20, max_value=100000, value=200, step=20)
+    
+    snapshot = get_snapshot(api_url)
+    if snapshot.ready:
+        # Every widget change reruns the script; answer it from the local snapshot
+        result = snapshot.search(
+            position=position_filter if position_filter != "All" else None,
+            age_min=age_range[0],
+            age_max=age_range[1],
+            search=search_name or None,
+            limit=int(max_results),
+            as_frame=True
+        )
+        stats = snapshot.stats()
+        st.caption(f"Filtered locally: {result['total']} matches in snapshot v{stats['version']} "
+                   f"({stats['rows']} players)")
+        # st.dataframe only draws the rows in view, so the whole frame goes in; no per-row dicts
+        view = TableView.from_records(result["data"], PLAYER_COLUMNS).query(st.text_input("Filter rows"))
+        st.dataframe(view.rows(), use_container_width=True, hide_index=True)
+    elif st.button("Search Players", use_container_width=True):
         try:
             params = {
-                "limit": 20,
                 "min_age": age_range[0],
                 "max_age": age_range[1]
             }
@@ -136,27 +214,22 @@ with tab2:
             if search_name:
                 params["search"] = search_name
             
-            response = requests.get(f"{api_url}/players", params=params, timeout=10)
+            # The first page shows as soon as it arrives; the full table is sent once, at the end
+            status = st.empty()
+            table = st.empty()
+            frames, count = [], 0
+            for page in client.iter_player_pages(params, max_rows=int(max_results)):
+                frames.append(build_frame(page, PLAYER_COLUMNS))
+                count += len(page)
+                status.info(f"Loading… {count} players so far")
+                if len(frames) == 1:
+                    table.dataframe(frames[0], use_container_width=True, hide_index=True)
+            if frames:
+                table.dataframe(pd.concat(frames, ignore_index=True), use_container_width=True, hide_index=True)
             
-            if response.status_code == 200:
-                players = response.json()
-                st.success(f"Found {len(players)} players")
-                
-                df_data = []
-                for p in players:
-                    df_data.append({
-                        "Name": p.get('name'),
-                        "Position": p.get('position'),
-                        "Club": p.get('club'),
-                        "Age": p.get('age'),
-                        "Rating": p.get('rating', 'N/A'),
-                        "Availability": "✅" if p.get('is_available') else "❌"
-                    })
-                
-                if df_data:
-                    st.dataframe(df_data, use_container_width=True)
-            else:
-                st.error("Failed to fetch players")
+            status.success(f"Found {count} players")
+        except requests.HTTPError:
+            st.error("Failed to fetch players")
         except Exception as e:
             st.error(f"Error: {str(e)}")
 
@@ -169,25 +242,10 @@ with tab3:
     with col1:
         if st.button("Load All Clubs", use_container_width=True):
             try:
-                response = requests.get(f"{api_url}/clubs", timeout=10)
-                
-                if response.status_code == 200:
-                    clubs_data = response.json()
-                    
-                    for club in clubs_data:
-                        with st.expander(f"🏟️ {club.get('name')}"):
-                            col_x, col_y = st.columns(2)
-                            
-                            with col_x:
-                                st.markdown(f"**Country:** {club.get('country')}")
-                                st.markdown(f"**Founded:** {club.get('founded_year')}")
-                                st.markdown(f"**League:** {club.get('league')}")
-                            
-                            with col_y:
-                                st.markdown(f"**Budget:** ${club.get('budget', 'N/A')}M")
-                                st.markdown(f"**Stadium:** {club.get('stadium')}")
-                else:
-                    st.error("Failed to fetch clubs")
+                clubs_data = client.fetch_clubs()
+                st.dataframe(build_frame(clubs_data, CLUB_COLUMNS), use_container_width=True, hide_index=True)
+            except requests.HTTPError:
+                st.error("Failed to fetch clubs")
             except Exception as e:
                 st.error(f"Error: {str(e)}")
     
@@ -197,13 +255,10 @@ with tab3:
         
         if st.button("View Club Needs", use_container_width=True):
             try:
-                response = requests.get(f"{api_url}/clubs/needs/{1}", timeout=10)  # Assuming ID=1
-                
-                if response.status_code == 200:
-                    needs = response.json()
-                    st.json(needs)
-                else:
-                    st.info("No specific needs configured")
+                needs = client.fetch_club_needs(1)  # Assuming ID=1
+                st.json(needs)
+            except requests.HTTPError:
+                st.info("No specific needs configured")
             except Exception as e:
                 st.warning(f"Could not fetch needs: {str(e)}")
 
@@ -216,38 +271,27 @@ with tab4:
     with col1:
         st.subheader("Latest Football News")
     
+    news_feed = get_news_feed(api_url)
     with col2:
         if st.button("Refresh News", use_container_width=True):
-            pass  # Trigger news refresh
+            # Deltas only: articles added or changed since the buffer's cursor
+            try:
+                news_feed.catch_up()
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
     
-    if st.button("Load News Articles", use_container_width=True):
+    if news_feed.ready:
+        stats = news_feed.stats()
+        st.caption(f"{stats['articles']} articles buffered locally ({stats['mode'] or 'connecting'}, "
+                   f"{stats['deltas']} deltas applied)")
+        for article in news_feed.articles(10):
+            render_article(article)
+    elif st.button("Load News Articles", use_container_width=True):
         try:
-            response = requests.get(f"{api_url}/news", params={"limit": 10}, timeout=10)
-            
-            if response.status_code == 200:
-                articles = response.json()
-                
-                for article in articles:
-                    with st.container():
-                        st.markdown(f"### {article.get('title')}")
-                        
-                        col_a, col_b = st.columns([3, 1])
-                        with col_a:
-                            st.caption(f"Source: {article.get('source')} | {article.get('published_date')}")
-                            st.write(article.get('summary', 'No summary available')[:200] + "...")
-                        
-                        with col_b:
-                            confidence = article.get('confidence_score', 0)
-                            if confidence > 0.8:
-                                st.success(f"Confidence: {confidence:.0%}")
-                            elif confidence > 0.6:
-                                st.warning(f"Confidence: {confidence:.0%}")
-                            else:
-                                st.info(f"Confidence: {confidence:.0%}")
-                        
-                        st.divider()
-            else:
-                st.error("Failed to fetch news")
+            for article in client.fetch_news(limit=10):
+                render_article(article)
+        except requests.HTTPError:
+            st.error("Failed to fetch news")
         except Exception as e:
             st.error(f"Error: {str(e)}")
 
@@ -255,38 +299,123 @@ with tab4:
 with tab5:
     st.header("Analytics & Metrics")
     
-    col1, col2, col3, col4 = st.columns(4)
+    col_days, col_auto, col_every = st.columns([2, 1, 1])
+    with col_days:
+        analytics_days = st.slider("Days of activity", min_value=1, max_value=90, value=14)
+    with col_auto:
+        auto_refresh = st.checkbox("Auto-refresh", value=False)
+    with col_every:
+        refresh_seconds = st.selectbox("Every (s)", REFRESH_CHOICES,
+                                       index=REFRESH_CHOICES.index(ANALYTICS_REFRESH_SECONDS))
     
-    with col1:
-        st.metric("Total Players", "6", "+2 this week")
-    
-    with col2:
-        st.metric("Total Clubs", "6", "Stable")
+    def analytics_panel(days: int):
+        """Counters and charts; reruns on its own, without the rest of the page"""
+        try:
+            analytics = client.fetch_analytics(days=days)
+        except Exception as e:
+            analytics = None
+            st.error(f"Could not fetch analytics: {str(e)}")
     
-    with col3:
-        st.metric("Recommendations", "24", "+8 pending")
+        if analytics:
+            totals, today = analytics["totals"], analytics["today"]
+            col1, col2, col3, col4, col5 = st.columns(5)
+        
+            with col1:
+                st.metric("Total Players", f"{totals['players']:,}", f"{totals['players_available']:,} available",
+                          delta_color="off")
+        
+            with col2:
+                st.metric("Total Clubs", f"{totals['clubs']:,}")
+        
+            with col3:
+                st.metric("Recommendations", f"{totals['recommendations_active']:,}",
+                          f"+{today['recommendations']:,} today")
+        
+            with col4:
+                st.metric("News Articles", f"{totals['news_articles']:,}", f"+{today['news']:,} today")
+        
+            with col5:
+                st.metric("Feedback", f"{totals['feedback']:,}", f"+{today['feedback']:,} today")
+        
+            st.caption(f"Rollups last updated {analytics.get('updated_at') or 'never'}; "
+                       "the backend keeps them current on every write")
+        
+            col_pos, col_age = st.columns(2)
+            with col_pos:
+                st.subheader("Players by Position")
+                if analytics["players_by_position"]:
+                    st.bar_chart(pd.DataFrame(analytics["players_by_position"]).set_index("position")[["players", "available"]])
+            with col_age:
+                st.subheader("Players by Age Band")
+                if analytics["players_by_age_band"]:
+                    st.bar_chart(pd.DataFrame(analytics["players_by_age_band"]).set_index("age_band")[["players", "available"]])
+        
+            st.subheader(f"News per Source per Day (last {analytics['days']} days)")
+            if analytics["news_per_source_per_day"]:
+                news_daily = pd.DataFrame(analytics["news_per_source_per_day"]).pivot_table(
+                    index="day", columns="source", values="articles", aggfunc="sum", fill_value=0)
+                st.bar_chart(news_daily)
+                with st.expander("Table"):
+                    st.dataframe(news_daily, use_container_width=True)
+            else:
+                st.info("No news ingested in this window")
+        
+            col_rec, col_fb = st.columns(2)
+            with col_rec:
+                st.subheader("Recommendations per Day")
+                if analytics["recommendations_per_day"]:
+                    st.line_chart(pd.DataFrame(analytics["recommendations_per_day"]).set_index("day")["count"])
+                else:
+                    st.info("None generated in this window")
+            with col_fb:
+                st.subheader("Feedback per Day")
+                if analytics["feedback_per_day"]:
+                    st.bar_chart(pd.DataFrame(analytics["feedback_per_day"]).pivot_table(
+                        index="day", columns="feedback_type", values="count", aggfunc="sum", fill_value=0))
+                else:
+                    st.info("No feedback in this window")
     
-    with col4:
-        st.metric("News Articles", "12", "+3 today")
+    # A fragment with run_every refreshes just this panel on a timer, without blocking the script
+    st.fragment(run_every=refresh_seconds if auto_refresh else None)(analytics_panel)(analytics_days)
     
     st.divider()
     
     st.subheader("System Health")
     if st.button("Check API Status", use_container_width=True):
         try:
-            response = requests.get(f"{api_url}/health", timeout=5)
-            if response.status_code == 200:
-                health = response.json()
-                
-                col_h1, col_h2 = st.columns(2)
-                with col_h1:
-                    st.success("✅ API Online")
-                    st.json(health)
-                with col_h2:
-                    st.info("Last Check: " + datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            health = client.fetch_health()
+            
+            col_h1, col_h2 = st.columns(2)
+            with col_h1:
+                st.success("✅ API Online")
+                st.json(health)
+            with col_h2:
+                st.info("Last Check: " + datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
         except Exception as e:
             st.error(f"❌ API Unavailable: {str(e)}")
     
+    st.subheader("Client Cache")
+    st.caption("Responses served locally instead of hitting the backend")
+    st.json(client.cache_stats())
+    
+    st.subheader("Client Latency")
+    latency = client.metrics_summary()
+    st.caption(f"Per-endpoint timings over the last {latency.get('window_seconds', 0) // 60:.0f} minutes, "
+               "as seen from this app (cache hits are excluded from the phase means)")
+    if latency["endpoints"]:
+        st.dataframe(
+            [{"endpoint": endpoint, **row} for endpoint, row in latency["endpoints"].items()],
+            use_container_width=True,
+        )
+    else:
+        st.info("No requests recorded yet")
+    with st.expander("Prometheus exposition"):
+        st.code(client.metrics_prometheus(), language="text")
+    
+    st.subheader("Backend Gateway")
+    st.caption("Shared by all sessions: identical in-flight requests coalesced, overflow queued")
+    st.json(client.gateway_stats())
+    
     st.markdown("---")
     st.markdown("""
     ### 📚 Documentation
@@ -5,198 +5,786 @@ Optimized for Hugging Face Spaces
 """
 
 import gradio as gr
+import httpx
+import inspect
 import requests
 import json
 import os
-from typing import List, Dict, Any
+import threading
+import time
+from typing import AsyncIterator, Iterator, List, Dict, Any, Optional, Union
 
-# Configuration
-API_BASE_URL = os.getenv("API_URL", "http://localhost:3000/api")
-API_TIMEOUT = 15
+import pandas as pd
 
-class SportifyAPI:
+from client_metrics import ClientMetrics
+from gateway import Gateway
+from news_feed import NewsFeed
+from player_snapshot import PlayerSnapshot
+from response_cache import ResponseCache
+from scoring import DEFAULT_WEIGHTS, CandidateSet
+from sportify_client import API_BASE_URL, API_TIMEOUT, AsyncSportifyClient, SportifyClient
+from table_view import (CLUB_COLUMNS, NEWS_COLUMNS, PLAYER_COLUMNS, RECOMMENDATION_COLUMNS, TABLE_WINDOW_ROWS,
+                        TableView, build_frame, column_labels, explanation_text)
+
+HTTP_ERRORS = (requests.HTTPError, httpx.HTTPStatusError)
+MAX_PLAYER_RESULTS = 200
+MAX_PLAYER_RESULTS_LIMIT = 100_000  # rendering is windowed, so the cap is the fetch, not the table
+MAX_SCORING_CANDIDATES = 100_000
+CLUBS_CACHE_PATH = os.getenv("CLUBS_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".clubs_cache.json"))
+CLUBS_REFRESH_SECONDS = int(os.getenv("CLUBS_REFRESH_SECONDS", "600"))
+CLUBS_FIRST_LOAD_WAIT = 5
+NEWS_RENDER_SECONDS = 2  # redraw from the local feed buffer; no backend call
+ANALYTICS_REFRESH_SECONDS = int(os.getenv("ANALYTICS_REFRESH_SECONDS", "30"))
+DEFAULT_CLUBS = ["Manchester City"]
+
+
+def _status_error(error) -> str:
+    return f"Error: API returned status {error.response.status_code}"
+
+
+def _recommendations_payload(num_recommendations: int, positions: str) -> Dict[str, Any]:
+    # Find club ID (for demo, using club_id=1)
+    payload = {
+        "club_id": 1,
+        "limit": num_recommendations
+    }
+    
+    if positions:
+        payload["positions"] = [p.strip() for p in positions.split(",")]
+    return payload
+
+
+def _players_params(search_name: str, position: str, min_age: int, max_age: int) -> Dict[str, Any]:
+    params = {
+        "limit": 20,
+        "min_age": min_age,
+        "max_age": max_age
+    }
+    
+    if search_name:
+        params["search"] = search_name
+    if position and position != "All":
+        params["position"] = position
+    return params
+
+
+def _snapshot_players(snapshot: PlayerSnapshot, search_name: str, position: str, min_age: int, max_age: int,
+                      max_results: int):
+    """Answer a Players search from the local snapshot; None until the first sync lands"""
+    if snapshot is None or not snapshot.ready:
+        return None
+    params = _players_params(search_name, position, min_age, max_age)
+    result = snapshot.search(position=params.get("position"), age_min=min_age, age_max=max_age,
+                             search=params.get("search"), limit=int(max_results), as_frame=True)
+    return players_view(result["data"])
+
+
+def _similar_filters(position: str, max_value_m: float, cheaper: bool, exclude_same_club: bool) -> Dict[str, Any]:
+    return {
+        "position": position if position and position != "Any" else None,
+        "max_market_value_eur": int(max_value_m * 1_000_000) if max_value_m else None,
+        "cheaper": cheaper,
+        "exclude_same_club": exclude_same_club,
+    }
+
+
+# ==================== RESULT TABLES ====================
+
+TableResult = Union[TableView, str]  # a table, or a message in its place (errors, empty results)
+
+
+def players_view(players: Union[pd.DataFrame, List[Dict[str, Any]]]) -> TableResult:
+    if len(players) == 0:
+        return "No players found matching criteria."
+    return TableView.from_records(players, PLAYER_COLUMNS, f"## 👥 Found {len(players):,} Players")
+
+
+class PlayerPages:
+    """
+    A players search arriving page by page. Each page is converted to columns once;
+    while loading, the view holds just the first window, and the full frame is
+    concatenated a single time at the end.
+    """
+    
+    def __init__(self):
+        self.frames: List[pd.DataFrame] = []
+        self.count = 0
+        self.head = None
+    
+    def add(self, page: List[Dict[str, Any]]) -> TableView:
+        self.frames.append(build_frame(page, PLAYER_COLUMNS))
+        self.count += len(page)
+        if self.head is None or len(self.head) < TABLE_WINDOW_ROWS:
+            self.head = pd.concat(self.frames, ignore_index=True).head(TABLE_WINDOW_ROWS)
+        return TableView(self.head, f"## 👥 Loading… {self.count:,} Players so far")
+    
+    def done(self) -> TableResult:
+        if self.count == 0:
+            return "No players found matching criteria."
+        return TableView(pd.concat(self.frames, ignore_index=True), f"## 👥 Found {self.count:,} Players")
+
+
+class ShortlistView:
+    """
+    Table for a streamed shortlist. The frame is built once from the ranking;
+    each explanation then fills in one cell, so an update never rebuilds the table.
+    """
+    
+    def __init__(self, club_name: str, club_id: int):
+        self.club_name = club_name
+        self.club_id = club_id  # the requesting club; feedback is recorded against it
+        self.table = None
+        self.explained = 0
+        self.status = ""
+    
+    def apply(self, event: Dict[str, Any]) -> TableResult:
+        kind, data = event.get('event'), event.get('data')
+        if kind == 'ranked':
+            self.table = TableView.from_records(data, RECOMMENDATION_COLUMNS)
+            # Shortlist rows are player rows: `id` is the player, the club is the one that asked
+            self.table.keys = pd.DataFrame({"player_id": [row["id"] for row in data], "club_id": self.club_id})
+            why = self.table.frame["Why"]
+            self.table.frame["Why"] = why.where(why != "", "explaining…")
+        elif kind == 'explanation':
+            self.table.set(data['rank_position'] - 1, "Why", explanation_text(data['explanation']))
+            self.explained += 1
+        elif kind == 'done':
+            self.status = "_Served from cache._" if event.get('cached') else ""
+        elif kind == 'error':
+            self.status = f"⚠️ {event.get('message', 'Failed to generate recommendations')}"
+        return self.render()
+    
+    def render(self) -> TableResult:
+        if self.table is None or len(self.table) == 0:
+            return self.status or "No recommendations found."
+        lines = [f"## 🎯 Recommendations for {self.club_name}"]
+        if self.explained < len(self.table):
+            lines.append(f"_Explaining… {self.explained}/{len(self.table)}_")
+        if self.status:
+            lines.append(self.status)
+        self.table.title = "\n\n".join(lines)
+        return self.table
+
+
+FEEDBACK_TYPES = ["interested", "not_interested", "contacted", "signed"]
+
+
+def _feedback_entries(shortlist: Optional[TableView], ranks: str, feedback_type: str, rating: int,
+                      comment: str) -> tuple[List[Dict[str, Any]], List[str]]:
+    """Feedback rows for the shortlist players at `ranks` (all of them when blank), and their names"""
+    if shortlist is None or shortlist.keys is None:
+        raise ValueError("Generate a shortlist first")
+    frame = shortlist.frame
+    picked = [int(r) for r in ranks.replace(" ", "").split(",") if r]
+    wanted = frame.index[frame["Rank"].isin(picked)] if picked else frame.index
+    if len(wanted) == 0:
+        raise ValueError("No shortlist players at those ranks")
+    keys = shortlist.keys.loc[wanted]
+    entries = [{"club_id": int(club_id), "player_id": int(player_id), "feedback_type": feedback_type,
+                "rating": int(rating) if rating else None, "comment": comment or None}
+               for player_id, club_id in zip(keys["player_id"], keys["club_id"])]
+    return entries, frame.loc[wanted, "Name"].astype(str).tolist()
+
+
+def _feedback_status(entries: List[Dict[str, Any]], names: List[str], stored: List[Dict[str, Any]]) -> str:
+    shown = ", ".join(names[:5]) + (f" and {len(names) - 5} more" if len(names) > 5 else "")
+    return f"✅ Recorded {len(stored)} × {entries[0]['feedback_type'].replace('_', ' ')}: {shown}"
+
+
+def _parse_club_ids(club_ids: str) -> List[int]:
+    return [int(c) for c in club_ids.replace(" ", "").split(",") if c]
+
+
+class BatchView:
+    """Every club's shortlist in one table, with a For Club column; failed clubs are listed above it"""
+    
+    def __init__(self):
+        self.frames: List[pd.DataFrame] = []
+        self.errors: List[str] = []
+    
+    def add(self, result: Dict[str, Any]) -> TableResult:
+        club = f"Club {result.get('club_id')}"
+        if result.get('status') != 'success':
+            self.errors.append(f"⚠️ **{club}:** {result.get('message', 'Failed to generate recommendations')}")
+        elif result.get('data'):
+            frame = build_frame(result['data'], RECOMMENDATION_COLUMNS)
+            frame.insert(0, "For Club", club)
+            self.frames.append(frame)
+        return self.render()
+    
+    def fail(self, message: str) -> TableResult:
+        self.errors.append(message)
+        return self.render()
+    
+    def render(self) -> TableResult:
+        errors = "\n\n".join(self.errors)
+        if not self.frames:
+            return errors or "No recommendations found."
+        frame = pd.concat(self.frames, ignore_index=True)
+        title = f"## 🎯 Recommendations for {len(self.frames)} Clubs"
+        return TableView(frame, f"{title}\n\n{errors}" if errors else title)
+
+
+def _millions(value) -> str:
+    return "N/A" if value is None else f"€{value / 1_000_000:,.1f}M"
+
+
+def render_similar_players(body: Dict[str, Any]) -> str:
+    source = body.get('source') or {}
+    players = body.get('data', [])
+    result = (f"## 🧭 Players like {source.get('full_name')} "
+              f"({source.get('primary_position')}, {source.get('age')}, {_millions(source.get('market_value_eur'))})\n\n")
+    if not players:
+        return result + "No similar players match these filters."
+    
+    result += f"_{body.get('backend', 'local')} index, {body.get('took_ms', 0):.2f} ms_\n\n"
+    result += "| # | Name | Position | Age | Value | vs. Source | Similarity |\n"
+    result += "|---|------|----------|-----|-------|------------|------------|\n"
+    for i, p in enumerate(players, 1):
+        difference = p.get('value_difference_eur')
+        delta = "N/A" if difference is None else f"{'+' if difference > 0 else '−' if difference < 0 else '±'}{_millions(abs(difference))}"
+        result += (f"| {i} | {p.get('full_name')} | {p.get('primary_position')} | {p.get('age')} | "
+                   f"{_millions(p.get('market_value_eur'))} | {delta} | {p.get('similarity', 0):.0%} |\n")
+    
+    return result
+
+
+def news_view(articles: List[Dict[str, Any]], title: str = "## 📰 Latest News") -> TableResult:
+    if not articles:
+        return "No news articles available."
+    return TableView.from_records(articles, NEWS_COLUMNS, title)
+
+
+_live_news_views: Dict[int, tuple] = {}  # feed -> ((version, mode), view); every session shows the same buffer
+
+
+def live_news_view(feed: NewsFeed) -> TableResult:
+    """News tab table from the local feed buffer; rebuilt only when the buffer changes"""
+    if not feed.ready:
+        return "_Connecting to the news feed…_"
+    key = (feed.version, feed.mode)
+    cached = _live_news_views.get(id(feed))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    stats = feed.stats()
+    mode = "live" if stats["mode"] == "push" else f"refreshed every {feed.poll_interval}s"
+    view = news_view(feed.articles(feed.capacity),
+                     f"## 📰 Latest News\n\n_{mode} · {stats['articles']} articles buffered · "
+                     f"{stats['deltas']} deltas applied_")
+    _live_news_views[id(feed)] = (key, view)
+    return view
+
+
+def clubs_view(clubs: List[Dict[str, Any]]) -> TableResult:
+    if not clubs:
+        return "No clubs found."
+    return TableView.from_records(clubs, CLUB_COLUMNS, "## 🏟️ Club Profiles")
+
+
+class SportifyAPI(SportifyClient):
     """API client for Sportify AI"""
     
-    def __init__(self, base_url: str):
-        self.base_url = base_url
+    snapshot: PlayerSnapshot = None  # local players table, once synced
+    news_feed: NewsFeed = None  # local buffer of the latest articles, pushed by the backend
     
     def test_connection(self) -> tuple[str, bool]:
         """Test API connection"""
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
-            if response.status_code == 200:
-                return "✅ Connected to API!", True
-            else:
-                return f"⚠️ API returned status {response.status_code}", False
+            self.fetch_health()
+            return "✅ Connected to API!", True
+        except requests.HTTPError as e:
+            return f"⚠️ API returned status {e.response.status_code}", False
         except Exception as e:
             return f"❌ Connection failed: {str(e)}", False
     
     def get_clubs(self) -> List[str]:
         """Get list of clubs"""
         try:
-            response = requests.get(f"{self.base_url}/clubs", timeout=API_TIMEOUT)
-            if response.status_code == 200:
-                clubs = response.json()
-                return [club.get('name', 'Unknown') for club in clubs]
+            clubs = self.fetch_clubs()
+            return [club.get('name', 'Unknown') for club in clubs]
+        except requests.HTTPError:
             return ["Error fetching clubs"]
-        except:
+        except Exception:
             return ["Connection error"]
     
     def generate_recommendations(self, club_name: str, num_recommendations: int, 
-                               positions: str = "") -> str:
-        """Generate player recommendations"""
+                               positions: str = "") -> Iterator[TableResult]:
+        """Generate player recommendations, yielding the ranking first and explanations as they land"""
+        payload = _recommendations_payload(num_recommendations, positions)
+        view = ShortlistView(club_name, payload["club_id"])
         try:
-            # Find club ID (for demo, using club_id=1)
-            payload = {
-                "club_id": 1,
-                "limit": num_recommendations
-            }
-            
-            if positions:
-                payload["positions"] = [p.strip() for p in positions.split(",")]
-            
-            response = requests.post(
-                f"{self.base_url}/recommendations",
-                json=payload,
-                timeout=API_TIMEOUT
-            )
-            
-            if response.status_code == 201:
-                data = response.json()
-                recommendations = data.get('recommendations', [])
-                
-                if not recommendations:
-                    return "No recommendations found."
-                
-                result = f"## 🎯 Recommendations for {club_name}\n\n"
-                for i, rec in enumerate(recommendations, 1):
-                    result += f"### {i}. {rec.get('player_name', 'Unknown')}\n"
-                    result += f"- **Position:** {rec.get('position')}\n"
-                    result += f"- **Current Club:** {rec.get('current_club')}\n"
-                    result += f"- **Age:** {rec.get('age')}\n"
-                    result += f"- **Match Score:** {rec.get('match_score', 0):.1f}%\n"
-                    result += f"- **Fit Score:** {rec.get('fit_score', 0):.1f}%\n"
-                    if rec.get('explanation'):
-                        result += f"- **Why:** {rec.get('explanation')}\n"
-                    result += "\n"
-                
-                return result
-            else:
-                return f"Error: API returned status {response.status_code}"
+            for event in self.stream_recommendations(payload):
+                yield view.apply(event)
+        except requests.HTTPError as e:
+            yield _status_error(e)
+        except Exception as e:
+            yield f"Error generating recommendations: {str(e)}"
+    
+    def batch_recommendations(self, club_ids: str, num_recommendations: int) -> Iterator[TableResult]:
+        """Generate shortlists for many clubs, yielding each club as it finishes"""
+        view = BatchView()
+        try:
+            for club_result in self.generate_recommendations_batch(_parse_club_ids(club_ids), int(num_recommendations)):
+                yield view.add(club_result)
+        except ValueError:
+            yield "Club IDs must be comma-separated integers."
+        except requests.HTTPError as e:
+            yield _status_error(e)
         except Exception as e:
-            return f"Error generating recommendations: {str(e)}"
+            yield view.fail(f"Error generating recommendations: {str(e)}")
     
     def search_players(self, search_name: str = "", position: str = "", 
-                      min_age: int = 18, max_age: int = 40) -> str:
-        """Search players"""
+                      min_age: int = 18, max_age: int = 40,
+                      max_results: int = MAX_PLAYER_RESULTS) -> Iterator[TableResult]:
+        """Search players, yielding the table as each page arrives"""
+        local = _snapshot_players(self.snapshot, search_name, position, min_age, max_age, max_results)
+        if local is not None:
+            yield local
+            return
+        pages = PlayerPages()
         try:
-            params = {
-                "limit": 20,
-                "min_age": min_age,
-                "max_age": max_age
-            }
-            
-            if search_name:
-                params["search"] = search_name
-            if position and position != "All":
-                params["position"] = position
-            
-            response = requests.get(
-                f"{self.base_url}/players",
-                params=params,
-                timeout=API_TIMEOUT
-            )
-            
-            if response.status_code == 200:
-                players = response.json()
-                
-                if not players:
-                    return "No players found matching criteria."
-                
-                result = f"## 👥 Found {len(players)} Players\n\n"
-                result += "| Name | Position | Club | Age | Rating | Status |\n"
-                result += "|------|----------|------|-----|--------|--------|\n"
-                
-                for p in players[:20]:
-                    status = "✅ Available" if p.get('is_available') else "❌ Not Available"
-                    result += f"| {p.get('name')} | {p.get('position')} | {p.get('club')} | {p.get('age')} | {p.get('rating', 'N/A')} | {status} |\n"
-                
-                return result
-            else:
-                return f"Error: API returned status {response.status_code}"
+            params = _players_params(search_name, position, min_age, max_age)
+            for page in self.iter_player_pages(params, max_rows=int(max_results)):
+                yield pages.add(page)
+            yield pages.done()
+        except requests.HTTPError as e:
+            yield _status_error(e)
         except Exception as e:
-            return f"Error searching players: {str(e)}"
+            yield f"Error searching players: {str(e)}"
     
-    def get_news(self) -> str:
+    def similar_players(self, player_id: int, k: int = 10, filters: Dict[str, Any] = None) -> str:
+        """Find players with the closest profile, e.g. like Rodri but cheaper"""
+        try:
+            return render_similar_players(self.fetch_similar_players(int(player_id), int(k), filters))
+        except requests.HTTPError as e:
+            if e.response.status_code == 404:
+                return f"Player {player_id} not found."
+            return _status_error(e)
+        except Exception as e:
+            return f"Error finding similar players: {str(e)}"
+    
+    def get_news(self) -> TableResult:
         """Get latest news"""
+        if self.news_feed is not None and self.news_feed.ready:
+            return live_news_view(self.news_feed)
         try:
-            response = requests.get(
-                f"{self.base_url}/news",
-                params={"limit": 10},
-                timeout=API_TIMEOUT
-            )
-            
-            if response.status_code == 200:
-                articles = response.json()
-                
-                if not articles:
-                    return "No news articles available."
-                
-                result = "## 📰 Latest News\n\n"
-                
-                for article in articles[:10]:
-                    confidence = article.get('confidence_score', 0)
-                    confidence_emoji = "🟢" if confidence > 0.8 else "🟡" if confidence > 0.6 else "🔴"
-                    
-                    result += f"### {article.get('title')}\n"
-                    result += f"- **Source:** {article.get('source')}\n"
-                    result += f"- **Date:** {article.get('published_date')}\n"
-                    result += f"- **Confidence:** {confidence_emoji} {confidence:.0%}\n"
-                    result += f"- **Summary:** {article.get('summary', 'N/A')}\n\n"
-                
-                return result
-            else:
-                return f"Error: API returned status {response.status_code}"
+            return news_view(self.fetch_news(limit=10))
+        except requests.HTTPError as e:
+            return _status_error(e)
         except Exception as e:
             return f"Error fetching news: {str(e)}"
     
-    def get_clubs_data(self) -> str:
+    def get_clubs_data(self) -> TableResult:
         """Get clubs data"""
         try:
-            response = requests.get(f"{self.base_url}/clubs", timeout=API_TIMEOUT)
-            
-            if response.status_code == 200:
-                clubs = response.json()
-                
-                result = "## 🏟️ Club Profiles\n\n"
-                
-                for club in clubs:
-                    result += f"### {club.get('name')}\n"
-                    result += f"- **Country:** {club.get('country')}\n"
-                    result += f"- **League:** {club.get('league')}\n"
-                    result += f"- **Founded:** {club.get('founded_year')}\n"
-                    result += f"- **Stadium:** {club.get('stadium')}\n"
-                    result += f"- **Budget:** ${club.get('budget', 'N/A')}M\n\n"
-                
-                return result
-            else:
-                return f"Error: API returned status {response.status_code}"
+            return clubs_view(self.fetch_clubs())
+        except requests.HTTPError as e:
+            return _status_error(e)
         except Exception as e:
             return f"Error fetching clubs: {str(e)}"
+    
+    def shortlist_feedback(self, shortlist: TableView, ranks: str, feedback_type: str, rating: int,
+                           comment: str) -> str:
+        """Record one feedback type for the chosen shortlist players in a single request"""
+        try:
+            entries, names = _feedback_entries(shortlist, ranks, feedback_type, rating, comment)
+            return _feedback_status(entries, names, self.submit_feedback_batch(entries))
+        except ValueError as e:
+            return f"⚠️ {str(e)}"
+        except requests.HTTPError as e:
+            return _status_error(e)
+        except Exception as e:
+            return f"Error submitting feedback: {str(e)}"
 
-# Initialize API client
-api = SportifyAPI(API_BASE_URL)
 
-# Get clubs list for dropdown
-try:
-    clubs_list = api.get_clubs()
-except:
-    clubs_list = ["Connection Error"]
+class AsyncSportifyAPI(AsyncSportifyClient):
+    """Awaitable counterpart of SportifyAPI, used by the Gradio handlers"""
+    
+    snapshot: PlayerSnapshot = None
+    news_feed: NewsFeed = None
+    
+    async def test_connection(self) -> tuple[str, bool]:
+        """Test API connection"""
+        try:
+            await self.fetch_health()
+            return "✅ Connected to API!", True
+        except httpx.HTTPStatusError as e:
+            return f"⚠️ API returned status {e.response.status_code}", False
+        except Exception as e:
+            return f"❌ Connection failed: {str(e)}", False
+    
+    async def get_clubs(self) -> List[str]:
+        """Get list of clubs"""
+        try:
+            clubs = await self.fetch_clubs()
+            return [club.get('name', 'Unknown') for club in clubs]
+        except httpx.HTTPStatusError:
+            return ["Error fetching clubs"]
+        except Exception:
+            return ["Connection error"]
+    
+    async def generate_recommendations(self, club_name: str, num_recommendations: int, 
+                                       positions: str = "") -> AsyncIterator[TableResult]:
+        """Generate player recommendations, yielding the ranking first and explanations as they land"""
+        payload = _recommendations_payload(num_recommendations, positions)
+        view = ShortlistView(club_name, payload["club_id"])
+        try:
+            async for event in self.stream_recommendations(payload):
+                yield view.apply(event)
+        except httpx.HTTPStatusError as e:
+            yield _status_error(e)
+        except Exception as e:
+            yield f"Error generating recommendations: {str(e)}"
+    
+    async def batch_recommendations(self, club_ids: str, num_recommendations: int) -> AsyncIterator[TableResult]:
+        """Generate shortlists for many clubs, yielding each club as it finishes"""
+        view = BatchView()
+        try:
+            async for club_result in self.generate_recommendations_batch(_parse_club_ids(club_ids), int(num_recommendations)):
+                yield view.add(club_result)
+        except ValueError:
+            yield "Club IDs must be comma-separated integers."
+        except httpx.HTTPStatusError as e:
+            yield _status_error(e)
+        except Exception as e:
+            yield view.fail(f"Error generating recommendations: {str(e)}")
+    
+    async def search_players(self, search_name: str = "", position: str = "", 
+                             min_age: int = 18, max_age: int = 40,
+                             max_results: int = MAX_PLAYER_RESULTS) -> AsyncIterator[TableResult]:
+        """Search players, yielding the table as each page arrives"""
+        local = _snapshot_players(self.snapshot, search_name, position, min_age, max_age, max_results)
+        if local is not None:
+            yield local
+            return
+        pages = PlayerPages()
+        try:
+            params = _players_params(search_name, position, min_age, max_age)
+            async for page in self.iter_player_pages(params, max_rows=int(max_results)):
+                yield pages.add(page)
+            yield pages.done()
+        except httpx.HTTPStatusError as e:
+            yield _status_error(e)
+        except Exception as e:
+            yield f"Error searching players: {str(e)}"
+    
+    async def similar_players(self, player_id: int, k: int = 10, filters: Dict[str, Any] = None) -> str:
+        """Find players with the closest profile, e.g. like Rodri but cheaper"""
+        try:
+            return render_similar_players(await self.fetch_similar_players(int(player_id), int(k), filters))
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return f"Player {player_id} not found."
+            return _status_error(e)
+        except Exception as e:
+            return f"Error finding similar players: {str(e)}"
+    
+    async def get_news(self) -> TableResult:
+        """Get latest news"""
+        if self.news_feed is not None and self.news_feed.ready:
+            return live_news_view(self.news_feed)
+        try:
+            return news_view(await self.fetch_news(limit=10))
+        except httpx.HTTPStatusError as e:
+            return _status_error(e)
+        except Exception as e:
+            return f"Error fetching news: {str(e)}"
+    
+    async def get_clubs_data(self) -> TableResult:
+        """Get clubs data"""
+        try:
+            return clubs_view(await self.fetch_clubs())
+        except httpx.HTTPStatusError as e:
+            return _status_error(e)
+        except Exception as e:
+            return f"Error fetching clubs: {str(e)}"
+    
+    async def shortlist_feedback(self, shortlist: TableView, ranks: str, feedback_type: str, rating: int,
+                                 comment: str) -> str:
+        """Record one feedback type for the chosen shortlist players in a single request"""
+        try:
+            entries, names = _feedback_entries(shortlist, ranks, feedback_type, rating, comment)
+            return _feedback_status(entries, names, await self.submit_feedback_batch(entries))
+        except ValueError as e:
+            return f"⚠️ {str(e)}"
+        except httpx.HTTPStatusError as e:
+            return _status_error(e)
+        except Exception as e:
+            return f"Error submitting feedback: {str(e)}"
+    
+    async def load_dashboard(self, search_name: str = "", position: str = "",
+                             min_age: int = 18, max_age: int = 40) -> tuple[str, TableResult, TableResult, TableResult]:
+        """Load status, clubs, news and players in one concurrent round trip"""
+        results = await self.fetch_dashboard(_players_params(search_name, position, min_age, max_age))
+        
+        def section(key, render, label):
+            value = results[key]
+            if isinstance(value, HTTP_ERRORS):
+                return _status_error(value)
+            if isinstance(value, Exception):
+                return f"Error fetching {label}: {str(value)}"
+            return render(value)
+        
+        status = results["health"]
+        if isinstance(status, httpx.HTTPStatusError):
+            status = f"⚠️ API returned status {status.response.status_code}"
+        elif isinstance(status, Exception):
+            status = f"❌ Connection failed: {str(status)}"
+        else:
+            status = "✅ Connected to API!"
+        
+        return (
+            status,
+            section("clubs", clubs_view, "clubs"),
+            section("news", news_view, "news"),
+            section("players", players_view, "players"),
+        )
+
+# Initialize API clients (sharing one response cache and one metrics registry)
+response_cache = ResponseCache()
+client_metrics = ClientMetrics()
+# Every session shares one gateway: identical in-flight calls coalesce, overflow queues
+gateway = Gateway()
+api = SportifyAPI(API_BASE_URL, cache=response_cache, metrics=client_metrics, gateway=gateway)
+async_api = AsyncSportifyAPI(API_BASE_URL, cache=response_cache, metrics=client_metrics, gateway=gateway)
+
+# ==================== CLUB LIST ====================
+
+class ClubDirectory:
+    """
+    Club names for the dropdown. Starts from the last list persisted on disk so
+    launch never waits on the backend, then refreshes in a background thread.
+    """
+
+    def __init__(self, client: SportifyClient, path: str = CLUBS_CACHE_PATH,
+                 interval: float = CLUBS_REFRESH_SECONDS):
+        self.client = client
+        self.path = path
+        self.interval = interval
+        self.names = self._load()
+        self.persisted = bool(self.names)
+        self.names = self.names or list(DEFAULT_CLUBS)
+        self._fetched = threading.Event()
+        self._started = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> List[str]:
+        try:
+            with open(self.path) as f:
+                names = json.load(f)
+            return [n for n in names if isinstance(n, str)]
+        except (OSError, ValueError, TypeError):
+            return []
+
+    def _save(self, names: List[str]):
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(names, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # read-only filesystem: keep the in-memory list only
+
+    def refresh(self) -> bool:
+        """Fetch clubs from the backend; on failure keep the last-known list"""
+        try:
+            names = [club.get('name', 'Unknown') for club in self.client.fetch_clubs()]
+        except Exception:
+            return False
+        if not names:
+            return False
+        self.names = names
+        self._save(names)
+        return True
+
+    def start(self):
+        """Refresh now and every `interval` seconds, off the request path"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+
+        def loop():
+            while True:
+                self.refresh()
+                self._fetched.set()
+                time.sleep(self.interval)
+
+        threading.Thread(target=loop, name="club-directory", daemon=True).start()
+
+    def dropdown_update(self, current: str = None):
+        """Latest choices, keeping the user's selection when it is still listed"""
+        if not self.persisted:
+            # Nothing on disk yet: give the first fetch a moment rather than showing the placeholder
+            self._fetched.wait(CLUBS_FIRST_LOAD_WAIT)
+        names = self.names
+        return gr.update(choices=names, value=current if current in names else names[0])
+
+
+club_directory = ClubDirectory(api)
+player_snapshot = PlayerSnapshot(api)
+api.snapshot = async_api.snapshot = player_snapshot
+news_feed = NewsFeed(api)
+api.news_feed = async_api.news_feed = news_feed
+
+# ==================== CLIENT LATENCY ====================
+
+LATENCY_COLUMNS = ["endpoint", "requests", "errors", "cache_hits", "p50_ms", "p90_ms", "p99_ms",
+                   "dns_ms", "connect_ms", "tls_ms", "ttfb_ms", "bytes", "last_status"]
+
+
+def latency_table() -> List[List[Any]]:
+    """Rows for the latency panel, one per endpoint"""
+    endpoints = client_metrics.summary()["endpoints"]
+    return [[endpoint] + [row[c] for c in LATENCY_COLUMNS[1:]] for endpoint, row in endpoints.items()]
+
+# ==================== ANALYTICS ====================
+
+def analytics_panels(summary: Dict[str, Any]) -> tuple[str, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Totals as Markdown, then players by position, by age band and news per source per day"""
+    totals, today = summary["totals"], summary["today"]
+    text = (
+        f"**Players:** {totals['players']:,} ({totals['players_available']:,} available) | "
+        f"**Clubs:** {totals['clubs']:,} | "
+        f"**News:** {totals['news_articles']:,} (+{today['news']:,} today) | "
+        f"**Recommendations:** {totals['recommendations_active']:,} (+{today['recommendations']:,} today) | "
+        f"**Feedback:** {totals['feedback']:,} (+{today['feedback']:,} today)\n\n"
+        f"_Last {summary['days']} days; rollups updated {summary.get('updated_at') or 'never'}_"
+    )
+    news = pd.DataFrame(summary["news_per_source_per_day"], columns=["day", "source", "articles"])
+    news = news.pivot_table(index="day", columns="source", values="articles", aggfunc="sum", fill_value=0)
+    return (
+        text,
+        pd.DataFrame(summary["players_by_position"], columns=["position", "players", "available"]),
+        pd.DataFrame(summary["players_by_age_band"], columns=["age_band", "players", "available"]),
+        news.reset_index(),
+    )
+
+
+async def load_analytics(days: int):
+    try:
+        return analytics_panels(await async_api.fetch_analytics(days=int(days)))
+    except httpx.HTTPStatusError as e:
+        return _status_error(e), None, None, None
+    except Exception as e:
+        return f"Error fetching analytics: {str(e)}", None, None, None
+
+# ==================== WHAT-IF SCORING ====================
+
+# Profile columns plus the signals behind the performance, availability, news and risk scores
+CANDIDATE_COLUMNS = ["full_name", "age", "primary_position", "secondary_positions", "preferred_foot",
+                     "market_value_eur", "is_available", "form_score", "availability_penalty", "active_risk_count",
+                     "avg_risk", "news_confidence"]
+
+
+async def load_candidates():
+    """
+    Pull the available players once, with their scoring signals; re-ranking then applies
+    each need's hard filters and runs locally
+    """
+    try:
+        players = await async_api.players_frame(CANDIDATE_COLUMNS, is_available=True, limit=MAX_SCORING_CANDIDATES)
+    except Exception as e:
+        return None, f"Error loading candidates: {str(e)}"
+    return CandidateSet(players), f"✅ Loaded {len(players)} candidates"
+
+
+def rerank_candidates(candidates, positions, age_min, age_max, budget_m, foot,
+                      w_fit, w_perf, w_avail, w_news, w_risk, k):
+    """Filter the loaded players by the need, as the backend does, and score them with the given weights"""
+    if candidates is None:
+        return "Load candidates first."
+    
+    need = {
+        "positions_required": [p.strip() for p in positions.split(",") if p.strip()],
+        "age_min": age_min,
+        "age_max": age_max,
+        "budget_max_eur": budget_m * 1_000_000 if budget_m else None,
+        "preferred_foot": None if foot == "Any" else foot,
+    }
+    weights = {
+        "fit_score": w_fit,
+        "performance_score": w_perf,
+        "availability_score": w_avail,
+        "news_confidence": w_news,
+        "risk_penalty": w_risk,
+    }
+    ranked = candidates.top_k(need, int(k), weights)
+    
+    if ranked.empty:
+        return "No loaded candidates match this need."
+    
+    result = f"## ⚖️ Top {len(ranked)} of {len(candidates)} Candidates\n\n"
+    result += "| # | Name | Position | Age | Fit | Final |\n"
+    result += "|---|------|----------|-----|-----|-------|\n"
+    result += "".join(
+        f"| {row.rank_position} | {getattr(row, 'full_name', None) or getattr(row, 'name', 'Unknown')} | "
+        f"{getattr(row, 'primary_position', '')} | {getattr(row, 'age', '')} | "
+        f"{row.fit_score:.0%} | {row.final_score:.3f} |\n"
+        for row in ranked.itertuples()
+    )
+    return result
+
+# ==================== VIRTUAL TABLES ====================
+
+class VirtualTable:
+    """
+    A TableView on the page: a caption, one window of rows, and filter / sort / page
+    controls. The whole view stays in session state and the controls re-slice it
+    locally, so only the visible rows ever reach the browser.
+    """
+    
+    def __init__(self, labels: List[str]):
+        self.labels = labels
+        self.state = gr.State(None)
+        with gr.Row():
+            self.filter = gr.Textbox(label="Filter rows", placeholder="Text in any column")
+            self.sort_by = gr.Dropdown(labels, label="Sort by", value=None)
+            self.descending = gr.Checkbox(label="Descending", value=False)
+            self.page = gr.Number(label="Page", value=1, precision=0, minimum=1)
+        self.caption = gr.Markdown()
+        self.table = gr.Dataframe(headers=labels, interactive=False, wrap=True)
+        self.controls = [self.filter, self.sort_by, self.descending, self.page]
+        self.outputs = [self.state, self.caption, self.table]
+        
+        for control in self.controls:
+            control.change(self.render, inputs=[self.state, *self.controls], outputs=self.outputs)
+    
+    def show(self, result: TableResult, filter_text: str, sort_by: str, descending: bool, page: int) -> tuple:
+        """State, caption and visible rows for a handler's result; a message clears the table"""
+        if not isinstance(result, TableView):
+            return None, result, pd.DataFrame(columns=self.labels)
+        view = result.query(filter_text, sort_by, descending)
+        return result, view.caption(page), view.window(page)
+    
+    def render(self, view: TableView, *controls):
+        if view is None:
+            return gr.update(), gr.update(), gr.update()
+        return self.show(view, *controls)
+    
+    def stream(self, handler):
+        """Event handler for an async generator of results; the last four inputs are this table's controls"""
+        async def run(*inputs):
+            async for result in handler(*inputs[:-4]):
+                yield self.show(result, *inputs[-4:])
+        return run
+    
+    def call(self, handler):
+        """Event handler for a function (or coroutine) returning one result"""
+        async def run(*inputs):
+            result = handler(*inputs[:-4])
+            if inspect.isawaitable(result):
+                result = await result
+            return self.show(result, *inputs[-4:])
+        return run
 
 # ==================== GRADIO INTERFACE ====================
 
 def interface():
     """Create Gradio interface"""
+    club_directory.start()
+    player_snapshot.start()
+    news_feed.start()
     
     with gr.Blocks(theme=gr.themes.Soft(), title="Sportify AI Testing") as demo:
         # Header
@@ -213,9 +801,10 @@ def interface():
         with gr.Row():
             api_status = gr.Textbox(label="API Status", interactive=False, value="Testing...")
             test_btn = gr.Button("🔗 Test Connection")
+            dashboard_btn = gr.Button("⚡ Load Dashboard")
         
-        def check_status():
-            status, _ = api.test_connection()
+        async def check_status():
+            status, _ = await async_api.test_connection()
             return status
         
         test_btn.click(check_status, outputs=api_status)
@@ -229,9 +818,9 @@ def interface():
                 
                 with gr.Row():
                     club_dropdown = gr.Dropdown(
-                        choices=clubs_list,
+                        choices=club_directory.names,
                         label="Select Club",
-                        value=clubs_list[0] if clubs_list else "Manchester City"
+                        value=club_directory.names[0]
                     )
                     num_recs = gr.Slider(1, 10, value=5, step=1, label="Number of Recommendations")
                 
@@ -242,15 +831,88 @@ def interface():
                         lines=1
                     )
                 
-                recommendations_output = gr.Markdown()
+                recommendations_table = VirtualTable(column_labels(RECOMMENDATION_COLUMNS))
                 generate_btn = gr.Button("🚀 Generate Recommendations", variant="primary")
                 
                 generate_btn.click(
-                    api.generate_recommendations,
-                    inputs=[club_dropdown, num_recs, positions_input],
-                    outputs=recommendations_output
+                    recommendations_table.stream(async_api.generate_recommendations),
+                    inputs=[club_dropdown, num_recs, positions_input, *recommendations_table.controls],
+                    outputs=recommendations_table.outputs
+                )
+                
+                gr.Markdown("### Feedback on this Shortlist")
+                
+                with gr.Row():
+                    feedback_ranks = gr.Textbox(label="Ranks (comma-separated, blank for all)",
+                                                placeholder="e.g., 1, 3, 4", lines=1)
+                    feedback_type = gr.Dropdown(FEEDBACK_TYPES, label="Feedback", value="interested")
+                    feedback_rating = gr.Slider(1, 5, value=3, step=1, label="Rating")
+                feedback_comment = gr.Textbox(label="Comment (optional)", lines=1)
+                feedback_btn = gr.Button("💬 Submit Feedback", variant="secondary")
+                feedback_output = gr.Markdown()
+                
+                feedback_btn.click(
+                    async_api.shortlist_feedback,
+                    inputs=[recommendations_table.state, feedback_ranks, feedback_type, feedback_rating, feedback_comment],
+                    outputs=feedback_output
+                )
+                
+                gr.Markdown("### Batch Recommendations")
+                
+                with gr.Row():
+                    batch_club_ids = gr.Textbox(
+                        label="Club IDs (comma-separated)",
+                        placeholder="e.g., 1, 2, 3, 4, 5, 6",
+                        lines=1
+                    )
+                
+                batch_table = VirtualTable(["For Club", *column_labels(RECOMMENDATION_COLUMNS)])
+                batch_btn = gr.Button("📦 Generate for All Clubs", variant="secondary")
+                
+                batch_btn.click(
+                    batch_table.stream(async_api.batch_recommendations),
+                    inputs=[batch_club_ids, num_recs, *batch_table.controls],
+                    outputs=batch_table.outputs
                 )
             
+            # ============= TAB: WHAT-IF SCORING =============
+            with gr.TabItem("⚖️ What-If Scoring"):
+                gr.Markdown("### Re-weight the scoring model locally")
+                
+                candidates_state = gr.State(None)
+                with gr.Row():
+                    load_candidates_btn = gr.Button("📥 Load Candidates", variant="primary")
+                    candidates_status = gr.Textbox(label="Candidate Pool", interactive=False)
+                
+                with gr.Row():
+                    whatif_positions = gr.Textbox(label="Positions (comma-separated)", value="CM, CDM")
+                    whatif_foot = gr.Dropdown(["Any", "left", "right"], label="Preferred Foot", value="Any")
+                    whatif_budget = gr.Number(label="Max Budget (€M)", value=80)
+                
+                with gr.Row():
+                    whatif_age_min = gr.Slider(16, 40, value=23, step=1, label="Min Age")
+                    whatif_age_max = gr.Slider(16, 40, value=32, step=1, label="Max Age")
+                    whatif_k = gr.Slider(5, 100, value=20, step=5, label="Top K")
+                
+                with gr.Row():
+                    w_fit = gr.Slider(0, 1, value=DEFAULT_WEIGHTS["fit_score"], step=0.05, label="Fit")
+                    w_perf = gr.Slider(0, 1, value=DEFAULT_WEIGHTS["performance_score"], step=0.05, label="Performance")
+                    w_avail = gr.Slider(0, 1, value=DEFAULT_WEIGHTS["availability_score"], step=0.05, label="Availability")
+                    w_news = gr.Slider(0, 1, value=DEFAULT_WEIGHTS["news_confidence"], step=0.05, label="News")
+                    w_risk = gr.Slider(0, 1, value=DEFAULT_WEIGHTS["risk_penalty"], step=0.05, label="Risk (−)")
+                
+                whatif_output = gr.Markdown()
+                whatif_inputs = [candidates_state, whatif_positions, whatif_age_min, whatif_age_max,
+                                 whatif_budget, whatif_foot, w_fit, w_perf, w_avail, w_news, w_risk, whatif_k]
+                
+                load_candidates_btn.click(
+                    load_candidates, outputs=[candidates_state, candidates_status]
+                ).then(rerank_candidates, inputs=whatif_inputs, outputs=whatif_output)
+                
+                # Every control re-ranks locally, no backend round trip
+                for control in whatif_inputs[1:]:
+                    control.change(rerank_candidates, inputs=whatif_inputs, outputs=whatif_output)
+            
             # ============= TAB 2: PLAYERS =============
             with gr.TabItem("👥 Players"):
                 gr.Markdown("### Search Players")
@@ -264,34 +926,107 @@ def interface():
                     )
                 
                 with gr.Row():
-                    age_slider = gr.Slider(18, 40, value=[22, 35], label="Age Range")
+                    min_age_slider = gr.Slider(18, 40, value=22, step=1, label="Min Age")
+                    max_age_slider = gr.Slider(18, 40, value=35, step=1, label="Max Age")
+                    max_results = gr.Slider(20, MAX_PLAYER_RESULTS_LIMIT, value=MAX_PLAYER_RESULTS, step=20,
+                                            label="Max Results")
                 
-                players_output = gr.Markdown()
+                players_table = VirtualTable(column_labels(PLAYER_COLUMNS))
                 search_btn = gr.Button("🔍 Search Players", variant="primary")
                 
-                search_btn.click(
-                    api.search_players,
-                    inputs=[player_search, position_filter, age_slider],
-                    outputs=players_output
+                player_inputs = [player_search, position_filter, min_age_slider, max_age_slider, max_results]
+                search_btn.click(players_table.stream(async_api.search_players),
+                                 inputs=[*player_inputs, *players_table.controls], outputs=players_table.outputs)
+                
+                def filter_players(*inputs):
+                    # Live filtering only once the snapshot is on disk; before that the button asks the backend
+                    local = _snapshot_players(player_snapshot, *inputs[:-4])
+                    return (gr.update(),) * 3 if local is None else players_table.show(local, *inputs[-4:])
+                
+                for control in player_inputs:
+                    control.change(filter_players, inputs=[*player_inputs, *players_table.controls],
+                                   outputs=players_table.outputs)
+            
+            # ============= SIMILAR PLAYERS =============
+            with gr.TabItem("🧭 Similar Players"):
+                gr.Markdown("### Find Players With a Similar Profile")
+                
+                with gr.Row():
+                    similar_player_id = gr.Number(label="Player ID", value=3, precision=0)
+                    similar_k = gr.Slider(5, 50, value=10, step=1, label="Results")
+                    similar_position = gr.Dropdown(
+                        ["Any", "GK", "CB", "LB", "RB", "CDM", "CM", "CAM", "LM", "RM", "LW", "RW", "CF", "ST"],
+                        label="Position",
+                        value="Any"
+                    )
+                
+                with gr.Row():
+                    similar_max_value = gr.Number(label="Max Value (€M, 0 = any)", value=0)
+                    similar_cheaper = gr.Checkbox(label="Cheaper than this player", value=True)
+                    similar_other_clubs = gr.Checkbox(label="Other clubs only", value=True)
+                
+                similar_output = gr.Markdown()
+                similar_btn = gr.Button("🧭 Find Similar Players", variant="primary")
+                
+                async def find_similar(player_id, k, position, max_value_m, cheaper, other_clubs):
+                    filters = _similar_filters(position, max_value_m, cheaper, other_clubs)
+                    return await async_api.similar_players(player_id, k, filters)
+                
+                similar_btn.click(
+                    find_similar,
+                    inputs=[similar_player_id, similar_k, similar_position, similar_max_value,
+                            similar_cheaper, similar_other_clubs],
+                    outputs=similar_output
                 )
             
             # ============= TAB 3: CLUBS =============
             with gr.TabItem("🏟️ Clubs"):
                 gr.Markdown("### Club Profiles")
                 
-                clubs_output = gr.Markdown()
+                clubs_table = VirtualTable(column_labels(CLUB_COLUMNS))
                 load_clubs_btn = gr.Button("📂 Load All Clubs", variant="primary")
                 
-                load_clubs_btn.click(api.get_clubs_data, outputs=clubs_output)
+                load_clubs_btn.click(clubs_table.call(async_api.get_clubs_data),
+                                     inputs=clubs_table.controls, outputs=clubs_table.outputs)
             
             # ============= TAB 4: NEWS =============
             with gr.TabItem("📰 News"):
                 gr.Markdown("### Latest Football News")
                 
-                news_output = gr.Markdown()
+                news_table = VirtualTable(column_labels(NEWS_COLUMNS))
                 load_news_btn = gr.Button("📡 Load News Articles", variant="primary")
                 
-                load_news_btn.click(api.get_news, outputs=news_output)
+                load_news_btn.click(news_table.call(async_api.get_news),
+                                    inputs=news_table.controls, outputs=news_table.outputs)
+            
+            # ============= ANALYTICS =============
+            with gr.TabItem("📊 Analytics"):
+                gr.Markdown(f"### Activity Rollups\nRefreshed every {ANALYTICS_REFRESH_SECONDS}s.")
+                
+                analytics_days = gr.Slider(1, 90, value=14, step=1, label="Days of activity")
+                analytics_text = gr.Markdown()
+                with gr.Row():
+                    position_output = gr.Dataframe(label="Players by position")
+                    age_band_output = gr.Dataframe(label="Players by age band")
+                news_daily_output = gr.Dataframe(label="News per source per day")
+                analytics_outputs = [analytics_text, position_output, age_band_output, news_daily_output]
+                
+                analytics_days.release(load_analytics, inputs=analytics_days, outputs=analytics_outputs)
+            
+            # ============= LATENCY =============
+            with gr.TabItem("📈 Latency"):
+                gr.Markdown(
+                    "### Client-side Request Timings\n"
+                    "Rolling 5-minute window per endpoint. Prometheus text at `/metrics`, JSON at `/metrics.json`."
+                )
+                
+                latency_output = gr.Dataframe(headers=LATENCY_COLUMNS, value=latency_table, every=5)
+                refresh_latency_btn = gr.Button("🔄 Refresh")
+                
+                refresh_latency_btn.click(latency_table, outputs=latency_output)
+                
+                gr.Markdown("### Backend Gateway\nShared by all sessions: coalesced requests, queue depth and waits.")
+                gr.JSON(value=gateway.stats, every=5)
             
             # ============= TAB 5: DOCUMENTATION =============
             with gr.TabItem("📚 Documentation"):
@@ -339,6 +1074,31 @@ def interface():
                 - **Ready to test:** All APIs functional with example data
                 """)
         
+        # Clubs, news, players and health fetched concurrently
+        async def load_dashboard(search_name, position, min_age, max_age, *controls):
+            status, clubs, news, players = await async_api.load_dashboard(search_name, position, min_age, max_age)
+            return (status, *clubs_table.show(clubs, *controls[:4]), *news_table.show(news, *controls[4:8]),
+                    *players_table.show(players, *controls[8:]))
+        
+        dashboard_btn.click(
+            load_dashboard,
+            inputs=[player_search, position_filter, min_age_slider, max_age_slider,
+                    *clubs_table.controls, *news_table.controls, *players_table.controls],
+            outputs=[api_status, *clubs_table.outputs, *news_table.outputs, *players_table.outputs]
+        )
+        
+        # News is re-drawn from the local buffer (the backend pushes new articles into it),
+        # keeping whatever filter, sort and page the session has set
+        demo.load(news_table.call(lambda: live_news_view(news_feed)), inputs=news_table.controls,
+                  outputs=news_table.outputs, every=NEWS_RENDER_SECONDS)
+        
+        demo.load(load_analytics, inputs=analytics_days, outputs=analytics_outputs,
+                  every=ANALYTICS_REFRESH_SECONDS)
+        
+        # Club list comes from the background refresher; page load never waits on the backend
+        demo.load(club_directory.dropdown_update, inputs=club_dropdown, outputs=club_dropdown,
+                  every=CLUBS_REFRESH_SECONDS)
+        
         # Footer
         gr.HTML("""
         <div style='text-align: center; padding: 20px; border-top: 1px solid #ddd; margin-top: 20px;'>
@@ -352,6 +1112,23 @@ def interface():
     
     return demo
 
+def create_app():
+    """Gradio UI mounted on FastAPI, with the client metrics alongside"""
+    from fastapi import FastAPI
+    from fastapi.responses import PlainTextResponse
+
+    app = FastAPI()
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def metrics():
+        return client_metrics.prometheus() + gateway.prometheus()
+
+    @app.get("/metrics.json")
+    def metrics_json():
+        return {**client_metrics.summary(), "gateway": gateway.stats()}
+
+    return gr.mount_gradio_app(app, interface(), path="/")
+
 if __name__ == "__main__":
-    demo = interface()
-    demo.launch(server_name="0.0.0.0", server_port=7860)
+    import uvicorn
+    uvicorn.run(create_app(), host="0.0.0.0", port=7860)
@@ -0,0 +1,277 @@
+"""
+Sportify AI - Client request instrumentation
+Per-endpoint phase timings aggregated into rolling histograms,
+exported as JSON or Prometheus text exposition format.
+"""
+
+import re
+import socket
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+METRICS_WINDOW_SECONDS = 300
+METRICS_MAX_SAMPLES = 2048
+# Histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0)
+
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_label(method: str, path: str) -> str:
+    """'GET /clubs/7/needs' -> 'GET /clubs/:id/needs' to keep label cardinality bounded"""
+    return f"{method} {_NUMERIC_SEGMENT.sub('/:id', path)}"
+
+
+@dataclass
+class RequestSample:
+    endpoint: str
+    status: int
+    total_ms: float
+    ttfb_ms: Optional[float] = None
+    dns_ms: Optional[float] = None
+    connect_ms: Optional[float] = None
+    tls_ms: Optional[float] = None
+    bytes: int = 0
+    cache_hit: bool = False
+    error: Optional[str] = None
+    at: float = field(default_factory=time.time)
+
+
+# ==================== CONNECTION PHASE TIMING (requests/urllib3) ====================
+
+_active = threading.local()
+
+
+def start_phase_timing() -> Dict[str, float]:
+    """Collect phase timings for connections opened by this thread until cleared"""
+    _active.phases = {}
+    return _active.phases
+
+
+def stop_phase_timing():
+    _active.phases = None
+
+
+class _TimedConnectionMixin:
+    """Times DNS, TCP connect and TLS handshake when urllib3 opens a new connection"""
+
+    def _new_conn(self):
+        phases = getattr(_active, "phases", None)
+        if phases is None:
+            return super()._new_conn()
+
+        start = time.perf_counter()
+        dns_host = self._dns_host
+        try:
+            *_, address = socket.getaddrinfo(dns_host, self.port, 0, socket.SOCK_STREAM)[0]
+            self._dns_host = address[0]
+        except OSError:
+            pass  # let urllib3 raise its own NewConnectionError
+        resolved = time.perf_counter()
+        try:
+            sock = super()._new_conn()
+        finally:
+            self._dns_host = dns_host
+        phases["dns_ms"] = (resolved - start) * 1000
+        phases["connect_ms"] = (time.perf_counter() - resolved) * 1000
+        return sock
+
+    def connect(self):
+        phases = getattr(_active, "phases", None)
+        start = time.perf_counter()
+        super().connect()
+        if phases is not None and isinstance(self, HTTPSConnection):
+            handshake = (time.perf_counter() - start) * 1000
+            phases["tls_ms"] = handshake - phases.get("dns_ms", 0) - phases.get("connect_ms", 0)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools record connection phase timings"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+def sample_from_response(endpoint: str, response: requests.Response, started: float,
+                         phases: Dict[str, float]) -> RequestSample:
+    size = len(response.content) if response._content_consumed else int(response.headers.get("Content-Length") or 0)
+    return RequestSample(
+        endpoint=endpoint,
+        status=response.status_code,
+        total_ms=(time.perf_counter() - started) * 1000,
+        ttfb_ms=response.elapsed.total_seconds() * 1000,
+        bytes=size,
+        error=None if response.ok or response.status_code == 304 else f"HTTP {response.status_code}",
+        **phases,
+    )
+
+
+# ==================== CONNECTION PHASE TIMING (httpx) ====================
+
+_TRACE_PHASES = {
+    "connection.connect_tcp": "connect_ms",  # includes DNS resolution
+    "connection.start_tls": "tls_ms",
+}
+
+
+def httpx_trace(phases: Dict[str, float], started: float):
+    """httpx `trace` extension callback filling connect/TLS/TTFB timings into `phases`"""
+    marks: Dict[str, float] = {}
+
+    async def trace(event_name: str, info: Dict[str, Any]):
+        now = time.perf_counter()
+        event, _, stage = event_name.rpartition(".")
+        if stage == "started":
+            marks[event] = now
+        elif stage == "complete":
+            if event in _TRACE_PHASES:
+                phases[_TRACE_PHASES[event]] = (now - marks.get(event, now)) * 1000
+            elif event.endswith("receive_response_headers"):
+                phases["ttfb_ms"] = (now - started) * 1000
+
+    return trace
+
+
+def sample_from_httpx(endpoint: str, response: httpx.Response, started: float,
+                      phases: Dict[str, float]) -> RequestSample:
+    return RequestSample(
+        endpoint=endpoint,
+        status=response.status_code,
+        total_ms=(time.perf_counter() - started) * 1000,
+        bytes=response.num_bytes_downloaded,
+        error=None if response.is_success or response.status_code == 304 else f"HTTP {response.status_code}",
+        **phases,
+    )
+
+
+# ==================== AGGREGATION ====================
+
+class ClientMetrics:
+    """
+    Rolling per-endpoint samples (for percentiles over the last window)
+    plus cumulative Prometheus-style histogram counters.
+    """
+
+    def __init__(self, window_seconds: float = METRICS_WINDOW_SECONDS, max_samples: int = METRICS_MAX_SAMPLES):
+        self.window_seconds = window_seconds
+        self.samples: Dict[str, Deque[RequestSample]] = defaultdict(lambda: deque(maxlen=max_samples))
+        self.bucket_counts: Dict[str, List[int]] = defaultdict(lambda: [0] * len(LATENCY_BUCKETS))
+        self.totals: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"count": 0, "sum_seconds": 0.0, "bytes": 0, "errors": 0, "cache_hits": 0}
+        )
+        self.status_counts: Dict[tuple, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, sample: RequestSample):
+        seconds = sample.total_ms / 1000
+        with self._lock:
+            self.samples[sample.endpoint].append(sample)
+            totals = self.totals[sample.endpoint]
+            totals["count"] += 1
+            totals["sum_seconds"] += seconds
+            totals["bytes"] += sample.bytes
+            totals["errors"] += 1 if sample.error else 0
+            totals["cache_hits"] += 1 if sample.cache_hit else 0
+            self.status_counts[(sample.endpoint, sample.status)] += 1
+            counts = self.bucket_counts[sample.endpoint]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    counts[i] += 1
+
+    def _recent(self, endpoint: str) -> List[RequestSample]:
+        cutoff = time.time() - self.window_seconds
+        return [s for s in self.samples[endpoint] if s.at >= cutoff]
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-friendly per-endpoint view over the rolling window"""
+        def pct(values, p):
+            return round(values[min(len(values) - 1, int(p / 100 * len(values)))], 2) if values else None
+
+        def mean(values):
+            values = [v for v in values if v is not None]
+            return round(sum(values) / len(values), 2) if values else None
+
+        with self._lock:
+            endpoints = {}
+            for endpoint in sorted(self.samples):
+                recent = self._recent(endpoint)
+                if not recent:
+                    continue
+                network = [s for s in recent if not s.cache_hit]
+                totals = sorted(s.total_ms for s in recent)
+                endpoints[endpoint] = {
+                    "requests": len(recent),
+                    "errors": sum(1 for s in recent if s.error),
+                    "cache_hits": len(recent) - len(network),
+                    "p50_ms": pct(totals, 50),
+                    "p90_ms": pct(totals, 90),
+                    "p99_ms": pct(totals, 99),
+                    "dns_ms": mean(s.dns_ms for s in network),
+                    "connect_ms": mean(s.connect_ms for s in network),
+                    "tls_ms": mean(s.tls_ms for s in network),
+                    "ttfb_ms": mean(s.ttfb_ms for s in network),
+                    "bytes": sum(s.bytes for s in recent),
+                    "last_status": recent[-1].status,
+                    "last_error": next((s.error for s in reversed(recent) if s.error), None),
+                }
+            return {"window_seconds": self.window_seconds, "endpoints": endpoints}
+
+    def prometheus(self) -> str:
+        """Cumulative counters in Prometheus text exposition format"""
+        lines = [
+            "# HELP sportify_client_request_duration_seconds Backend request latency seen by the client",
+            "# TYPE sportify_client_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            for endpoint in sorted(self.totals):
+                label = f'endpoint="{endpoint}"'
+                for bound, count in zip(LATENCY_BUCKETS, self.bucket_counts[endpoint]):
+                    lines.append(f'sportify_client_request_duration_seconds_bucket{{{label},le="{bound}"}} {count}')
+                totals = self.totals[endpoint]
+                lines.append(f'sportify_client_request_duration_seconds_bucket{{{label},le="+Inf"}} {totals["count"]}')
+                lines.append(f"sportify_client_request_duration_seconds_sum{{{label}}} {totals['sum_seconds']:.6f}")
+                lines.append(f"sportify_client_request_duration_seconds_count{{{label}}} {totals['count']}")
+
+            lines += ["# HELP sportify_client_requests_total Requests by endpoint and status (0 = no response)",
+                      "# TYPE sportify_client_requests_total counter"]
+            for (endpoint, status), count in sorted(self.status_counts.items()):
+                lines.append(f'sportify_client_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+
+            for name, key, help_text in (
+                ("sportify_client_response_bytes_total", "bytes", "Response body bytes received"),
+                ("sportify_client_errors_total", "errors", "Failed requests"),
+                ("sportify_client_cache_hits_total", "cache_hits", "Requests served from the client cache"),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for endpoint in sorted(self.totals):
+                    lines.append(f'{name}{{endpoint="{endpoint}"}} {int(self.totals[endpoint][key])}')
+        return "\n".join(lines) + "\n"
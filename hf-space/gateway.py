@@ -0,0 +1,253 @@
+"""
+Sportify AI - Shared backend gateway
+One instance per process, shared by every UI session's client (sync and async):
+identical in-flight requests are coalesced into one upstream call (singleflight),
+and upstream calls pass a global concurrency limit and a token-bucket rate limit.
+Requests over the limits wait in a FIFO queue instead of timing out.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional
+
+GATEWAY_MAX_CONCURRENCY = int(os.getenv("GATEWAY_MAX_CONCURRENCY", "8"))
+GATEWAY_RATE_PER_SECOND = float(os.getenv("GATEWAY_RATE_PER_SECOND", "20"))
+GATEWAY_BURST = int(os.getenv("GATEWAY_BURST", "40"))
+GATEWAY_MAX_QUEUE = int(os.getenv("GATEWAY_MAX_QUEUE", "500"))
+QUEUE_WAIT_SAMPLES = 1000
+
+
+class GatewayQueueFull(RuntimeError):
+    """Raised instead of queueing once GATEWAY_MAX_QUEUE requests are already waiting"""
+
+
+class _Waiter:
+    """A queued caller: a thread blocked on an Event, or a coroutine awaiting a future"""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop
+        self.event = None if loop else threading.Event()
+        self.future = loop.create_future() if loop else None
+        self.enqueued = time.perf_counter()
+
+    def wake(self, on_cancelled: Callable[[], None] = None):
+        if self.loop is None:
+            self.event.set()
+            return
+
+        def resolve():
+            if not self.future.done():
+                self.future.set_result(None)
+            elif on_cancelled is not None:
+                on_cancelled()  # the coroutine gave up after being woken; pass its slot on
+
+        self.loop.call_soon_threadsafe(resolve)
+
+
+class _Call:
+    """One upstream call that later identical requests attach to"""
+
+    def __init__(self):
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers: List[_Waiter] = []
+
+
+class Gateway:
+    def __init__(self, max_concurrency: int = GATEWAY_MAX_CONCURRENCY, rate: float = GATEWAY_RATE_PER_SECOND,
+                 burst: int = GATEWAY_BURST, max_queue: int = GATEWAY_MAX_QUEUE):
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = burst
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, _Call] = {}
+        self._active = 0
+        self._queue: Deque[_Waiter] = deque()
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._queue_waits: Deque[float] = deque(maxlen=QUEUE_WAIT_SAMPLES)
+        self.counters = {"requests": 0, "upstream": 0, "coalesced": 0, "queued": 0, "rejected": 0,
+                         "rate_limited": 0, "max_queue_depth": 0}
+
+    # ==================== SINGLEFLIGHT ====================
+
+    def _join(self, key: Hashable, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """(call, waiter): waiter is None when this caller leads the upstream request"""
+        with self._lock:
+            self.counters["requests"] += 1
+            call = self._inflight.get(key)
+            if call is None:
+                call = self._inflight[key] = _Call()
+                self.counters["upstream"] += 1
+                return call, None
+            waiter = _Waiter(loop)
+            call.followers.append(waiter)
+            self.counters["coalesced"] += 1
+            return call, waiter
+
+    def _finish(self, key: Hashable, call: _Call):
+        with self._lock:
+            del self._inflight[key]
+        for waiter in call.followers:
+            waiter.wake()
+
+    @staticmethod
+    def _outcome(call: _Call) -> Any:
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def coalesce(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """Run fetch() once for all concurrent callers with the same key"""
+        call, waiter = self._join(key)
+        if waiter is not None:
+            waiter.event.wait()
+            return self._outcome(call)
+        try:
+            call.result = fetch()
+        except BaseException as e:
+            call.error = e
+        self._finish(key, call)
+        return self._outcome(call)
+
+    async def coalesce_async(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        call, waiter = self._join(key, asyncio.get_running_loop())
+        if waiter is not None:
+            await asyncio.shield(waiter.future)
+            return self._outcome(call)
+
+        # The upstream call runs as its own task so a leader that goes away
+        # (session closed, handler cancelled) doesn't cancel it for the followers
+        def finished(task: asyncio.Task):
+            if task.cancelled():
+                call.error = asyncio.CancelledError()
+            else:
+                call.error = task.exception()
+                call.result = None if call.error else task.result()
+            self._finish(key, call)
+
+        task = asyncio.ensure_future(fetch())
+        task.add_done_callback(finished)
+        return await asyncio.shield(task)
+
+    # ==================== CONCURRENCY + RATE LIMIT ====================
+
+    def _enter(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> Optional[_Waiter]:
+        """Take a slot now (None) or join the queue (the waiter to block on)"""
+        with self._lock:
+            if self._active < self.max_concurrency and not self._queue:
+                self._active += 1
+                return None
+            if len(self._queue) >= self.max_queue:
+                self.counters["rejected"] += 1
+                raise GatewayQueueFull(f"{len(self._queue)} backend requests already queued")
+            waiter = _Waiter(loop)
+            self._queue.append(waiter)
+            self.counters["queued"] += 1
+            self.counters["max_queue_depth"] = max(self.counters["max_queue_depth"], len(self._queue))
+            return waiter
+
+    def _release(self):
+        """Hand the slot straight to the oldest waiter, or free it"""
+        with self._lock:
+            if not self._queue:
+                self._active -= 1
+                return
+            waiter = self._queue.popleft()
+            self._queue_waits.append((time.perf_counter() - waiter.enqueued) * 1000)
+        waiter.wake(on_cancelled=self._release)
+
+    def _rate_delay(self) -> float:
+        """Reserve one token; seconds to wait before it is ours"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+            self._refilled = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            self.counters["rate_limited"] += 1
+            return -self._tokens / self.rate
+
+    @contextmanager
+    def slot(self):
+        """Hold one upstream slot for the duration of a backend call"""
+        waiter = self._enter()
+        if waiter is not None:
+            waiter.event.wait()
+        try:
+            delay = self._rate_delay()
+            if delay:
+                time.sleep(delay)
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def slot_async(self):
+        waiter = self._enter(asyncio.get_running_loop())
+        if waiter is not None:
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                with self._lock:
+                    queued = waiter in self._queue
+                    if queued:
+                        self._queue.remove(waiter)
+                if not queued and waiter.future.done() and not waiter.future.cancelled():
+                    # Woken with the slot, then cancelled before resuming: it is ours to give back
+                    self._release()
+                # Woken but the future was cancelled first: wake() passes the slot on
+                raise
+        try:
+            delay = self._rate_delay()
+            if delay:
+                await asyncio.sleep(delay)
+            yield
+        finally:
+            self._release()
+
+    # ==================== METRICS ====================
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.counters)
+            waits = sorted(self._queue_waits)
+            depth = len(self._queue)
+            active = self._active
+
+        def pct(p):
+            return round(waits[min(len(waits) - 1, int(len(waits) * p))], 2) if waits else None
+
+        return {
+            **counters,
+            "coalescing_ratio": round(counters["coalesced"] / counters["requests"], 4) if counters["requests"] else 0.0,
+            "queue_depth": depth,
+            "active": active,
+            "max_concurrency": self.max_concurrency,
+            "rate_per_second": self.rate,
+            "queue_wait_p50_ms": pct(0.5),
+            "queue_wait_p99_ms": pct(0.99),
+        }
+
+    def prometheus(self) -> str:
+        stats = self.stats()
+        lines = []
+        for name, key, kind, help_text in (
+            ("sportify_gateway_requests_total", "requests", "counter", "Requests entering the gateway's coalescer"),
+            ("sportify_gateway_upstream_total", "upstream", "counter", "Requests actually sent to the backend"),
+            ("sportify_gateway_coalesced_total", "coalesced", "counter", "Requests served by another caller's in-flight call"),
+            ("sportify_gateway_queued_total", "queued", "counter", "Requests that waited for a concurrency slot"),
+            ("sportify_gateway_rejected_total", "rejected", "counter", "Requests refused because the queue was full"),
+            ("sportify_gateway_rate_limited_total", "rate_limited", "counter", "Requests delayed by the token bucket"),
+            ("sportify_gateway_queue_depth", "queue_depth", "gauge", "Requests waiting for a concurrency slot"),
+            ("sportify_gateway_active", "active", "gauge", "Backend calls in flight"),
+            ("sportify_gateway_coalescing_ratio", "coalescing_ratio", "gauge", "Coalesced share of gateway requests"),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {stats[key]}"]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Sportify AI - Load generator
+Replays realistic UI sessions through SportifyClient and reports
+throughput, latency percentiles and error rates per endpoint.
+
+Usage:
+    python loadtest.py --mock --users 20 --duration 30 --latency-ms 40 --error-rate 0.02
+    python loadtest.py --url http://localhost:3000/api --users 10 --duration 60
+"""
+
+import argparse
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from mock_server import SEED_NEEDS, MockConfig, start_mock_server
+from response_cache import ResponseCache
+from sportify_client import API_BASE_URL, SportifyClient
+
+POSITIONS = ["ST", "CM", "CDM", "CB", "LW", "RW"]
+
+
+class LoadStats:
+    """Thread-safe latency and error samples, keyed by endpoint"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float, ok: bool):
+        with self._lock:
+            self.latencies[endpoint].append(seconds * 1000)
+            if not ok:
+                self.errors[endpoint] += 1
+
+    def timed(self, endpoint: str, call: Callable):
+        start = time.perf_counter()
+        try:
+            result = call()
+        except Exception:
+            self.record(endpoint, time.perf_counter() - start, ok=False)
+            return None
+        self.record(endpoint, time.perf_counter() - start, ok=True)
+        return result
+
+    def report(self, elapsed: float) -> str:
+        def pct(samples, p):
+            return samples[min(len(samples) - 1, int(p / 100 * len(samples)))]
+
+        lines = [f"{'endpoint':<24}{'requests':>9}{'rps':>8}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'errors':>9}"]
+        total = errors = 0
+        for endpoint in sorted(self.latencies):
+            samples = sorted(self.latencies[endpoint])
+            total += len(samples)
+            errors += self.errors[endpoint]
+            lines.append(
+                f"{endpoint:<24}{len(samples):>9}{len(samples) / elapsed:>8.1f}"
+                f"{pct(samples, 50):>9.1f}{pct(samples, 90):>9.1f}{pct(samples, 99):>9.1f}"
+                f"{self.errors[endpoint] / len(samples):>8.1%} "
+            )
+        lines.append(f"\nTotal: {total} requests in {elapsed:.1f}s = {total / elapsed:.1f} req/s, "
+                     f"error rate {errors / max(total, 1):.2%}")
+        return "\n".join(lines)
+
+
+def run_session(client: SportifyClient, stats: LoadStats, think_time: float, rng: random.Random):
+    """One visitor: check the API, browse clubs, page through players, read news, ask for a shortlist"""
+    def think():
+        if think_time:
+            time.sleep(rng.expovariate(1 / think_time))
+
+    stats.timed("GET /health", client.fetch_health)
+    think()
+    stats.timed("GET /clubs", client.fetch_clubs)
+    think()
+
+    params = {"position": rng.choice(POSITIONS), "min_age": rng.randint(18, 24), "max_age": rng.randint(28, 36)}
+    pages = client.iter_player_pages(params, page_size=50, max_rows=50 * rng.randint(1, 3))
+    while stats.timed("GET /players (page)", lambda: next(pages, None)):
+        pass
+    think()
+
+    stats.timed("GET /news", lambda: client.fetch_news(limit=10))
+    think()
+
+    payload = {"club_id": rng.choice(SEED_NEEDS)["club_id"], "limit": rng.randint(5, 10)}
+    stats.timed("POST /recommendations", lambda: client.post_recommendations(payload))
+
+
+def run_load(base_url: str, users: int, duration: float, think_time: float = 0.0,
+             cache: bool = False, seed: int = 0) -> LoadStats:
+    """Run `users` concurrent session loops for `duration` seconds"""
+    stats = LoadStats()
+    deadline = time.monotonic() + duration
+    no_cache = ResponseCache(ttls={path: 0 for path in ResponseCache().ttls})
+
+    def user_loop(user_id: int):
+        rng = random.Random(seed + user_id)
+        client = SportifyClient(base_url, cache=None if cache else no_cache)
+        try:
+            while time.monotonic() < deadline:
+                run_session(client, stats, think_time, rng)
+        finally:
+            client.close()
+
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        list(pool.map(user_loop, range(users)))
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay Sportify AI user sessions under load")
+    parser.add_argument("--url", default=API_BASE_URL, help="backend API base URL")
+    parser.add_argument("--mock", action="store_true", help="start an in-process mock backend instead")
+    parser.add_argument("--users", type=int, default=10, help="concurrent sessions")
+    parser.add_argument("--duration", type=float, default=20, help="seconds to run")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean pause between steps, seconds")
+    parser.add_argument("--cache", action="store_true", help="enable the client response cache")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="mock: mean latency")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="mock: latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="mock: injected 503 rate")
+    parser.add_argument("--players", type=int, default=5000, help="mock: player count")
+    args = parser.parse_args()
+
+    base_url = args.url
+    if args.mock:
+        server = start_mock_server(config=MockConfig(args.latency_ms, args.jitter_ms, args.error_rate),
+                                   num_players=args.players)
+        base_url = f"http://127.0.0.1:{server.server_port}/api"
+
+    print(f"🔥 {args.users} users × {args.duration:.0f}s against {base_url}")
+    start = time.monotonic()
+    stats = run_load(base_url, args.users, args.duration, args.think_time, args.cache)
+    print(stats.report(time.monotonic() - start))
+
+
+if __name__ == "__main__":
+    main()
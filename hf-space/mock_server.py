@@ -0,0 +1,689 @@
+#!/usr/bin/env python3
+"""
+Sportify AI - Offline stand-in backend
+Serves /health, /clubs, /players, /news (+ /news/stream), /recommendations, /feedback, /analytics and /export without Node/Postgres.
+
+Usage:
+    python mock_server.py --port 3000 --latency-ms 40 --jitter-ms 20 --error-rate 0.02 --players 10000
+    python mock_server.py --news-every 10   # publish a new article every 10s to /news/stream
+    API_URL=http://localhost:3000/api python app_gradio.py
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:  # /export then serves format=ndjson only
+    pa = None
+
+from scoring import CandidateSet
+
+# ==================== SEED DATA (mirrors backend/scripts/seedData.js) ====================
+
+SEED_CLUBS = [
+    {"external_id": "man_city_1", "name": "Manchester City FC", "country": "England",
+     "league": "Premier League", "founded_year": 1880, "stadium_name": "Etihad Stadium"},
+    {"external_id": "liverpool_1", "name": "Liverpool FC", "country": "England",
+     "league": "Premier League", "founded_year": 1892, "stadium_name": "Anfield"},
+    {"external_id": "real_madrid_1", "name": "Real Madrid CF", "country": "Spain",
+     "league": "La Liga", "founded_year": 1902, "stadium_name": "Santiago Bernabéu"},
+    {"external_id": "barca_1", "name": "FC Barcelona", "country": "Spain",
+     "league": "La Liga", "founded_year": 1899, "stadium_name": "Camp Nou"},
+    {"external_id": "juventus_1", "name": "Juventus FC", "country": "Italy",
+     "league": "Serie A", "founded_year": 1897, "stadium_name": "Allianz Stadium"},
+    {"external_id": "psg_1", "name": "Paris Saint-Germain", "country": "France",
+     "league": "Ligue 1", "founded_year": 1970, "stadium_name": "Parc des Princes"},
+]
+
+SEED_PLAYERS = [
+    {"external_id": "haaland_ek_1", "first_name": "Erling", "last_name": "Haaland",
+     "full_name": "Erling Haaland", "date_of_birth": "2000-07-21", "nationality": "Norway",
+     "primary_position": "ST", "secondary_positions": ["CF"], "preferred_foot": "left",
+     "height_cm": 194, "weight_kg": 88, "market_value_eur": 150000000,
+     "contract_end_date": "2027-06-30", "contract_status": "active", "current_club_id": 1},
+    {"external_id": "salah_mo_1", "first_name": "Mohamed", "last_name": "Salah",
+     "full_name": "Mohamed Salah", "date_of_birth": "1992-06-15", "nationality": "Egypt",
+     "primary_position": "RW", "secondary_positions": ["ST", "CAM"], "preferred_foot": "left",
+     "height_cm": 175, "weight_kg": 78, "market_value_eur": 90000000,
+     "contract_end_date": "2026-06-30", "contract_status": "active", "current_club_id": 2},
+    {"external_id": "rodri_1", "first_name": "Rodri", "last_name": "Hernández",
+     "full_name": "Rodri Hernández Cascante", "date_of_birth": "1996-06-22", "nationality": "Spain",
+     "primary_position": "CDM", "secondary_positions": ["CM"], "preferred_foot": "right",
+     "height_cm": 190, "weight_kg": 82, "market_value_eur": 100000000,
+     "contract_end_date": "2027-06-30", "contract_status": "active", "current_club_id": 1},
+    {"external_id": "vinicius_1", "first_name": "Vinícius", "last_name": "Júnior",
+     "full_name": "Vinícius José Paixão de Oliveira Júnior", "date_of_birth": "2000-07-12",
+     "nationality": "Brazil", "primary_position": "LW", "secondary_positions": ["ST"],
+     "preferred_foot": "left", "height_cm": 180, "weight_kg": 76, "market_value_eur": 110000000,
+     "contract_end_date": "2027-06-30", "contract_status": "active", "current_club_id": 3},
+    {"external_id": "bellingham_1", "first_name": "Jude", "last_name": "Bellingham",
+     "full_name": "Jude Victor William Bellingham", "date_of_birth": "2003-06-17",
+     "nationality": "England", "primary_position": "CM", "secondary_positions": ["CAM", "CDM"],
+     "preferred_foot": "left", "height_cm": 186, "weight_kg": 86, "market_value_eur": 120000000,
+     "contract_end_date": "2029-06-30", "contract_status": "active", "current_club_id": 3},
+    {"external_id": "mbappe_1", "first_name": "Kylian", "last_name": "Mbappé",
+     "full_name": "Kylian Mbappé Lottin", "date_of_birth": "1998-12-20", "nationality": "France",
+     "primary_position": "ST", "secondary_positions": ["LW", "RW"], "preferred_foot": "right",
+     "height_cm": 178, "weight_kg": 73, "market_value_eur": 180000000,
+     "contract_end_date": "2026-06-30", "contract_status": "active", "current_club_id": 3},
+]
+
+SEED_NEEDS = [
+    {"club_id": 2, "positions_required": ["CM", "CDM"], "age_min": 23, "age_max": 32,
+     "budget_max_eur": 80000000, "tactical_style": "pressing", "urgency_level": "high"},
+    {"club_id": 4, "positions_required": ["ST", "RW"], "age_min": 24, "age_max": 35,
+     "budget_max_eur": 60000000, "tactical_style": "possession", "urgency_level": "medium"},
+    {"club_id": 5, "positions_required": ["CDM"], "age_min": 25, "age_max": 33,
+     "budget_max_eur": 50000000, "tactical_style": "defensive", "urgency_level": "low"},
+]
+
+# Same headlines as NewsIngestionService._getMockArticles
+SEED_NEWS = [
+    ("Haaland ruled out for 3 weeks due to hamstring injury", "injury", 0.9, [1],
+     "Manchester City confirmed that Erling Haaland will miss the next 3 weeks with a hamstring injury "
+     "sustained in training. The Norwegian striker is expected to return after the international break."),
+    ("Chelsea close to signing Brighton defender", "transfer_rumor", 0.65, [],
+     "Chelsea has agreed a deal with Brighton & Hove Albion to sign defender Moisés Caicedo. The transfer "
+     "fee is reported at €80 million with contract terms agreed. Medical tests scheduled for this week."),
+    ("Liverpool extend Salah contract through 2026", "contract_extension", 0.95, [2],
+     "Liverpool FC has confirmed Mohamed Salah has signed a new contract extension through June 2026. "
+     "The Egyptian winger expressed his commitment to the club with improved wages."),
+]
+
+SOURCES = ["ESPN", "Sky Sports", "Goal.com"]
+POSITIONS = ["ST", "CF", "LW", "RW", "CAM", "CM", "CDM", "CB", "LB", "RB", "GK"]
+AGE_BANDS = ["U21", "21-24", "25-28", "29-32", "33+", "unknown"]
+MAX_PAGE_SIZE = 200
+EXPORT_CHUNK_ROWS = 10000
+NEWS_FEED_PAGE_SIZE = 100
+NEWS_FEED_HEARTBEAT_SECONDS = 15
+
+
+def _age(date_of_birth: str) -> int:
+    born = date.fromisoformat(date_of_birth)
+    today = date.today()
+    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+
+
+def _export_value(value: Any) -> Any:
+    """Arrays export as comma-separated text, as in the backend's column catalog"""
+    return ",".join(value) if isinstance(value, list) else value
+
+
+def _age_band(age: Optional[int]) -> str:
+    """Same bands as analytics_age_band() in schema.sql"""
+    if age is None:
+        return "unknown"
+    for band, top in (("U21", 20), ("21-24", 24), ("25-28", 28), ("29-32", 32)):
+        if age <= top:
+            return band
+    return "33+"
+
+
+def _news_article(i: int, published_at: datetime) -> Dict[str, Any]:
+    title, event_type, confidence, affected, content = SEED_NEWS[(i - 1) % len(SEED_NEWS)]
+    return {
+        "id": i, "external_id": f"mock-{i}", "title": title, "content": content,
+        "original_language": "en", "source_name": SOURCES[(i - 1) % len(SOURCES)],
+        "published_at": published_at.isoformat(),
+        "extractions": [{"event_type": event_type, "confidence": confidence}],
+        "affected_players": affected,
+        "feed_seq": str(i),  # BIGINT arrives as a string from pg
+    }
+
+
+def build_dataset(num_players: int = len(SEED_PLAYERS), num_news: int = len(SEED_NEWS),
+                  seed: int = 7) -> Dict[str, List[Dict[str, Any]]]:
+    """Seed rows plus deterministic synthetic padding up to the requested sizes"""
+    rng = random.Random(seed)
+    signals = random.Random(seed + 1)  # separate stream so the player rows stay as they were
+    now = datetime.now(timezone.utc)
+    stamp = now.replace(tzinfo=None).isoformat(timespec="microseconds")  # backend's last_updated format
+
+    clubs = [{"id": i, **club, "is_active": True} for i, club in enumerate(SEED_CLUBS, 1)]
+    needs = [{"id": i, **need, "is_active": True} for i, need in enumerate(SEED_NEEDS, 1)]
+
+    players = [{"id": i, **p, "age": _age(p["date_of_birth"]), "is_available": True,
+                "form_score": round(rng.uniform(0.6, 0.95), 3), "last_updated": stamp}
+               for i, p in enumerate(SEED_PLAYERS, 1)]
+    for i in range(len(players) + 1, num_players + 1):
+        primary = rng.choice(POSITIONS)
+        players.append({
+            "id": i, "external_id": f"synthetic_{i}", "first_name": "Player", "last_name": str(i),
+            "full_name": f"Player {i}", "age": rng.randint(17, 37), "nationality": "Unknown",
+            "primary_position": primary,
+            "secondary_positions": rng.sample([p for p in POSITIONS if p != primary], rng.randint(0, 2)),
+            "preferred_foot": rng.choices(["left", "right", "both"], [3, 6, 1])[0],
+            "height_cm": rng.randint(165, 200), "weight_kg": rng.randint(60, 95),
+            "market_value_eur": rng.randint(1, 150) * 1_000_000, "contract_status": "active",
+            "current_club_id": rng.randint(1, len(clubs)), "is_available": rng.random() > 0.1,
+            "form_score": round(rng.random(), 3), "last_updated": stamp,
+        })
+
+    # player_signal_rollups columns, as the export joins them
+    for p in players:
+        injured = signals.random() < 0.1
+        p.update({"availability_penalty": round(signals.uniform(0.3, 0.9), 3) if injured else 0.0,
+                  "active_risk_count": signals.choice([0, 0, 0, 1, 2]), "avg_risk": round(signals.random(), 3),
+                  "news_confidence": round(signals.uniform(0.4, 0.95), 3) if signals.random() < 0.6 else None})
+
+    # Newest first, as GET /news orders them
+    news = [_news_article(i, now - timedelta(minutes=15 * (num_news - i + 1))) for i in range(num_news, 0, -1)]
+
+    return {"clubs": clubs, "needs": needs, "players": players, "news": news}
+
+
+@dataclass
+class MockConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    payload_padding: int = 0  # extra bytes of filler per player row
+
+
+class MockBackend:
+    """Request routing over an in-memory dataset"""
+
+    def __init__(self, dataset: Dict[str, List[Dict[str, Any]]], config: MockConfig):
+        self.data = dataset
+        self.config = config
+        self.started = time.time()
+        self.candidates = CandidateSet.from_records(dataset["players"])
+        self.profiles = self._profile_matrix(dataset["players"])
+        self.counters = {"requests": 0, "injected_errors": 0}
+        self.activity: Counter = Counter()  # (metric, dimension, day) -> count, bumped on writes
+        self.feedback: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.news_changed = threading.Condition()
+
+    # ==================== NEWS FEED ====================
+
+    def news_head(self) -> str:
+        with self.news_changed:
+            return max((a["feed_seq"] for a in self.data["news"]), key=int, default="0")
+
+    def news_since(self, since: str, limit: int) -> List[Dict[str, Any]]:
+        """Articles past the cursor, oldest change first, like NewsModel.getFeed"""
+        with self.news_changed:
+            rows = [a for a in self.data["news"] if int(a["feed_seq"]) > int(since)]
+        return sorted(rows, key=lambda a: int(a["feed_seq"]))[:limit]
+
+    def publish_news(self, count: int = 1) -> List[Dict[str, Any]]:
+        """Store new articles and wake /news/stream subscribers, as the ingest triggers do"""
+        with self.news_changed:
+            start = max((a["id"] for a in self.data["news"]), default=0) + 1
+            head = int(self.news_head())
+            articles = []
+            for i in range(start, start + count):
+                article = _news_article(i, datetime.now(timezone.utc))
+                head += 1
+                article["feed_seq"] = str(head)
+                articles.append(article)
+            self.data["news"][:0] = reversed(articles)
+            self.news_changed.notify_all()
+        return articles
+
+    # ==================== ANALYTICS ====================
+
+    def record_activity(self, metric: str, dimension: str, count: int = 1):
+        """Per-day event counts, as the backend's analytics triggers keep them"""
+        with self._lock:
+            self.activity[(metric, dimension, datetime.now(timezone.utc).date().isoformat())] += count
+
+    def add_feedback(self, rows: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """POST /feedback(/batch): all rows are stored or none (None when one lacks club_id/player_id)"""
+        if any(not row.get("club_id") or not row.get("player_id") for row in rows):
+            return None
+        created = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            stored = [{"id": len(self.feedback) + i + 1, "club_id": row["club_id"], "player_id": row["player_id"],
+                       "recommendation_id": row.get("recommendation_id"), "feedback_type": row.get("feedback_type"),
+                       "rating": row.get("rating"), "comment": row.get("comment"), "created_at": created}
+                      for i, row in enumerate(rows)]
+            self.feedback.extend(stored)
+        for row in stored:
+            self.record_activity("feedback", row["feedback_type"] or "")
+        return stored
+
+    def analytics(self, days: int) -> Dict[str, Any]:
+        """GET /analytics; players and news are tallied from the dataset, writes from activity"""
+        days = min(max(days, 1), 90)
+        current = datetime.now(timezone.utc).date()
+        since, today = (current - timedelta(days=days - 1)).isoformat(), current.isoformat()
+        cells: Dict[tuple, Dict[str, Any]] = {}
+        for p in self.data["players"]:
+            key = (p.get("primary_position") or "unknown", _age_band(p.get("age")))
+            cell = cells.setdefault(key, {"position": key[0], "age_band": key[1], "players": 0, "available": 0})
+            cell["players"] += 1
+            cell["available"] += bool(p.get("is_available"))
+        by_position: Dict[str, Dict[str, Any]] = {}
+        by_band = {band: {"age_band": band, "players": 0, "available": 0} for band in AGE_BANDS}
+        for cell in cells.values():
+            for group in (by_position.setdefault(cell["position"], {"position": cell["position"], "players": 0,
+                                                                   "available": 0}), by_band[cell["age_band"]]):
+                group["players"] += cell["players"]
+                group["available"] += cell["available"]
+
+        with self.news_changed:
+            news = Counter((a["source_name"], a["published_at"][:10]) for a in self.data["news"]
+                           if a["published_at"][:10] >= since)
+        with self._lock:
+            activity = {key: count for key, count in self.activity.items() if key[2] >= since}
+            generated = sum(n for (m, _, _), n in self.activity.items() if m == "recommendations")
+            feedback = sum(n for (m, _, _), n in self.activity.items() if m == "feedback")
+
+        def per_day(metric):
+            return sorted((day, dim, n) for (m, dim, day), n in activity.items() if m == metric)
+
+        return {
+            "days": days,
+            "totals": {
+                "players": len(self.data["players"]),
+                "players_available": sum(cell["available"] for cell in cells.values()),
+                "clubs": len(self.data["clubs"]),
+                "news_articles": len(self.data["news"]),
+                "recommendations_active": generated,
+                "recommendations_generated": generated,
+                "feedback": feedback,
+            },
+            "today": {
+                "news": sum(n for (_, day), n in news.items() if day == today),
+                "recommendations": sum(n for (m, _, day), n in activity.items() if m == "recommendations" and day == today),
+                "feedback": sum(n for (m, _, day), n in activity.items() if m == "feedback" and day == today),
+            },
+            "players_by_position": sorted(by_position.values(), key=lambda g: -g["players"]),
+            "players_by_age_band": [g for g in by_band.values() if g["age_band"] != "unknown" or g["players"]],
+            "players_by_position_age": sorted(cells.values(), key=lambda c: (c["position"], c["age_band"])),
+            "news_per_source_per_day": [{"day": day, "source": source, "articles": n}
+                                        for (source, day), n in sorted(news.items(), key=lambda kv: (kv[0][1], kv[0][0]))],
+            "recommendations_per_day": [{"day": day, "count": n} for day, _, n in per_day("recommendations")],
+            "feedback_per_day": [{"day": day, "feedback_type": dim, "count": n} for day, dim, n in per_day("feedback")],
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def players_page(self, query: Dict[str, str]) -> Dict[str, Any]:
+        limit = min(int(query.get("limit", 50)), MAX_PAGE_SIZE)
+        cursor = int(query.get("cursor", 0))
+        position = query.get("position")
+        age_min = int(query.get("age_min") or query.get("min_age") or 0)
+        age_max = int(query.get("age_max") or query.get("max_age") or 200)
+        search = (query.get("search") or "").lower()
+
+        page = []
+        for p in self.data["players"]:
+            if p["id"] <= cursor or not p["is_available"]:
+                continue
+            if position and position != p["primary_position"] and position not in p["secondary_positions"]:
+                continue
+            if not age_min <= p["age"] <= age_max or search not in p["full_name"].lower():
+                continue
+            page.append({**p, "notes": "x" * self.config.payload_padding} if self.config.payload_padding else p)
+            if len(page) == limit:
+                break
+        return {"status": "success", "data": page, "count": len(page),
+                "next_cursor": page[-1]["id"] if len(page) == limit else None}
+
+    def recommend(self, club_need: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+        ranked = self.candidates.top_k(club_need, limit)
+        self.record_activity("recommendations", "", len(ranked))
+        return [
+            {**{k: v for k, v in row.items() if k != "notes"},
+             "performance_score": row.get("form_score", 0.5), "availability_score": 1.0,
+             "risk_penalty": 0.0, "news_confidence": 0.5,
+             "explanation": {"top_reasons": [f"Position match: {row['primary_position']}",
+                                             f"Age fit: {row['age']}"]}}
+            for row in json.loads(ranked.to_json(orient="records"))
+        ]
+
+    @staticmethod
+    def _profile_matrix(players: List[Dict[str, Any]]) -> np.ndarray:
+        """Standardized subset of the backend's player vector (utils/playerVectors.js)"""
+        columns = np.array([
+            [p["primary_position"] == "GK", p["age"], p.get("height_cm") or 0, p.get("weight_kg") or 0,
+             np.log10(p.get("market_value_eur") or 1), p.get("form_score") or 0.5,
+             POSITIONS.index(p["primary_position"]) if p["primary_position"] in POSITIONS else -1]
+            for p in players
+        ], dtype=float)
+        std = columns.std(axis=0)
+        return (columns - columns.mean(axis=0)) / np.where(std == 0, 1, std)
+
+    def similar(self, player_id: int, query: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Exact nearest neighbours; the mock doesn't need the backend's ANN index"""
+        players = self.data["players"]
+        if not 1 <= player_id <= len(players):
+            return None
+        started = time.perf_counter()
+        source = players[player_id - 1]
+        k = min(int(query.get("k", 10)), 100)
+        position = query.get("position")
+        max_value = float(query.get("max_market_value_eur") or "inf")
+        if query.get("cheaper") == "true":
+            max_value = min(max_value, source["market_value_eur"] - 1)
+
+        distances = np.sqrt(((self.profiles - self.profiles[player_id - 1]) ** 2).sum(axis=1))
+        results = []
+        for i in np.argsort(distances):
+            p = players[i]
+            if p["id"] == player_id or not p["is_available"] or p["market_value_eur"] > max_value:
+                continue
+            if position and position != p["primary_position"] and position not in p["secondary_positions"]:
+                continue
+            if query.get("exclude_same_club") == "true" and p["current_club_id"] == source["current_club_id"]:
+                continue
+            results.append({**p, "distance": round(float(distances[i]), 4),
+                            "similarity": round(1 / (1 + float(distances[i])), 4),
+                            "value_difference_eur": p["market_value_eur"] - source["market_value_eur"]})
+            if len(results) == k:
+                break
+        return {"status": "success", "data": results, "count": len(results), "source": source,
+                "backend": "mock", "took_ms": round((time.perf_counter() - started) * 1000, 3)}
+
+    def export_chunks(self, table: str, query: Dict[str, str]) -> Optional[List[Dict[str, List[Any]]]]:
+        """Column-major chunks of `table`, projected and filtered like /api/export; None if a column is unknown"""
+        rows = self.data[table]
+        if table == "players":
+            position = query.get("position")
+            age_min = int(query.get("age_min") or 0)
+            age_max = int(query.get("age_max") or 200)
+            max_value = float(query.get("max_market_value_eur") or "inf")
+            rows = [p for p in rows
+                    if (not position or position == p["primary_position"] or position in p["secondary_positions"])
+                    and age_min <= p["age"] <= age_max and p["market_value_eur"] <= max_value
+                    and ("club_id" not in query or str(p["current_club_id"]) == query["club_id"])
+                    and ("is_available" not in query or str(p["is_available"]).lower() == query["is_available"])
+                    and p["last_updated"] >= query.get("updated_since", "")]
+            limit = int(query.get("limit") or 0)
+            if limit:
+                rows = rows[:max(limit, 1)]
+        elif query.get("league"):
+            rows = [c for c in rows if c["league"] == query["league"]]
+
+        known = list(self.data[table][0])
+        columns = list(dict.fromkeys(["id", *query["columns"].split(",")])) if query.get("columns") else known
+        if any(c not in known for c in columns):
+            return None
+        return [{c: [_export_value(r.get(c)) for r in rows[i:i + EXPORT_CHUNK_ROWS]] for c in columns}
+                for i in range(0, max(len(rows), 1), EXPORT_CHUNK_ROWS)]
+
+    def need_for(self, club_id: int) -> Optional[Dict[str, Any]]:
+        return next((n for n in self.data["needs"] if n["club_id"] == club_id), None)
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            self.counters["requests"] += 1
+            if random.random() < self.config.error_rate:
+                self.counters["injected_errors"] += 1
+                return True
+        return False
+
+    def delay(self):
+        latency = self.config.latency_ms + random.uniform(-1, 1) * self.config.jitter_ms
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+
+def make_handler(backend: MockBackend):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: Any):
+            payload = json.dumps(body, default=str).encode()
+            etag = f'W/"{hashlib.md5(payload).hexdigest()}"'
+            if status == 200 and self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            if status == 200:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _prelude(self) -> bool:
+            backend.delay()
+            if backend.should_fail():
+                self._send(503, {"status": "error", "message": "Injected failure"})
+                return False
+            return True
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            parts = [p for p in url.path.split("/") if p and p != "api"]
+            if not self._prelude():
+                return
+
+            if parts == ["health"]:
+                return self._send(200, {"status": "healthy", "timestamp": datetime.now(timezone.utc).isoformat(),
+                                        "uptime": time.time() - backend.started,
+                                        "service": "Sportify AI Mock Backend", **backend.counters})
+            if parts == ["clubs"]:
+                return self._send(200, {"status": "success", "data": backend.data["clubs"],
+                                        "count": len(backend.data["clubs"])})
+            if len(parts) == 3 and parts[0] == "clubs" and parts[2] == "needs":
+                needs = [n for n in backend.data["needs"] if str(n["club_id"]) == parts[1]]
+                return self._send(200, {"status": "success", "data": needs})
+            if parts in (["players"], ["players", "search"]):
+                return self._send(200, backend.players_page(query))
+            if len(parts) == 3 and parts[0] == "players" and parts[2] == "similar" and parts[1].isdigit():
+                similar = backend.similar(int(parts[1]), query)
+                if similar is None:
+                    return self._send(404, {"status": "error", "message": "Player not found"})
+                return self._send(200, similar)
+            if len(parts) == 2 and parts[0] == "export" and parts[1] in ("players", "clubs"):
+                return self._send_export(parts[1], query)
+            if parts == ["news"]:
+                limit = min(int(query.get("limit", 50)), MAX_PAGE_SIZE)
+                if "since" in query:
+                    articles = backend.news_since(query["since"], limit)
+                    cursor = articles[-1]["feed_seq"] if articles else query["since"]
+                else:
+                    cursor = backend.news_head()
+                    articles = backend.data["news"][:limit]
+                return self._send(200, {"status": "success", "data": articles, "count": len(articles),
+                                        "cursor": cursor, "has_more": "since" in query and len(articles) == limit})
+            if parts == ["news", "stream"]:
+                return self._stream_news(self.headers.get("Last-Event-ID") or query.get("since"))
+            if parts == ["analytics"]:
+                return self._send(200, {"status": "success", "data": backend.analytics(int(query.get("days") or 14)),
+                                        "timestamp": datetime.now(timezone.utc).isoformat()})
+            self._send(404, {"status": "error", "message": "Route not found", "path": self.path})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            parts = [p for p in urlparse(self.path).path.split("/") if p and p != "api"]
+            if not self._prelude():
+                return
+
+            if parts == ["recommendations"]:
+                need = backend.need_for(int(body.get("club_id") or 0))
+                if need is None:
+                    return self._send(404, {"status": "error", "message": "Club needs profile not found"})
+                recs = backend.recommend(need, int(body.get("limit", 20)))
+                return self._send(200, {"status": "success", "data": recs, "count": len(recs),
+                                        "timestamp": datetime.now(timezone.utc).isoformat()})
+            if parts == ["recommendations", "batch"]:
+                return self._stream_batch(body)
+            if parts == ["recommendations", "stream"]:
+                need = backend.need_for(int(body.get("club_id") or 0))
+                if need is None:
+                    return self._send(404, {"status": "error", "message": "Club needs profile not found"})
+                return self._stream_shortlist(backend.recommend(need, int(body.get("limit", 20))))
+            if parts == ["feedback"]:
+                stored = backend.add_feedback([body])
+                if stored is None:
+                    return self._send(400, {"status": "error", "message": "club_id and player_id are required"})
+                return self._send(201, {"status": "success", "data": stored[0], "message": "Feedback recorded"})
+            if parts == ["feedback", "batch"]:
+                rows = [{"club_id": body.get("club_id"), **entry} for entry in body.get("feedback") or []]
+                stored = backend.add_feedback(rows) if rows else None
+                if stored is None:
+                    return self._send(400, {"status": "error", "message": "feedback must be a non-empty array of "
+                                                                         "entries with club_id and player_id"})
+                return self._send(201, {"status": "success", "data": stored, "count": len(stored),
+                                        "message": "Feedback recorded"})
+            self._send(404, {"status": "error", "message": "Route not found", "path": self.path})
+
+        def _send_export(self, table: str, query: Dict[str, str]):
+            fmt = query.get("format", "arrow")
+            if fmt not in ("arrow", "ndjson") or (fmt == "arrow" and pa is None):
+                return self._send(400, {"status": "error", "message": f"Unsupported export format: {fmt}"})
+            chunks = backend.export_chunks(table, query)
+            if chunks is None:
+                return self._send(400, {"status": "error", "message": "Unknown columns"})
+
+            if fmt == "arrow":
+                batches = [pa.RecordBatch.from_pydict(chunk) for chunk in chunks]
+                sink = pa.BufferOutputStream()
+                with pa.ipc.new_stream(sink, batches[0].schema) as writer:
+                    for batch in batches:
+                        writer.write_batch(batch)
+                payload = sink.getvalue().to_pybytes()
+                content_type = "application/vnd.apache.arrow.stream"
+            else:
+                payload = b"".join((json.dumps({"columns": chunk, "rows": len(chunk["id"])}, default=str) + "\n").encode()
+                                   for chunk in chunks)
+                content_type = "application/x-ndjson"
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _write_chunk(self, line: Dict[str, Any]):
+            chunk = (json.dumps(line, default=str) + "\n").encode()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.flush()
+
+        def _stream_news(self, since: Optional[str]):
+            """SSE: `ready`, then a `news` delta whenever publish_news() stores articles"""
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            def event(text: str):
+                chunk = text.encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.flush()
+
+            cursor = since or backend.news_head()
+            try:
+                event(f"id: {cursor}\nevent: ready\ndata: {json.dumps({'cursor': cursor})}\n\n")
+                while True:
+                    rows = backend.news_since(cursor, NEWS_FEED_PAGE_SIZE)
+                    if rows:
+                        cursor = rows[-1]["feed_seq"]
+                        body = {"data": rows, "cursor": cursor, "has_more": len(rows) == NEWS_FEED_PAGE_SIZE}
+                        event(f"id: {cursor}\nevent: news\ndata: {json.dumps(body, default=str)}\n\n")
+                        continue
+                    with backend.news_changed:
+                        changed = backend.news_changed.wait_for(lambda: backend.news_head() != cursor,
+                                                                timeout=NEWS_FEED_HEARTBEAT_SECONDS)
+                    if not changed:
+                        event(": keepalive\n\n")
+            except (BrokenPipeError, ConnectionResetError):
+                return  # subscriber went away
+
+        def _stream_shortlist(self, recs: List[Dict[str, Any]]):
+            """Ranked list first, then one explanation per configured latency, like the backend"""
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self._write_chunk({"event": "ranked", "cached": False,
+                               "data": [{k: v for k, v in rec.items() if k != "explanation"} for rec in recs]})
+            for rank, rec in enumerate(recs, 1):
+                backend.delay()
+                self._write_chunk({"event": "explanation",
+                                   "data": {"player_id": rec["id"], "rank_position": rank,
+                                            "explanation": rec["explanation"]}})
+            self._write_chunk({"event": "done", "cached": False, "count": len(recs), "data": recs,
+                               "generated_at": datetime.now(timezone.utc).isoformat()})
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _stream_batch(self, body: Dict[str, Any]):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for club_id in body.get("club_ids", []):
+                need = backend.need_for(int(club_id))
+                if need is None:
+                    line = {"club_id": club_id, "status": "error", "message": "Club needs profile not found"}
+                else:
+                    recs = backend.recommend(need, int(body.get("limit", 20)))
+                    line = {"club_id": club_id, "status": "success", "data": recs, "count": len(recs)}
+                chunk = (json.dumps(line, default=str) + "\n").encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.flush()
+                backend.delay()
+            self.wfile.write(b"0\r\n\r\n")
+
+    return Handler
+
+
+def start_mock_server(port: int = 0, config: Optional[MockConfig] = None, num_players: int = len(SEED_PLAYERS),
+                      num_news: int = len(SEED_NEWS)) -> ThreadingHTTPServer:
+    """Start the mock backend on a daemon thread; port 0 picks a free port"""
+    backend = MockBackend(build_dataset(num_players, num_news), config or MockConfig())
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(backend))
+    server.daemon_threads = True
+    server.backend = backend
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stand-in for the Sportify AI backend")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="mean added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform ± jitter on the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--players", type=int, default=len(SEED_PLAYERS), help="pad the seed players up to N")
+    parser.add_argument("--news", type=int, default=len(SEED_NEWS), help="number of news articles")
+    parser.add_argument("--payload-padding", type=int, default=0, help="filler bytes per player row")
+    parser.add_argument("--news-every", type=float, default=0, help="publish a new article every N seconds")
+    args = parser.parse_args()
+
+    config = MockConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.payload_padding)
+    server = start_mock_server(args.port, config, args.players, args.news)
+    if args.news_every > 0:
+        def publish():
+            while True:
+                time.sleep(args.news_every)
+                server.backend.publish_news()
+
+        threading.Thread(target=publish, name="mock-news", daemon=True).start()
+    print(f"🧪 Mock backend on http://127.0.0.1:{server.server_port}/api "
+          f"({args.players} players, latency {args.latency_ms}±{args.jitter_ms}ms, errors {args.error_rate:.0%})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Sportify AI - Live news feed
+A bounded local buffer of the latest articles, kept current by the backend's
+/news/stream push channel. Only deltas cross the wire after the first load, and
+a reconnect resumes from the last cursor instead of re-downloading the feed.
+Falls back to polling /news?since=... against a backend without the stream.
+
+Usage:
+    python news_feed.py --publish 20 --every 0.5
+"""
+
+import argparse
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from sportify_client import SportifyClient
+
+NEWS_FEED_CAPACITY = int(os.getenv("NEWS_FEED_CAPACITY", "200"))
+NEWS_FEED_POLL_SECONDS = int(os.getenv("NEWS_FEED_POLL_SECONDS", "30"))
+NEWS_FEED_RECONNECT_SECONDS = float(os.getenv("NEWS_FEED_RECONNECT_SECONDS", "5"))
+
+
+def _feed_seq(article: Dict[str, Any]) -> int:
+    return int(article.get("feed_seq") or 0)
+
+
+class NewsFeed:
+    """
+    Ring buffer of at most `capacity` articles keyed by id. A delta row replaces the
+    copy we hold (late extractions arrive that way); the least recently changed
+    article falls out when the buffer is full.
+    """
+
+    def __init__(self, client: SportifyClient, capacity: int = NEWS_FEED_CAPACITY,
+                 poll_interval: float = NEWS_FEED_POLL_SECONDS,
+                 reconnect_interval: float = NEWS_FEED_RECONNECT_SECONDS):
+        self.client = client
+        self.capacity = capacity
+        self.poll_interval = poll_interval
+        self.reconnect_interval = reconnect_interval
+        self.cursor: Optional[str] = None
+        self.version = 0  # bumped whenever the buffer changes
+        self.mode: Optional[str] = None  # "push" or "poll"
+        self.last_event_at: Optional[float] = None
+        self.counters = {"loads": 0, "deltas": 0, "articles_applied": 0, "evicted": 0, "reconnects": 0}
+        self._articles: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._started = False
+
+    @property
+    def ready(self) -> bool:
+        return self.cursor is not None
+
+    def apply(self, rows: List[Dict[str, Any]], cursor: Optional[str]):
+        """Upsert a delta (oldest change first) and advance the cursor"""
+        with self._lock:
+            for article in rows:
+                self._articles.pop(article["id"], None)
+                self._articles[article["id"]] = article
+            while len(self._articles) > self.capacity:
+                self._articles.popitem(last=False)
+                self.counters["evicted"] += 1
+            # A catch_up() racing the stream must not move the cursor backwards
+            if cursor is not None and (self.cursor is None or int(cursor) > int(self.cursor)):
+                self.cursor = str(cursor)
+            if rows:
+                self.version += 1
+                self.counters["articles_applied"] += len(rows)
+            self.last_event_at = time.time()
+
+    def load(self):
+        """Fill the buffer from scratch with the newest `capacity` articles"""
+        body = self.client.fetch_news_since(None, limit=self.capacity)
+        rows = sorted(body.get("data", []), key=_feed_seq)
+        with self._lock:
+            self._articles.clear()
+            self.cursor = None
+        self.apply(rows, body.get("cursor"))
+        self.counters["loads"] += 1
+
+    def catch_up(self) -> int:
+        """Pull every delta past the cursor; returns articles applied"""
+        if not self.ready:
+            self.load()
+            return len(self._articles)
+        applied = 0
+        while True:
+            body = self.client.fetch_news_since(self.cursor, limit=self.capacity)
+            rows = body.get("data", [])
+            self.apply(rows, body.get("cursor"))
+            applied += len(rows)
+            if rows:
+                self.counters["deltas"] += 1
+            if not body.get("has_more"):
+                return applied
+
+    def _follow(self):
+        """Apply pushed deltas until the stream ends; the server catches us up from the cursor first"""
+        self.mode = "push"
+        for event in self.client.stream_news(self.cursor):
+            if event["event"] == "news":
+                self.apply(event["data"].get("data", []), event["data"].get("cursor"))
+                self.counters["deltas"] += 1
+            elif event["event"] == "ready":
+                self.last_event_at = time.time()
+
+    def start(self):
+        """Load, then follow the push channel (or poll) in a background thread"""
+        if self._started:
+            return
+        self._started = True
+
+        def loop():
+            while True:
+                try:
+                    if not self.ready:
+                        self.load()
+                    self._follow()
+                except requests.HTTPError as e:
+                    if e.response is not None and e.response.status_code == 404:
+                        # Backend without /news/stream: deltas on a timer instead
+                        self.mode = "poll"
+                        try:
+                            self.catch_up()
+                        except Exception:
+                            pass
+                        time.sleep(self.poll_interval)
+                        continue
+                except Exception:
+                    pass  # backend down or stream cut: keep serving the buffer
+                self.counters["reconnects"] += 1
+                time.sleep(self.reconnect_interval)
+
+        threading.Thread(target=loop, name="news-feed", daemon=True).start()
+
+    def articles(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Newest `limit` buffered articles by published_at"""
+        with self._lock:
+            rows = list(self._articles.values())
+        return sorted(rows, key=lambda a: str(a.get("published_at") or ""), reverse=True)[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"articles": len(self._articles), "capacity": self.capacity, "cursor": self.cursor,
+                "version": self.version, "mode": self.mode, "last_event_at": self.last_event_at,
+                **self.counters}
+
+
+def main():
+    """Follow the mock backend's stream while it publishes articles; report push latency"""
+    from mock_server import start_mock_server  # dev-only dependency
+
+    parser = argparse.ArgumentParser(description="Follow the live news feed from the mock backend")
+    parser.add_argument("--publish", type=int, default=20, help="articles to publish")
+    parser.add_argument("--every", type=float, default=0.5, help="seconds between articles")
+    parser.add_argument("--capacity", type=int, default=NEWS_FEED_CAPACITY)
+    args = parser.parse_args()
+
+    server = start_mock_server(num_news=args.capacity * 2)
+    client = SportifyClient(f"http://127.0.0.1:{server.server_port}/api")
+    feed = NewsFeed(client, capacity=args.capacity)
+    feed.start()
+    while not feed.ready:
+        time.sleep(0.01)
+    print(f"loaded {feed.stats()['articles']} articles, cursor {feed.cursor}")
+
+    latencies = []
+    for _ in range(args.publish):
+        time.sleep(args.every)
+        version = feed.version
+        published = time.perf_counter()
+        article = server.backend.publish_news()[0]
+        while feed.version == version:
+            time.sleep(0.001)
+        latencies.append((time.perf_counter() - published) * 1000)
+        assert feed.articles(1)[0]["id"] == article["id"]
+    latencies.sort()
+    print(f"{args.publish} pushed articles: p50 {latencies[len(latencies) // 2]:.1f}ms, "
+          f"max {latencies[-1]:.1f}ms")
+    print(feed.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+"""
+Sportify AI - Local player snapshot
+A versioned, memory-mapped copy of the players table with prebuilt indexes, so
+the Players tab filters locally instead of calling /players on every change.
+Kept current by delta sync over /export/players?updated_since=...; deletions never
+show up in a delta, so the id column is re-exported periodically and diffed.
+
+Layout under PLAYER_SNAPSHOT_DIR:
+    CURRENT                     name of the live version directory
+    v000012/manifest.json       version, synced_through, row count, positions
+    v000012/<column>.npy        one array per column, rows sorted by id
+    v000012/idx_*.npy           sorted age/value orders, position bitmaps, name n-grams
+
+Usage:
+    python player_snapshot.py --players 100000 --queries 2000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from sportify_client import SportifyClient
+
+PLAYER_SNAPSHOT_DIR = os.getenv("PLAYER_SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                     ".player_snapshot"))
+PLAYER_SNAPSHOT_SYNC_SECONDS = int(os.getenv("PLAYER_SNAPSHOT_SYNC_SECONDS", "60"))
+# How often a sync also fetches every live id and drops the players deleted upstream
+PLAYER_SNAPSHOT_RECONCILE_SECONDS = int(os.getenv("PLAYER_SNAPSHOT_RECONCILE_SECONDS", "900"))
+# Re-request rows touched shortly before the last sync; a transaction's CURRENT_TIMESTAMP
+# is its start time, so a slow commit can land behind the previous high-water mark
+SYNC_OVERLAP = timedelta(minutes=5)
+KEEP_VERSIONS = 2
+
+TEXT_COLUMNS = ["external_id", "full_name", "nationality", "primary_position", "secondary_positions",
+                "preferred_foot", "contract_status", "last_updated"]
+INT_COLUMNS = ["age", "height_cm", "weight_kg", "current_club_id"]
+COLUMNS = ["id", *TEXT_COLUMNS, *INT_COLUMNS, "market_value_eur", "is_available"]
+
+
+def _grams(text: str, sizes=(1, 2, 3)) -> set:
+    """Distinct substrings of the given lengths; 1- and 2-grams make short searches exact"""
+    return {text[i:i + n] for n in sizes for i in range(len(text) - n + 1)}
+
+
+def _python_values(column: str, values: np.ndarray) -> List[Any]:
+    """Plain Python values for one column of a result page; missing values become None"""
+    if column in TEXT_COLUMNS:
+        return [v or None for v in values.tolist()]
+    if column in ("id", "is_available"):
+        return values.tolist()
+    return [None if v != v else int(v) for v in values.tolist()]
+
+
+class SnapshotView:
+    """One immutable snapshot version; arrays are memory-mapped, derived masks are built lazily"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "manifest.json")) as f:
+            self.manifest = json.load(f)
+        self.version = self.manifest["version"]
+        self.rows = self.manifest["rows"]
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._masks: Dict[str, np.ndarray] = {}
+
+    def array(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            self._arrays[name] = np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r")
+        return self._arrays[name]
+
+    def column(self, name: str) -> np.ndarray:
+        """Row-aligned values; is_available is stored as a bitmap"""
+        return self._bitmap(name) if name == "is_available" else self.array(name)
+
+    def _bitmap(self, name: str) -> np.ndarray:
+        if name not in self._masks:
+            self._masks[name] = np.unpackbits(self.array(name), count=self.rows).astype(bool)
+        return self._masks[name]
+
+    def _range(self, column: str, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        """Rows with low <= column <= high, from the sorted order index"""
+        values = self.array(f"idx_{column}_sorted")
+        start = 0 if low is None else np.searchsorted(values, low, side="left")
+        stop = np.searchsorted(values, np.inf if high is None else high, side="right")
+        mask = np.zeros(self.rows, dtype=bool)
+        mask[self.array(f"idx_{column}_order")[start:stop]] = True
+        return mask
+
+    def _name_matches(self, search: str) -> np.ndarray:
+        """
+        Rows whose full_name contains `search`, case-insensitively (the backend's ILIKE).
+        Up to three characters is a single posting list; longer searches intersect the
+        trigram lists and confirm candidates against the names.
+        """
+        query = search.lower()
+        keys = self.array("idx_grams")
+        offsets = self.array("idx_gram_offsets")
+        postings = []
+        for gram in _grams(query, sizes=(min(len(query), 3),)):
+            i = np.searchsorted(keys, gram)
+            if i == len(keys) or keys[i] != gram:
+                return np.empty(0, dtype=np.int32)
+            postings.append(self.array("idx_gram_rows")[offsets[i]:offsets[i + 1]])
+        # Narrow the shortest posting list by scattering each other list into a row mask
+        postings.sort(key=len)
+        rows = np.asarray(postings[0])
+        hits = np.zeros(self.rows, dtype=bool)
+        for posting in postings[1:]:
+            hits[:] = False
+            hits[posting] = True
+            rows = rows[hits[rows]]
+        if len(query) <= 3:
+            return rows
+        return rows[np.char.find(self.array("idx_name_lower")[rows], query) >= 0]
+
+    def query(self, position: str = None, club_id: int = None, age_min: int = None, age_max: int = None,
+              max_market_value_eur: float = None, search: str = None, include_unavailable: bool = False,
+              cursor: int = None, limit: int = 50, as_frame: bool = False) -> Dict[str, Any]:
+        """
+        Same filters and id ordering as /players/search; `total` counts every match.
+        With `as_frame`, "data" is a DataFrame gathered straight from the columns.
+        """
+        mask = np.ones(self.rows, dtype=bool) if include_unavailable else self._bitmap("is_available").copy()
+        if position:
+            if position not in self.manifest["positions"]:
+                mask[:] = False
+            else:
+                mask &= self._bitmap(f"idx_position_{position}")
+        if club_id is not None:
+            mask &= self.array("current_club_id") == float(club_id)
+        if age_min is not None or age_max is not None:
+            mask &= self._range("age", age_min, age_max)
+        if max_market_value_eur is not None:
+            mask &= self._range("market_value_eur", None, max_market_value_eur)
+        if search:
+            matches = np.zeros(self.rows, dtype=bool)
+            matches[self._name_matches(search)] = True
+            mask &= matches
+        if cursor is not None:
+            mask[:np.searchsorted(self.array("id"), cursor, side="right")] = False
+
+        rows = np.flatnonzero(mask)
+        page = rows[:limit]
+        next_cursor = int(self.array("id")[page[-1]]) if len(rows) > limit > 0 else None
+        if as_frame:
+            data = pd.DataFrame({c: np.asarray(self.column(c)[page]) for c in COLUMNS})
+            data[INT_COLUMNS] = data[INT_COLUMNS].astype("Int64")  # stored as float so they can be missing
+            return {"data": data, "total": int(len(rows)), "next_cursor": next_cursor}
+        # Gather column by column; per-cell numpy scalar access would dominate the query
+        values = [_python_values(c, self.column(c)[page]) for c in COLUMNS]
+        return {
+            "data": [dict(zip(COLUMNS, row)) for row in zip(*values)],
+            "total": int(len(rows)),
+            "next_cursor": next_cursor,
+        }
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame({c: np.asarray(self.column(c)) for c in COLUMNS})
+
+
+def write_version(root: str, version: int, players: pd.DataFrame, synced_through: Optional[str]) -> str:
+    """Write columns and indexes for one version into root/vNNNNNN and return the path"""
+    players = players.sort_values("id", ignore_index=True)
+    path = os.path.join(root, f"v{version:06d}")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    def save(name: str, values: np.ndarray):
+        np.save(os.path.join(tmp, f"{name}.npy"), values)
+
+    save("id", players["id"].to_numpy(dtype=np.int64))
+    for column in TEXT_COLUMNS:
+        save(column, players[column].fillna("").astype(str).to_numpy(dtype=str))
+    for column in [*INT_COLUMNS, "market_value_eur"]:
+        save(column, pd.to_numeric(players[column], errors="coerce").to_numpy(dtype=np.float64))
+    available = players["is_available"].fillna(False).astype(bool).to_numpy()
+    save("is_available", np.packbits(available))
+
+    # Range indexes: row order by value (missing values sort last) and the sorted values
+    for column in ("age", "market_value_eur"):
+        values = pd.to_numeric(players[column], errors="coerce").to_numpy(dtype=np.float64)
+        order = np.argsort(values, kind="stable").astype(np.int32)
+        save(f"idx_{column}_order", order)
+        save(f"idx_{column}_sorted", values[order])
+
+    # Position bitmaps, primary or secondary like the backend's position filter
+    primary = players["primary_position"].fillna("").to_numpy(dtype=str)
+    secondary = [set(s.split(",")) if s else set() for s in players["secondary_positions"].fillna("")]
+    positions = sorted(({p for p in primary if p} | set().union(*secondary)) - {""})
+    for position in positions:
+        save(f"idx_position_{position}", np.packbits((primary == position) | np.array([position in s for s in secondary],
+                                                                                      dtype=bool)))
+
+    # Name index: sorted 1-3-gram keys with CSR posting lists of rows (ascending)
+    names = players["full_name"].fillna("").str.lower()
+    save("idx_name_lower", names.to_numpy(dtype=str))
+    postings: Dict[str, List[int]] = {}
+    for row, name in enumerate(names):
+        for gram in _grams(name):
+            postings.setdefault(gram, []).append(row)
+    keys = sorted(postings)
+    save("idx_grams", np.array(keys, dtype=str))
+    save("idx_gram_offsets", np.cumsum([0] + [len(postings[k]) for k in keys], dtype=np.int64))
+    save("idx_gram_rows", np.fromiter((r for k in keys for r in postings[k]), dtype=np.int32))
+
+    with open(os.path.join(tmp, "manifest.json"), "w") as f:
+        json.dump({"version": version, "synced_through": synced_through, "rows": len(players),
+                   "positions": positions, "built_at": datetime.now(timezone.utc).isoformat()}, f)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    return path
+
+
+class PlayerSnapshot:
+    """
+    Local player table for instant filtering. Opens the last version on disk at once,
+    then delta-syncs in a background thread; the backend only sees export traffic.
+    """
+
+    def __init__(self, client: SportifyClient, root: str = PLAYER_SNAPSHOT_DIR,
+                 interval: float = PLAYER_SNAPSHOT_SYNC_SECONDS,
+                 reconcile_interval: float = PLAYER_SNAPSHOT_RECONCILE_SECONDS):
+        self.client = client
+        self.root = root
+        self.interval = interval
+        self.reconcile_interval = reconcile_interval
+        self._reconciled_at: Optional[float] = None  # a version opened from disk may predate deletions
+        self.view: Optional[SnapshotView] = self._open_current()
+        self.last_sync: Dict[str, Any] = {}
+        self._sync_lock = threading.Lock()
+        self._started = False
+
+    @property
+    def ready(self) -> bool:
+        return self.view is not None
+
+    def _open_current(self) -> Optional[SnapshotView]:
+        try:
+            with open(os.path.join(self.root, "CURRENT")) as f:
+                return SnapshotView(os.path.join(self.root, f.read().strip()))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _publish(self, path: str):
+        tmp = os.path.join(self.root, "CURRENT.tmp")
+        with open(tmp, "w") as f:
+            f.write(os.path.basename(path))
+        os.replace(tmp, os.path.join(self.root, "CURRENT"))
+        self.view = SnapshotView(path)
+        # Readers still holding an older view keep their mappings after the unlink
+        versions = sorted(d for d in os.listdir(self.root) if d.startswith("v") and not d.endswith(".tmp"))
+        for old in versions[:-KEEP_VERSIONS]:
+            shutil.rmtree(os.path.join(self.root, old), ignore_errors=True)
+
+    def sync(self, reconcile: bool = False) -> int:
+        """
+        Pull rows changed since the last sync (everything on first run); returns rows applied.
+        Every `reconcile_interval` (or with `reconcile`) also drops ids the backend no longer has.
+        """
+        with self._sync_lock:
+            started = time.perf_counter()
+            view = self.view
+            reconcile = view is not None and (reconcile or self._reconciled_at is None
+                                              or time.monotonic() - self._reconciled_at >= self.reconcile_interval)
+            since = None
+            if view is not None and view.manifest.get("synced_through"):
+                since = (datetime.fromisoformat(view.manifest["synced_through"]) - SYNC_OVERLAP).isoformat()
+
+            delta = self.client.export_frame("players", COLUMNS, updated_since=since)
+            if view is None:
+                players = delta
+            else:
+                current = view.frame()
+                # The overlap window re-sends rows we already hold; keep only real changes
+                known = current.set_index("id")["last_updated"]
+                delta = delta[delta["last_updated"].ne(delta["id"].map(known))]
+                players = pd.concat([current[~current["id"].isin(delta["id"])], delta], ignore_index=True)
+
+            removed = 0
+            if reconcile:
+                # Fetched after the delta, so a player inserted meanwhile is in this list too
+                live = self.client.export_frame("players", ["id"])["id"]
+                deleted = ~players["id"].isin(live)
+                removed = int(deleted.sum())
+                players = players[~deleted]
+            if reconcile or view is None:
+                self._reconciled_at = time.monotonic()
+
+            if view is not None and delta.empty and not removed:
+                self.last_sync = {"rows": 0, "removed": 0, "ms": round((time.perf_counter() - started) * 1000, 1)}
+                return 0
+
+            stamps = [s for s in (delta["last_updated"].dropna().max() if not delta.empty else None,
+                                  view.manifest.get("synced_through") if view else None) if s]
+            os.makedirs(self.root, exist_ok=True)
+            path = write_version(self.root, (view.version + 1) if view else 1, players, max(stamps) if stamps else None)
+            self._publish(path)
+            self.last_sync = {"rows": len(delta), "removed": removed,
+                              "ms": round((time.perf_counter() - started) * 1000, 1)}
+            return len(delta) + removed
+
+    def start(self):
+        """Sync now and every `interval` seconds, off the request path"""
+        if self._started:
+            return
+        self._started = True
+
+        def loop():
+            while True:
+                try:
+                    self.sync()
+                except Exception:
+                    pass  # backend down: keep serving the version on disk
+                time.sleep(self.interval)
+
+        threading.Thread(target=loop, name="player-snapshot", daemon=True).start()
+
+    def search(self, **filters) -> Optional[Dict[str, Any]]:
+        """Local /players/search; None until the first version exists"""
+        view = self.view
+        return view.query(**filters) if view is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        view = self.view
+        return {"version": view.version if view else None, "rows": view.rows if view else 0,
+                "synced_through": view.manifest.get("synced_through") if view else None, **self.last_sync}
+
+
+def main():
+    """Sync from the mock backend, then time local queries"""
+    from mock_server import start_mock_server  # dev-only dependency
+
+    parser = argparse.ArgumentParser(description="Benchmark the local player snapshot")
+    parser.add_argument("--players", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    server = start_mock_server(num_players=args.players)
+    client = SportifyClient(f"http://127.0.0.1:{server.server_port}/api")
+    snapshot = PlayerSnapshot(client, root=tempfile.mkdtemp(prefix="player-snapshot-"))
+    snapshot.sync()
+    print(f"full sync: {snapshot.last_sync['rows']} rows in {snapshot.last_sync['ms']}ms")
+    snapshot.sync()
+    print(f"delta sync (no changes): {snapshot.last_sync['ms']}ms")
+    stamp = datetime.now(timezone.utc).replace(tzinfo=None).isoformat(timespec="microseconds")
+    for player in server.backend.data["players"][:100]:
+        player.update(market_value_eur=player["market_value_eur"] + 1_000_000, last_updated=stamp)
+    snapshot.sync()
+    print(f"delta sync ({snapshot.last_sync['rows']} changed): {snapshot.last_sync['ms']}ms")
+
+    rng = np.random.default_rng(7)
+    positions = ["ST", "CM", "CB", "GK", None]
+    searches = ["", "", "", "pl", "er 12", "haaland"]
+    latencies = []
+    for _ in range(args.queries):
+        age_min = int(rng.integers(17, 30))
+        filters = {"position": positions[rng.integers(len(positions))], "age_min": age_min,
+                   "age_max": age_min + int(rng.integers(2, 10)), "search": searches[rng.integers(len(searches))],
+                   "limit": 20}
+        t = time.perf_counter()
+        snapshot.search(**filters)
+        latencies.append((time.perf_counter() - t) * 1000)
+    latencies.sort()
+    print(f"{args.queries} local queries: p50 {latencies[len(latencies) // 2]:.3f}ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)]:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
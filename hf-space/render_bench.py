@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Sportify AI - Render benchmark
+Times fetch-to-render for every result table (players, news, recommendations,
+clubs) at 100, 10k and 100k rows against the mock backend: the fetch, the
+frame build, the first window, then a sort, a filter and a page turn on the frame.
+
+Usage:
+    python render_bench.py
+    python render_bench.py --sizes 100 10000 --budget-ms 1500 --interaction-budget-ms 300
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from mock_server import start_mock_server
+from sportify_client import SportifyClient
+from table_view import (CLUB_COLUMNS, NEWS_COLUMNS, PLAYER_COLUMNS, RECOMMENDATION_COLUMNS, TABLE_WINDOW_ROWS,
+                        TableView)
+
+SIZES = [100, 10_000, 100_000]
+PAGE_SIZE = 200
+
+# (table, columns, sort column, filter text)
+TABLES = [
+    ("players", PLAYER_COLUMNS, "Value (€M)", "player 12"),
+    ("news", NEWS_COLUMNS, "Confidence %", "transfer"),
+    ("recommendations", RECOMMENDATION_COLUMNS, "Age", "position match: cm"),
+    ("clubs", CLUB_COLUMNS, "Founded", "liga"),
+]
+
+STAGES = ["fetch", "build", "first_window", "sort", "filter", "page"]
+
+
+def _ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+
+def fetch_players(client: SportifyClient, rows: int) -> List[Dict[str, Any]]:
+    players = []
+    for page in client.iter_player_pages({}, page_size=PAGE_SIZE, max_rows=rows):
+        players.extend(page)
+    return players
+
+
+def fetch_news(client: SportifyClient, rows: int) -> List[Dict[str, Any]]:
+    """Oldest first through the since-cursor, the way the feed catches up"""
+    articles, cursor = [], "0"
+    while len(articles) < rows:
+        body = client.fetch_news_since(cursor, limit=min(PAGE_SIZE, rows - len(articles)))
+        articles.extend(body.get("data", []))
+        cursor = body.get("cursor") or cursor
+        if not body.get("has_more"):
+            break
+    return articles
+
+
+def fetch_recommendations(client: SportifyClient, rows: int) -> List[Dict[str, Any]]:
+    return client.post_recommendations({"club_id": 2, "limit": rows})
+
+
+def fetch_clubs(client: SportifyClient, rows: int) -> List[Dict[str, Any]]:
+    """/clubs only has the seed clubs; repeat them with numbered names up to `rows`"""
+    clubs = client.fetch_clubs()
+    return [{**clubs[i % len(clubs)], "id": i + 1, "name": f"{clubs[i % len(clubs)]['name']} {i + 1}"}
+            for i in range(rows)]
+
+
+FETCHERS: Dict[str, Callable[[SportifyClient, int], List[Dict[str, Any]]]] = {
+    "players": fetch_players,
+    "news": fetch_news,
+    "recommendations": fetch_recommendations,
+    "clubs": fetch_clubs,
+}
+
+
+def render_once(records: List[Dict[str, Any]], columns, sort_by: str, filter_text: str) -> Dict[str, float]:
+    """One cold pass over a fresh view; every stage ends with the window a UI would draw"""
+    timings = {}
+    started = time.perf_counter()
+    view = TableView.from_records(records, columns)
+    timings["build"] = _ms(started)
+
+    started = time.perf_counter()
+    first = view.query()
+    first.caption(1)
+    first.window(1)
+    timings["first_window"] = _ms(started)
+
+    started = time.perf_counter()
+    view.query("", sort_by, True).window(1)
+    timings["sort"] = _ms(started)
+
+    started = time.perf_counter()
+    filtered = view.query(filter_text, sort_by, True)
+    filtered.window(1)
+    timings["filter"] = _ms(started)
+
+    started = time.perf_counter()
+    filtered.window(max(1, filtered.pages() // 2))
+    timings["page"] = _ms(started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fetch-to-render for the result tables")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="result sizes (rows)")
+    parser.add_argument("--repeat", type=int, default=3, help="render passes per table (median is reported)")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="fail if fetch + build + first window exceeds this for any table")
+    parser.add_argument("--interaction-budget-ms", type=float, default=None,
+                        help="fail if a sort, filter or page turn exceeds this for any table")
+    args = parser.parse_args()
+
+    largest = max(args.sizes)
+    started = time.perf_counter()
+    server = start_mock_server(num_players=largest, num_news=largest)
+    client = SportifyClient(f"http://127.0.0.1:{server.server_port}/api")
+    print(f"mock backend with {largest:,} players and articles ready in {_ms(started):.0f}ms "
+          f"(window {TABLE_WINDOW_ROWS} rows)\n")
+
+    print(f"{'table':<16} {'rows':>8} " + " ".join(f"{stage:>12}" for stage in STAGES) + f" {'to render':>10}")
+    failures = []
+    for size in args.sizes:
+        for table, columns, sort_by, filter_text in TABLES:
+            started = time.perf_counter()
+            records = FETCHERS[table](client, size)
+            fetch = _ms(started)
+            passes = [render_once(records, columns, sort_by, filter_text) for _ in range(args.repeat)]
+            timings = {"fetch": fetch, **{stage: statistics.median(p[stage] for p in passes) for stage in STAGES[1:]}}
+            to_render = timings["fetch"] + timings["build"] + timings["first_window"]
+            print(f"{table:<16} {len(records):>8,} " + " ".join(f"{timings[s]:>10.1f}ms" for s in STAGES)
+                  + f" {to_render:>8.1f}ms")
+
+            if args.budget_ms is not None and to_render > args.budget_ms:
+                failures.append(f"{table} @ {size:,}: fetch-to-render {to_render:.1f}ms > {args.budget_ms}ms")
+            interaction = max(timings["sort"], timings["filter"], timings["page"])
+            if args.interaction_budget_ms is not None and interaction > args.interaction_budget_ms:
+                failures.append(f"{table} @ {size:,}: interaction {interaction:.1f}ms > {args.interaction_budget_ms}ms")
+
+    server.shutdown()
+    if failures:
+        print("\nOver budget:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Sportify AI - Client-side response cache
+TTL + LRU cache for read endpoints, with ETag revalidation
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+CACHE_MAX_ENTRIES = 256
+CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# Seconds a response stays fresh, by first path segment (0 = never cached)
+CACHE_TTLS = {
+    "/health": 0,
+    "/clubs": 3600,
+    "/players": 120,
+    "/news": 60,
+    "/recommendations": 300,
+    "/analytics": 15,
+}
+
+
+@dataclass
+class CacheEntry:
+    payload: Any
+    size: int
+    expires_at: float
+    etag: Optional[str] = None
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class ResponseCache:
+    """Thread-safe LRU cache bounded by entry count and total bytes"""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES,
+                 ttls: Optional[Dict[str, float]] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = {**CACHE_TTLS, **(ttls or {})}
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "revalidated": 0, "stale": 0,
+                         "evictions": 0, "invalidations": 0}
+
+    @staticmethod
+    def key(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        return f"{path}?{json.dumps(params or {}, sort_keys=True, default=str)}"
+
+    def ttl_for(self, path: str) -> float:
+        root = "/" + path.lstrip("/").split("/", 1)[0]
+        return self.ttls.get(root, 0)
+
+    def lookup(self, key: str) -> Tuple[Optional[Any], Dict[str, str]]:
+        """
+        Return (payload, headers). payload is set on a fresh hit; otherwise
+        headers carries If-None-Match when a stale entry can be revalidated.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.counters["misses"] += 1
+                return None, {}
+            self._entries.move_to_end(key)
+            if entry.fresh:
+                self.counters["hits"] += 1
+                return entry.payload, {}
+            self.counters["stale"] += 1
+            return None, ({"If-None-Match": entry.etag} if entry.etag else {})
+
+    def revalidate(self, key: str, ttl: float) -> Optional[Any]:
+        """Extend a stale entry after a 304 Not Modified; returns its payload"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.expires_at = time.monotonic() + ttl
+            self.counters["revalidated"] += 1
+            return entry.payload
+
+    def store(self, key: str, payload: Any, size: int, ttl: float, etag: Optional[str] = None):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = CacheEntry(payload, size, time.monotonic() + ttl, etag)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.counters["evictions"] += 1
+
+    def invalidate(self, prefix: str = ""):
+        """Drop every entry whose path starts with prefix (all entries if empty)"""
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                self._bytes -= self._entries.pop(key).size
+                self.counters["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.counters["hits"] + self.counters["misses"] + self.counters["stale"]
+            served = self.counters["hits"] + self.counters["revalidated"]
+            return {
+                **self.counters,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hit_ratio": round(served / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,208 @@
+"""
+Sportify AI - Local scoring engine
+Vectorized mirror of RecommendationService._filterCandidates / _calculateFitScore / _calculateFinalScore
+"""
+
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Same weights as the backend; risk_penalty is subtractive
+DEFAULT_WEIGHTS = {
+    "fit_score": 0.35,
+    "performance_score": 0.25,
+    "availability_score": 0.20,
+    "news_confidence": 0.15,
+    "risk_penalty": 0.05,
+}
+
+# Filtered candidates the backend scores per need: the best form first, ties by id
+CANDIDATE_LIMIT = 500
+
+# Neutral values the backend uses when a signal is missing
+SIGNAL_DEFAULTS = {
+    "form_score": 0.5,
+    "availability_score": 1.0,
+    "risk_penalty": 0.0,
+    "news_confidence": 0.5,
+}
+
+
+class CandidateSet:
+    """
+    Candidate players held as columnar NumPy arrays.
+    Load once, then re-score against any club need and weights without a round trip.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame.reset_index(drop=True)
+        n = len(self.frame)
+
+        def column(name, default):
+            if name not in self.frame:
+                return np.full(n, default, dtype=float)
+            return pd.to_numeric(self.frame[name], errors="coerce").fillna(default).to_numpy(dtype=float)
+
+        self.ids = column("id", 0) if "id" in self.frame else np.arange(n, dtype=float)
+        self.age = column("age", 0)
+        self.market_value = column("market_value_eur", 0)
+        available = self.frame["is_available"] if "is_available" in self.frame else pd.Series([True] * n)
+        self.available = available.fillna(False).astype(bool).to_numpy()
+        # The candidate cut orders by COALESCE(form_score, 0.5); scoring uses `form_score || 0.5`,
+        # so a zero form also falls back there
+        self.form = column("form_score", SIGNAL_DEFAULTS["form_score"])
+        self.performance = np.where(self.form == 0, SIGNAL_DEFAULTS["form_score"], self.form)
+        if "availability_score" not in self.frame and "availability_penalty" in self.frame:
+            # Raw signal rollups (the players export): derive as _calculateAvailabilityScore
+            self.availability = np.maximum(0, 1 - column("availability_penalty", 0))
+        else:
+            self.availability = column("availability_score", SIGNAL_DEFAULTS["availability_score"])
+        if "risk_penalty" not in self.frame and "active_risk_count" in self.frame:
+            # As _calculateRiskPenalty
+            self.risk = np.minimum(0.4, column("active_risk_count", 0) * 0.1 + column("avg_risk", 0) * 0.2)
+        else:
+            self.risk = column("risk_penalty", SIGNAL_DEFAULTS["risk_penalty"])
+        news = column("news_confidence", SIGNAL_DEFAULTS["news_confidence"])
+        self.news = np.where(news == 0, SIGNAL_DEFAULTS["news_confidence"], news)
+
+        foot = self.frame["preferred_foot"] if "preferred_foot" in self.frame else pd.Series([None] * n)
+        self.foot = foot.fillna("").astype(str).to_numpy()
+
+        # Positions as integer codes plus a one-hot matrix of secondary positions
+        primary = self.frame["primary_position"] if "primary_position" in self.frame else pd.Series([None] * n)
+        secondary = self.frame["secondary_positions"] if "secondary_positions" in self.frame else pd.Series([None] * n)
+        # Lists from the API, comma-separated text from the export
+        secondary = [list(s) if isinstance(s, (list, tuple)) else s.split(",") if isinstance(s, str) and s else []
+                     for s in secondary]
+        vocab = sorted({p for p in primary.dropna()} | {p for s in secondary for p in s})
+        self.position_codes = {p: i for i, p in enumerate(vocab)}
+        self.primary = primary.map(self.position_codes).fillna(-1).to_numpy(dtype=np.int32)
+        self.secondary = np.zeros((n, len(vocab)), dtype=bool)
+        for row, positions in enumerate(secondary):
+            for p in positions:
+                self.secondary[row, self.position_codes[p]] = True
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "CandidateSet":
+        return cls(pd.DataFrame.from_records(list(records)))
+
+    def matches(self, need: Dict[str, Any]) -> np.ndarray:
+        """Mask of the hard constraints in _candidateQuery: available, position, age, budget, foot"""
+        mask = self.available.copy()
+        positions = need.get("positions_required") or []
+        if positions:
+            required = [self.position_codes[p] for p in positions if p in self.position_codes]
+            mask &= np.isin(self.primary, required) | self.secondary[:, required].any(axis=1)
+        if need.get("age_min") is not None:
+            mask &= self.age >= need["age_min"]
+        if need.get("age_max") is not None:
+            mask &= self.age <= need["age_max"]
+        if need.get("budget_max_eur"):
+            mask &= self.market_value <= need["budget_max_eur"]
+        if need.get("preferred_foot"):
+            mask &= (self.foot == need["preferred_foot"]) | (self.foot == "both")
+        return mask
+
+    def candidates(self, need: Dict[str, Any], limit: int = CANDIDATE_LIMIT) -> np.ndarray:
+        """Row indices the backend would score for `need`: matches, best form first, cut to `limit`"""
+        rows = np.flatnonzero(self.matches(need))
+        order = np.lexsort((self.ids[rows], -self.form[rows]))
+        return rows[order[:limit]]
+
+    def fit_scores(self, need: Dict[str, Any]) -> np.ndarray:
+        """Position (0.4), age (0.3), budget (0.2) and preferred foot (0.1) fit"""
+        required = [self.position_codes[p] for p in need.get("positions_required") or [] if p in self.position_codes]
+        first = (need.get("positions_required") or [None])[0]
+
+        position = np.zeros(len(self), dtype=float)
+        if first in self.position_codes:
+            position = np.where(self.secondary[:, self.position_codes[first]], 0.35, 0.0)
+        position = np.where(np.isin(self.primary, required), 0.4, position)
+
+        age_min = need.get("age_min") or 0
+        age_max = need.get("age_max") or 40
+        in_range = (self.age >= age_min) & (self.age <= age_max)
+        age = np.where(in_range, 0.3, np.maximum(0, 0.3 * (1 - np.abs(self.age - age_max) / 10)))
+
+        budget_max = need.get("budget_max_eur") or np.inf
+        budget = np.where(self.market_value <= budget_max, 0.2, 0.0)
+
+        preferred = need.get("preferred_foot")
+        if preferred:
+            foot = np.where((self.foot == preferred) | (self.foot == "both"), 0.1, 0.0)
+        else:
+            foot = np.full(len(self), 0.1)
+
+        return np.minimum(1, position + age + budget + foot)
+
+    def final_scores(self, need: Dict[str, Any], weights: Optional[Dict[str, float]] = None,
+                     fit: Optional[np.ndarray] = None) -> np.ndarray:
+        w = {**DEFAULT_WEIGHTS, **(weights or {})}
+        fit = self.fit_scores(need) if fit is None else fit
+        return (
+            fit * w["fit_score"]
+            + self.performance * w["performance_score"]
+            + self.availability * w["availability_score"]
+            + self.news * w["news_confidence"]
+            - self.risk * w["risk_penalty"]
+        )
+
+    def top_k(self, need: Dict[str, Any], k: int = 20,
+              weights: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """
+        Rank the need's candidates as the backend does: a stable sort by final score,
+        so ties keep the candidate order (best form first, then id)
+        """
+        rows = self.candidates(need)
+        fit = self.fit_scores(need)
+        scores = self.final_scores(need, weights, fit=fit)
+        k = min(k, len(rows))
+        if k == 0:
+            return self.frame.iloc[0:0].assign(fit_score=[], final_score=[], rank_position=[])
+
+        top = rows[np.argsort(-scores[rows], kind="stable")[:k]]
+        return self.frame.iloc[top].assign(
+            fit_score=fit[top],
+            final_score=scores[top],
+            rank_position=np.arange(1, k + 1),
+        )
+
+
+def synthetic_candidates(n: int, seed: int = 0) -> CandidateSet:
+    """Random candidate pool for benchmarking"""
+    rng = np.random.default_rng(seed)
+    positions = np.array(["ST", "CF", "LW", "RW", "CAM", "CM", "CDM", "CB", "LB", "RB", "GK"])
+    secondary = [list(rng.choice(positions, size=rng.integers(0, 3), replace=False)) for _ in range(n)]
+    frame = pd.DataFrame({
+        "id": np.arange(1, n + 1),
+        "primary_position": rng.choice(positions, n),
+        "secondary_positions": secondary,
+        "age": rng.integers(17, 38, n),
+        "market_value_eur": rng.integers(1, 200, n) * 1_000_000,
+        "preferred_foot": rng.choice(["left", "right", "both"], n, p=[0.3, 0.6, 0.1]),
+        "form_score": rng.random(n),
+        "availability_score": rng.random(n),
+        "risk_penalty": rng.random(n) * 0.4,
+        "news_confidence": rng.random(n),
+    })
+    return CandidateSet(frame)
+
+
+if __name__ == "__main__":
+    candidates = synthetic_candidates(100_000)
+    need = {"positions_required": ["CM", "CDM"], "age_min": 23, "age_max": 32, "budget_max_eur": 80_000_000}
+
+    runs: List[float] = []
+    for i in range(20):
+        weights = {**DEFAULT_WEIGHTS, "fit_score": 0.2 + i * 0.02}
+        start = time.perf_counter()
+        candidates.top_k(need, k=20, weights=weights)
+        runs.append((time.perf_counter() - start) * 1000)
+
+    runs.sort()
+    print(f"Re-ranked {len(candidates):,} candidates: p50 {runs[len(runs) // 2]:.2f}ms, max {runs[-1]:.2f}ms")
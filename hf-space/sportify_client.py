@@ -0,0 +1,672 @@
+"""
+Sportify AI - Shared HTTP client
+Used by both the Gradio and Streamlit interfaces
+"""
+
+import asyncio
+import json
+import os
+import time
+from contextlib import nullcontext
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+import httpx
+import pandas as pd
+import requests
+from urllib3.util.retry import Retry
+
+try:
+    import pyarrow as pa
+except ImportError:  # exports fall back to column-major NDJSON
+    pa = None
+
+from client_metrics import (
+    ClientMetrics,
+    RequestSample,
+    TimedHTTPAdapter,
+    endpoint_label,
+    httpx_trace,
+    sample_from_httpx,
+    sample_from_response,
+    start_phase_timing,
+    stop_phase_timing,
+)
+from gateway import Gateway
+from response_cache import ResponseCache
+
+# Configuration
+API_BASE_URL = os.getenv("API_URL", "http://localhost:3000/api")
+API_TIMEOUT = 15
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "10"))
+API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "3"))
+API_BACKOFF_FACTOR = float(os.getenv("API_BACKOFF_FACTOR", "0.3"))
+API_MAX_CONCURRENCY = int(os.getenv("API_MAX_CONCURRENCY", "4"))
+RETRY_STATUSES = (502, 503, 504)
+PLAYER_PAGE_SIZE = 50
+# The server sends a keepalive every 15s; a silent stream is dead well before this
+NEWS_STREAM_READ_TIMEOUT = 45
+
+# Per-endpoint (connect, read) timeouts in seconds
+ENDPOINT_TIMEOUTS = {
+    "/health": (3, 5),
+    "/clubs": (3, API_TIMEOUT),
+    "/players": (3, API_TIMEOUT),
+    "/news": (3, API_TIMEOUT),
+    "/recommendations": (3, 30),
+    "/export": (3, 120),
+}
+
+EXPORT_ACCEPT = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _timeout_for(timeouts: Dict[str, Any], path: str):
+    """Resolve the timeout for a path by its first segment"""
+    root = "/" + path.lstrip("/").split("/", 1)[0]
+    return timeouts.get(root, (3, API_TIMEOUT))
+
+
+def _unwrap_body(body: Any) -> Any:
+    """Unwrap the backend's {status, data} envelope"""
+    if isinstance(body, dict) and "data" in body and "status" in body:
+        return body["data"]
+    return body
+
+
+def _next_cursor(body: Any) -> Optional[Any]:
+    return body.get("next_cursor") if isinstance(body, dict) else None
+
+
+def _cache_hit_sample(path: str, started: float) -> RequestSample:
+    return RequestSample(endpoint_label("GET", path), 200, (time.perf_counter() - started) * 1000, cache_hit=True)
+
+
+def _similar_params(k: int, filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Drop unset filters and send booleans the way the backend parses them"""
+    params = {"k": k}
+    for key, value in (filters or {}).items():
+        if value is True:
+            params[key] = "true"
+        elif value not in (None, "", False):
+            params[key] = value
+    return params
+
+
+def _export_params(columns: Optional[List[str]], filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Projection, filters and the wire format this process can decode"""
+    params = {key: str(value).lower() if isinstance(value, bool) else value
+              for key, value in filters.items() if value not in (None, "")}
+    if columns:
+        params["columns"] = ",".join(columns)
+    params["format"] = "arrow" if pa is not None else "ndjson"
+    return params
+
+
+def _frame_from_export(content: bytes, fmt: str) -> pd.DataFrame:
+    """
+    Decode an export body straight into columns. Arrow batches are read zero-copy;
+    NDJSON chunks are already column-major, so no per-row dicts are built either way.
+    """
+    if fmt == "arrow":
+        table = pa.ipc.open_stream(pa.py_buffer(content)).read_all()
+        # Nullable pandas dtypes keep int columns with gaps as ints instead of floats
+        mapping = {pa.int32(): pd.Int32Dtype(), pa.bool_(): pd.BooleanDtype()}
+        return table.to_pandas(types_mapper=mapping.get)
+
+    frames = [pd.DataFrame(json.loads(line)["columns"]) for line in content.splitlines() if line]
+    return pd.concat(frames, ignore_index=True)
+
+
+def _payload_key(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, sort_keys=True, default=str)
+
+
+def _recommendations_from(data: Any) -> List[Dict[str, Any]]:
+    if isinstance(data, dict):
+        return data.get("recommendations", [])
+    return data
+
+
+class SportifyClient:
+    """Connection-pooled client for the Sportify AI backend"""
+
+    def __init__(self, base_url: str = API_BASE_URL, pool_size: int = API_POOL_SIZE,
+                 max_retries: int = API_MAX_RETRIES, backoff_factor: float = API_BACKOFF_FACTOR,
+                 timeouts: Optional[Dict[str, Any]] = None, cache: Optional[ResponseCache] = None,
+                 metrics: Optional[ClientMetrics] = None, gateway: Optional[Gateway] = None):
+        self.base_url = base_url.rstrip("/")
+        self.timeouts = {**ENDPOINT_TIMEOUTS, **(timeouts or {})}
+        self.cache = cache if cache is not None else ResponseCache()
+        self.metrics = metrics
+        self.gateway = gateway
+        self.session = self._build_session(pool_size, max_retries, backoff_factor)
+
+    @staticmethod
+    def _build_session(pool_size: int, max_retries: int, backoff_factor: float) -> requests.Session:
+        """Build a keep-alive session; only idempotent GETs are retried"""
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False,
+        )
+        adapter = TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"Connection": "keep-alive", "Accept": "application/json"})
+        return session
+
+    def _slot(self):
+        """Gateway concurrency/rate slot around one upstream call; a no-op without a gateway"""
+        return self.gateway.slot() if self.gateway is not None else nullcontext()
+
+    def _coalesce(self, key: Any, fetch):
+        return self.gateway.coalesce(key, fetch) if self.gateway is not None else fetch()
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        with self._slot():
+            return self._send(method, path, **kwargs)
+
+    def _send(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send a request, recording phase timings and outcome when metrics are enabled"""
+        url = f"{self.base_url}{path}"
+        kwargs.setdefault("timeout", _timeout_for(self.timeouts, path))
+        if self.metrics is None:
+            return self.session.request(method, url, **kwargs)
+
+        endpoint = endpoint_label(method, path)
+        phases = start_phase_timing()
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException as e:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.metrics.record(RequestSample(endpoint, 0, elapsed, error=type(e).__name__, **phases))
+            raise
+        finally:
+            stop_phase_timing()
+        self.metrics.record(sample_from_response(endpoint, response, started, phases))
+        return response
+
+    def _get(self, path: str, params: Optional[Dict[str, Any]] = None,
+             headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        return self._request("GET", path, params=params, headers=headers)
+
+    def _get_json(self, path: str, params: Optional[Dict[str, Any]] = None, cached: bool = True) -> Any:
+        """GET through the response cache; stale entries are revalidated by ETag"""
+        started = time.perf_counter()
+        ttl = self.cache.ttl_for(path) if cached else 0
+        key = self.cache.key(path, params)
+        if ttl:
+            payload, headers = self.cache.lookup(key)
+            if payload is not None:
+                if self.metrics is not None:
+                    self.metrics.record(_cache_hit_sample(path, started))
+                return payload
+        else:
+            headers = {}
+        # Concurrent sessions asking for the same thing share one upstream request
+        return self._coalesce(("GET", key), lambda: self._fetch_json(path, params, key, ttl, headers))
+
+    def _fetch_json(self, path: str, params: Optional[Dict[str, Any]], key: str, ttl: float,
+                    headers: Dict[str, str]) -> Any:
+        response = self._get(path, params, headers=headers)
+        if response.status_code == 304:
+            payload = self.cache.revalidate(key, ttl)
+            if payload is not None:
+                return payload
+            response = self._get(path, params)
+        response.raise_for_status()
+        payload = response.json()
+        if ttl:
+            self.cache.store(key, payload, len(response.content), ttl, response.headers.get("ETag"))
+        return payload
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> requests.Response:
+        return self._request("POST", path, json=payload)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+    def metrics_summary(self) -> Dict[str, Any]:
+        return self.metrics.summary() if self.metrics is not None else {"endpoints": {}}
+
+    def metrics_prometheus(self) -> str:
+        return self.metrics.prometheus() if self.metrics is not None else ""
+
+    def gateway_stats(self) -> Dict[str, Any]:
+        return self.gateway.stats() if self.gateway is not None else {}
+
+    def close(self):
+        """Release pooled connections"""
+        self.session.close()
+
+    # ==================== DATA METHODS ====================
+    # Each method raises requests.HTTPError on a non-2xx response
+
+    def fetch_health(self) -> Dict[str, Any]:
+        return self._get_json("/health")
+
+    def fetch_clubs(self) -> List[Dict[str, Any]]:
+        return _unwrap_body(self._get_json("/clubs"))
+
+    def fetch_club_needs(self, club_id: int) -> Any:
+        return _unwrap_body(self._get_json(f"/clubs/{club_id}/needs"))
+
+    def fetch_players(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return _unwrap_body(self._get_json("/players", params))
+
+    def iter_player_pages(self, params: Dict[str, Any], page_size: int = PLAYER_PAGE_SIZE,
+                          max_rows: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Lazily yield pages of players, following the backend's keyset cursor"""
+        query = {**params, "limit": page_size}
+        query.pop("cursor", None)
+        yielded = 0
+        while True:
+            body = self._get_json("/players", query)
+            page = _unwrap_body(body)
+            if max_rows is not None:
+                page = page[:max_rows - yielded]
+            if not page:
+                return
+            yield page
+            yielded += len(page)
+            cursor = _next_cursor(body)
+            if cursor is None or (max_rows is not None and yielded >= max_rows):
+                return
+            query = {**query, "cursor": cursor}
+
+    def fetch_similar_players(self, player_id: int, k: int = 10,
+                              filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Nearest players by profile; the body carries `source` alongside `data`"""
+        return self._get_json(f"/players/{player_id}/similar", _similar_params(k, filters))
+
+    def fetch_news(self, limit: int = 10) -> List[Dict[str, Any]]:
+        return _unwrap_body(self._get_json("/news", {"limit": limit}))
+
+    def fetch_news_since(self, since: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+        """
+        Newest articles plus a `cursor` (since=None), or only articles added or changed
+        after `since`. The body carries `cursor` and `has_more`; deltas are never cached.
+        """
+        params = {"limit": limit} if since is None else {"since": since, "limit": limit}
+        return self._get_json("/news", params, cached=since is None)
+
+    def fetch_analytics(self, days: int = 14) -> Dict[str, Any]:
+        """Totals, player distributions and per-day activity from the backend's rollups"""
+        return _unwrap_body(self._get_json("/analytics", {"days": days}))
+
+    def stream_news(self, since: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield {event, id, data} from the /news/stream Server-Sent Events: `ready`, then
+        one `news` delta per batch of stored articles, until the connection drops
+        """
+        params = {"since": since} if since is not None else None
+        # Long-lived: not counted against the gateway's concurrency slots
+        with self._send("GET", "/news/stream", params=params, headers={"Accept": "text/event-stream"},
+                        stream=True, timeout=(3, NEWS_STREAM_READ_TIMEOUT)) as response:
+            response.raise_for_status()
+            event: Dict[str, Any] = {}
+            for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                if not line:
+                    if "data" in event:
+                        yield {"event": event.get("event", "message"), "id": event.get("id"),
+                               "data": json.loads(event["data"])}
+                    event = {}
+                elif not line.startswith(":"):  # comments are keepalives
+                    field, _, value = line.partition(":")
+                    value = value[1:] if value.startswith(" ") else value
+                    event[field] = f"{event[field]}\n{value}" if field == "data" and "data" in event else value
+
+    def post_recommendations(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        def fetch():
+            response = self._post("/recommendations", payload)
+            response.raise_for_status()
+            self.cache.invalidate("/recommendations")
+            return _recommendations_from(_unwrap_body(response.json()))
+
+        return self._coalesce(("POST", "/recommendations", _payload_key(payload)), fetch)
+
+    def generate_recommendations_batch(self, club_ids: List[int], limit: int = 20) -> Iterator[Dict[str, Any]]:
+        """Yield one {club_id, status, data} result per club as the backend finishes it"""
+        path = "/recommendations/batch"
+        # The gateway slot is held for the whole stream, not just until the headers
+        payload = {"club_ids": club_ids, "limit": limit}
+        with self._slot(), self._send("POST", path, json=payload, stream=True) as response:
+            response.raise_for_status()
+            self.cache.invalidate("/recommendations")
+            for line in response.iter_lines(chunk_size=None):
+                if line:
+                    yield json.loads(line)
+
+    def stream_recommendations(self, payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield {event, data} as the backend produces the shortlist: `ranked` (top-N,
+        no explanations), one `explanation` per player, then `done` (or `error`)
+        """
+        path = "/recommendations/stream"
+        with self._slot(), self._send("POST", path, json=payload, stream=True) as response:
+            response.raise_for_status()
+            self.cache.invalidate("/recommendations")
+            for line in response.iter_lines(chunk_size=None):
+                if line:
+                    yield json.loads(line)
+
+    def export_frame(self, table: str, columns: Optional[List[str]] = None, **filters) -> pd.DataFrame:
+        """Bulk-load `players` or `clubs` into a DataFrame; columns and filters are applied server-side"""
+        params = _export_params(columns, filters)
+        response = self._get(f"/export/{table}", params, headers={"Accept": EXPORT_ACCEPT[params["format"]]})
+        response.raise_for_status()
+        return _frame_from_export(response.content, params["format"])
+
+    def players_frame(self, columns: Optional[List[str]] = None, **filters) -> pd.DataFrame:
+        """
+        Players as a DataFrame, e.g. players_frame(["full_name", "age", "form_score"], position="ST").
+        Filters: position, club_id, age_min, age_max, max_market_value_eur, is_available, limit
+        """
+        return self.export_frame("players", columns, **filters)
+
+    def clubs_frame(self, columns: Optional[List[str]] = None, **filters) -> pd.DataFrame:
+        """Clubs as a DataFrame; filters: league"""
+        return self.export_frame("clubs", columns, **filters)
+
+    def update_club_needs(self, club_id: int, needs: Dict[str, Any]) -> Dict[str, Any]:
+        response = self._post(f"/clubs/{club_id}/needs", needs)
+        response.raise_for_status()
+        self.cache.invalidate("/clubs")
+        self.cache.invalidate("/recommendations")
+        return _unwrap_body(response.json())
+
+    def submit_feedback(self, feedback: Dict[str, Any]) -> Dict[str, Any]:
+        """One feedback entry: club_id, player_id, feedback_type, optional recommendation_id, rating, comment"""
+        response = self._post("/feedback", feedback)
+        response.raise_for_status()
+        self.cache.invalidate("/analytics")
+        return _unwrap_body(response.json())
+
+    def submit_feedback_batch(self, feedback: List[Dict[str, Any]], club_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Many feedback entries in one request, committed together (all or none).
+        `club_id` applies to entries without one.
+        """
+        payload = {"feedback": feedback} if club_id is None else {"club_id": club_id, "feedback": feedback}
+        response = self._post("/feedback/batch", payload)
+        response.raise_for_status()
+        self.cache.invalidate("/analytics")
+        return _unwrap_body(response.json())
+
+
+class AsyncSportifyClient:
+    """Asyncio variant of SportifyClient with the same method surface, awaitable"""
+
+    def __init__(self, base_url: str = API_BASE_URL, pool_size: int = API_POOL_SIZE,
+                 max_concurrency: int = API_MAX_CONCURRENCY, max_retries: int = API_MAX_RETRIES,
+                 backoff_factor: float = API_BACKOFF_FACTOR, timeouts: Optional[Dict[str, Any]] = None,
+                 cache: Optional[ResponseCache] = None, metrics: Optional[ClientMetrics] = None,
+                 gateway: Optional[Gateway] = None):
+        self.base_url = base_url.rstrip("/")
+        self.timeouts = {**ENDPOINT_TIMEOUTS, **(timeouts or {})}
+        self.cache = cache if cache is not None else ResponseCache()
+        self.metrics = metrics
+        self.gateway = gateway
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            headers={"Accept": "application/json"},
+        )
+
+    def _timeout(self, path: str) -> httpx.Timeout:
+        connect, read = _timeout_for(self.timeouts, path)
+        return httpx.Timeout(read, connect=connect)
+
+    def _slot(self):
+        return self.gateway.slot_async() if self.gateway is not None else nullcontext()
+
+    async def _coalesce(self, key: Any, fetch):
+        return await self.gateway.coalesce_async(key, fetch) if self.gateway is not None else await fetch()
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        async with self._slot():
+            return await self._send(method, path, **kwargs)
+
+    async def _send(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request, recording phase timings and outcome when metrics are enabled"""
+        url = f"{self.base_url}{path}"
+        kwargs.setdefault("timeout", self._timeout(path))
+        if self.metrics is None:
+            return await self.client.request(method, url, **kwargs)
+
+        endpoint = endpoint_label(method, path)
+        phases: Dict[str, float] = {}
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, extensions={"trace": httpx_trace(phases, started)},
+                                                 **kwargs)
+        except httpx.HTTPError as e:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.metrics.record(RequestSample(endpoint, 0, elapsed, error=type(e).__name__, **phases))
+            raise
+        self.metrics.record(sample_from_httpx(endpoint, response, started, phases))
+        return response
+
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None,
+                   headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """GET with retry-with-backoff, mirroring the sync session's Retry policy"""
+        attempt = 0
+        while True:
+            try:
+                async with self.semaphore:
+                    response = await self._request("GET", path, params=params, headers=headers)
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+            attempt += 1
+
+    async def _post(self, path: str, payload: Dict[str, Any]) -> httpx.Response:
+        async with self.semaphore:
+            return await self._request("POST", path, json=payload)
+
+    async def _get_json(self, path: str, params: Optional[Dict[str, Any]] = None, cached: bool = True) -> Any:
+        """GET through the response cache; stale entries are revalidated by ETag"""
+        started = time.perf_counter()
+        ttl = self.cache.ttl_for(path) if cached else 0
+        key = self.cache.key(path, params)
+        if ttl:
+            payload, headers = self.cache.lookup(key)
+            if payload is not None:
+                if self.metrics is not None:
+                    self.metrics.record(_cache_hit_sample(path, started))
+                return payload
+        else:
+            headers = {}
+        return await self._coalesce(("GET", key), lambda: self._fetch_json(path, params, key, ttl, headers))
+
+    async def _fetch_json(self, path: str, params: Optional[Dict[str, Any]], key: str, ttl: float,
+                          headers: Dict[str, str]) -> Any:
+        response = await self._get(path, params, headers=headers)
+        if response.status_code == 304:
+            payload = self.cache.revalidate(key, ttl)
+            if payload is not None:
+                return payload
+            response = await self._get(path, params)
+        response.raise_for_status()
+        payload = response.json()
+        if ttl:
+            self.cache.store(key, payload, len(response.content), ttl, response.headers.get("ETag"))
+        return payload
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+    def metrics_summary(self) -> Dict[str, Any]:
+        return self.metrics.summary() if self.metrics is not None else {"endpoints": {}}
+
+    def metrics_prometheus(self) -> str:
+        return self.metrics.prometheus() if self.metrics is not None else ""
+
+    def gateway_stats(self) -> Dict[str, Any]:
+        return self.gateway.stats() if self.gateway is not None else {}
+
+    async def close(self):
+        """Release pooled connections"""
+        await self.client.aclose()
+
+    # ==================== DATA METHODS ====================
+    # Each method raises httpx.HTTPStatusError on a non-2xx response
+
+    async def fetch_health(self) -> Dict[str, Any]:
+        return await self._get_json("/health")
+
+    async def fetch_clubs(self) -> List[Dict[str, Any]]:
+        return _unwrap_body(await self._get_json("/clubs"))
+
+    async def fetch_club_needs(self, club_id: int) -> Any:
+        return _unwrap_body(await self._get_json(f"/clubs/{club_id}/needs"))
+
+    async def fetch_players(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return _unwrap_body(await self._get_json("/players", params))
+
+    async def iter_player_pages(self, params: Dict[str, Any], page_size: int = PLAYER_PAGE_SIZE,
+                                max_rows: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Lazily yield pages of players, following the backend's keyset cursor"""
+        query = {**params, "limit": page_size}
+        query.pop("cursor", None)
+        yielded = 0
+        while True:
+            body = await self._get_json("/players", query)
+            page = _unwrap_body(body)
+            if max_rows is not None:
+                page = page[:max_rows - yielded]
+            if not page:
+                return
+            yield page
+            yielded += len(page)
+            cursor = _next_cursor(body)
+            if cursor is None or (max_rows is not None and yielded >= max_rows):
+                return
+            query = {**query, "cursor": cursor}
+
+    async def fetch_similar_players(self, player_id: int, k: int = 10,
+                                    filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Nearest players by profile; the body carries `source` alongside `data`"""
+        return await self._get_json(f"/players/{player_id}/similar", _similar_params(k, filters))
+
+    async def fetch_news(self, limit: int = 10) -> List[Dict[str, Any]]:
+        return _unwrap_body(await self._get_json("/news", {"limit": limit}))
+
+    async def fetch_news_since(self, since: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+        params = {"limit": limit} if since is None else {"since": since, "limit": limit}
+        return await self._get_json("/news", params, cached=since is None)
+
+    async def fetch_analytics(self, days: int = 14) -> Dict[str, Any]:
+        return _unwrap_body(await self._get_json("/analytics", {"days": days}))
+
+    async def post_recommendations(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        async def fetch():
+            response = await self._post("/recommendations", payload)
+            response.raise_for_status()
+            self.cache.invalidate("/recommendations")
+            return _recommendations_from(_unwrap_body(response.json()))
+
+        return await self._coalesce(("POST", "/recommendations", _payload_key(payload)), fetch)
+
+    async def generate_recommendations_batch(self, club_ids: List[int],
+                                             limit: int = 20) -> AsyncIterator[Dict[str, Any]]:
+        """Yield one {club_id, status, data} result per club as the backend finishes it"""
+        path = "/recommendations/batch"
+        async with self.semaphore, self._slot():
+            phases: Dict[str, float] = {}
+            started = time.perf_counter()
+            trace = {"trace": httpx_trace(phases, started)} if self.metrics is not None else None
+            async with self.client.stream("POST", f"{self.base_url}{path}",
+                                          json={"club_ids": club_ids, "limit": limit},
+                                          timeout=self._timeout(path), extensions=trace) as response:
+                if self.metrics is not None:
+                    self.metrics.record(sample_from_httpx(endpoint_label("POST", path), response, started, phases))
+                response.raise_for_status()
+                self.cache.invalidate("/recommendations")
+                async for line in response.aiter_lines():
+                    if line:
+                        yield json.loads(line)
+
+    async def stream_recommendations(self, payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield {event, data} as the backend produces the shortlist: `ranked` (top-N,
+        no explanations), one `explanation` per player, then `done` (or `error`)
+        """
+        path = "/recommendations/stream"
+        async with self.semaphore, self._slot():
+            phases: Dict[str, float] = {}
+            started = time.perf_counter()
+            trace = {"trace": httpx_trace(phases, started)} if self.metrics is not None else None
+            async with self.client.stream("POST", f"{self.base_url}{path}", json=payload,
+                                          timeout=self._timeout(path), extensions=trace) as response:
+                if self.metrics is not None:
+                    self.metrics.record(sample_from_httpx(endpoint_label("POST", path), response, started, phases))
+                response.raise_for_status()
+                self.cache.invalidate("/recommendations")
+                async for line in response.aiter_lines():
+                    if line:
+                        yield json.loads(line)
+
+    async def export_frame(self, table: str, columns: Optional[List[str]] = None, **filters) -> pd.DataFrame:
+        """Bulk-load `players` or `clubs` into a DataFrame; columns and filters are applied server-side"""
+        params = _export_params(columns, filters)
+        response = await self._get(f"/export/{table}", params, headers={"Accept": EXPORT_ACCEPT[params["format"]]})
+        response.raise_for_status()
+        return _frame_from_export(response.content, params["format"])
+
+    async def players_frame(self, columns: Optional[List[str]] = None, **filters) -> pd.DataFrame:
+        """Players as a DataFrame; see SportifyClient.players_frame"""
+        return await self.export_frame("players", columns, **filters)
+
+    async def clubs_frame(self, columns: Optional[List[str]] = None, **filters) -> pd.DataFrame:
+        """Clubs as a DataFrame; filters: league"""
+        return await self.export_frame("clubs", columns, **filters)
+
+    async def update_club_needs(self, club_id: int, needs: Dict[str, Any]) -> Dict[str, Any]:
+        response = await self._post(f"/clubs/{club_id}/needs", needs)
+        response.raise_for_status()
+        self.cache.invalidate("/clubs")
+        self.cache.invalidate("/recommendations")
+        return _unwrap_body(response.json())
+
+    async def submit_feedback(self, feedback: Dict[str, Any]) -> Dict[str, Any]:
+        response = await self._post("/feedback", feedback)
+        response.raise_for_status()
+        self.cache.invalidate("/analytics")
+        return _unwrap_body(response.json())
+
+    async def submit_feedback_batch(self, feedback: List[Dict[str, Any]],
+                                    club_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        payload = {"feedback": feedback} if club_id is None else {"club_id": club_id, "feedback": feedback}
+        response = await self._post("/feedback/batch", payload)
+        response.raise_for_status()
+        self.cache.invalidate("/analytics")
+        return _unwrap_body(response.json())
+
+    async def fetch_dashboard(self, player_params: Optional[Dict[str, Any]] = None,
+                              news_limit: int = 10) -> Dict[str, Any]:
+        """
+        Fire health, clubs, news and players concurrently.
+        Each value is either the payload or the exception that request raised.
+        """
+        keys = ("health", "clubs", "news", "players")
+        results = await asyncio.gather(
+            self.fetch_health(),
+            self.fetch_clubs(),
+            self.fetch_news(limit=news_limit),
+            self.fetch_players(player_params or {"limit": 20}),
+            return_exceptions=True,
+        )
+        return dict(zip(keys, results))
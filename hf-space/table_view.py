@@ -0,0 +1,220 @@
+"""
+Sportify AI - Windowed result tables
+Result sets held as a pandas DataFrame. Filter and sort run on the frame, and a
+UI only ever receives one window of rows, so render cost follows the window size
+rather than the result size. Frames are built column by column from the API
+records, with no per-row dict or Markdown.
+"""
+
+import copy
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+TABLE_WINDOW_ROWS = int(os.getenv("TABLE_WINDOW_ROWS", "50"))
+
+# (label, source[, transform]): source is a tuple of record keys, first non-null wins
+# (the backend and older callers name some fields differently), or a function of the raw frame
+Column = Tuple[Any, ...]
+
+
+def explanation_text(explanation: Any) -> str:
+    """The backend sends a structured explanation; older callers sent plain text"""
+    if not isinstance(explanation, dict):
+        return "" if explanation is None or pd.isna(explanation) else str(explanation)
+    parts = list(explanation.get('top_reasons', []))
+    narrative = explanation.get('narrative') or {}
+    parts.extend(narrative.get('reasons', []))
+    parts.extend(f"⚠️ {risk}" for risk in explanation.get('risk_indicators', []))
+    return "; ".join(parts)
+
+
+def _millions(values: pd.Series) -> pd.Series:
+    return (pd.to_numeric(values, errors="coerce") / 1_000_000).round(1)
+
+
+def _percent(values: pd.Series) -> pd.Series:
+    return (pd.to_numeric(values, errors="coerce") * 100).round(1)
+
+
+def _yes_no(values: pd.Series) -> pd.Series:
+    return values.map({True: "✅", False: "❌"})
+
+
+def _rank(values: pd.Series) -> pd.Series:
+    """rank_position where sent, otherwise list order"""
+    return values.fillna(pd.Series(np.arange(1, len(values) + 1), index=values.index)).astype(int)
+
+
+def _summary(values: pd.Series) -> pd.Series:
+    return values.fillna("").astype(str).str.slice(0, 200)
+
+
+def _news_confidence(raw: pd.DataFrame) -> pd.Series:
+    """confidence_score where sent, else the strongest extraction's, as a percentage"""
+    explicit = pd.to_numeric(raw["confidence_score"], errors="coerce") if "confidence_score" in raw else None
+    extracted = pd.Series(np.nan, index=raw.index)
+    if "extractions" in raw:
+        extracted = raw["extractions"].map(lambda extractions: max(
+            (e["confidence"] for e in extractions or [] if e.get("confidence") is not None), default=np.nan))
+    confidence = extracted if explicit is None else explicit.where(explicit > 0, extracted)
+    return (confidence.fillna(0) * 100).round()
+
+
+PLAYER_COLUMNS: List[Column] = [
+    ("ID", ("id",)),
+    ("Name", ("full_name", "name")),
+    ("Position", ("primary_position", "position")),
+    ("Club", ("current_club", "club", "current_club_id")),
+    ("Age", ("age",)),
+    ("Value (€M)", ("market_value_eur",), _millions),
+    ("Available", ("is_available",), _yes_no),
+]
+
+CLUB_COLUMNS: List[Column] = [
+    ("Name", ("name",)),
+    ("Country", ("country",)),
+    ("League", ("league",)),
+    ("Founded", ("founded_year",)),
+    ("Stadium", ("stadium", "stadium_name")),
+]
+
+NEWS_COLUMNS: List[Column] = [
+    ("Published", ("published_date", "published_at")),
+    ("Title", ("title",)),
+    ("Source", ("source", "source_name")),
+    ("Confidence %", _news_confidence),
+    ("Summary", ("summary", "content"), _summary),
+]
+
+RECOMMENDATION_COLUMNS: List[Column] = [
+    ("Rank", ("rank_position",), _rank),
+    ("Name", ("full_name", "player_name")),
+    ("Position", ("primary_position", "position")),
+    ("Club", ("current_club", "current_club_id")),
+    ("Age", ("age",)),
+    ("Match %", ("final_score",), _percent),
+    ("Fit %", ("fit_score",), _percent),
+    ("Why", ("explanation",), lambda values: values.map(explanation_text)),
+]
+
+
+def column_labels(columns: Sequence[Column]) -> List[str]:
+    return [column[0] for column in columns]
+
+
+def build_frame(records: Union[pd.DataFrame, Iterable[Dict[str, Any]]], columns: Sequence[Column]) -> pd.DataFrame:
+    """Display frame for `columns` from API records (or an already-columnar frame)"""
+    raw = records if isinstance(records, pd.DataFrame) else pd.DataFrame.from_records(list(records))
+    out = {}
+    for label, source, *transform in columns:
+        if callable(source):
+            values = source(raw)
+        else:
+            values = None
+            for key in source:
+                if key in raw:
+                    values = raw[key] if values is None else values.where(values.notna(), raw[key])
+            if values is None:
+                values = pd.Series([None] * len(raw), index=raw.index, dtype=object)
+        out[label] = transform[0](values) if transform else values
+    return pd.DataFrame(out, index=raw.index).reset_index(drop=True)
+
+
+class TableView:
+    """
+    One result set and the rows currently shown from it. query() returns a new
+    view over the same frame, sharing its sort orders and filter text, so a
+    session's filter or sort never rebuilds the frame or touches another session's view.
+    """
+
+    def __init__(self, frame: pd.DataFrame, title: str = ""):
+        self.frame = frame.reset_index(drop=True)
+        self.title = title
+        self.order = np.arange(len(self.frame))
+        self.filtered = False
+        self.keys: Optional[pd.DataFrame] = None  # ids behind each row (not displayed), aligned with frame
+        self._cache: Dict[Any, Any] = {}
+
+    @classmethod
+    def from_records(cls, records: Union[pd.DataFrame, Iterable[Dict[str, Any]]], columns: Sequence[Column],
+                     title: str = "") -> "TableView":
+        return cls(build_frame(records, columns), title)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def matches(self) -> int:
+        return len(self.order)
+
+    def _sort_order(self, column: str, descending: bool) -> np.ndarray:
+        key = ("sort", column, descending)
+        if key not in self._cache:
+            values = self.frame[column]
+            try:
+                ordered = values.sort_values(ascending=not descending, kind="stable", na_position="last")
+            except TypeError:  # mixed types, e.g. club names and ids
+                ordered = values.astype(str).sort_values(ascending=not descending, kind="stable")
+            self._cache[key] = ordered.index.to_numpy()
+        return self._cache[key]
+
+    def _text(self) -> pd.Series:
+        """Every text column, lowercased and joined per row; built on the first filter"""
+        if "text" not in self._cache:
+            text = pd.Series("", index=self.frame.index)
+            for column in self.frame.columns:
+                if not pd.api.types.is_numeric_dtype(self.frame[column]):
+                    text = text + "\x1f" + self.frame[column].fillna("").astype(str).str.lower()
+            self._cache["text"] = text
+        return self._cache["text"]
+
+    def query(self, filter_text: str = "", sort_by: Optional[str] = None, descending: bool = False) -> "TableView":
+        """Rows containing `filter_text` in any text column, ordered by `sort_by`"""
+        view = copy.copy(self)
+        rows = self._sort_order(sort_by, bool(descending)) if sort_by in self.frame else np.arange(len(self.frame))
+        text = (filter_text or "").strip().lower()
+        if text:
+            hits = self._text().str.contains(text, regex=False).to_numpy()
+            rows = rows[hits[rows]]
+        view.order = rows
+        view.filtered = bool(text)
+        return view
+
+    def set(self, row: int, column: str, value: Any):
+        """Update one cell in place; cached sort orders and filter text are rebuilt on next use"""
+        self.frame.at[row, column] = value
+        self._cache.clear()
+
+    def pages(self, size: int = TABLE_WINDOW_ROWS) -> int:
+        return max(1, -(-self.matches // size))
+
+    def _page(self, page: Any, size: int) -> int:
+        try:
+            page = int(page or 1)
+        except (TypeError, ValueError):
+            page = 1
+        return min(max(page, 1), self.pages(size))
+
+    def window(self, page: Any = 1, size: int = TABLE_WINDOW_ROWS) -> pd.DataFrame:
+        """The rows on one page: the only part of the result a UI renders"""
+        start = (self._page(page, size) - 1) * size
+        return self.frame.iloc[self.order[start:start + size]]
+
+    def rows(self) -> pd.DataFrame:
+        """Every matching row in order, for components that virtualize on their own (st.dataframe)"""
+        return self.frame.iloc[self.order]
+
+    def caption(self, page: Any = 1, size: int = TABLE_WINDOW_ROWS) -> str:
+        lines = [self.title] if self.title else []
+        if self.matches == 0:
+            lines.append("_No rows match the filter._" if self.filtered else "_No rows._")
+            return "\n\n".join(lines)
+        page = self._page(page, size)
+        start = (page - 1) * size
+        filtered = f" (filtered from {len(self):,})" if self.filtered else ""
+        lines.append(f"_Rows {start + 1:,}–{min(start + size, self.matches):,} of {self.matches:,}{filtered}"
+                     f" · page {page} of {self.pages(size)}_")
+        return "\n\n".join(lines)
@@ -0,0 +1,212 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from gateway import Gateway, GatewayQueueFull
+
+
+def unlimited(**kwargs) -> Gateway:
+    """A gateway whose token bucket never delays, so only the concurrency limit applies"""
+    return Gateway(rate=1e9, burst=10 ** 9, **kwargs)
+
+
+# ==================== SINGLEFLIGHT ====================
+
+def test_coalesce_runs_one_fetch_for_concurrent_callers():
+    gateway = unlimited()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "players"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(gateway.coalesce("k", fetch)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(gateway.coalesce("k", fetch))) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    while gateway.counters["coalesced"] < 4:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ["players"] * 5
+    assert gateway.counters["upstream"] == 1 and gateway.counters["coalesced"] == 4
+    assert gateway._inflight == {}
+
+
+def test_coalesce_shares_the_leaders_error():
+    gateway = unlimited()
+
+    def fetch():
+        raise ValueError("backend down")
+
+    with pytest.raises(ValueError):
+        gateway.coalesce("k", fetch)
+    assert gateway._inflight == {}
+
+
+def test_coalesce_async_survives_leader_cancellation():
+    async def run():
+        gateway = unlimited()
+        release = asyncio.Event()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await release.wait()
+            return "news"
+
+        leader = asyncio.ensure_future(gateway.coalesce_async("k", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(gateway.coalesce_async("k", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        release.set()
+        assert await follower == "news"
+        assert calls == [1]
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    asyncio.run(run())
+
+
+# ==================== CONCURRENCY + QUEUE ====================
+
+def test_slots_are_handed_over_in_fifo_order():
+    async def run():
+        gateway = unlimited(max_concurrency=1)
+        order = []
+        hold = asyncio.Event()
+
+        async def call(name):
+            async with gateway.slot_async():
+                order.append(name)
+                if name == "first":
+                    await hold.wait()
+
+        tasks = [asyncio.ensure_future(call(name)) for name in ("first", "second", "third")]
+        await asyncio.sleep(0.01)
+        assert gateway.stats()["queue_depth"] == 2
+        hold.set()
+        await asyncio.gather(*tasks)
+        assert order == ["first", "second", "third"]
+        assert gateway._active == 0
+
+    asyncio.run(run())
+
+
+def test_full_queue_rejects_instead_of_waiting():
+    gateway = unlimited(max_concurrency=1, max_queue=1)
+    holder_in, holder_out = threading.Event(), threading.Event()
+
+    def hold():
+        with gateway.slot():
+            holder_in.set()
+            holder_out.wait(5)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    holder_in.wait(5)
+    waiting = threading.Thread(target=hold)
+    waiting.start()
+    while gateway.stats()["queue_depth"] < 1:
+        time.sleep(0.001)
+
+    with pytest.raises(GatewayQueueFull):
+        with gateway.slot():
+            pass
+    assert gateway.counters["rejected"] == 1
+
+    holder_out.set()
+    holder.join(5)
+    waiting.join(5)
+    assert gateway._active == 0
+
+
+def test_cancelled_while_queued_leaves_the_queue():
+    async def run():
+        gateway = unlimited(max_concurrency=1)
+        hold = asyncio.Event()
+
+        async def holder():
+            async with gateway.slot_async():
+                await hold.wait()
+
+        async def queued():
+            async with gateway.slot_async():
+                pass
+
+        first = asyncio.ensure_future(holder())
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(queued())
+        await asyncio.sleep(0)
+        second.cancel()
+        await asyncio.gather(second, return_exceptions=True)
+        assert gateway.stats()["queue_depth"] == 0
+        hold.set()
+        await first
+        assert gateway._active == 0
+
+    asyncio.run(run())
+
+
+def test_cancelled_after_being_handed_the_slot_gives_it_back():
+    """The slot is handed to a queued caller, which is cancelled before it resumes"""
+    async def run():
+        gateway = unlimited(max_concurrency=1)
+        entered = []
+
+        async def queued():
+            async with gateway.slot_async():
+                entered.append(1)
+
+        assert gateway._enter() is None  # hold the only slot
+        waiter = asyncio.ensure_future(queued())
+        await asyncio.sleep(0)
+        assert gateway.stats()["queue_depth"] == 1
+
+        gateway._release()  # hands the slot over; the waiter's future resolves on the next loop turn
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        assert entered == [] and gateway._active == 0
+        async with gateway.slot_async():  # would queue forever if the slot had leaked
+            pass
+
+    asyncio.run(asyncio.wait_for(run(), 5))
+
+
+def test_cancelled_before_the_handover_runs_passes_the_slot_on():
+    async def run():
+        gateway = unlimited(max_concurrency=1)
+        entered = []
+
+        async def queued(name):
+            async with gateway.slot_async():
+                entered.append(name)
+
+        assert gateway._enter() is None
+        second = asyncio.ensure_future(queued("second"))
+        third = asyncio.ensure_future(queued("third"))
+        await asyncio.sleep(0)
+
+        gateway._release()  # pops `second`; its future is resolved on the next loop turn...
+        second.cancel()  # ...by which time it is already cancelled
+        await asyncio.gather(second, third, return_exceptions=True)
+
+        assert entered == ["third"]
+        assert gateway._active == 0
+
+    asyncio.run(asyncio.wait_for(run(), 5))
@@ -0,0 +1,96 @@
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from mock_server import start_mock_server
+from news_feed import NewsFeed
+from sportify_client import SportifyClient
+
+
+def article(id: int, feed_seq: int, **fields) -> Dict[str, Any]:
+    return {"id": id, "feed_seq": str(feed_seq), "published_at": f"2025-01-{id:02d}", **fields}
+
+
+class FakeClient:
+    """Serves queued /news?since= responses and a scripted stream"""
+
+    def __init__(self, pages: Optional[List[Dict[str, Any]]] = None, events: Optional[List[Dict[str, Any]]] = None):
+        self.pages = list(pages or [])
+        self.events = list(events or [])
+        self.requested: List[Optional[str]] = []
+
+    def fetch_news_since(self, since, limit=50):
+        self.requested.append(since)
+        return self.pages.pop(0)
+
+    def stream_news(self, since):
+        self.requested.append(since)
+        yield from self.events
+
+
+def test_delta_replaces_the_copy_and_evicts_the_least_recently_changed():
+    feed = NewsFeed(FakeClient(), capacity=2)
+    feed.apply([article(1, 1), article(2, 2)], "2")
+    feed.apply([article(1, 3, title="edited")], "3")
+    assert feed.stats()["articles"] == 2 and feed.cursor == "3"
+
+    feed.apply([article(3, 4)], "4")
+    ids = {a["id"] for a in feed.articles(10)}
+    assert ids == {1, 3}
+    assert feed.counters["evicted"] == 1
+    assert [a for a in feed.articles(10) if a["id"] == 1][0]["title"] == "edited"
+
+
+def test_cursor_never_moves_backwards():
+    feed = NewsFeed(FakeClient())
+    feed.apply([article(1, 10)], "10")
+    version = feed.version
+    feed.apply([], "7")
+    assert feed.cursor == "10"
+    assert feed.version == version  # an empty delta changes nothing
+
+
+def test_catch_up_loads_first_then_pages_through_has_more():
+    client = FakeClient(pages=[
+        {"data": [article(2, 2), article(1, 1)], "cursor": "2"},
+        {"data": [article(3, 3)], "cursor": "3", "has_more": True},
+        {"data": [article(4, 4)], "cursor": "4", "has_more": False},
+    ])
+    feed = NewsFeed(client)
+
+    assert feed.catch_up() == 2
+    assert feed.cursor == "2"
+    assert feed.catch_up() == 2
+    assert client.requested == [None, "2", "3"]
+    assert feed.cursor == "4" and feed.counters["deltas"] == 2
+
+
+def test_follow_applies_pushed_deltas():
+    client = FakeClient(events=[
+        {"event": "ready", "data": {"cursor": "5"}},
+        {"event": "news", "data": {"data": [article(6, 6)], "cursor": "6"}},
+    ])
+    feed = NewsFeed(client)
+    feed.apply([article(5, 5)], "5")
+    feed._follow()
+
+    assert client.requested == ["5"]
+    assert feed.cursor == "6" and feed.mode == "push"
+    assert feed.articles(1)[0]["id"] == 6
+
+
+@pytest.fixture
+def backend():
+    server = start_mock_server(num_news=5)
+    yield server
+    server.shutdown()
+
+
+def test_catch_up_against_the_mock_backend(backend):
+    feed = NewsFeed(SportifyClient(f"http://127.0.0.1:{backend.server_port}/api"), capacity=10)
+    feed.catch_up()
+    assert feed.stats()["articles"] == 5
+
+    published = backend.backend.publish_news()[0]
+    assert feed.catch_up() == 1
+    assert feed.articles(1)[0]["id"] == published["id"]
@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from mock_server import start_mock_server
+from player_snapshot import PlayerSnapshot
+from sportify_client import SportifyClient
+
+
+@pytest.fixture
+def backend():
+    server = start_mock_server(num_players=50)
+    yield server
+    server.shutdown()
+
+
+def _snapshot(server, tmp_path, **kwargs) -> PlayerSnapshot:
+    return PlayerSnapshot(SportifyClient(f"http://127.0.0.1:{server.server_port}/api"), root=str(tmp_path), **kwargs)
+
+
+def _ids(snapshot: PlayerSnapshot) -> set:
+    return set(snapshot.view.frame()["id"])
+
+
+def test_delta_sync_applies_only_changed_rows(backend, tmp_path):
+    snapshot = _snapshot(backend, tmp_path)
+    assert snapshot.sync() == 50
+    assert snapshot.sync() == 0
+
+    stamp = datetime.now(timezone.utc).replace(tzinfo=None).isoformat(timespec="microseconds")
+    player = backend.backend.data["players"][0]
+    player.update(market_value_eur=player["market_value_eur"] + 1_000_000, last_updated=stamp)
+
+    assert snapshot.sync() == 1
+    row = snapshot.view.frame().set_index("id").loc[player["id"]]
+    assert row["market_value_eur"] == player["market_value_eur"]
+    assert snapshot.view.version == 2
+
+
+def test_deleted_players_leave_on_reconcile(backend, tmp_path):
+    snapshot = _snapshot(backend, tmp_path, reconcile_interval=3600)
+    snapshot.sync()
+    deleted = backend.backend.data["players"].pop(3)["id"]
+
+    assert snapshot.sync() == 0  # a delta cannot carry the deletion
+    assert deleted in _ids(snapshot)
+
+    assert snapshot.sync(reconcile=True) == 1
+    assert deleted not in _ids(snapshot)
+    assert snapshot.last_sync["removed"] == 1 and snapshot.view.rows == 49
+
+
+def test_first_sync_after_restart_reconciles(backend, tmp_path):
+    _snapshot(backend, tmp_path).sync()
+    deleted = backend.backend.data["players"].pop()["id"]
+
+    reopened = _snapshot(backend, tmp_path, reconcile_interval=3600)
+    assert deleted in _ids(reopened)
+    reopened.sync()
+    assert deleted not in _ids(reopened)
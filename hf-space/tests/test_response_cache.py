@@ -0,0 +1,76 @@
+import response_cache
+from response_cache import ResponseCache
+
+
+def test_fresh_hit_then_stale_with_etag(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    cache = ResponseCache()
+    key = cache.key("/players", {"position": "ST", "limit": 20})
+
+    assert cache.lookup(key) == (None, {})
+    cache.store(key, ["haaland"], size=10, ttl=120, etag='"v1"')
+    assert cache.lookup(key) == (["haaland"], {})
+
+    now[0] += 121
+    assert cache.lookup(key) == (None, {"If-None-Match": '"v1"'})
+    assert cache.revalidate(key, ttl=120) == ["haaland"]
+    assert cache.lookup(key) == (["haaland"], {})
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_key_ignores_parameter_order():
+    assert ResponseCache.key("/players", {"a": 1, "b": 2}) == ResponseCache.key("/players", {"b": 2, "a": 1})
+
+
+def test_ttl_by_first_path_segment():
+    cache = ResponseCache(ttls={"/news": 5})
+    assert cache.ttl_for("/clubs/12") == 3600
+    assert cache.ttl_for("news") == 5
+    assert cache.ttl_for("/health") == 0
+    assert cache.ttl_for("/unknown") == 0
+
+
+def test_evicts_least_recently_used_by_count():
+    cache = ResponseCache(max_entries=2)
+    cache.store("a", 1, size=1, ttl=60)
+    cache.store("b", 2, size=1, ttl=60)
+    cache.lookup("a")
+    cache.store("c", 3, size=1, ttl=60)
+
+    assert cache.lookup("b") == (None, {})
+    assert cache.lookup("a") == (1, {})
+    assert cache.stats()["evictions"] == 1
+
+
+def test_evicts_by_bytes_and_skips_oversized_payloads():
+    cache = ResponseCache(max_bytes=100)
+    cache.store("a", 1, size=60, ttl=60)
+    cache.store("b", 2, size=60, ttl=60)
+    assert cache.lookup("a") == (None, {})
+    assert cache.stats()["bytes"] == 60
+
+    cache.store("huge", 3, size=101, ttl=60)
+    assert cache.lookup("huge") == (None, {})
+    assert cache.lookup("b") == (2, {})
+
+
+def test_storing_again_replaces_the_entry_and_its_size():
+    cache = ResponseCache()
+    cache.store("a", 1, size=40, ttl=60)
+    cache.store("a", 2, size=10, ttl=60)
+    assert cache.lookup("a") == (2, {})
+    assert cache.stats()["bytes"] == 10
+
+
+def test_invalidate_by_prefix():
+    cache = ResponseCache()
+    for path in ("/players", "/players/7", "/clubs"):
+        cache.store(cache.key(path), path, size=1, ttl=60)
+
+    cache.invalidate("/players")
+    assert cache.stats()["entries"] == 1
+    assert cache.lookup(cache.key("/clubs")) == ("/clubs", {})
+
+    cache.invalidate()
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
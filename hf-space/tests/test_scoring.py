@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+from mock_server import start_mock_server
+from scoring import CandidateSet
+from sportify_client import SportifyClient
+
+NEED = {"positions_required": ["ST", "CF"], "age_min": 20, "age_max": 28, "budget_max_eur": 50_000_000,
+        "preferred_foot": "right"}
+
+# Shaped like the players export: secondary positions as text, rollup columns empty without a rollup row
+MATCHING = pd.DataFrame([
+    {"id": 1, "primary_position": "ST", "secondary_positions": "", "age": 24, "market_value_eur": 40e6,
+     "preferred_foot": "right", "is_available": True, "form_score": 0.8,
+     "availability_penalty": 0.3, "active_risk_count": 1, "avg_risk": 0.5, "news_confidence": 0.9},
+    {"id": 2, "primary_position": "LW", "secondary_positions": "ST", "age": 27, "market_value_eur": 30e6,
+     "preferred_foot": "both", "is_available": True, "form_score": 0.7,
+     "availability_penalty": 0.0, "active_risk_count": 0, "avg_risk": 0.0, "news_confidence": None},
+    {"id": 3, "primary_position": "CAM", "secondary_positions": "CF", "age": 22, "market_value_eur": 20e6,
+     "preferred_foot": "right", "is_available": True, "form_score": 0.9,
+     "availability_penalty": 0.6, "active_risk_count": 3, "avg_risk": 0.8, "news_confidence": 0.7},
+    {"id": 4, "primary_position": "CF", "secondary_positions": "ST", "age": 21, "market_value_eur": 45e6,
+     "preferred_foot": "right", "is_available": True, "form_score": 0.0,
+     "availability_penalty": None, "active_risk_count": None, "avg_risk": None, "news_confidence": None},
+])
+
+# (id, fit_score, final_score) from RecommendationService._calculateScores / _calculateFinalScore
+# on the rows above, in the backend's ranked order
+BACKEND_SCORES = [(1, 1.0, 0.815), (2, 0.95, 0.7825), (4, 1.0, 0.75), (3, 0.6, 0.6)]
+
+# One hard constraint broken each, all with a better form than any match
+EXCLUDED = pd.DataFrame([
+    {**MATCHING.iloc[0].to_dict(), "id": 10, "form_score": 0.99, **change}
+    for change in [{"is_available": False}, {"primary_position": "CB"}, {"age": 19}, {"age": 29},
+                   {"market_value_eur": 60e6}, {"preferred_foot": "left"}]
+])
+
+
+def test_scores_match_the_backend():
+    ranked = CandidateSet(MATCHING).top_k(NEED, k=10)
+
+    assert list(ranked["id"]) == [player_id for player_id, _, _ in BACKEND_SCORES]
+    assert list(ranked["fit_score"]) == pytest.approx([fit for _, fit, _ in BACKEND_SCORES])
+    assert list(ranked["final_score"]) == pytest.approx([final for _, _, final in BACKEND_SCORES])
+    assert list(ranked["rank_position"]) == [1, 2, 3, 4]
+
+
+def test_hard_filters_drop_players_the_backend_never_scores():
+    frame = pd.concat([EXCLUDED.assign(id=range(10, 10 + len(EXCLUDED))), MATCHING], ignore_index=True)
+    ranked = CandidateSet(frame).top_k(NEED, k=10)
+
+    assert list(ranked["id"]) == [1, 2, 4, 3]
+
+
+def test_candidates_keep_the_best_form_up_to_the_limit():
+    candidates = CandidateSet(MATCHING)
+
+    assert list(candidates.frame.loc[candidates.candidates(NEED, limit=2), "id"]) == [3, 1]
+    assert list(candidates.top_k({**NEED, "positions_required": []}, k=10)["id"]) == [1, 2, 4, 3]
+
+
+def test_export_limit_and_availability_are_applied_server_side():
+    server = start_mock_server(num_players=50)
+    try:
+        api = SportifyClient(f"http://127.0.0.1:{server.server_port}/api")
+        available = api.players_frame(["is_available"], is_available=True)
+        players = api.players_frame(["is_available"], is_available=True, limit=10)
+    finally:
+        server.shutdown()
+
+    assert len(available) > 10 and bool(available["is_available"].all())
+    assert list(players["id"]) == list(available["id"][:10])
@@ -0,0 +1,57 @@
+import pytest
+
+pytest.importorskip("gradio")
+
+from app_gradio import ShortlistView, SportifyAPI, _feedback_entries  # noqa: E402
+from mock_server import start_mock_server  # noqa: E402
+from table_view import TableView  # noqa: E402
+
+# Shaped like RecommendationService's rows: player columns plus scores, no player_id/club_id
+BACKEND_RANKED = [
+    {"id": 42, "full_name": "Erling Haaland", "primary_position": "ST", "age": 24, "current_club_id": 7,
+     "market_value_eur": 180000000, "fit_score": 0.9, "performance_score": 0.95, "availability_score": 1.0,
+     "risk_penalty": 0.0, "news_confidence": 0.5, "final_score": 0.91, "rank_position": 1},
+    {"id": 17, "full_name": "Victor Osimhen", "primary_position": "ST", "age": 26, "current_club_id": None,
+     "market_value_eur": 100000000, "fit_score": 0.8, "performance_score": 0.85, "availability_score": 0.7,
+     "risk_penalty": 0.1, "news_confidence": 0.6, "final_score": 0.78, "rank_position": 2},
+]
+
+
+@pytest.fixture
+def backend():
+    server = start_mock_server(num_players=200)
+    yield server
+    server.shutdown()
+
+
+def test_feedback_keys_come_from_the_player_and_the_requesting_club():
+    view = ShortlistView("Arsenal", club_id=1)
+    table = view.apply({"event": "ranked", "data": BACKEND_RANKED})
+
+    entries, names = _feedback_entries(table, "", "interested", 4, "")
+    assert [(e["club_id"], e["player_id"]) for e in entries] == [(1, 42), (1, 17)]
+    assert names == ["Erling Haaland", "Victor Osimhen"]
+
+    entries, _ = _feedback_entries(table, "2", "contacted", 0, "")
+    assert entries == [{"club_id": 1, "player_id": 17, "feedback_type": "contacted", "rating": None,
+                        "comment": None}]
+
+
+def test_feedback_for_a_backend_shaped_shortlist_is_stored(backend):
+    api = SportifyAPI(f"http://127.0.0.1:{backend.server_port}/api")
+    table = ShortlistView("Arsenal", club_id=1).apply({"event": "ranked", "data": BACKEND_RANKED})
+
+    assert api.shortlist_feedback(table, "1,2", "interested", 4, "").startswith("✅ Recorded 2")
+
+
+def test_streamed_mock_shortlist_round_trips_to_feedback(backend):
+    api = SportifyAPI(f"http://127.0.0.1:{backend.server_port}/api")
+    view = ShortlistView("Club 2", club_id=2)
+    for event in api.stream_recommendations({"club_id": 2, "limit": 3}):
+        if event["event"] == "ranked":
+            assert "player_id" not in event["data"][0]  # same row shape as the backend
+        table = view.apply(event)
+    assert isinstance(table, TableView) and len(table) == 3
+
+    assert api.shortlist_feedback(table, "", "interested", 0, "").startswith("✅ Recorded 3")
+    assert {row["club_id"] for row in backend.backend.feedback} == {2}